@@ -4,10 +4,15 @@ Fast exploration mode with Chemeleon and MACE (no SMACT for speed).
 
 Tools: Chemeleon, MACE, PyMatgen (no composition validation)
 Features: Fast structure prediction, energy calculations, basic visualization
-Optimized for rapid exploration of materials space.
+Optimized for rapid exploration of materials space: the discovery pipeline runs
+generation, MACE and file writing as concurrent stages, and batch_call runs many
+tool calls in one request.
 """
 
+import asyncio
+import io
 import logging
+import time
 import warnings
 from datetime import datetime
 from pathlib import Path
@@ -24,9 +29,14 @@ warnings.filterwarnings(
 )
 
 # CLEAN IMPORTS - No sys.path manipulation!
-from crystalyse.tools.chemeleon import ChemeleonPredictor
-from crystalyse.tools.mace import MACECalculator
-from crystalyse.tools.pymatgen import PyMatgenAnalyzer
+from crystalyse.tools.arrays import check_encoding, encode_arrays
+from crystalyse.tools.batch import register_batch_call
+from crystalyse.tools.budget import BudgetExceeded, tool_budget
+from crystalyse.tools.pipeline import Stage, run_stages
+from crystalyse.tools.registry import ToolRegistry
+from crystalyse.tools.resources import add_resource, wait_for_resource, warm_up_plan
+from crystalyse.tools.serving import serve
+from crystalyse.utils.serialization import to_jsonable
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -35,10 +45,14 @@ logger = logging.getLogger(__name__)
 # Initialize FastMCP server
 mcp = FastMCP("chemistry-creative")
 
-# Initialize tool instances
-chemeleon_predictor = ChemeleonPredictor()
-mace_calculator = MACECalculator()
-pymatgen_analyzer = PyMatgenAnalyzer()
+# Tool instances, imported and created on first use
+tools = ToolRegistry()
+tools.register("chemeleon_predictor", "crystalyse.tools.chemeleon.predictor:ChemeleonPredictor")
+tools.register("mace_calculator", "crystalyse.tools.mace.energy:MACECalculator")
+tools.register("pymatgen_analyzer", "crystalyse.tools.pymatgen.analyzer:PyMatgenAnalyzer")
+
+# Resources loaded in the background at startup (see crystalyse.tools.resources)
+DEFAULT_WARM_UP = ["chemeleon:csp", "mace:medium"]
 
 logger.info("Chemistry Creative Server initialized with Chemeleon and MACE")
 
@@ -48,27 +62,7 @@ logger.info("Chemistry Creative Server initialized with Chemeleon and MACE")
 
 def make_json_serializable(obj: Any) -> Any:
     """Convert objects to JSON-serializable format."""
-    if isinstance(obj, dict):
-        return {k: make_json_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list | tuple):
-        return [make_json_serializable(item) for item in obj]
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, np.integer | np.int64 | np.int32):
-        return int(obj)
-    elif isinstance(obj, np.floating | np.float64 | np.float32):
-        return float(obj)
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif hasattr(obj, "tolist"):
-        return obj.tolist()
-    elif obj is None or isinstance(obj, str | int | float | bool):
-        return obj
-    else:
-        try:
-            return str(obj)
-        except Exception:
-            return repr(obj)
+    return to_jsonable(obj)
 
 
 def structure_dict_to_cif(structure_dict: dict[str, Any]) -> str:
@@ -90,21 +84,10 @@ def structure_dict_to_cif(structure_dict: dict[str, Any]) -> str:
 
         atoms = Atoms(numbers=numbers, positions=positions, cell=cell, pbc=pbc)
 
-        # Write to temporary file and read back
-        import os
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".cif", delete=False) as tmp_file:
-            tmp_filename = tmp_file.name
-
-        try:
-            ase_write(tmp_filename, atoms, format="cif")
-            with open(tmp_filename) as f:
-                cif_content = f.read()
-            return cif_content
-        finally:
-            if os.path.exists(tmp_filename):
-                os.unlink(tmp_filename)
+        # Written in memory (ASE's CIF writer only writes bytes)
+        buffer = io.BytesIO()
+        ase_write(buffer, atoms, format="cif")
+        return buffer.getvalue().decode()
     except Exception as e:
         logger.error(f"Error converting structure to CIF: {e}")
         return ""
@@ -130,7 +113,12 @@ def _create_session_directory() -> Path:
 
 @mcp.tool()
 async def generate_crystal_structure(
-    formula: str, num_samples: int = 3, prefer_gpu: bool = True
+    formula: str,
+    num_samples: int = 3,
+    prefer_gpu: bool = True,
+    seed: int | None = None,
+    time_limit: float | None = None,
+    array_encoding: str | None = None,
 ) -> dict[str, Any]:
     """
     Generate crystal structures using Chemeleon CSP (fast creative mode).
@@ -139,6 +127,10 @@ async def generate_crystal_structure(
         formula: Chemical formula (e.g., "NaCl", "LiCoO2")
         num_samples: Number of structure candidates to generate
         prefer_gpu: Use GPU if available
+        seed: Random seed for reproducible (and cached) sampling
+        time_limit: Stop sampling after this many seconds (default: the server limit)
+        array_encoding: Return large arrays as base64 "float64" or "float32" blobs with
+            dtype and shape instead of nested lists (default: lists)
 
     Returns:
         Structure prediction results with multiple candidates
@@ -146,11 +138,17 @@ async def generate_crystal_structure(
     logger.info(f"Generating {num_samples} structures for {formula}")
 
     try:
-        result = await chemeleon_predictor.predict_structure(
-            formula=formula, num_samples=num_samples, prefer_gpu=prefer_gpu
+        check_encoding(array_encoding)
+        await asyncio.to_thread(wait_for_resource, tools, "chemeleon:csp")
+        result = await tools.get("chemeleon_predictor").predict_structure(
+            formula=formula,
+            num_samples=num_samples,
+            prefer_gpu=prefer_gpu,
+            seed=seed,
+            budget=tool_budget("diffusion", time_limit),
         )
 
-        return make_json_serializable(
+        output = make_json_serializable(
             {
                 "success": result.success,
                 "formula": result.formula,
@@ -169,14 +167,62 @@ async def generate_crystal_structure(
                 "computation_time": result.computation_time,
                 "method": result.method,
                 "checkpoint_used": result.checkpoint_used,
+                "stopped": result.stopped,
                 "error": result.error,
             }
         )
+        return encode_arrays(output, array_encoding)
     except Exception as e:
         logger.error(f"Chemeleon structure generation failed: {e}")
         return {"success": False, "formula": formula, "structures": [], "error": str(e)}
 
 
+@mcp.tool()
+async def generate_novel_structures(
+    num_samples: int = 10,
+    batch_size: int = 5,
+    allowed_elements: list[str] | None = None,
+    max_atoms: int | None = None,
+    prefer_gpu: bool = True,
+    time_limit: float | None = None,
+    array_encoding: str | None = None,
+) -> dict[str, Any]:
+    """
+    Generate structures with unconstrained compositions using Chemeleon DNG.
+
+    Args:
+        num_samples: Total number of structures to sample
+        batch_size: Structures denoised together per batch
+        allowed_elements: Keep only structures made exclusively of these elements
+        max_atoms: Keep only structures with at most this many atoms per cell
+        prefer_gpu: Use GPU if available
+        time_limit: Stop sampling after this many seconds (default: the server limit)
+        array_encoding: Return large arrays as base64 "float64" or "float32" blobs with
+            dtype and shape instead of nested lists (default: lists)
+
+    Returns:
+        Generated structures that passed the filters, with sampling statistics;
+        if sampling was stopped, the batches finished before then
+    """
+    logger.info(f"De novo generation of {num_samples} structures (batch size {batch_size})")
+
+    try:
+        check_encoding(array_encoding)
+        await asyncio.to_thread(wait_for_resource, tools, "chemeleon:dng")
+        result = await tools.get("chemeleon_predictor").generate_de_novo_collected(
+            num_samples=num_samples,
+            batch_size=batch_size,
+            allowed_elements=allowed_elements,
+            max_atoms=max_atoms,
+            prefer_gpu=prefer_gpu,
+            budget=tool_budget("diffusion", time_limit),
+        )
+        return encode_arrays(make_json_serializable(result.model_dump()), array_encoding)
+    except Exception as e:
+        logger.error(f"Chemeleon de novo generation failed: {e}")
+        return {"success": False, "predicted_structures": [], "error": str(e)}
+
+
 # --- MACE TOOLS ---
 
 
@@ -195,7 +241,9 @@ async def calculate_formation_energy(cif_content: str, prefer_gpu: bool = True)
     logger.info("Calculating formation energy with MACE")
 
     try:
-        result = await mace_calculator.calculate_energy(
+        if prefer_gpu:
+            await asyncio.to_thread(wait_for_resource, tools, "mace:medium")
+        result = await tools.get("mace_calculator").calculate_energy(
             cif_content=cif_content, prefer_gpu=prefer_gpu
         )
 
@@ -227,24 +275,147 @@ async def creative_discovery_pipeline(
     structures_per_composition: int = 3,
     calculate_energies: bool = True,
     prefer_gpu: bool = True,
+    concurrency: int = 2,
+    time_limit: float | None = None,
 ) -> dict[str, Any]:
     """
     Fast creative discovery pipeline: Chemeleon structure generation + MACE energies.
 
-    No SMACT validation, no hull calculations - optimized for speed.
+    No SMACT validation, no hull calculations - optimized for speed. Generation,
+    MACE energies and CIF writing run as concurrent stages: structures for the
+    next composition are sampled while earlier ones are evaluated and written.
 
     Args:
         compositions: List of chemical formulas
         structures_per_composition: Structures to generate per composition
         calculate_energies: Calculate formation energies with MACE
-        prefer_gpu: Use GPU if available
+        prefer_gpu: Use GPU if available for Chemeleon sampling (MACE uses the
+            server's loaded model)
+        concurrency: CIF writing threads; each stage queues at most twice this many
+            structures before holding back the stage feeding it (Chemeleon and MACE
+            each run one model, so they have one worker each)
+        time_limit: Stop after this many seconds and return the structures finished
+            so far (default: the server limit)
 
     Returns:
-        Discovery results with structures and energies
+        Discovery results with structures, energies, CIF paths and per-stage timings;
+        if the run was stopped, summary.stopped says why and summary.skipped_compositions
+        lists the compositions not generated
     """
     logger.info(f"Creative discovery for {len(compositions)} compositions")
 
+    start = time.perf_counter()
     session_dir = _create_session_directory()
+    failed: list[str] = []
+    skipped: list[str] = []
+    predictor = mace = None
+    # Shared by every stage; cancelled with the tool call so the stage threads stop too
+    budget = tool_budget(None, time_limit)
+
+    def generate(composition: str) -> list[dict[str, Any]]:
+        nonlocal predictor
+        try:
+            budget.checkpoint(0)
+        except BudgetExceeded:
+            skipped.append(composition)
+            return []
+        try:
+            if predictor is None:
+                wait_for_resource(tools, "chemeleon:csp")
+                predictor = tools.get("chemeleon_predictor")
+            # The predictor's coroutine runs the model synchronously in this worker thread
+            result = asyncio.run(
+                predictor.predict_structure(
+                    formula=composition,
+                    num_samples=structures_per_composition,
+                    prefer_gpu=prefer_gpu,
+                    budget=budget,
+                )
+            )
+        except Exception as e:
+            result = None
+            error = str(e)
+        else:
+            error = result.error
+        if result is not None and result.stopped:
+            skipped.append(composition)
+            return []
+        if result is None or not result.success:
+            logger.error(f"Chemeleon structure generation failed for {composition}: {error}")
+            failed.append(composition)
+            return []
+        return [
+            {"composition": composition, "index": idx, "structure": s.model_dump()}
+            for idx, s in enumerate(result.predicted_structures)
+        ]
+
+    def evaluate(item: dict[str, Any]) -> list[dict[str, Any]]:
+        nonlocal mace
+        if calculate_energies:
+            try:
+                budget.checkpoint(0)
+            except BudgetExceeded as e:
+                item["energy"] = {"success": False, "error": f"Not calculated: {e}"}
+                return [item]
+            if mace is None:
+                from crystalyse.tools.mace.energy import MACECalculator
+
+                # The pipeline's own calculator on the warmed model: prefer_gpu only
+                # steers Chemeleon, as a CPU copy of MACE would mean a second load
+                wait_for_resource(tools, "mace:medium")
+                mace = MACECalculator(size="medium")
+            structure = item["structure"]
+            energy_start = time.perf_counter()
+            result = mace.calculate_formation_energy_sync(
+                {
+                    "numbers": structure["numbers"],
+                    "positions": structure["positions"],
+                    "cell": structure["cell"],
+                    "pbc": [True, True, True],
+                }
+            )
+            item["energy"] = {
+                "success": result.success,
+                "formula": result.formula,
+                "formation_energy_per_atom": result.formation_energy,
+                "total_energy": result.total_energy,
+                "num_atoms": len(structure["numbers"]) if result.success else 0,
+                "uncertainty": None,
+                "computation_time": time.perf_counter() - energy_start,
+                "model_used": f"{mace.model_type}_{mace.size}",
+                "error": result.error,
+            }
+        return [item]
+
+    def write(item: dict[str, Any]) -> list[dict[str, Any]]:
+        cif_content = structure_dict_to_cif(item["structure"])
+        if cif_content:
+            cif_path = session_dir / f"{item['composition']}_structure_{item['index']}.cif"
+            cif_path.write_text(cif_content)
+            item["cif_path"] = str(cif_path)
+        return [item]
+
+    concurrency = max(1, concurrency)
+    stage_seconds: dict[str, float] = {}
+    try:
+        items = await run_stages(
+            compositions,
+            [
+                Stage("generate", generate),
+                Stage("energy", evaluate),
+                Stage("write", write, workers=concurrency),
+            ],
+            queue_size=2 * concurrency,
+            stage_seconds=stage_seconds,
+        )
+    except asyncio.CancelledError:
+        budget.cancel()
+        raise
+
+    # Stages finish out of order; report in input order
+    order = {composition: i for i, composition in reversed(list(enumerate(compositions)))}
+    items.sort(key=lambda item: (order[item["composition"]], item["index"]))
+
     results = {
         "compositions": compositions,
         "mode": "creative",
@@ -253,62 +424,33 @@ async def creative_discovery_pipeline(
         "cif_files": {},
         "summary": {
             "total_compositions": len(compositions),
-            "structures_generated": 0,
+            "structures_generated": len(items),
             "energies_calculated": 0,
-            "failed_compositions": [],
+            "failed_compositions": [c for c in compositions if c in failed],
+            "skipped_compositions": [c for c in compositions if c in skipped],
+            "stopped": budget.stopped,
         },
     }
-
-    for composition in compositions:
-        try:
-            # Generate structures
-            struct_result = await generate_crystal_structure(
-                formula=composition, num_samples=structures_per_composition, prefer_gpu=prefer_gpu
-            )
-
-            if struct_result["success"]:
-                results["structures"][composition] = struct_result["structures"]
-                results["summary"]["structures_generated"] += len(struct_result["structures"])
-
-                # Calculate energies if requested
-                if calculate_energies and struct_result["structures"]:
-                    composition_energies = []
-
-                    for idx, structure in enumerate(struct_result["structures"]):
-                        # Convert to CIF
-                        cif_content = structure_dict_to_cif(structure)
-
-                        if cif_content:
-                            # Save CIF
-                            cif_filename = f"{composition}_structure_{idx}.cif"
-                            cif_path = session_dir / cif_filename
-                            with open(cif_path, "w") as f:
-                                f.write(cif_content)
-
-                            results["cif_files"][f"{composition}_{idx}"] = str(cif_path)
-
-                            # Calculate energy
-                            energy_result = await calculate_formation_energy(
-                                cif_content=cif_content, prefer_gpu=prefer_gpu
-                            )
-
-                            if energy_result["success"]:
-                                composition_energies.append(energy_result)
-                                results["summary"]["energies_calculated"] += 1
-
-                    results["energies"][composition] = composition_energies
-            else:
-                results["summary"]["failed_compositions"].append(composition)
-
-        except Exception as e:
-            logger.error(f"Failed to process {composition}: {e}")
-            results["summary"]["failed_compositions"].append(composition)
+    for item in items:
+        composition = item["composition"]
+        results["structures"].setdefault(composition, []).append(item["structure"])
+        if calculate_energies:
+            composition_energies = results["energies"].setdefault(composition, [])
+            if item["energy"]["success"]:
+                composition_energies.append(item["energy"])
+                results["summary"]["energies_calculated"] += 1
+        if "cif_path" in item:
+            results["cif_files"][f"{composition}_{item['index']}"] = item["cif_path"]
 
     # Add performance metrics
     results["summary"]["session_directory"] = str(session_dir)
+    results["summary"]["stage_seconds"] = {name: round(s, 3) for name, s in stage_seconds.items()}
+    results["summary"]["wall_time"] = round(time.perf_counter() - start, 3)
+    results["summary"]["concurrency"] = concurrency
     results["summary"]["optimization_notes"] = [
         "No SMACT composition validation (creative mode)",
         "No energy above hull calculations",
+        "Generation, MACE and CIF writing run as concurrent stages",
         f"GPU acceleration: {'enabled' if prefer_gpu else 'disabled'}",
     ]
 
@@ -332,6 +474,8 @@ async def comprehensive_materials_analysis(
     temperature_range: str = "ambient",
     applications: str = "general",
     prefer_gpu: bool = True,
+    concurrency: int = 2,
+    time_limit: float | None = None,
 ) -> dict[str, Any]:
     """
     Comprehensive materials analysis for creative mode.
@@ -346,6 +490,9 @@ async def comprehensive_materials_analysis(
         temperature_range: Temperature info (metadata)
         applications: Application info (metadata)
         prefer_gpu: Use GPU if available
+        concurrency: CIF writing threads in the discovery pipeline
+        time_limit: Stop the discovery pipeline after this many seconds (default: the
+            server limit)
 
     Returns:
         Analysis results matching unified server format
@@ -358,6 +505,8 @@ async def comprehensive_materials_analysis(
         structures_per_composition=structures_per_composition,
         calculate_energies=calculate_energies_flag,
         prefer_gpu=prefer_gpu,
+        concurrency=concurrency,
+        time_limit=time_limit,
     )
 
     # Add metadata to match unified server format
@@ -369,12 +518,36 @@ async def comprehensive_materials_analysis(
     return results
 
 
+# Every tool here uses the shared Chemeleon and MACE models, so calls run one at a time
+register_batch_call(
+    mcp,
+    exclusive={
+        "models": [
+            "generate_crystal_structure",
+            "generate_novel_structures",
+            "calculate_formation_energy",
+            "creative_discovery_pipeline",
+            "comprehensive_materials_analysis",
+        ]
+    },
+)
+
+
 def main():
     """Run the creative chemistry MCP server."""
     logger.info("Starting Chemistry Creative Server...")
     logger.info("Optimized for fast exploration with Chemeleon + MACE")
     logger.info("No SMACT validation - creative mode only")
-    mcp.run()
+    plan = []
+    for spec in warm_up_plan(DEFAULT_WARM_UP):
+        try:
+            add_resource(tools, spec)
+            plan.append(spec)
+        except ValueError as e:
+            logger.warning(f"Skipping warm-up of {spec}: {e}")
+    if plan:
+        tools.warm_up(plan + list(tools.status()))
+    serve(mcp, "chemistry_creative")
 
 
 if __name__ == "__main__":
@@ -6,15 +6,26 @@ Tools: SMACT, Chemeleon, MACE, PyMatgen, Visualization
 Features: Dopant Prediction, Advanced Screening, Stress/Strain, Foundation Models
 
 All tools use clean imports without sys.path manipulation.
-Total Tools: 20 MCP endpoints
+Tool stacks (torch, MACE, Chemeleon, SMACT, pymatgen) are imported on first use
+or by a background warm-up, so the server answers the MCP handshake immediately.
+Generated and relaxed structures are kept in a server-side structure store and
+returned as short handles; structure-consuming tools accept a handle or inline data.
+run_screening_pipeline runs a whole SMACT -> Chemeleon -> MACE -> hull screen in one call.
+batch_call runs many calls to these tools in one request.
+With --http the server runs as a shared streamable-HTTP endpoint for local clients.
+Total Tools: 33 MCP endpoints
 """
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
 import logging
 import warnings
 from typing import Any
 
-import numpy as np
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
 # Suppress e3nn warning about TORCH_FORCE_NO_WEIGHTS_ONLY_LOAD
 # This warning appears when MACE loads e3nn components
@@ -23,33 +34,46 @@ warnings.filterwarnings(
 )
 
 # CLEAN IMPORTS - No sys.path manipulation!
-from crystalyse.tools.chemeleon import ChemeleonPredictor
-from crystalyse.tools.mace import MACECalculator, MACEFoundationModels, MACEStressCalculator
+# Result models only: the tool implementations are loaded through the registry
+from crystalyse.tools.arrays import check_encoding, encode_array, encode_arrays
+from crystalyse.tools.batch import register_batch_call
+from crystalyse.tools.budget import run_in_thread, tool_budget
 from crystalyse.tools.models import (
     BandGapResult,
+    BulkValidationResult,
     CompositionFilterResult,
     CompositionValidityResult,
+    CoordinationBatchResult,
+    CrystalStructure,
+    DeNovoGenerationResult,
+    DopantBatchResult,
     DopantPredictionResult,
+    EncodedArray,
     EnergyAboveHullResult,
     EnergyResult,
     EOSResult,
+    FeatureMatrixResult,
     FoundationModelListResult,
+    HullTargetBatchResult,
+    KnownMaterialsBatchResult,
     MLRepresentationResult,
+    OxidationStateBatchResult,
     PredictionResult,
+    ScreeningPipelineResult,
+    SpaceGroupBatchResult,
     SpaceGroupResult,
     StabilityResult,
     StressResult,
+    StructureStoreResult,
+    StructureSummary,
     ValidationResult,
     VisualizationResult,
 )
-from crystalyse.tools.pymatgen import PhaseDiagramAnalyzer, PyMatgenAnalyzer
-from crystalyse.tools.smact import (
-    SMACTCalculator,
-    SMACTDopantPredictor,
-    SMACTScreener,
-    SMACTValidator,
-)
-from crystalyse.tools.visualization import CrystaLyseVisualizer
+from crystalyse.tools.registry import ToolRegistry
+from crystalyse.tools.resources import add_resource, wait_for_resource, warm_up_plan
+from crystalyse.tools.serving import serve
+from crystalyse.tools.structure_store import get_structure_store, is_handle
+from crystalyse.utils.serialization import to_jsonable
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -58,44 +82,109 @@ logger = logging.getLogger(__name__)
 # Suppress warnings
 warnings.filterwarnings("ignore", message=".*Pauling electronegativity.*")
 
+# Startup timings (seconds since this module started importing)
+startup: dict[str, float | None] = {"import_seconds": None, "handshake_seconds": None}
+
+
+class ChemistryMCP(FastMCP):
+    """FastMCP server that records when the client's first tool listing is answered."""
+
+    async def list_tools(self):
+        listed = await super().list_tools()
+        if startup["handshake_seconds"] is None:
+            startup["handshake_seconds"] = time.perf_counter() - _IMPORT_STARTED
+        return listed
+
+
 # Initialize FastMCP server
-mcp = FastMCP("Chemistry Unified")
+mcp = ChemistryMCP("Chemistry Unified")
+
+# Tool instances, imported and created on first use
+tools = ToolRegistry()
+tools.register("smact_validator", "crystalyse.tools.smact.validators:SMACTValidator")
+tools.register("smact_calculator", "crystalyse.tools.smact.calculators:SMACTCalculator")
+tools.register(
+    "smact_screener", "crystalyse.tools.smact.screening:SMACTScreener", instantiate=False
+)
+tools.register(
+    "smact_dopant_predictor",
+    "crystalyse.tools.smact.dopant_predictor:SMACTDopantPredictor",
+    instantiate=False,
+)
+tools.register("chemeleon_predictor", "crystalyse.tools.chemeleon.predictor:ChemeleonPredictor")
+tools.register("mace_calculator", "crystalyse.tools.mace.energy:MACECalculator")
+tools.register(
+    "mace_stress_calculator", "crystalyse.tools.mace.stress:MACEStressCalculator", instantiate=False
+)
+tools.register(
+    "mace_foundation_models",
+    "crystalyse.tools.mace.foundation_models:MACEFoundationModels",
+    instantiate=False,
+)
+tools.register("pymatgen_analyzer", "crystalyse.tools.pymatgen.analyzer:PyMatgenAnalyzer")
+tools.register(
+    "phase_diagram_analyzer", "crystalyse.tools.pymatgen.phase_diagram:PhaseDiagramAnalyzer"
+)
+tools.register("visualizer", "crystalyse.tools.visualization.visualizer:CrystaLyseVisualizer")
 
-# Initialize tool instances
-smact_validator = SMACTValidator()
-smact_calculator = SMACTCalculator()
-chemeleon_predictor = ChemeleonPredictor()
-mace_calculator = MACECalculator()
-pymatgen_analyzer = PyMatgenAnalyzer()
-phase_diagram_analyzer = PhaseDiagramAnalyzer()
-visualizer = CrystaLyseVisualizer()
+# Resources loaded in the background at startup (see crystalyse.tools.resources)
+DEFAULT_WARM_UP = ["mace:medium", "chemeleon:csp", "phase_diagram", "doper:skipspecies"]
+warm_up: list[str] = []
 
 # --- Core Utility Functions ---
 
 
+def store_structures(
+    result: Any, include_structures: bool, array_encoding: str | None = None
+) -> Any:
+    """
+    Put generated structures in the structure store and list their handles.
+
+    Structures returned inline have their arrays encoded if ``array_encoding`` is set.
+    """
+    if not result.success:
+        return result
+    store = get_structure_store()
+    handles = [
+        StructureSummary(**store.summary(store.put(s.model_dump(), formula=s.formula)))
+        for s in result.predicted_structures
+    ]
+    update: dict[str, Any] = {"structure_handles": handles}
+    if not include_structures:
+        update["predicted_structures"] = []
+    elif array_encoding:
+        update["predicted_structures"] = [
+            CrystalStructure.model_validate(encode_arrays(s.model_dump(), array_encoding))
+            for s in result.predicted_structures
+        ]
+    return result.model_copy(update=update)
+
+
+def resolve_structure(structure: str | dict[str, Any]) -> dict[str, Any]:
+    """
+    The structure dict behind a structure-store handle, or the inline dict itself.
+
+    Encoded arrays in an inline dict (see crystalyse.tools.arrays) are decoded.
+
+    Raises:
+        ValueError: If the handle is unknown or expired, or the input is not a structure
+    """
+    structure = get_structure_store().resolve(structure)
+    if not isinstance(structure, dict):
+        raise ValueError("Expected a structure handle or a structure dictionary")
+    return structure
+
+
+def resolve_cif(cif_content: str) -> str:
+    """CIF text of a structure-store handle, or the CIF string itself."""
+    if is_handle(cif_content):
+        return get_structure_store().export(cif_content, "cif")
+    return cif_content
+
+
 def make_json_serializable(obj: Any) -> Any:
     """Convert objects to JSON-serializable format."""
-    if isinstance(obj, dict):
-        return {k: make_json_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list | tuple):
-        return [make_json_serializable(item) for item in obj]
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, np.integer | np.int64 | np.int32):
-        return int(obj)
-    elif isinstance(obj, np.floating | np.float64 | np.float32):
-        return float(obj)
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif hasattr(obj, "tolist"):
-        return obj.tolist()
-    elif obj is None or isinstance(obj, str | int | float | bool):
-        return obj
-    else:
-        try:
-            return str(obj)
-        except Exception:
-            return f"<non-serializable: {type(obj).__name__}>"
+    return to_jsonable(obj)
 
 
 # ===================================================================
@@ -130,7 +219,7 @@ def validate_composition(
         Structured ValidationResult with full type information
     """
     logger.info(f"Validating composition: {composition}")
-    result = smact_validator.validate_composition(
+    result = tools.get("smact_validator").validate_composition(
         composition,
         use_pauling_test=use_pauling_test,
         include_alloys=include_alloys,
@@ -155,7 +244,7 @@ def analyze_stability(
         Structured stability analysis result
     """
     logger.info(f"Analyzing stability: {composition}")
-    result = smact_validator.analyze_stability(
+    result = tools.get("smact_validator").analyze_stability(
         composition,
         check_electronegativity=check_electronegativity,
         electronegativity_threshold=electronegativity_threshold,
@@ -175,7 +264,7 @@ def predict_band_gap(composition: str) -> BandGapResult:
         Structured band gap prediction result
     """
     logger.info(f"Predicting band gap: {composition}")
-    result = smact_calculator.predict_band_gap(composition)
+    result = tools.get("smact_calculator").predict_band_gap(composition)
     return result
 
 
@@ -188,7 +277,13 @@ def predict_band_gap(composition: str) -> BandGapResult:
     description="Generate crystal structure for a composition - Use AFTER validation to predict the most likely crystal structure and space group"
 )
 async def generate_crystal_csp(
-    formulas: str | list[str], num_samples: int = 1, prefer_gpu: bool = True
+    formulas: str | list[str],
+    num_samples: int = 1,
+    prefer_gpu: bool = True,
+    seed: int | None = None,
+    include_structures: bool = False,
+    time_limit: float | None = None,
+    array_encoding: str | None = None,
 ) -> PredictionResult:
     """
     Generate crystal structures using Chemeleon diffusion model (CSP - Crystal Structure Prediction).
@@ -197,12 +292,20 @@ async def generate_crystal_csp(
         formulas: Chemical formula(s) to generate structures for (e.g., "LiCoO2", ["Na2SO4", "CaTiO3"])
         num_samples: Number of structures to generate per formula (default: 1)
         prefer_gpu: If True, use GPU if available (default: True)
+        seed: Random seed for reproducible sampling. Seeded requests are cached on disk,
+            so repeating one returns the same structures instantly (default: None)
+        include_structures: Also return the full structures inline (default: False)
+        time_limit: Stop sampling after this many seconds (default: the server limit)
+        array_encoding: Return large arrays as base64 "float64" or "float32" blobs with
+            dtype and shape instead of nested lists (default: lists)
 
     Returns:
         PredictionResult with:
             - success: bool
             - formula: str
-            - predicted_structures: List of structures, each with:
+            - structure_handles: One entry per structure with handle, formula,
+              num_atoms and volume
+            - predicted_structures: Full structures (only with include_structures), each with:
                 * numbers: List[int] - atomic numbers
                 * positions: List[List[float]] - 3D Cartesian coordinates
                 * cell: List[List[float]] - 3x3 lattice matrix
@@ -212,9 +315,12 @@ async def generate_crystal_csp(
                 * confidence: float (0-1)
             - computation_time: float
             - method: "chemeleon"
+            - seed: int | None
+            - from_cache: bool - True if served from the seeded sample cache
+            - stopped: "time", "steps" or "cancelled" if sampling was stopped
 
-        NOTE: Each structure in predicted_structures can be passed directly to calculate_formation_energy
-        or relax_structure tools by extracting the required fields (numbers, positions, cell).
+        NOTE: Pass a handle (e.g. "struct-3f9c2a71d04be815") to calculate_formation_energy,
+        relax_structure, the analysis tools or export_structure instead of the structure itself.
     """
     if isinstance(formulas, str):
         formulas_list = [formulas]
@@ -222,14 +328,70 @@ async def generate_crystal_csp(
         formulas_list = formulas
 
     logger.info(f"Generating structures for: {formulas_list}")
+    check_encoding(array_encoding)
 
     # For simplicity, process first formula
     formula = formulas_list[0]
-    result = await chemeleon_predictor.predict_structure(
-        formula=formula, num_samples=num_samples, prefer_gpu=prefer_gpu
+    await asyncio.to_thread(wait_for_resource, tools, "chemeleon:csp")
+    result = await tools.get("chemeleon_predictor").predict_structure(
+        formula=formula,
+        num_samples=num_samples,
+        prefer_gpu=prefer_gpu,
+        seed=seed,
+        budget=tool_budget("diffusion", time_limit),
     )
 
-    return result
+    return store_structures(result, include_structures, array_encoding)
+
+
+@mcp.tool(
+    description="Generate novel crystal structures without a target composition (de novo generation) - Use for open-ended exploration of a chemical space"
+)
+async def generate_crystal_dng(
+    num_samples: int = 10,
+    batch_size: int = 5,
+    allowed_elements: list[str] | None = None,
+    max_atoms: int | None = None,
+    prefer_gpu: bool = True,
+    include_structures: bool = False,
+    time_limit: float | None = None,
+    array_encoding: str | None = None,
+) -> DeNovoGenerationResult:
+    """
+    Generate crystal structures with unconstrained compositions using Chemeleon DNG.
+
+    Args:
+        num_samples: Total number of structures to sample (default: 10)
+        batch_size: Structures denoised together per batch (default: 5)
+        allowed_elements: Keep only structures made exclusively of these elements (e.g., ["Li", "Fe", "O"])
+        max_atoms: Keep only structures with at most this many atoms per cell
+        prefer_gpu: If True, use GPU if available (default: True)
+        include_structures: Also return the full structures inline (default: False)
+        time_limit: Stop sampling after this many seconds (default: the server limit)
+        array_encoding: Return large arrays as base64 "float64" or "float32" blobs with
+            dtype and shape instead of nested lists (default: lists)
+
+    Returns:
+        DeNovoGenerationResult with handles of the structures that passed the
+        filters, plus num_sampled / num_rejected counts. Handles work like those
+        from generate_crystal_csp. If sampling was stopped, stopped says why and
+        the batches finished before then are returned.
+    """
+    logger.info(
+        f"De novo generation: {num_samples} samples in batches of {batch_size} "
+        f"(elements={allowed_elements}, max_atoms={max_atoms})"
+    )
+    check_encoding(array_encoding)
+    await asyncio.to_thread(wait_for_resource, tools, "chemeleon:dng")
+    result = await tools.get("chemeleon_predictor").generate_de_novo_collected(
+        num_samples=num_samples,
+        batch_size=batch_size,
+        allowed_elements=allowed_elements,
+        max_atoms=max_atoms,
+        prefer_gpu=prefer_gpu,
+        budget=tool_budget("diffusion", time_limit),
+    )
+    return store_structures(result, include_structures, array_encoding)
 
 
 # ===================================================================
@@ -239,13 +401,14 @@ async def generate_crystal_csp(
 
 @mcp.tool(description="Calculate formation energy using MACE machine learning force field")
 async def calculate_formation_energy(
-    structure_dict: dict[str, Any], model_type: str = "mace_mp", size: str = "medium"
+    structure_dict: str | dict[str, Any], model_type: str = "mace_mp", size: str = "medium"
 ) -> EnergyResult:
     """
     Calculate formation energy of a crystal from its constituent elements.
 
     Args:
-        structure_dict: Crystal structure with REQUIRED fields:
+        structure_dict: Structure handle (e.g. "struct-3f9c2a71d04be815") or a crystal
+            structure with REQUIRED fields:
             - numbers: List[int] - atomic numbers (e.g., [3, 27, 8, 8] for LiCoO2)
             - positions: List[List[float]] - 3D positions in Cartesian coordinates
             - cell: List[List[float]] - 3x3 lattice matrix in Angstroms
@@ -257,6 +420,7 @@ async def calculate_formation_energy(
         Structured energy calculation result with formation_energy, total_energy, etc.
     """
     logger.info("Calculating formation energy for structure")
+    structure_dict = resolve_structure(structure_dict)
 
     # Normalize structure_dict to only required fields (remove extra fields like 'formula', 'symbols', etc.)
     normalized_structure = {
@@ -266,19 +430,27 @@ async def calculate_formation_energy(
         "pbc": structure_dict.get("pbc", [True, True, True]),
     }
 
-    result = await mace_calculator.calculate_formation_energy(normalized_structure)
+    await asyncio.to_thread(wait_for_resource, tools, "mace:medium")
+    result = await tools.get("mace_calculator").calculate_formation_energy(normalized_structure)
     return result
 
 
 @mcp.tool(description="Relax crystal structure to minimize energy using MACE forces")
 async def relax_structure(
-    structure_dict: dict[str, Any], fmax: float = 0.01, steps: int = 500, optimizer: str = "BFGS"
+    structure_dict: str | dict[str, Any],
+    fmax: float = 0.01,
+    steps: int = 500,
+    optimizer: str = "BFGS",
+    include_structure: bool = False,
+    time_limit: float | None = None,
+    array_encoding: str | None = None,
 ) -> dict:
     """
     Relax structure to local energy minimum using MACE forces.
 
     Args:
-        structure_dict: Initial crystal structure with REQUIRED fields:
+        structure_dict: Structure handle (e.g. "struct-3f9c2a71d04be815") or an initial
+            crystal structure with REQUIRED fields:
             - numbers: List[int] - atomic numbers (e.g., [3, 27, 8, 8] for LiCoO2)
             - positions: List[List[float]] - 3D positions in Cartesian coordinates
             - cell: List[List[float]] - 3x3 lattice matrix in Angstroms
@@ -286,11 +458,19 @@ async def relax_structure(
         fmax: Maximum force convergence criterion (eV/Å)
         steps: Maximum optimization steps
         optimizer: Optimization algorithm ('BFGS', 'FIRE', 'LBFGS')
+        include_structure: Also return the relaxed structure inline (default: False)
+        time_limit: Stop the optimiser after this many seconds (default: the server limit)
+        array_encoding: Return large arrays as base64 "float64" or "float32" blobs with
+            dtype and shape instead of nested lists (default: lists)
 
     Returns:
-        Relaxation result with optimized structure
+        Relaxation result with the handle (relaxed_handle) of the optimized structure.
+        If the optimiser was stopped (stopped: "time", "steps" or "cancelled"), the
+        lowest-energy structure reached so far is returned.
     """
     logger.info(f"Relaxing structure with {optimizer}")
+    check_encoding(array_encoding)
+    structure_dict = resolve_structure(structure_dict)
 
     # Normalize structure_dict to only required fields
     normalized_structure = {
@@ -300,10 +480,24 @@ async def relax_structure(
         "pbc": structure_dict.get("pbc", [True, True, True]),
     }
 
-    result = await mace_calculator.relax_structure(
-        structure=normalized_structure, fmax=fmax, steps=steps, optimizer=optimizer
+    await asyncio.to_thread(wait_for_resource, tools, "mace:medium")
+    budget = tool_budget("relax", time_limit)
+    result = await run_in_thread(
+        budget,
+        tools.get("mace_calculator").relax_structure_sync,
+        structure=normalized_structure,
+        fmax=fmax,
+        steps=steps,
+        optimizer=optimizer,
+        budget=budget,
     )
-    return result.dict()
+    if result.success and result.relaxed_structure:
+        store = get_structure_store()
+        handle = store.put(result.relaxed_structure)
+        result.relaxed_handle = StructureSummary(**store.summary(handle))
+        if not include_structure:
+            result.relaxed_structure = None
+    return encode_arrays(result.dict(), array_encoding)
 
 
 # ===================================================================
@@ -313,28 +507,71 @@ async def relax_structure(
 
 @mcp.tool(description="Analyze space group and symmetry of crystal structure")
 def analyze_space_group(
-    structure_input: str | dict[str, Any], symprec: float = 0.1, angle_tolerance: float = 5.0
+    structure_input: str | dict[str, Any],
+    symprec: float = 0.1,
+    angle_tolerance: float = 5.0,
+    fields: list[str] | None = None,
 ) -> SpaceGroupResult:
     """
     Analyze space group and crystallographic symmetry.
 
     Args:
-        structure_input: CIF string or structure dictionary
+        structure_input: Structure handle, CIF string or structure dictionary
         symprec: Symmetry precision for space group detection
         angle_tolerance: Angle tolerance for symmetry operations
+        fields: Fields to compute, e.g. ["space_group_number"] (default: all, including
+                symmetrized_cif and primitive_cif)
 
     Returns:
         Structured space group analysis result
     """
     logger.info("Analyzing space group")
-    result = pymatgen_analyzer.analyze_space_group(
-        structure_input=structure_input, symprec=symprec, angle_tolerance=angle_tolerance
+    result = tools.get("pymatgen_analyzer").analyze_space_group(
+        structure_input=structure_input,
+        symprec=symprec,
+        angle_tolerance=angle_tolerance,
+        fields=fields,
     )
     return result
 
 
+@mcp.tool(description="Classify the space groups of many structures in one call")
+def analyze_space_group_batch(
+    structure_inputs: list[str | dict[str, Any]],
+    symprec: float = 0.1,
+    angle_tolerance: float = 5.0,
+    fields: list[str] | None = None,
+) -> SpaceGroupBatchResult:
+    """
+    Analyze the space groups of a generated set of structures.
+
+    Without fields, ``["space_group_number"]`` is requested. That selects the
+    core field group, which is always computed, so the core symmetry summary is
+    returned (symbols, numbers, crystal system, formula and operation count).
+    Request e.g. "lattice_a" or "primitive_cif" to add lattice parameters or CIFs.
+
+    Args:
+        structure_inputs: Structure handles, CIF strings or structure dictionaries
+        symprec: Symmetry precision for space group detection
+        angle_tolerance: Angle tolerance for symmetry operations
+        fields: Result fields to compute (default: ["space_group_number"])
+
+    Returns:
+        One space group result per structure, in input order
+    """
+    logger.info(f"Analyzing space groups of {len(structure_inputs)} structures")
+    return tools.get("pymatgen_analyzer").analyze_space_group_batch(
+        structure_inputs=structure_inputs,
+        symprec=symprec,
+        angle_tolerance=angle_tolerance,
+        fields=fields or ["space_group_number"],
+    )
+
+
 @mcp.tool(description="Calculate energy above hull for thermodynamic stability")
-def calculate_energy_above_hull(composition: str, total_energy: float) -> EnergyAboveHullResult:
+async def calculate_energy_above_hull(
+    composition: str, total_energy: float
+) -> EnergyAboveHullResult:
     """
     Calculate energy above hull using Materials Project phase diagram.
 
@@ -359,47 +596,159 @@ def calculate_energy_above_hull(composition: str, total_energy: float) -> Energy
     logger.info(
         f"Calculating energy above hull for: {composition} with total_energy={total_energy} eV"
     )
-    result = phase_diagram_analyzer.calculate_energy_above_hull(
+    await asyncio.to_thread(wait_for_resource, tools, "phase_diagram")
+    analyzer = tools.get("phase_diagram_analyzer")
+    return await asyncio.to_thread(
+        analyzer.calculate_energy_above_hull,
         composition=composition,
         energy=total_energy,  # Critical: use total energy!
         per_atom=False,  # total_energy is already total, not per-atom
     )
-    return result
+
+
+@mcp.tool(description="Check which compositions already exist in the Materials Project data")
+async def check_known_materials(
+    compositions: list[str], energies_per_atom: list[float] | None = None
+) -> KnownMaterialsBatchResult:
+    """
+    Look up compositions in the phase diagram entries before generating structures.
+
+    Known compositions report their number of polymorphs, lowest energy per atom
+    and Materials Project entry ids. Skip or de-prioritise them before spending
+    Chemeleon and MACE compute.
+
+    Args:
+        compositions: Chemical formulas (e.g., ["LiFePO4", "Li2MnO3"])
+        energies_per_atom: Optional candidate energies per atom, compared with the
+            lowest known energy for the same formula
+
+    Returns:
+        One result per composition, in input order
+    """
+    logger.info(f"Checking {len(compositions)} compositions against known materials")
+    analyzer = tools.get("phase_diagram_analyzer")
+    # Building the index the first time reads the phase diagram, so keep it off the loop
+    return await asyncio.to_thread(
+        analyzer.check_known_materials,
+        compositions=compositions,
+        energies_per_atom=energies_per_atom,
+    )
+
+
+@mcp.tool(description="Hull energy targets for compositions before generating structures")
+async def calculate_hull_targets(
+    compositions: list[str], min_target_energy: float | None = None
+) -> HullTargetBatchResult:
+    """
+    Compute the formation energy each composition would need to reach the convex hull.
+
+    Use this to prescreen enumerated compositions before Chemeleon and MACE. A
+    target far below typical MACE formation energies means that a new phase
+    there is unlikely to be stable.
+
+    Args:
+        compositions: Chemical formulas (thousands are fine)
+        min_target_energy: Deepest acceptable target formation energy in eV/atom
+            (e.g. -3.0); compositions below it are marked passes=False
+
+    Returns:
+        Hull energy, target formation energy and competing phases per composition
+    """
+    logger.info(f"Calculating hull targets for {len(compositions)} compositions")
+    await asyncio.to_thread(wait_for_resource, tools, "phase_diagram")
+    analyzer = tools.get("phase_diagram_analyzer")
+    return await asyncio.to_thread(
+        analyzer.calculate_hull_targets,
+        compositions=compositions,
+        min_target_energy=min_target_energy,
+    )
 
 
 @mcp.tool(description="Analyze coordination environment of atoms")
-def analyze_coordination(structure_input: str | dict[str, Any], method: str = "voronoi") -> dict:
+def analyze_coordination(
+    structure_input: str | dict[str, Any], method: str = "voronoi", symprec: float = 1e-3
+) -> dict:
     """
-    Analyze coordination environment using Voronoi nearest neighbors.
+    Analyze coordination environment of each symmetry-inequivalent site.
 
     Args:
-        structure_input: CIF string or structure dictionary
-        method: Coordination analysis method (default: voronoi)
+        structure_input: Structure handle, CIF string or structure dictionary
+        method: "voronoi" (default), "crystalnn", or "cutoff" (fastest, distance based)
+        symprec: Symmetry precision (Å) for grouping equivalent sites
 
     Returns:
         Coordination analysis result
     """
-    logger.info("Analyzing coordination environment")
-    result = pymatgen_analyzer.analyze_coordination(structure_input=structure_input, method=method)
+    logger.info(f"Analyzing coordination environment ({method})")
+    result = tools.get("pymatgen_analyzer").analyze_coordination(
+        structure_input=structure_input, method=method, symprec=symprec
+    )
     return result.dict()
 
 
+@mcp.tool(description="Analyze coordination environments of many structures in parallel")
+def analyze_coordination_batch(
+    structure_inputs: list[str | dict[str, Any]], method: str = "cutoff", symprec: float = 1e-3
+) -> CoordinationBatchResult:
+    """
+    Analyze coordination environments of a generated set of structures.
+
+    Args:
+        structure_inputs: Structure handles, CIF strings or structure dictionaries
+        method: "cutoff" (default, fastest), "voronoi", or "crystalnn"
+        symprec: Symmetry precision (Å) for grouping equivalent sites
+
+    Returns:
+        One coordination result per structure, in input order
+    """
+    logger.info(f"Analyzing coordination of {len(structure_inputs)} structures ({method})")
+    return tools.get("pymatgen_analyzer").analyze_coordination_batch(
+        structure_inputs=structure_inputs, method=method, symprec=symprec
+    )
+
+
 @mcp.tool(description="Validate oxidation states using bond valence analysis")
 def validate_oxidation_states(structure_input: str | dict[str, Any]) -> dict:
     """
     Validate oxidation states using bond valence sum analysis.
 
     Args:
-        structure_input: CIF string or structure dictionary
+        structure_input: Structure handle, CIF string or structure dictionary
 
     Returns:
         Oxidation state validation result
     """
     logger.info("Validating oxidation states")
-    result = pymatgen_analyzer.validate_oxidation_states(structure_input=structure_input)
+    result = tools.get("pymatgen_analyzer").validate_oxidation_states(
+        structure_input=structure_input
+    )
     return result.dict()
 
 
+@mcp.tool(description="Validate oxidation states of many structures with caching and a time budget")
+def validate_oxidation_states_batch(
+    structure_inputs: list[str | dict[str, Any]], time_budget: float = 10.0
+) -> OxidationStateBatchResult:
+    """
+    Validate oxidation states of a generated set of structures.
+
+    Compositions with a single SMACT charge-neutral assignment are settled without
+    bond-valence analysis. Structures whose bond-valence analysis exceeds the
+    budget fall back to the composition-level assignment (marked timed_out).
+
+    Args:
+        structure_inputs: Structure handles, CIF strings or structure dictionaries
+        time_budget: Seconds of bond-valence analysis allowed per structure
+
+    Returns:
+        One oxidation state result per structure, in input order
+    """
+    logger.info(f"Validating oxidation states of {len(structure_inputs)} structures")
+    return tools.get("pymatgen_analyzer").validate_oxidation_states_batch(
+        structure_inputs=structure_inputs, time_budget=time_budget
+    )
+
+
 # ===================================================================
 # VISUALIZATION TOOLS - Now using modular implementation
 # ===================================================================
@@ -413,7 +762,7 @@ def save_cif_file(
     Save CIF file to output directory with caching.
 
     Args:
-        cif_content: CIF file content as string
+        cif_content: CIF file content as string, or a structure handle
         formula: Chemical formula for naming
         output_dir: Directory to save CIF file
         title: Title for the structure
@@ -422,8 +771,8 @@ def save_cif_file(
         Structured visualization result
     """
     logger.info(f"Saving CIF file for {formula}")
-    result = visualizer.save_cif_file(
-        cif_content=cif_content, formula=formula, output_dir=output_dir, title=title
+    result = tools.get("visualizer").save_cif_file(
+        cif_content=resolve_cif(cif_content), formula=formula, output_dir=output_dir, title=title
     )
     return result
 
@@ -440,7 +789,7 @@ def create_analysis_suite(
     Create analysis directory (full visualization via pymatviz server).
 
     Args:
-        cif_content: CIF file content as string
+        cif_content: CIF file content as string, or a structure handle
         formula: Chemical formula for naming
         output_dir: Directory to save analysis files
         title: Title for the analysis
@@ -450,8 +799,8 @@ def create_analysis_suite(
         Structured visualization result
     """
     logger.info(f"Creating analysis suite for {formula}")
-    result = visualizer.create_analysis_suite(
-        cif_content=cif_content,
+    result = tools.get("visualizer").create_analysis_suite(
+        cif_content=resolve_cif(cif_content),
         formula=formula,
         output_dir=output_dir,
         title=title,
@@ -489,7 +838,7 @@ def smact_validate_fast(
         Structured validity result
     """
     logger.info(f"Fast SMACT validation for: {composition}")
-    result = SMACTScreener.validate_composition(
+    result = tools.get("smact_screener").validate_composition(
         composition=composition,
         use_pauling_test=use_pauling_test,
         include_alloys=include_alloys,
@@ -500,8 +849,50 @@ def smact_validate_fast(
     return result
 
 
+@mcp.tool(description="Validate many compositions at once with SMACT rules")
+def smact_validate_bulk(
+    compositions: list[str],
+    use_pauling_test: bool = True,
+    include_alloys: bool = True,
+    check_metallicity: bool = False,
+    metallicity_threshold: float = 0.7,
+    oxidation_states_set: str = "icsd24",
+) -> BulkValidationResult:
+    """
+    Validate a batch of compositions (e.g. an enumerated chemical space).
+
+    Duplicate and equivalent formulas are validated once and large batches are
+    spread over worker processes. Prefer this over repeated smact_validate_fast
+    calls when screening more than a handful of formulas.
+
+    Args:
+        compositions: Chemical formulas (e.g., ["LiFePO4", "NaCl", "Fe4O6"])
+        use_pauling_test: Apply Pauling electronegativity test
+        include_alloys: Consider pure metals valid automatically
+        check_metallicity: Consider high metallicity compositions valid
+        metallicity_threshold: Threshold for metallicity validity (0-1)
+        oxidation_states_set: Oxidation state dataset ('icsd24', 'smact14', etc.)
+
+    Returns:
+        Per-formula verdicts in input order and the distinct valid formulas
+    """
+    from crystalyse.tools.smact.bulk import validate_compositions_bulk
+
+    logger.info(f"Bulk SMACT validation for {len(compositions)} compositions")
+    return validate_compositions_bulk(
+        compositions,
+        use_pauling_test=use_pauling_test,
+        include_alloys=include_alloys,
+        check_metallicity=check_metallicity,
+        metallicity_threshold=metallicity_threshold,
+        oxidation_states_set=oxidation_states_set,
+    )
+
+
 @mcp.tool(description="Generate ML-compatible composition vector (103 elements)")
-def generate_ml_representation(composition: str) -> MLRepresentationResult:
+def generate_ml_representation(
+    composition: str, array_encoding: str | None = None
+) -> MLRepresentationResult:
     """
     Generate 103-element ML vector for a composition.
 
@@ -510,33 +901,101 @@ def generate_ml_representation(composition: str) -> MLRepresentationResult:
 
     Args:
         composition: Chemical formula (e.g., "Li2O")
+        array_encoding: Return large arrays as base64 "float64" or "float32" blobs with
+            dtype and shape instead of nested lists (default: lists)
 
     Returns:
         Structured ML representation with 103-element vector
     """
     logger.info(f"Generating ML representation for: {composition}")
-    result = SMACTScreener.generate_ml_representation(composition=composition)
+    check_encoding(array_encoding)
+    result = tools.get("smact_screener").generate_ml_representation(composition=composition)
+    if array_encoding and result.success:
+        result.ml_vector = EncodedArray(**encode_array(result.ml_vector, array_encoding))
     return result
 
 
+@mcp.tool(description="Write ML composition vectors for many formulas to a matrix file")
+def generate_feature_matrix(
+    output_dir: str,
+    compositions: list[str] | None = None,
+    cursor: str | None = None,
+    sparse: bool | None = None,
+    name: str | None = None,
+) -> FeatureMatrixResult:
+    """
+    Write the 103-element ML vectors of many compositions as one N x 103 matrix.
+
+    The matrix is saved as .npy (dense) or .npz (CSR) with a .index.json listing
+    the formula of each row; only the paths and summary statistics are returned.
+    Pass either compositions or a cursor from filter_compositions to featurise
+    the whole enumerated space.
+
+    Args:
+        output_dir: Directory to write the matrix and index to
+        compositions: Chemical formulas, one matrix row each
+        cursor: Any cursor returned by filter_compositions
+        sparse: Write CSR instead of dense (default: chosen by row count)
+        name: File stem for the outputs
+
+    Returns:
+        Matrix file paths, shape and summary statistics
+    """
+    from crystalyse.tools.smact.enumeration import decode_cursor, get_enumeration_store
+    from crystalyse.tools.smact.features import featurise_compositions, featurise_enumeration
+
+    if cursor is not None:
+        try:
+            key, _ = decode_cursor(cursor)
+        except ValueError as e:
+            return FeatureMatrixResult(success=False, error_message=str(e))
+        table = get_enumeration_store().get(key)
+        if table is None:
+            return FeatureMatrixResult(
+                success=False, error_message="Cursor expired; call filter_compositions again"
+            )
+        logger.info(f"Featurising enumeration of {table.count} compositions")
+        return featurise_enumeration(table, output_dir, name=name, sparse=sparse)
+
+    if not compositions:
+        return FeatureMatrixResult(
+            success=False, error_message="Provide either compositions or a cursor"
+        )
+    logger.info(f"Featurising {len(compositions)} compositions")
+    return featurise_compositions(compositions, output_dir, name=name, sparse=sparse)
+
+
 @mcp.tool(description="Filter and enumerate valid compositions for elements")
 def filter_compositions(
-    elements: list[str], threshold: int = 8, oxidation_states_set: str = "icsd24"
+    elements: list[str],
+    threshold: int = 8,
+    oxidation_states_set: str = "icsd24",
+    page_size: int = 100,
+    cursor: str | None = None,
 ) -> CompositionFilterResult:
     """
-    Generate all valid compositions for a set of elements.
+    Generate all valid compositions for a set of elements, one page at a time.
+
+    num_valid_compositions is the full count. When next_cursor is set, call again
+    with cursor=next_cursor to get the following page.
 
     Args:
         elements: List of element symbols (e.g., ["Li", "Fe", "P", "O"])
         threshold: Maximum stoichiometry coefficient
         oxidation_states_set: Oxidation state dataset to use
+        page_size: Maximum compositions per page
+        cursor: next_cursor from a previous call (other arguments are then ignored)
 
     Returns:
-        Structured result with all valid compositions
+        Structured result with the total count and one page of valid compositions
     """
     logger.info(f"Filtering compositions for: {elements}")
-    result = SMACTScreener.filter_compositions(
-        elements=elements, threshold=threshold, oxidation_states_set=oxidation_states_set
+    result = tools.get("smact_screener").filter_compositions(
+        elements=elements,
+        threshold=threshold,
+        oxidation_states_set=oxidation_states_set,
+        page_size=page_size,
+        cursor=cursor,
     )
     return result
 
@@ -547,7 +1006,7 @@ def filter_compositions(
 
 
 @mcp.tool(description="Predict n-type and p-type dopants for materials")
-def predict_dopants(
+async def predict_dopants(
     species: list[str], composition: str, num_dopants: int = 5, embedding: str = "skipspecies"
 ) -> DopantPredictionResult:
     """
@@ -564,10 +1023,52 @@ def predict_dopants(
         Structured dopant predictions with n-type/p-type suggestions
     """
     logger.info(f"Predicting dopants for: {composition}")
-    result = SMACTDopantPredictor.predict_dopants(
-        species=species, composition=composition, num_dopants=num_dopants, embedding=embedding
+    predictor = await asyncio.to_thread(tools.get, "smact_dopant_predictor")
+    if embedding in predictor.AVAILABLE_EMBEDDINGS:
+        await asyncio.to_thread(wait_for_resource, tools, f"doper:{embedding}")
+    return await asyncio.to_thread(
+        predictor.predict_dopants,
+        species=species,
+        composition=composition,
+        num_dopants=num_dopants,
+        embedding=embedding,
+    )
+
+
+@mcp.tool(description="Predict dopants for many host materials with one loaded embedding")
+async def predict_dopants_batch(
+    hosts: list[list[str]],
+    compositions: list[str] | None = None,
+    num_dopants: int = 5,
+    embedding: str = "skipspecies",
+) -> DopantBatchResult:
+    """
+    Predict dopants for a family of hosts in one call.
+
+    The embedding is loaded once per server process and repeated hosts are answered
+    from a cache, so prefer this over many predict_dopants calls.
+
+    Args:
+        hosts: Species lists, one per host (e.g., [["Ti4+", "O2-"], ["Zn2+", "O2-"]])
+        compositions: Chemical formula of each host for reference
+        num_dopants: Number of dopant suggestions per category
+        embedding: Embedding method ('skipspecies', 'M3GNet-MP-2023.11.1-oxi-Eform',
+                   'M3GNet-MP-2023.11.1-oxi-band_gap')
+
+    Returns:
+        One dopant prediction per host, in input order
+    """
+    logger.info(f"Predicting dopants for {len(hosts)} hosts")
+    predictor = await asyncio.to_thread(tools.get, "smact_dopant_predictor")
+    if embedding in predictor.AVAILABLE_EMBEDDINGS:
+        await asyncio.to_thread(wait_for_resource, tools, f"doper:{embedding}")
+    return await asyncio.to_thread(
+        predictor.predict_dopants_batch,
+        hosts=hosts,
+        compositions=compositions,
+        num_dopants=num_dopants,
+        embedding=embedding,
     )
-    return result
 
 
 # ===================================================================
@@ -576,8 +1077,8 @@ def predict_dopants(
 
 
 @mcp.tool(description="Calculate stress tensor for mechanical property prediction")
-def calculate_stress(
-    structure: dict[str, Any],
+async def calculate_stress(
+    structure: str | dict[str, Any],
     model_type: str = "mace_mp",
     size: str = "medium",
     device: str = "auto",
@@ -586,7 +1087,7 @@ def calculate_stress(
     Calculate full stress tensor and derived mechanical properties.
 
     Args:
-        structure: Structure dictionary with numbers, positions, cell
+        structure: Structure handle, or dictionary with numbers, positions, cell
         model_type: MACE model type ('mace_mp', 'mace_off', or path)
         size: Model size ('small', 'medium', 'large', 'medium-mpa-0', etc.)
         device: Compute device ('auto', 'cpu', 'cuda')
@@ -595,15 +1096,21 @@ def calculate_stress(
         Stress tensor, pressure, von Mises stress, max shear stress
     """
     logger.info("Calculating stress tensor")
-    result = MACEStressCalculator.calculate_stress(
-        structure=structure, model_type=model_type, size=size, device=device
+    if model_type == "mace_mp" and device == "auto":
+        await asyncio.to_thread(wait_for_resource, tools, f"mace:{size}")
+    calculator = await asyncio.to_thread(tools.get, "mace_stress_calculator")
+    return await asyncio.to_thread(
+        calculator.calculate_stress,
+        structure=resolve_structure(structure),
+        model_type=model_type,
+        size=size,
+        device=device,
     )
-    return result
 
 
 @mcp.tool(description="Fit equation of state for bulk modulus calculation")
-def fit_equation_of_state(
-    structure: dict[str, Any],
+async def fit_equation_of_state(
+    structure: str | dict[str, Any],
     eos_type: str = "birchmurnaghan",
     strain_range: float = 0.05,
     n_points: int = 7,
@@ -614,7 +1121,7 @@ def fit_equation_of_state(
     Fit equation of state by calculating energy at multiple volumes.
 
     Args:
-        structure: Structure dictionary
+        structure: Structure handle or structure dictionary
         eos_type: EOS type ('birchmurnaghan', 'murnaghan', 'vinet')
         strain_range: Strain range (+/-)
         n_points: Number of volume points
@@ -625,15 +1132,177 @@ def fit_equation_of_state(
         EOS fitting result with bulk modulus and equilibrium properties
     """
     logger.info(f"Fitting equation of state ({eos_type})")
-    result = MACEStressCalculator.fit_equation_of_state(
-        structure=structure,
+    if model_type == "mace_mp":
+        await asyncio.to_thread(wait_for_resource, tools, f"mace:{size}")
+    calculator = await asyncio.to_thread(tools.get, "mace_stress_calculator")
+    return await asyncio.to_thread(
+        calculator.fit_equation_of_state,
+        structure=resolve_structure(structure),
         eos_type=eos_type,
         strain_range=strain_range,
         n_points=n_points,
         model_type=model_type,
         size=size,
     )
-    return result
+
+
+# ===================================================================
+# SCREENING PIPELINE
+# ===================================================================
+
+
+@mcp.tool(
+    description="Screen many compositions in one call: SMACT validation, Chemeleon structures, MACE energy and relaxation, and energy above hull, returning a ranked table"
+)
+async def run_screening_pipeline(
+    compositions: list[str],
+    ctx: Context,
+    stages: list[str] | None = None,
+    structures_per_composition: int = 1,
+    max_formation_energy: float | None = None,
+    max_energy_above_hull: float | None = 0.1,
+    fmax: float = 0.05,
+    relax_steps: int = 200,
+    seed: int | None = None,
+    prefer_gpu: bool = True,
+    time_limit: float | None = None,
+) -> ScreeningPipelineResult:
+    """
+    Run the screening chain server-side instead of one tool call per step.
+
+    Generation and the MACE stages overlap, and progress notifications are sent
+    after each composition is generated and each structure evaluated.
+
+    Args:
+        compositions: Chemical formulas to screen (e.g., ["LiFePO4", "NaCoO2"])
+        stages: Subset of "validate", "generate", "energy", "relax", "hull" (default: all)
+        structures_per_composition: Chemeleon structures per composition (default: 1)
+        max_formation_energy: Reject structures above this formation energy in eV/atom
+            (default: no limit)
+        max_energy_above_hull: Reject structures further above the hull in eV/atom
+            (default: 0.1; None for no limit)
+        fmax: Relaxation force convergence criterion in eV/Å (default: 0.05)
+        relax_steps: Maximum relaxation steps (default: 200)
+        seed: Random seed for reproducible (cached) Chemeleon sampling
+        prefer_gpu: If True, use GPU if available (default: True)
+        time_limit: Stop after this many seconds and rank the candidates finished so
+            far (default: the server limit)
+
+    Returns:
+        ScreeningPipelineResult with:
+            - ranked: Candidates that passed every stage, most stable first, each with
+              formula, structure handle, formation_energy, total_energy,
+              energy_above_hull and is_stable
+            - rejected: Candidates with the stage that rejected them and why
+            - stage_counts / stage_seconds: Candidates passing and time spent per stage
+            - stopped: "time" or "cancelled" if the run was stopped early
+    """
+    from crystalyse.tools.pipeline import ScreeningPipeline
+
+    logger.info(f"Screening {len(compositions)} compositions")
+    budget = tool_budget(None, time_limit)
+    try:
+        pipeline = ScreeningPipeline(
+            tools,
+            stages=stages,
+            structures_per_composition=structures_per_composition,
+            max_formation_energy=max_formation_energy,
+            max_energy_above_hull=max_energy_above_hull,
+            fmax=fmax,
+            relax_steps=relax_steps,
+            seed=seed,
+            prefer_gpu=prefer_gpu,
+            budget=budget,
+        )
+        return await pipeline.run(compositions, progress=ctx.report_progress)
+    except asyncio.CancelledError:
+        # Stop the worker threads at their next checkpoint
+        budget.cancel()
+        raise
+    except Exception as e:
+        logger.error(f"Screening pipeline failed: {e}")
+        return ScreeningPipelineResult(
+            success=False, stages=stages or [], num_compositions=len(compositions), error=str(e)
+        )
+
+
+# ===================================================================
+# STRUCTURE STORE
+# ===================================================================
+
+
+@mcp.tool(description="Store a CIF or structure dictionary and get a short handle for it")
+def store_structure(
+    structure: str | dict[str, Any], formula: str | None = None
+) -> StructureStoreResult:
+    """
+    Put a structure in the server-side structure store.
+
+    Args:
+        structure: CIF string, or dictionary with numbers, positions, cell (and optional pbc)
+        formula: Formula to report in the summary (default: derived from the atoms)
+
+    Returns:
+        The structure's handle, formula, number of atoms and volume
+    """
+    try:
+        if isinstance(structure, str):
+            from crystalyse.utils.parse_cache import parse_cif_atoms
+
+            atoms = parse_cif_atoms(structure)
+            structure = {
+                "numbers": atoms.numbers,
+                "positions": atoms.positions,
+                "cell": atoms.cell[:],
+                "pbc": atoms.pbc,
+            }
+        store = get_structure_store()
+        handle = store.put(structure, formula=formula)
+        return StructureStoreResult(structure=StructureSummary(**store.summary(handle)))
+    except Exception as e:
+        logger.error(f"Could not store structure: {e}")
+        return StructureStoreResult(success=False, error=str(e))
+
+
+@mcp.tool(description="Export a stored structure as CIF, POSCAR, XYZ or JSON, inline or to a file")
+def export_structure(
+    handle: str,
+    format: str = "cif",
+    output_path: str | None = None,
+    array_encoding: str | None = None,
+) -> StructureStoreResult:
+    """
+    Get the full structure behind a handle.
+
+    Args:
+        handle: Structure handle (e.g. "struct-3f9c2a71d04be815")
+        format: 'cif', 'poscar', 'xyz' (extended XYZ) or 'json'
+        output_path: Write the structure to this file and return only the path (default:
+            return the content inline)
+        array_encoding: For 'json', write positions and other large arrays as base64
+            "float64" or "float32" blobs with dtype and shape (default: lists)
+
+    Returns:
+        The structure summary plus either the content or the path it was written to
+    """
+    try:
+        store = get_structure_store()
+        check_encoding(array_encoding)
+        content = store.export(handle, format, array_encoding)
+        summary = StructureSummary(**store.summary(handle))
+        if output_path:
+            from pathlib import Path
+
+            path = Path(output_path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+            return StructureStoreResult(
+                structure=summary, format=format.lower(), output_path=str(path)
+            )
+        return StructureStoreResult(structure=summary, format=format.lower(), content=content)
+    except Exception as e:
+        logger.error(f"Could not export structure {handle}: {e}")
+        return StructureStoreResult(success=False, format=format, error=str(e))
 
 
 # ===================================================================
@@ -650,7 +1319,7 @@ def list_foundation_models() -> FoundationModelListResult:
         Structured list of models with descriptions, training data, licenses
     """
     logger.info("Listing available MACE foundation models")
-    result = MACEFoundationModels.list_models()
+    result = tools.get("mace_foundation_models").list_models()
     return result
 
 
@@ -667,6 +1336,9 @@ def get_server_info() -> dict[str, Any]:
     Returns:
         Server information and capabilities
     """
+    from crystalyse.utils.parse_cache import get_parse_cache
+
+    chemeleon_loaded = tools.is_loaded("chemeleon_predictor")
     return {
         "server_name": "Chemistry Unified",
         "version": "2.0.0",
@@ -674,7 +1346,12 @@ def get_server_info() -> dict[str, Any]:
         "path_manipulation": False,
         "structured_output": True,
         "error_handling": True,
-        "total_tools": 20,
+        "total_tools": 33,
+        "parse_cache": get_parse_cache().stats(),
+        "structure_store": get_structure_store().stats(),
+        "startup": dict(startup),
+        "lazy_tools": tools.status(),
+        "readiness": {"warm_up": warm_up, "resources": tools.readiness()},
         "tool_categories": {
             "smact": {
                 "enabled": True,
@@ -683,12 +1360,23 @@ def get_server_info() -> dict[str, Any]:
                     "analyze_stability",
                     "predict_band_gap",
                     "smact_validate_fast",
+                    "smact_validate_bulk",
                     "generate_ml_representation",
+                    "generate_feature_matrix",
                     "filter_compositions",
                     "predict_dopants",
+                    "predict_dopants_batch",
                 ],
             },
-            "chemeleon": {"enabled": True, "tools": ["generate_crystal_csp"]},
+            "chemeleon": {
+                "enabled": True,
+                "tools": ["generate_crystal_csp", "generate_crystal_dng"],
+                "sample_cache": (
+                    tools.get("chemeleon_predictor").sample_cache.stats()
+                    if chemeleon_loaded
+                    else None
+                ),
+            },
             "mace": {
                 "enabled": True,
                 "tools": [
@@ -703,18 +1391,26 @@ def get_server_info() -> dict[str, Any]:
                 "enabled": True,
                 "tools": [
                     "analyze_space_group",
+                    "analyze_space_group_batch",
                     "calculate_energy_above_hull",
+                    "check_known_materials",
+                    "calculate_hull_targets",
                     "analyze_coordination",
+                    "analyze_coordination_batch",
                     "validate_oxidation_states",
+                    "validate_oxidation_states_batch",
                 ],
             },
             "visualization": {"enabled": True, "tools": ["save_cif_file", "create_analysis_suite"]},
+            "structures": {"enabled": True, "tools": ["store_structure", "export_structure"]},
+            "pipelines": {"enabled": True, "tools": ["run_screening_pipeline", "batch_call"]},
         },
         "capabilities": {
             "smact_validation": True,
             "smact_dopant_prediction": True,
             "smact_advanced_screening": True,
             "chemeleon_prediction": True,
+            "chemeleon_de_novo_generation": True,
             "mace_energy": True,
             "mace_relaxation": True,
             "mace_stress": True,
@@ -743,6 +1439,39 @@ def get_server_info() -> dict[str, Any]:
     }
 
 
+# Tools sharing the loaded MACE and Chemeleon models run one at a time, batched or not
+register_batch_call(
+    mcp,
+    exclusive={
+        "models": [
+            "generate_crystal_csp",
+            "generate_crystal_dng",
+            "calculate_formation_energy",
+            "relax_structure",
+            "calculate_stress",
+            "fit_equation_of_state",
+            "run_screening_pipeline",
+        ]
+    },
+)
+
+startup["import_seconds"] = time.perf_counter() - _IMPORT_STARTED
+
+
+def main():
+    """Run the server, loading the warm-up plan and tool stacks in the background."""
+    for spec in warm_up_plan(DEFAULT_WARM_UP):
+        try:
+            add_resource(tools, spec)
+        except ValueError as e:
+            logger.warning(f"Skipping warm-up of {spec}: {e}")
+            continue
+        warm_up.append(spec)
+    if warm_up:
+        tools.warm_up(warm_up + list(tools.status()))
+    serve(mcp, "chemistry_unified")
+
+
 if __name__ == "__main__":
     # Run the server
-    mcp.run()
+    main()
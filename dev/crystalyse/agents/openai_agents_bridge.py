@@ -10,7 +10,7 @@ from typing import Any
 try:
     from agents import Agent, Runner
     from agents.items import ItemHelpers
-    from agents.mcp import MCPServerStdio
+    from agents.mcp import MCPServerStdio, MCPServerStreamableHttp
     from agents.model_settings import ModelSettings
 
     # Try to import SQLiteSession from different locations
@@ -122,6 +122,29 @@ class EnhancedCrystaLyseAgent:
             logger.warning("No session to clear")
             return False
 
+    async def _connect_mcp_server(self, stack: AsyncExitStack, server_name: str) -> Any:
+        """Connect to a server's shared HTTP endpoint if one is set, otherwise spawn it."""
+        name = server_name.replace("_", "").title()
+        config = self.config.get_server_config(server_name)
+        if config.get("url"):
+            try:
+                return await stack.enter_async_context(
+                    MCPServerStreamableHttp(
+                        name=name,
+                        params={"url": config["url"], "sse_read_timeout": 300},
+                        client_session_timeout_seconds=300,
+                    )
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Could not reach {server_name} at {config['url']} ({e}); "
+                    "starting a local copy instead"
+                )
+                config = self.config.get_server_config(server_name, spawn=True)
+        return await stack.enter_async_context(
+            MCPServerStdio(name=name, params=config, client_session_timeout_seconds=300)
+        )
+
     @asynccontextmanager
     async def _managed_mcp_servers(self):
         """Starts, manages, and stops MCP servers."""
@@ -142,14 +165,7 @@ class EnhancedCrystaLyseAgent:
             # Start Servers
             for server_name in [chem_server_name, "visualization"]:
                 try:
-                    config = self.config.get_server_config(server_name)
-                    server = await stack.enter_async_context(
-                        MCPServerStdio(
-                            name=server_name.replace("_", "").title(),
-                            params=config,
-                            client_session_timeout_seconds=300,
-                        )
-                    )
+                    server = await self._connect_mcp_server(stack, server_name)
                     servers.append(server)
                     logger.info(f"✅ Connected to {server_name} server.")
                 except Exception as e:
@@ -28,16 +28,23 @@ class CrystaLyseConfig:
                 "command": os.getenv("CRYSTALYSE_PYTHON_PATH", sys.executable),
                 "args": ["-m", "chemistry_unified.server"],
                 "cwd": str(self.base_dir / "chemistry-unified-server" / "src"),
+                # Resources to load at startup (None: the server's default plan)
+                "warm_up": os.getenv("CRYSTALYSE_UNIFIED_WARM_UP"),
+                # Shared streamable-HTTP endpoint to use instead of spawning (--http mode)
+                "url": os.getenv("CRYSTALYSE_UNIFIED_URL"),
             },
             "chemistry_creative": {
                 "command": sys.executable,
                 "args": ["-m", "chemistry_creative.server"],
                 "cwd": str(self.base_dir / "chemistry-creative-server" / "src"),
+                "warm_up": os.getenv("CRYSTALYSE_CREATIVE_WARM_UP"),
+                "url": os.getenv("CRYSTALYSE_CREATIVE_URL"),
             },
             "visualization": {
                 "command": sys.executable,
                 "args": ["-m", "visualization_mcp.server"],
                 "cwd": str(self.base_dir / "visualization-mcp-server" / "src"),
+                "url": os.getenv("CRYSTALYSE_VISUALIZATION_URL"),
             },
         }
 
@@ -93,14 +100,27 @@ class CrystaLyseConfig:
             == "true",
         }
 
-    def get_server_config(self, server_name: str) -> dict[str, Any]:
-        """Get MCP server configuration with validation"""
+    def get_server_config(self, server_name: str, spawn: bool = False) -> dict[str, Any]:
+        """
+        Get MCP server configuration with validation.
+
+        Returns ``{"url": ...}`` for a server with a shared HTTP endpoint configured,
+        otherwise the command, args, cwd and env to spawn it over stdio.
+
+        Args:
+            server_name: Key in ``mcp_servers``
+            spawn: Return the stdio configuration even if an endpoint is configured
+        """
         if server_name not in self.mcp_servers:
             raise ValueError(
                 f"Unknown server: {server_name}. Available: {list(self.mcp_servers.keys())}"
             )
 
         config = self.mcp_servers[server_name].copy()
+        warm_up = config.pop("warm_up", None)
+        url = config.pop("url", None)
+        if url and not spawn:
+            return {"url": url}
 
         # Ensure the working directory exists
         cwd_path = Path(config["cwd"])
@@ -124,6 +144,9 @@ class CrystaLyseConfig:
         if self.debug_mode:
             config["env"]["CRYSTALYSE_DEBUG"] = "true"
 
+        if warm_up is not None:
+            config["env"]["CRYSTALYSE_WARM_UP"] = warm_up
+
         return config
 
     def validate_dependencies(self):
@@ -157,6 +180,7 @@ class CrystaLyseConfig:
             status["servers"][server_name] = {
                 "directory_exists": cwd_path.exists(),
                 "command": server_config["command"],
+                "url": server_config.get("url"),
                 "available": False,
             }
 
@@ -32,7 +32,7 @@ try:
     if os.path.exists(openai_agents_path) and openai_agents_path not in sys.path:
         sys.path.insert(0, openai_agents_path)
 
-    from agents.mcp.server import MCPServerStdio
+    from agents.mcp.server import MCPServerStdio, MCPServerStreamableHttp
 
     # Restore original sys.path
     sys.path = original_paths
@@ -51,6 +51,8 @@ except ImportError as e:
         async def cleanup(self):
             pass
 
+    MCPServerStreamableHttp = MCPServerStdio
+
 
 logger = logging.getLogger(__name__)
 
@@ -116,22 +118,37 @@ class MCPConnectionPool:
             try:
                 logger.info(f"Establishing connection to {server_name} (attempt {attempt + 1})")
 
-                # Create new connection with 5-minute timeout
-                connection = await self.exit_stack.enter_async_context(
-                    MCPServerStdio(
-                        name=server_name,
-                        params={
-                            "command": config["command"],
-                            "args": config["args"],
-                            "cwd": config["cwd"],
-                            "env": config.get("env", {}),
-                        },
-                        client_session_timeout_seconds=300,  # 5 minutes for complex operations
+                connection = None
+                if config.get("url"):
+                    # Shared server already running on this host (--http mode)
+                    try:
+                        connection = await self._open(
+                            MCPServerStreamableHttp(
+                                name=server_name,
+                                params={"url": config["url"], "sse_read_timeout": 300},
+                                client_session_timeout_seconds=300,
+                            )
+                        )
+                    except Exception as e:
+                        if "command" not in config:
+                            raise
+                        logger.warning(
+                            f"Could not reach {server_name} at {config['url']} ({e}); "
+                            "starting a local copy instead"
+                        )
+                if connection is None:
+                    connection = await self._open(
+                        MCPServerStdio(
+                            name=server_name,
+                            params={
+                                "command": config["command"],
+                                "args": config["args"],
+                                "cwd": config["cwd"],
+                                "env": config.get("env", {}),
+                            },
+                            client_session_timeout_seconds=300,  # 5 minutes for complex operations
+                        )
                     )
-                )
-
-                # Test the connection
-                await asyncio.wait_for(connection.list_tools(), timeout=30)
 
                 # Store successful connection
                 self.connections[server_name] = connection
@@ -155,6 +172,12 @@ class MCPConnectionPool:
 
         return None
 
+    async def _open(self, client: Any) -> Any:
+        """Enter a client into the pool's exit stack and check that it lists tools."""
+        connection = await self.exit_stack.enter_async_context(client)
+        await asyncio.wait_for(connection.list_tools(), timeout=30)
+        return connection
+
     async def close_connection(self, server_name: str) -> None:
         """Close a specific connection."""
         if server_name in self.connections:
@@ -5,7 +5,6 @@ Tracks computational artifacts with hashing to enable provenance verification
 of material property values in LLM outputs.
 """
 
-import hashlib
 import json
 import logging
 import re
@@ -13,6 +12,8 @@ from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from typing import Any
 
+from ..utils.serialization import content_hash
+
 logger = logging.getLogger(__name__)
 
 
@@ -89,16 +90,21 @@ class ArtifactTracker:
         input_data: Any,
         output_data: Any,
         timestamp: str | None = None,
+        output_hash: str | None = None,
     ) -> str:
         """
         Register a tool output and extract values.
 
+        Args:
+            output_hash: Hash of the output if the caller has already encoded it
+                (``Serialized.digest``); computed from output_data otherwise
+
         Returns:
             Artifact ID (the output hash)
         """
         # Generate hashes
         input_hash = self._generate_hash(input_data)
-        output_hash = self._generate_hash(output_data)
+        output_hash = output_hash or self._generate_hash(output_data)
 
         # Create artifact
         artifact = Artifact(
@@ -165,13 +171,10 @@ class ArtifactTracker:
         return matches
 
     def _generate_hash(self, data: Any) -> str:
-        """Generate SHA256 hash for data."""
+        """Generate SHA256 hash for data (of its canonical JSON for dicts and lists)."""
         if isinstance(data, dict | list):
-            data_str = json.dumps(data, sort_keys=True, default=str)
-        else:
-            data_str = str(data)
-
-        return hashlib.sha256(data_str.encode()).hexdigest()[:16]
+            return content_hash(data)
+        return content_hash(str(data))
 
     def _extract_values(self, output_data: Any, tool_name: str) -> list[ExtractedValue]:
         """
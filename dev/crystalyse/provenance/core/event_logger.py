@@ -3,11 +3,13 @@ JSONL Event Logger for structured provenance capture
 """
 
 import json
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from ...utils.serialization import dumps
+
 
 @dataclass
 class Event:
@@ -19,7 +21,8 @@ class Event:
 
     def to_jsonl(self) -> str:
         """Convert to JSONL string."""
-        return json.dumps(asdict(self))
+        # Data may embed already-encoded tool outputs (Serialized), written as they are
+        return dumps({"type": self.type, "ts": self.ts, "data": self.data}).decode()
 
 
 class JSONLLogger:
@@ -131,7 +131,7 @@ class MaterialsTracker:
             # Phase 1.5 tools
             elif tool_name == "calculate_formation_energy":
                 materials = self._extract_from_phase15_mace_energy(data)
-            elif tool_name == "generate_crystal_csp":
+            elif tool_name in ("generate_crystal_csp", "generate_crystal_dng"):
                 materials = self._extract_from_phase15_chemeleon(data)
             elif tool_name == "calculate_energy_above_hull":
                 materials = self._extract_from_phase15_pymatgen_hull(data)
@@ -139,6 +139,12 @@ class MaterialsTracker:
                 materials = self._extract_from_phase15_space_group(data)
             elif tool_name == "predict_dopants":
                 materials = self._extract_from_phase15_dopants(data)
+            elif tool_name == "predict_dopants_batch":
+                materials = [
+                    material
+                    for result in data.get("results", [])
+                    for material in self._extract_from_phase15_dopants(result)
+                ]
             elif tool_name == "estimate_band_gap":
                 materials = self._extract_from_phase15_band_gap(data)
             elif tool_name == "calculate_stress":
@@ -149,6 +155,8 @@ class MaterialsTracker:
             # SMACT validation tools
             elif tool_name == "smact_validate_fast":
                 materials = self._extract_from_smact_validate_fast(data)
+            elif tool_name == "smact_validate_bulk":
+                materials = self._extract_from_smact_validate_bulk(data)
             elif tool_name == "validate_composition":
                 materials = self._extract_from_validate_composition(data)
             elif tool_name == "filter_compositions":
@@ -434,14 +442,19 @@ class MaterialsTracker:
         return materials
 
     def _extract_from_phase15_chemeleon(self, data: dict) -> list[Material]:
-        """Extract from Phase 1.5 Chemeleon CSP generation."""
+        """Extract from Phase 1.5 Chemeleon CSP/DNG generation."""
         materials = []
-        if data.get("success") and "predicted_structures" in data:
-            for idx, struct in enumerate(data["predicted_structures"]):
+        if data.get("success") and ("predicted_structures" in data or "structure_handles" in data):
+            # Full structures are only returned on request; handles always are
+            handles = data.get("structure_handles") or []
+            structures = data.get("predicted_structures") or handles
+            for idx, struct in enumerate(structures):
+                handle = handles[idx].get("handle") if idx < len(handles) else None
                 material = Material(
-                    composition=data.get("formula", ""),
+                    # DNG results have no target formula, so fall back to each structure's own
+                    composition=data.get("formula") or struct.get("formula", ""),
                     formula=struct.get("formula", data.get("formula")),
-                    structure_id=f"chemeleon_{idx}",
+                    structure_id=handle or f"chemeleon_{idx}",
                     space_group=struct.get("space_group"),
                     lattice_params=struct.get("lattice"),
                     confidence=struct.get("confidence", 1.0),
@@ -559,6 +572,18 @@ class MaterialsTracker:
 
         return materials
 
+    def _extract_from_smact_validate_bulk(self, data: dict) -> list[Material]:
+        """Extract from SMACT bulk validation tool."""
+        return [
+            Material(
+                composition=formula,
+                formula=formula,
+                method="smact_validation",
+                confidence=1.0,
+            )
+            for formula in data.get("valid_formulas", [])
+        ]
+
     def _extract_from_validate_composition(self, data: dict) -> list[Material]:
         """Extract from validate_composition tool."""
         materials = []
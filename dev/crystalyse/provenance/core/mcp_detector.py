@@ -24,10 +24,14 @@ class MCPDetector:
         "validate_composition": ["is_valid", "charge_balanced", "electronegativity_test"],
         "estimate_band_gap": ["band_gap_ev", "band_gap_estimate", "confidence"],
         "predict_dopants": ["n_type_dopants", "p_type_dopants", "species"],
+        "predict_dopants_batch": ["results", "embedding", "cache_hits"],
         "smact_validate_fast": ["composition", "is_valid", "success", "use_pauling_test"],
+        "smact_validate_bulk": ["verdicts", "valid_formulas", "unique", "num_valid"],
         "generate_ml_representation": ["representation", "composition", "vector_length"],
+        "generate_feature_matrix": ["matrix_path", "index_path", "shape", "density"],
         "filter_compositions": ["valid_compositions", "invalid_compositions", "total_processed"],
-        "generate_crystal_csp": ["success", "formula", "predicted_structures", "checkpoint_used"],
+        "generate_crystal_csp": ["success", "formula", "structure_handles", "checkpoint_used"],
+        "generate_crystal_dng": ["success", "structure_handles", "num_sampled", "num_rejected"],
         "calculate_formation_energy": [
             "formation_energy",
             "energy_per_atom",
@@ -35,7 +39,7 @@ class MCPDetector:
             "composition",
         ],
         "relax_structure": [
-            "relaxed_structure",
+            "relaxed_handle",
             "initial_energy",
             "final_energy",
             "relaxation_steps",
@@ -44,14 +48,23 @@ class MCPDetector:
         "fit_equation_of_state": ["bulk_modulus", "bulk_modulus_derivative", "equilibrium_volume"],
         "list_foundation_models": ["models", "total_models"],
         "analyze_space_group": ["space_group", "number", "crystal_system", "point_group"],
+        "analyze_space_group_batch": ["results", "num_failed", "cache_hits"],
         "calculate_energy_above_hull": [
             "energy_above_hull",
             "is_stable",
             "is_metastable",
             "decomposition_products",
         ],
+        "check_known_materials": ["results", "num_known"],
+        "calculate_hull_targets": ["results", "num_passing"],
         "analyze_coordination": ["site_environments", "average_coordination"],
+        "analyze_coordination_batch": ["results", "num_failed"],
         "analyze_oxidation_states": ["oxidation_states", "is_valid", "charge_balanced"],
+        "validate_oxidation_states_batch": ["results", "num_failed", "num_timed_out"],
+        "run_screening_pipeline": ["ranked", "rejected", "stage_counts", "stage_seconds"],
+        "store_structure": ["success", "structure"],
+        "export_structure": ["success", "structure", "format", "output_path"],
+        "batch_call": ["results", "num_calls", "num_executed"],
         "save_structure_as_cif": ["success", "file_path", "structure_info"],
         "visualize_structure": ["visualization_url", "structure_data"],
     }
@@ -179,11 +192,15 @@ class MCPDetector:
             "validate_composition": "validation",
             "estimate_band_gap": "calculation",
             "predict_dopants": "analysis",
+            "predict_dopants_batch": "analysis",
             "smact_validate_fast": "validation",
+            "smact_validate_bulk": "validation",
             "generate_ml_representation": "analysis",
+            "generate_feature_matrix": "analysis",
             "filter_compositions": "validation",
             # Phase 1.5 Chemeleon tools
             "generate_crystal_csp": "generation",
+            "generate_crystal_dng": "generation",
             # Phase 1.5 MACE tools
             "calculate_formation_energy": "calculation",
             "relax_structure": "optimization",
@@ -192,9 +209,18 @@ class MCPDetector:
             "list_foundation_models": "utility",
             # Phase 1.5 PyMatgen tools
             "analyze_space_group": "analysis",
+            "analyze_space_group_batch": "analysis",
             "calculate_energy_above_hull": "calculation",
+            "check_known_materials": "analysis",
+            "calculate_hull_targets": "calculation",
             "analyze_coordination": "analysis",
+            "analyze_coordination_batch": "analysis",
             "analyze_oxidation_states": "validation",
+            "validate_oxidation_states_batch": "validation",
+            "run_screening_pipeline": "calculation",
+            "store_structure": "generation",
+            "export_structure": "visualization",
+            "batch_call": "other",
             # Phase 1.5 Visualization tools
             "save_structure_as_cif": "visualization",
             "visualize_structure": "visualization",
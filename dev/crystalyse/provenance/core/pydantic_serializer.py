@@ -10,6 +10,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from ...utils.serialization import Serialized
+
 logger = logging.getLogger(__name__)
 
 
@@ -148,6 +150,11 @@ def extract_pydantic_fields(data: dict[str, Any]) -> dict[str, Any]:
                     "volume": first.get("volume"),
                     "confidence": first.get("confidence", 1.0),
                 }
+    if data.get("structure_handles"):
+        extracted["num_structures"] = len(data["structure_handles"])
+        extracted["structure_handles"] = [s.get("handle") for s in data["structure_handles"]]
+    if data.get("relaxed_handle"):
+        extracted["relaxed_handle"] = data["relaxed_handle"].get("handle")
 
     # Extract dopant information
     if "n_type_dopants" in data and "p_type_dopants" in data:
@@ -180,14 +187,18 @@ def create_enhanced_material_record(
 
     Args:
         tool_name: Name of the tool that generated the output
-        tool_output: Raw or Pydantic model output from the tool
+        tool_output: Raw or Pydantic model output from the tool, or its existing
+            ``Serialized`` encoding, which is then embedded in the record as it is
         timestamp: Optional timestamp (auto-generated if not provided)
 
     Returns:
         Enhanced material record with rich metadata
     """
     # Serialize the output
-    serialized = serialize_pydantic_model(tool_output)
+    if isinstance(tool_output, Serialized):
+        serialized, full_output = tool_output.data, tool_output
+    else:
+        serialized = full_output = serialize_pydantic_model(tool_output)
 
     # Extract key fields
     if isinstance(serialized, dict):
@@ -200,7 +211,7 @@ def create_enhanced_material_record(
         "tool": tool_name,
         "timestamp": timestamp or datetime.now().isoformat(),
         "key_data": key_fields,
-        "full_output": serialized,
+        "full_output": full_output,
     }
 
     # Add tool category
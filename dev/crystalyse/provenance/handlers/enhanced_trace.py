@@ -12,9 +12,11 @@ from typing import Any
 
 from rich.console import Console
 
+from ...utils.serialization import serialize
+
 # Import core components - use relative imports within crystalyse.provenance
 from ..core import JSONLLogger, MaterialsTracker, MCPDetector
-from ..core.pydantic_serializer import create_enhanced_material_record, serialize_pydantic_model
+from ..core.pydantic_serializer import create_enhanced_material_record
 from ..value_registry import get_global_registry
 
 
@@ -216,12 +218,13 @@ class ProvenanceTraceHandler(ToolTraceHandler):
         tool_call.end_time = time.time()
         tool_call.output = item.output
 
-        # Serialize Pydantic models if present
-        serialized_output = serialize_pydantic_model(item.output)
+        # Serialize once; the raw output file, artifact hash and event log reuse the encoding
+        encoded_output = serialize(item.output)
+        serialized_output = encoded_output.data
 
         # Save raw output if enabled
         if self.save_raw_outputs and self.output_dir and serialized_output:
-            self._save_raw_output(call_id, serialized_output)
+            self._save_raw_output(call_id, encoded_output)
 
         # Detect actual MCP tool
         mcp_tool = self.mcp_detector.detect_tool(serialized_output)
@@ -247,6 +250,7 @@ class ProvenanceTraceHandler(ToolTraceHandler):
                 input_data={},  # Could extract from tool_call.args if needed
                 output_data=serialized_output,
                 timestamp=datetime.now().isoformat(),
+                output_hash=encoded_output.digest(),
             )
 
         # Create enhanced material record for Phase 1.5 tools
@@ -254,7 +258,7 @@ class ProvenanceTraceHandler(ToolTraceHandler):
             ("validate_", "calculate_", "analyze_", "predict_", "generate_")
         ):
             enhanced_record = create_enhanced_material_record(
-                mcp_tool, serialized_output, datetime.now().isoformat()
+                mcp_tool, encoded_output, datetime.now().isoformat()
             )
             self.event_logger.log("enhanced_material", enhanced_record)
 
@@ -347,16 +351,10 @@ class ProvenanceTraceHandler(ToolTraceHandler):
         return None
 
     def _save_raw_output(self, call_id: str, output: Any):
-        """Save raw tool output for debugging."""
+        """Save raw tool output for debugging (text outputs as they are, others as JSON)."""
         try:
             raw_file = self.output_dir / f"raw_output_{call_id[:8]}.json"
-
-            if isinstance(output, str):
-                with open(raw_file, "w") as f:
-                    f.write(output)
-            else:
-                with open(raw_file, "w") as f:
-                    json.dump(output, f, indent=2)
+            raw_file.write_bytes(serialize(output).payload)
         except Exception as e:
             logger.debug(f"Failed to save raw output: {e}")
 
@@ -79,10 +79,14 @@ class ProvenanceValueRegistry:
         input_data: Any,
         output_data: Any,
         timestamp: str | None = None,
+        output_hash: str | None = None,
     ) -> str:
         """
         Register a tool output and extract all values.
 
+        Args:
+            output_hash: Hash of the already-encoded output (computed if not given)
+
         Returns:
             Artifact ID
         """
@@ -93,6 +97,7 @@ class ProvenanceValueRegistry:
             input_data=input_data,
             output_data=output_data,
             timestamp=timestamp,
+            output_hash=output_hash,
         )
 
         # Get the artifact
@@ -1,54 +1,117 @@
-"""CrystaLyse tools package - modular MCP tool implementations."""
+"""
+CrystaLyse tools package - modular MCP tool implementations.
 
-# Import all tool modules
-from . import chemeleon, errors, mace, models, pymatgen, smact, visualization
-from .chemeleon import ChemeleonPredictor, CrystalStructure, PredictionResult
-from .errors import (
-    ComputationError,
-    CrystaLyseToolError,
-    FallbackChain,
-    ResourceUnavailableError,
-    ValidationError,
-    with_retry,
-)
-from .mace import (
-    EnergyResult,
-    EOSResult,
-    FoundationModelInfo,
-    FoundationModelListResult,
-    MACECalculator,
-    MACEFoundationModels,
-    MACEStressCalculator,
-    RelaxationResult,
-    StressResult,
-)
-from .models import MaterialProperty, ToolResult
-from .pymatgen import (
-    CoordinationResult,
-    EnergyAboveHullResult,
-    OxidationStateResult,
-    PhaseDiagramAnalyzer,
-    PyMatgenAnalyzer,
-    SpaceGroupResult,
-)
+The tool modules pull in torch, MACE, Chemeleon and pymatviz, so nothing is
+imported here until it is used: ``from crystalyse.tools import MACECalculator``
+imports ``crystalyse.tools.mace`` on first access (PEP 562). Code that only needs
+SMACT or pymatgen never pays for the ML stacks.
+"""
 
-# Export key classes and functions
-from .smact import (
-    BandGapResult,
-    CompositionFilterResult,
-    CompositionValidityResult,
-    DopantPredictionResult,
-    DopantSuggestion,
-    ElementInfo,
-    MLRepresentationResult,
-    SMACTCalculator,
-    SMACTDopantPredictor,
-    SMACTScreener,
-    SMACTValidator,
-    StabilityResult,
-    ValidationResult,
-)
-from .visualization import CrystaLyseVisualizer, VisualizationResult
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import chemeleon, errors, mace, models, pymatgen, smact, visualization
+    from .chemeleon import (
+        ChemeleonPredictor,
+        CrystalStructure,
+        DeNovoGenerationResult,
+        GenerationBatch,
+        PredictionResult,
+    )
+    from .errors import (
+        ComputationError,
+        CrystaLyseToolError,
+        FallbackChain,
+        ResourceUnavailableError,
+        ValidationError,
+        with_retry,
+    )
+    from .mace import (
+        EnergyResult,
+        EOSResult,
+        FoundationModelInfo,
+        FoundationModelListResult,
+        MACECalculator,
+        MACEFoundationModels,
+        MACEStressCalculator,
+        RelaxationResult,
+        StressResult,
+    )
+    from .models import MaterialProperty, ToolResult
+    from .pymatgen import (
+        CoordinationResult,
+        EnergyAboveHullResult,
+        OxidationStateResult,
+        PhaseDiagramAnalyzer,
+        PyMatgenAnalyzer,
+        SpaceGroupResult,
+    )
+    from .smact import (
+        BandGapResult,
+        CompositionFilterResult,
+        CompositionValidityResult,
+        DopantPredictionResult,
+        DopantSuggestion,
+        ElementInfo,
+        MLRepresentationResult,
+        SMACTCalculator,
+        SMACTDopantPredictor,
+        SMACTScreener,
+        SMACTValidator,
+        StabilityResult,
+        ValidationResult,
+    )
+    from .visualization import CrystaLyseVisualizer, VisualizationResult
+
+_SUBMODULES = {"chemeleon", "errors", "mace", "models", "pymatgen", "smact", "visualization"}
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "ChemeleonPredictor": "chemeleon",
+    "CrystalStructure": "chemeleon",
+    "DeNovoGenerationResult": "chemeleon",
+    "GenerationBatch": "chemeleon",
+    "PredictionResult": "chemeleon",
+    "ComputationError": "errors",
+    "CrystaLyseToolError": "errors",
+    "FallbackChain": "errors",
+    "ResourceUnavailableError": "errors",
+    "ValidationError": "errors",
+    "with_retry": "errors",
+    "EnergyResult": "mace",
+    "EOSResult": "mace",
+    "FoundationModelInfo": "mace",
+    "FoundationModelListResult": "mace",
+    "MACECalculator": "mace",
+    "MACEFoundationModels": "mace",
+    "MACEStressCalculator": "mace",
+    "RelaxationResult": "mace",
+    "StressResult": "mace",
+    "CoordinationResult": "pymatgen",
+    "EnergyAboveHullResult": "pymatgen",
+    "OxidationStateResult": "pymatgen",
+    "PhaseDiagramAnalyzer": "pymatgen",
+    "PyMatgenAnalyzer": "pymatgen",
+    "SpaceGroupResult": "pymatgen",
+    "BandGapResult": "smact",
+    "CompositionFilterResult": "smact",
+    "CompositionValidityResult": "smact",
+    "DopantPredictionResult": "smact",
+    "DopantSuggestion": "smact",
+    "ElementInfo": "smact",
+    "MLRepresentationResult": "smact",
+    "SMACTCalculator": "smact",
+    "SMACTDopantPredictor": "smact",
+    "SMACTScreener": "smact",
+    "SMACTValidator": "smact",
+    "StabilityResult": "smact",
+    "ValidationResult": "smact",
+    "MaterialProperty": "models",
+    "ToolResult": "models",
+    "CrystaLyseVisualizer": "visualization",
+    "VisualizationResult": "visualization",
+}
 
 __all__ = [
     # Modules
@@ -77,6 +140,8 @@ __all__ = [
     "ChemeleonPredictor",
     "PredictionResult",
     "CrystalStructure",
+    "GenerationBatch",
+    "DeNovoGenerationResult",
     # MACE
     "MACECalculator",
     "MACEStressCalculator",
@@ -108,3 +173,18 @@ __all__ = [
     "ToolResult",
     "MaterialProperty",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
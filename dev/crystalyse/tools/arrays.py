@@ -0,0 +1,159 @@
+"""
+Compact encoding of numeric arrays in tool inputs and results.
+
+Positions, cells, feature vectors and the like normally travel as nested JSON
+lists, which cost around 20 characters per float and a Python object per
+element to build and parse. With an ``array_encoding`` of ``"float64"`` or
+``"float32"``, tools instead return each large numeric array as
+
+    {"dtype": "<f8", "shape": [64, 3], "data": "<base64 of the little-endian bytes>"}
+
+which is about 11 (float64) or 5 (float32) characters per float. ``float64`` is
+lossless; ``float32`` keeps about seven significant digits, enough for
+positions in Å. Integer arrays (atomic numbers) are encoded losslessly in the
+smallest integer type that holds them.
+Arrays with fewer than ``MIN_ENCODED_SIZE`` elements stay as lists, where the
+metadata would outweigh the saving.
+
+Structure inputs accept the same form anywhere a list is accepted;
+``decode_arrays`` turns encoded arrays back into numpy arrays. Encoded arrays
+are meant for clients that hand results to code or to other tools; a language
+model cannot read the numbers.
+"""
+
+import base64
+from typing import Any
+
+import numpy as np
+
+# Precisions a caller can ask for, and the dtype of encoded floats for each
+ARRAY_ENCODINGS = {"float64": "<f8", "float32": "<f4"}
+
+# Arrays smaller than this stay as JSON lists
+MIN_ENCODED_SIZE = 16
+
+# Integer dtypes, smallest first
+_INT_DTYPES = ("<i1", "<i2", "<i4", "<i8")
+
+_ENCODED_KEYS = {"dtype", "shape", "data"}
+
+
+def check_encoding(encoding: str | None) -> None:
+    """
+    Raises:
+        ValueError: If the encoding is neither None nor one of ``ARRAY_ENCODINGS``
+    """
+    if encoding is not None and encoding not in ARRAY_ENCODINGS:
+        raise ValueError(
+            f"Unknown array encoding '{encoding}'. Use one of: {', '.join(ARRAY_ENCODINGS)}"
+        )
+
+
+def is_encoded_array(value: Any) -> bool:
+    """Whether a value is an array in the encoded form."""
+    return isinstance(value, dict) and value.keys() == _ENCODED_KEYS
+
+
+def encode_array(array: Any, encoding: str = "float64") -> dict[str, Any]:
+    """
+    Encode a numeric array as base64 of its little-endian bytes.
+
+    Args:
+        array: Array or nested list of numbers
+        encoding: Precision of floating-point arrays, ``"float64"`` or ``"float32"``
+
+    Returns:
+        Dict with dtype, shape and data
+    """
+    check_encoding(encoding)
+    array = np.asarray(array)
+    if array.dtype.kind in "iu":
+        low, high = (int(array.min()), int(array.max())) if array.size else (0, 0)
+        dtype = next(t for t in _INT_DTYPES if np.iinfo(t).min <= low and high <= np.iinfo(t).max)
+    else:
+        dtype = ARRAY_ENCODINGS[encoding]
+    data = np.ascontiguousarray(array, dtype=dtype).tobytes()
+    return {
+        "dtype": dtype,
+        "shape": list(array.shape),
+        "data": base64.b64encode(data).decode("ascii"),
+    }
+
+
+def decode_array(value: dict[str, Any]) -> np.ndarray:
+    """
+    Turn an encoded array back into a numpy array.
+
+    Raises:
+        ValueError: If the dtype is not a numeric type or the data does not match the shape
+    """
+    dtype = np.dtype(value["dtype"])
+    if dtype.kind not in "iuf":
+        raise ValueError(f"Encoded arrays must be numeric, got dtype {value['dtype']!r}")
+    data = base64.b64decode(value["data"], validate=True)
+    shape = tuple(int(n) for n in value["shape"])
+    if len(data) != dtype.itemsize * int(np.prod(shape)):
+        raise ValueError(f"Encoded array data does not match shape {list(shape)}")
+    return np.frombuffer(data, dtype=dtype).reshape(shape).astype(dtype.newbyteorder("="))
+
+
+def _numeric(value: Any) -> np.ndarray | None:
+    """The value as a numeric array if it is one (a rectangular list of numbers)."""
+    if isinstance(value, list):
+        first = value
+        while isinstance(first, list) and first:
+            first = first[0]
+        if isinstance(first, bool) or not isinstance(first, int | float | np.number):
+            return None
+        try:
+            value = np.asarray(value)
+        except ValueError:
+            return None
+    if isinstance(value, np.ndarray) and value.dtype.kind in "iuf":
+        return value
+    return None
+
+
+def encode_arrays(obj: Any, encoding: str | None, min_size: int = MIN_ENCODED_SIZE) -> Any:
+    """
+    Encode every numeric array of at least ``min_size`` elements in a result.
+
+    Args:
+        obj: Dicts, lists and values, as returned by ``model_dump``
+        encoding: ``"float64"``, ``"float32"``, or None to leave the result as it is
+        min_size: Smallest array to encode
+
+    Returns:
+        The result with large arrays replaced by their encoded form
+    """
+    if encoding is None:
+        return obj
+    if isinstance(obj, dict):
+        return {k: encode_arrays(v, encoding, min_size) for k, v in obj.items()}
+    array = _numeric(obj)
+    if array is not None:
+        if array.size >= min_size:
+            return encode_array(array, encoding)
+        return obj.tolist() if isinstance(obj, np.ndarray) else obj
+    if isinstance(obj, list | tuple):
+        return [encode_arrays(item, encoding, min_size) for item in obj]
+    return obj
+
+
+def decode_arrays(obj: Any) -> Any:
+    """
+    Replace every encoded array in a tool input by a numpy array.
+
+    Inputs without encoded arrays are returned as they are, not copied.
+    """
+    if is_encoded_array(obj):
+        return decode_array(obj)
+    if isinstance(obj, dict):
+        decoded = {k: decode_arrays(v) for k, v in obj.items()}
+        changed = any(decoded[k] is not v for k, v in obj.items())
+        return decoded if changed else obj
+    if isinstance(obj, list) and obj and isinstance(obj[0], dict | list):
+        decoded = [decode_arrays(item) for item in obj]
+        changed = any(new is not old for new, old in zip(decoded, obj, strict=True))
+        return decoded if changed else obj
+    return obj
@@ -0,0 +1,229 @@
+"""
+Batched tool calls for the MCP servers.
+
+Every MCP tool call is a separate request and response, so a fan-out such as
+"space group of all 20 candidates" costs 20 round trips between the agent and
+the server. ``register_batch_call`` adds a ``batch_call`` tool to a FastMCP
+server that takes a list of calls to the server's own tools and answers them
+in one response:
+
+- calls run concurrently, up to ``max_concurrency`` at a time; async tools run
+  on the server's event loop (they hand their heavy work to threads or
+  processes themselves) and sync tools in a thread from the default executor;
+- tools that share a loaded model (the MACE calculator, the Chemeleon
+  sampler) are placed in an exclusive group and run one at a time, as those
+  objects are not safe to use from several threads. The group's lock is taken
+  by the tool itself, so it also holds between concurrent batches and direct
+  calls; sync tools in a group are moved to a thread so waiting for the lock
+  never blocks the loop;
+- with ``deduplicate``, identical calls (same tool, same arguments) run once
+  and the repeats point at the first one. It is off by default, because
+  generation tools without a seed return different structures on every call;
+- each call gets its own result or error, so one bad call does not fail the
+  rest of the batch.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import time
+from collections.abc import Collection
+from contextlib import nullcontext
+from typing import Any
+
+from pydantic_core import to_jsonable_python
+
+from .models import BatchCall, BatchCallItem, BatchCallResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+
+# Upper bound on calls in one batch
+MAX_CALLS = 256
+
+BATCH_TOOL = "batch_call"
+
+
+def call_key(call: BatchCall) -> str:
+    """Canonical form of a call, equal for calls with the same tool and arguments."""
+    return json.dumps([call.tool, call.arguments], sort_keys=True, default=str)
+
+
+async def _run_tool(server: Any, call: BatchCall, context: Any) -> Any:
+    if call.tool == BATCH_TOOL:
+        raise ValueError("batch_call cannot be nested")
+    tool = server._tool_manager.get_tool(call.tool)
+    if tool is None:
+        raise ValueError(f"Unknown tool: {call.tool}")
+    if tool.is_async:
+        # Exclusive-group locks and the request context belong to this event loop
+        return await tool.run(call.arguments, context=context)
+    # Sync tools would otherwise block the loop
+    return await asyncio.to_thread(asyncio.run, tool.run(call.arguments))
+
+
+def _hold_lock(tool: Any, lock: asyncio.Lock) -> None:
+    fn, is_async = tool.fn, tool.is_async
+
+    @functools.wraps(fn)
+    async def locked(**kwargs: Any) -> Any:
+        async with lock:
+            if is_async:
+                return await fn(**kwargs)
+            return await asyncio.to_thread(fn, **kwargs)
+
+    tool.fn, tool.is_async = locked, True
+
+
+def serialise_tools(server: Any, exclusive: dict[str, list[str]]) -> set[str]:
+    """
+    Make each group of tools run one at a time, however they are called.
+
+    Every tool in a group is wrapped to hold the group's lock for the whole call,
+    so the lock applies across batches and to direct tool calls alike. Call this
+    once, after the tools are registered.
+
+    Args:
+        server: FastMCP server whose tools are wrapped
+        exclusive: Groups of tool names keyed by a group name
+
+    Returns:
+        Names of the wrapped tools
+    """
+    wrapped: set[str] = set()
+    for group, names in exclusive.items():
+        lock = asyncio.Lock()
+        for name in names:
+            tool = server._tool_manager.get_tool(name)
+            if tool is None:
+                logger.warning(f"Exclusive group {group} names unknown tool {name}")
+                continue
+            _hold_lock(tool, lock)
+            wrapped.add(name)
+    return wrapped
+
+
+async def run_batch(
+    server: Any,
+    calls: list[BatchCall],
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    deduplicate: bool = False,
+    exclusive: Collection[str] = (),
+    context: Any = None,
+) -> BatchCallResult:
+    """
+    Run a list of tool calls against a FastMCP server.
+
+    Args:
+        server: FastMCP server whose tools are called
+        calls: Tool name and arguments of each call
+        max_concurrency: Calls running at once
+        deduplicate: Run identical calls once and share the result (only for
+            deterministic tools)
+        exclusive: Tools wrapped by ``serialise_tools``; they wait for their group's
+            lock without holding one of the ``max_concurrency`` slots
+        context: Request context passed to tools that take one
+
+    Returns:
+        BatchCallResult with one item per call, in order
+    """
+    start = time.perf_counter()
+    if len(calls) > MAX_CALLS:
+        return BatchCallResult(
+            success=False,
+            num_calls=len(calls),
+            error=f"{len(calls)} calls in one batch; the limit is {MAX_CALLS}",
+        )
+    items = [BatchCallItem(index=i, tool=call.tool) for i, call in enumerate(calls)]
+    first: dict[str, int] = {}
+    to_run: list[int] = []
+    for i, call in enumerate(calls):
+        key = call_key(call)
+        if deduplicate and key in first:
+            items[i].duplicate_of = first[key]
+        else:
+            first.setdefault(key, i)
+            to_run.append(i)
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def execute(i: int) -> None:
+        item, call = items[i], calls[i]
+        # Exclusive tools already run one at a time per group, so calls queued on a
+        # busy model do not take slots other tools could use
+        async with nullcontext() if call.tool in exclusive else semaphore:
+            call_start = time.perf_counter()
+            try:
+                result = await _run_tool(server, call, context)
+                item.result = to_jsonable_python(result, fallback=str)
+                item.success = True
+            except Exception as e:
+                logger.debug(f"Batched call {i} to {call.tool} failed: {e}")
+                item.error = str(e) or type(e).__name__
+            item.seconds = round(time.perf_counter() - call_start, 4)
+
+    await asyncio.gather(*(execute(i) for i in to_run))
+
+    for item in items:
+        if item.duplicate_of is not None:
+            original = items[item.duplicate_of]
+            item.success = original.success
+            item.result = original.result
+            item.error = original.error
+
+    return BatchCallResult(
+        results=items,
+        num_calls=len(calls),
+        num_executed=len(to_run),
+        num_failed=sum(not item.success for item in items),
+        computation_time=time.perf_counter() - start,
+    )
+
+
+def register_batch_call(
+    server: Any,
+    exclusive: dict[str, list[str]] | None = None,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+) -> None:
+    """
+    Add a ``batch_call`` tool to a FastMCP server.
+
+    Args:
+        server: The FastMCP server
+        exclusive: Groups of tool names that must not run concurrently, keyed by
+            a group name (e.g. ``{"mace": ["calculate_formation_energy", ...]}``),
+            applied to every call of those tools (see ``serialise_tools``)
+        max_concurrency: Default number of calls running at once
+    """
+    from mcp.server.fastmcp import Context
+
+    serialised = serialise_tools(server, exclusive or {})
+    default_concurrency = max_concurrency
+
+    async def batch_call(
+        calls: list[BatchCall],
+        ctx: Context,
+        max_concurrency: int = default_concurrency,
+        deduplicate: bool = False,
+    ) -> BatchCallResult:
+        """
+        Run several calls to this server's tools in one request.
+
+        Use this for fan-out work, e.g. the space group of every candidate, instead
+        of one tool call per item. Calls run concurrently and each gets its own
+        result or error, in the order given.
+
+        Args:
+            calls: List of {"tool": name, "arguments": {...}}
+            max_concurrency: Calls running at once
+            deduplicate: Run identical calls (same tool and arguments) once. Leave
+                off for unseeded structure generation, where repeats should differ
+
+        Returns:
+            BatchCallResult with one item per call
+        """
+        return await run_batch(server, calls, max_concurrency, deduplicate, serialised, ctx)
+
+    server.tool()(batch_call)
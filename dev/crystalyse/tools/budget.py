@@ -0,0 +1,149 @@
+"""
+Time and step budgets for long tool calls, with cooperative cancellation.
+
+Relaxations and diffusion sampling run for minutes in worker threads. When the
+client gives up (an agent-side timeout, a cancelled MCP request, a closed
+session) the awaiting task is cancelled but the thread is not, so the work
+would run to the end for a result nobody reads. Instead the work is handed a
+``Budget`` and checks it at cooperative checkpoints: after every optimiser step
+and before every denoising step. ``checkpoint`` raises ``BudgetExceeded`` once
+
+- the call's wall time (``seconds``) has run out,
+- the call has used its ``max_steps`` optimiser or denoising steps, or
+- the budget was cancelled, which ``run_in_thread`` does when the task
+  awaiting the thread is cancelled.
+
+The tool then returns what it has so far (for a relaxation, the lowest-energy
+structure reached; for de novo generation, the finished batches) with
+``stopped`` set to ``"time"``, ``"steps"`` or ``"cancelled"``.
+
+The servers cap every call at ``CRYSTALYSE_TOOL_TIME_LIMIT`` seconds (default
+900), ``CRYSTALYSE_MAX_RELAX_STEPS`` optimiser steps (default 2000) and
+``CRYSTALYSE_MAX_DIFFUSION_STEPS`` denoising steps (default 20000, i.e. twenty
+batches of the 1000-step Chemeleon schedule). A caller can ask for less, not
+more; ``0`` removes a cap.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+DEFAULT_TIME_LIMIT = 900.0
+
+# Step caps per kind of work: (environment variable, default)
+STEP_LIMITS = {
+    "relax": ("CRYSTALYSE_MAX_RELAX_STEPS", 2000),
+    "diffusion": ("CRYSTALYSE_MAX_DIFFUSION_STEPS", 20000),
+}
+
+
+class BudgetExceeded(Exception):
+    """Raised at a checkpoint once a budget has run out or been cancelled."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class Budget:
+    """Wall time, step count and cancellation flag of one tool call."""
+
+    def __init__(self, seconds: float | None = None, max_steps: int | None = None):
+        """
+        Args:
+            seconds: Wall time allowed from now (None for no limit)
+            max_steps: Optimiser or denoising steps allowed (None for no limit)
+        """
+        self.seconds = seconds
+        self.max_steps = max_steps
+        self.started = time.monotonic()
+        self.steps = 0
+        self.stopped: str | None = None
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Stop the work at its next checkpoint."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def stop(self, reason: str) -> BudgetExceeded:
+        """Record why the work stops and build the exception to raise."""
+        self.stopped = reason
+        if reason == "cancelled":
+            message = "Cancelled by the client"
+        elif reason == "time":
+            message = f"Time limit of {self.seconds:g} s reached after {self.steps} steps"
+        else:
+            message = f"Step limit of {self.max_steps} reached"
+        return BudgetExceeded(reason, message)
+
+    def checkpoint(self, steps: int = 1) -> None:
+        """
+        Account for the next ``steps`` steps of work, or stop it.
+
+        Called before each unit of work; ``checkpoint(0)`` only checks the time
+        and the cancellation flag.
+
+        Raises:
+            BudgetExceeded: If the call was cancelled, its time is up, or the steps
+                would take it past ``max_steps``
+        """
+        if self._cancelled.is_set():
+            raise self.stop("cancelled")
+        if self.seconds is not None and self.elapsed() > self.seconds:
+            raise self.stop("time")
+        if self.max_steps is not None and self.steps + steps > self.max_steps:
+            raise self.stop("steps")
+        self.steps += steps
+
+
+def _cap(requested: float | None, limit: float) -> float | None:
+    if limit <= 0:
+        return requested
+    return limit if requested is None else min(requested, limit)
+
+
+def tool_budget(
+    kind: str | None, seconds: float | None = None, max_steps: int | None = None
+) -> Budget:
+    """
+    Budget for one call, within the server's limits.
+
+    Args:
+        kind: ``"relax"`` or ``"diffusion"``, selecting the step cap, or None for a
+            time budget only (e.g. a pipeline running many relaxations)
+        seconds: Wall time the caller asked for (None: the server limit)
+        max_steps: Steps the caller asked for (None: the server limit)
+
+    Returns:
+        Budget with the smaller of the requested and server limits
+    """
+    time_limit = float(os.getenv("CRYSTALYSE_TOOL_TIME_LIMIT", str(DEFAULT_TIME_LIMIT)))
+    steps = None
+    if kind is not None:
+        env, default = STEP_LIMITS[kind]
+        steps = _cap(max_steps, int(os.getenv(env, str(default))))
+    return Budget(_cap(seconds, time_limit), None if steps is None else int(steps))
+
+
+async def run_in_thread(budget: Budget | None, func: Callable[..., Any], /, *args, **kwargs) -> Any:
+    """
+    ``asyncio.to_thread`` that cancels the budget if the awaiting task is cancelled.
+
+    The thread keeps running until ``func`` reaches its next checkpoint.
+    """
+    try:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    except asyncio.CancelledError:
+        if budget is not None:
+            budget.cancel()
+        raise
@@ -1,5 +1,19 @@
 """Chemeleon tools package - crystal structure prediction."""
 
-from .predictor import ChemeleonPredictor, CrystalStructure, PredictionResult
+from .predictor import (
+    ChemeleonPredictor,
+    CrystalStructure,
+    DeNovoGenerationResult,
+    GenerationBatch,
+    PredictionResult,
+)
+from .sample_cache import SampleCache
 
-__all__ = ["ChemeleonPredictor", "PredictionResult", "CrystalStructure"]
+__all__ = [
+    "ChemeleonPredictor",
+    "PredictionResult",
+    "CrystalStructure",
+    "GenerationBatch",
+    "DeNovoGenerationResult",
+    "SampleCache",
+]
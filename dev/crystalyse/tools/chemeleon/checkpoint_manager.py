@@ -6,15 +6,22 @@ This replaces the buggy upstream download_util to provide:
 - Zero-configuration setup (auto-download on first use)
 - Standard cache location (~/.cache/crystalyse/chemeleon_checkpoints/)
 - Support for custom checkpoint directories via environment variable
-- Clean error handling and progress reporting
+- Resumable, verified, concurrency-safe downloads via tools/fetcher.py
+- Extraction of only the checkpoints a task needs, verified before it is cached
 """
 
 import logging
-import tarfile
 from pathlib import Path
 
-import requests
-from tqdm import tqdm
+from ..fetcher import (
+    Artifact,
+    extract_members,
+    fetch,
+    file_lock,
+    get_mirror,
+    recorded_sha256,
+    verify_artifact,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,81 +37,60 @@ CHECKPOINT_FILENAMES = {
     "dng": "chemeleon_dng_alex_mp_20_v0.0.2.ckpt",  # De Novo Generation
 }
 
-
-def _download_file(url: str, filepath: Path) -> None:
+# Figshare publishes no checksum for the archive, so its SHA256 is pinned on first
+# download (see fetcher.verify_artifact) and re-checked while every extraction reads it.
+# Each extracted checkpoint's SHA256 is recorded next to it the same way.
+CHECKPOINT_ARCHIVE = Artifact(
+    url=FIGSHARE_URL,
+    filename="checkpoints.tar.gz",
+    description="Chemeleon checkpoints (523 MB)",
+)
+
+
+# Checkpoints already hashed in this process, by (size, mtime), so repeated lookups
+# do not re-read hundreds of megabytes
+_verified: dict[Path, tuple[int, int]] = {}
+
+
+def _verified_checkpoint(path: Path) -> bool:
+    """Check a checkpoint against the SHA256 recorded when it was extracted."""
+    if not path.exists():
+        return False
+    stat = path.stat()
+    if _verified.get(path) == (stat.st_size, stat.st_mtime_ns):
+        return True
+    if not verify_artifact(path, Artifact(url=FIGSHARE_URL, filename=path.name)):
+        return False
+    _verified[path] = (stat.st_size, stat.st_mtime_ns)
+    return True
+
+
+def _mirrored_checkpoint(filename: str) -> Path | None:
+    """Return a checkpoint file from the local artifact mirror, if present."""
+    mirror = get_mirror()
+    if not mirror or mirror.startswith(("http://", "https://")):
+        return None
+    path = Path(mirror) / filename
+    return path if _verified_checkpoint(path) else None
+
+
+def ensure_checkpoints_downloaded(
+    cache_dir: Path = DEFAULT_CACHE_DIR, tasks: list[str] | None = None
+) -> dict[str, Path]:
     """
-    Download a file from URL with progress bar.
-
-    Args:
-        url: URL to download from
-        filepath: Local path to save file
-
-    Raises:
-        requests.HTTPError: If download fails
-    """
-    logger.info(f"Downloading checkpoint from {url}")
-
-    try:
-        response = requests.get(url, stream=True, timeout=60)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        raise RuntimeError(f"Failed to download checkpoint: {e}") from e
-
-    total_size = int(response.headers.get("content-length", 0))
-
-    with (
-        open(filepath, "wb") as f,
-        tqdm(
-            desc=f"Downloading {filepath.name}",
-            total=total_size,
-            unit="B",
-            unit_scale=True,
-            unit_divisor=1024,
-        ) as pbar,
-    ):
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
-                f.write(chunk)
-                pbar.update(len(chunk))
-
-    logger.info(f"Download complete: {filepath}")
-
-
-def _extract_tar_gz(filepath: Path, extract_to: Path) -> None:
-    """
-    Extract tar.gz file to specified directory.
-
-    Args:
-        filepath: Path to tar.gz file
-        extract_to: Directory to extract to
-
-    Raises:
-        tarfile.TarError: If extraction fails
-    """
-    logger.info(f"Extracting {filepath} to {extract_to}")
-
-    try:
-        with tarfile.open(filepath, "r:gz") as tar:
-            tar.extractall(path=extract_to)
-    except tarfile.TarError as e:
-        raise RuntimeError(f"Failed to extract checkpoint archive: {e}") from e
-
-    logger.info("Extraction complete")
-
-
-def ensure_checkpoints_downloaded(cache_dir: Path = DEFAULT_CACHE_DIR) -> dict[str, Path]:
-    """
-    Ensure all checkpoints are downloaded to cache directory.
+    Ensure checkpoints are available in the cache directory.
 
     This function:
-    1. Checks if checkpoints already exist in cache
-    2. If not, downloads the checkpoint archive from Figshare
-    3. Extracts checkpoints to cache directory
-    4. Cleans up the archive file
+    1. Checks if the requested checkpoints already exist in cache (or the local mirror)
+    2. If not, fetches the checkpoint archive (resumable, verified, locked)
+    3. Streams through the archive extracting only the missing checkpoints, checking
+       the archive's hash before any of them replaces a cached file
+    4. Removes the archive once every checkpoint has been extracted
     5. Returns dict mapping task names to checkpoint paths
 
     Args:
         cache_dir: Directory to store checkpoints (default: ~/.cache/crystalyse/chemeleon_checkpoints/)
+        tasks: Tasks whose checkpoints are needed (default: all)
 
     Returns:
         Dict mapping task ("csp", "dng") to checkpoint file paths
@@ -112,51 +98,60 @@ def ensure_checkpoints_downloaded(cache_dir: Path = DEFAULT_CACHE_DIR) -> dict[s
     Raises:
         RuntimeError: If download or extraction fails
     """
+    tasks = tasks or list(CHECKPOINT_FILENAMES)
+    cache_dir = Path(cache_dir)
     cache_dir.mkdir(parents=True, exist_ok=True)
 
-    # Build expected checkpoint paths
-    checkpoint_paths = {
-        task: cache_dir / filename for task, filename in CHECKPOINT_FILENAMES.items()
-    }
-
-    # Check if all checkpoints already exist
-    if all(path.exists() and path.stat().st_size > 0 for path in checkpoint_paths.values()):
-        logger.info(f"Checkpoints found in cache: {cache_dir}")
+    def available(task: str) -> Path | None:
+        path = cache_dir / CHECKPOINT_FILENAMES[task]
+        if _verified_checkpoint(path):
+            return path
+        if path.exists():
+            logger.warning(f"Cached checkpoint failed verification, extracting again: {path}")
+        return _mirrored_checkpoint(CHECKPOINT_FILENAMES[task])
+
+    checkpoint_paths = {task: available(task) for task in tasks}
+    if all(checkpoint_paths.values()):
+        logger.info(f"Checkpoints found: {sorted(tasks)}")
         return checkpoint_paths
 
-    # Need to download
-    logger.info(f"Checkpoints not found in {cache_dir}")
-    logger.info("Downloading checkpoint archive from Figshare (523 MB, one-time download)...")
+    with file_lock(cache_dir / "checkpoints"):
+        # Another process may have extracted them while we waited for the lock
+        checkpoint_paths = {task: available(task) for task in tasks}
+        missing = [task for task, path in checkpoint_paths.items() if path is None]
+        if not missing:
+            return checkpoint_paths
+
+        logger.info(f"Checkpoints {missing} not found in {cache_dir}")
+        logger.info("Fetching checkpoint archive from Figshare (523 MB, one-time download)...")
+
+        try:
+            archive = fetch(CHECKPOINT_ARCHIVE, cache_dir)
+            extracted = extract_members(
+                archive,
+                {
+                    CHECKPOINT_FILENAMES[task]: cache_dir / CHECKPOINT_FILENAMES[task]
+                    for task in missing
+                },
+                sha256=CHECKPOINT_ARCHIVE.sha256 or recorded_sha256(archive),
+            )
+        except Exception as e:
+            raise RuntimeError(f"Checkpoint download failed: {e}") from e
 
-    # Download tar.gz file
-    tar_file = cache_dir / "checkpoints.tar.gz"
-    try:
-        _download_file(FIGSHARE_URL, tar_file)
+        for task in missing:
+            checkpoint_paths[task] = extracted[CHECKPOINT_FILENAMES[task]]
 
-        # Extract to cache directory
-        logger.info("Extracting checkpoint files...")
-        _extract_tar_gz(
-            tar_file, cache_dir.parent
-        )  # Extracts to parent, creates ckpts/ or chemeleon_checkpoints/
+        # Keep the archive until every checkpoint is extracted, so a later request
+        # for the other task does not download it again
+        in_cache_dir = archive.parent == cache_dir
+        if in_cache_dir and all(
+            (cache_dir / filename).exists() for filename in CHECKPOINT_FILENAMES.values()
+        ):
+            archive.unlink(missing_ok=True)
+            archive.with_name(archive.name + ".sha256").unlink(missing_ok=True)
 
-        # Clean up tar file
-        tar_file.unlink()
         logger.info(f"Checkpoint setup complete: {cache_dir}")
 
-    except Exception as e:
-        # Clean up partial downloads
-        if tar_file.exists():
-            tar_file.unlink()
-        raise RuntimeError(f"Checkpoint download failed: {e}") from e
-
-    # Verify all checkpoints exist after extraction
-    for task, path in checkpoint_paths.items():
-        if not path.exists():
-            raise RuntimeError(
-                f"Checkpoint {task} not found after extraction: {path}\n"
-                f"This may indicate a corrupted download. Try removing {cache_dir} and retrying."
-            )
-
     return checkpoint_paths
 
 
@@ -207,7 +202,7 @@ def get_checkpoint_path(task: str, custom_dir: str | None = None) -> Path:
         return custom_path
 
     # Use standard cache location with auto-download
-    checkpoints = ensure_checkpoints_downloaded()
+    checkpoints = ensure_checkpoints_downloaded(tasks=[task])
     checkpoint_path = checkpoints[task]
     logger.info(f"Using cached checkpoint: {checkpoint_path}")
     return checkpoint_path
@@ -1,40 +1,33 @@
 """Chemeleon crystal structure prediction using direct API (no file I/O)."""
 
+import asyncio
 import logging
 import os
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import contextmanager, suppress
 
 import ase
+import numpy as np
 import torch
-from pydantic import BaseModel, Field
+
+from ..budget import Budget, BudgetExceeded, run_in_thread
+from ..models import CrystalStructure, DeNovoGenerationResult, GenerationBatch, PredictionResult
+from ..weights_cache import decode_config_value, encode_config_value, get_weights_cache
+from .sample_cache import SampleCache, checkpoint_fingerprint, schedule_signature
 
 logger = logging.getLogger(__name__)
 
-# Global model cache
+# Global model cache (the lock makes concurrent first calls share one load)
 _model_cache = {}
+_model_cache_lock = threading.Lock()
 
+# Sampling seeds the global torch RNG and patches in budget checks, so runs take turns
+_sampling_lock = threading.Lock()
 
-class CrystalStructure(BaseModel):
-    """Predicted crystal structure."""
-
-    formula: str
-    cell: list[list[float]]
-    positions: list[list[float]]
-    numbers: list[int]
-    symbols: list[str]
-    volume: float
-    confidence: float = Field(ge=0.0, le=1.0, default=1.0)
-
-
-class PredictionResult(BaseModel):
-    """Structure prediction result."""
-
-    success: bool
-    formula: str
-    predicted_structures: list[CrystalStructure] = Field(default_factory=list)
-    computation_time: float | None = None
-    method: str = "chemeleon"
-    checkpoint_used: str = ""
-    error: str | None = None
+# Shared on-disk cache for seeded samples (created on first use)
+_sample_cache: SampleCache | None = None
 
 
 def _get_device(prefer_gpu: bool = True):
@@ -50,33 +43,101 @@ def _get_device(prefer_gpu: bool = True):
     return "cpu"
 
 
-def _load_model(task: str = "csp", checkpoint_path: str | None = None, prefer_gpu: bool = True):
-    """Load or retrieve cached Chemeleon model."""
-    from chemeleon_dng.diffusion.diffusion_module import DiffusionModule
-    from chemeleon_dng.script_util import create_diffusion_module
-
-    from .checkpoint_manager import get_checkpoint_path as get_managed_checkpoint_path
+def get_sample_cache() -> SampleCache:
+    """Return the process-wide seeded sample cache."""
+    global _sample_cache
+    if _sample_cache is None:
+        _sample_cache = SampleCache()
+    return _sample_cache
 
-    cache_key = f"{task}_{checkpoint_path or 'default'}"
 
-    if cache_key in _model_cache:
-        logger.info(f"Using cached model for {cache_key}")
-        return _model_cache[cache_key]
+def _resolve_checkpoint_path(task: str, checkpoint_path: str | None = None) -> str:
+    """Resolve the checkpoint file for a task, downloading it if necessary."""
+    from .checkpoint_manager import get_checkpoint_path as get_managed_checkpoint_path
 
-    logger.info(f"Loading new model for {cache_key}")
+    if checkpoint_path is not None:
+        return checkpoint_path
 
-    # Get checkpoint path using our checkpoint manager
-    # This handles auto-download to ~/.cache/crystalyse/chemeleon_checkpoints/
+    # Handles auto-download to ~/.cache/crystalyse/chemeleon_checkpoints/
     # or uses custom directory from CHEMELEON_CHECKPOINT_DIR environment variable
-    if checkpoint_path is None:
-        # Check for custom checkpoint directory (optional)
-        custom_dir = os.getenv("CHEMELEON_CHECKPOINT_DIR")
-        checkpoint_path = str(get_managed_checkpoint_path(task=task, custom_dir=custom_dir))
+    custom_dir = os.getenv("CHEMELEON_CHECKPOINT_DIR")
+    return str(get_managed_checkpoint_path(task=task, custom_dir=custom_dir))
+
+
+# Diffusion schedule objects held by DiffusionModule (plain objects, not nn.Modules)
+_SCHEDULE_ATTRS = ("diffusion_atom_type", "diffusion_lattice", "diffusion_frac_coord")
+
+
+def _chemeleon_weights(diffusion_module) -> tuple[dict, dict]:
+    """Split a loaded DiffusionModule into tensors and a JSON-compatible rebuild config."""
+    tensors = {f"state_dict.{k}": v for k, v in diffusion_module.state_dict().items()}
+
+    schedules = {}
+    for attr in _SCHEDULE_ATTRS:
+        schedule = getattr(diffusion_module, attr)
+        if schedule is None:
+            schedules[attr] = None
+            continue
+        attributes = {}
+        for name, value in vars(schedule).items():
+            if isinstance(value, torch.Tensor):
+                tensors[f"{attr}.{name}"] = value
+            else:
+                attributes[name] = value
+        schedules[attr] = {
+            "class": encode_config_value(type(schedule)),
+            "attributes": encode_config_value(attributes),
+        }
+
+    hparams = diffusion_module.hparams
+    task = hparams["task"]
+    config = {
+        "task": task.name if hasattr(task, "name") else str(task).upper(),
+        "num_timesteps": int(diffusion_module.num_timesteps),
+        "model_configs": encode_config_value(dict(hparams["model_configs"])),
+        "optimizer_configs": encode_config_value(dict(hparams["optimizer_configs"])),
+        "schedules": schedules,
+    }
+    return tensors, config
+
+
+def _build_chemeleon_module(tensors: dict, config: dict):
+    """Rebuild a DiffusionModule from converted weights, keeping tensors memory-mapped."""
+    from chemeleon_dng.diffusion.diffusion_module import DiffusionModule, DiffusionModuleTask
+
+    schedules = {}
+    for attr in _SCHEDULE_ATTRS:
+        spec = config["schedules"].get(attr)
+        if spec is None:
+            schedules[attr] = None
+            continue
+        schedule_cls = decode_config_value(spec["class"])
+        schedule = schedule_cls.__new__(schedule_cls)
+        schedule.__dict__.update(decode_config_value(spec["attributes"]))
+        prefix = f"{attr}."
+        schedule.__dict__.update(
+            {k.removeprefix(prefix): v for k, v in tensors.items() if k.startswith(prefix)}
+        )
+        schedules[attr] = schedule
+
+    diffusion_module = DiffusionModule(
+        task=DiffusionModuleTask[config["task"]],
+        num_timesteps=config["num_timesteps"],
+        model_configs=decode_config_value(config["model_configs"]),
+        optimizer_configs=decode_config_value(config["optimizer_configs"]),
+        **schedules,
+    )
+    state_dict = {
+        k.removeprefix("state_dict."): v for k, v in tensors.items() if k.startswith("state_dict.")
+    }
+    diffusion_module.load_state_dict(state_dict, strict=True, assign=True)
+    return diffusion_module
 
-    # Load model
-    device = _get_device(prefer_gpu=prefer_gpu)
-    logger.info(f"Loading checkpoint: {checkpoint_path}")
-    logger.info(f"Loading model on device: {device}")
+
+def _load_from_checkpoint(checkpoint_path: str, device: str):
+    """Load a DiffusionModule from its original Lightning checkpoint."""
+    from chemeleon_dng.diffusion.diffusion_module import DiffusionModule
+    from chemeleon_dng.script_util import create_diffusion_module
 
     # Handle version compatibility for DiffusionModule
     try:
@@ -126,18 +187,78 @@ def _load_model(task: str = "csp", checkpoint_path: str | None = None, prefer_gp
         else:
             raise e
 
-    diffusion_module.eval()
+    return diffusion_module
 
-    # Log actual device for verification (helps debug HPC GPU issues)
-    try:
-        actual_device = next(diffusion_module.parameters()).device
-        logger.info(f"Model verified on device: {actual_device}")
-    except StopIteration:
-        logger.warning("Could not verify model device (no parameters found)")
 
-    _model_cache[cache_key] = diffusion_module
+def _load_model(task: str = "csp", checkpoint_path: str | None = None, prefer_gpu: bool = True):
+    """Load or retrieve cached Chemeleon model.
 
-    return diffusion_module
+    The first load of a checkpoint also writes a memory-mappable copy of its weights
+    (see ``tools/weights_cache.py``); later process starts rebuild the module from that
+    copy and fall back to the original checkpoint if it is missing or fails verification.
+    """
+    cache_key = f"{task}_{checkpoint_path or 'default'}"
+
+    if cache_key in _model_cache:
+        logger.info(f"Using cached model for {cache_key}")
+        return _model_cache[cache_key]
+
+    with _model_cache_lock:
+        if cache_key in _model_cache:
+            return _model_cache[cache_key]
+
+        logger.info(f"Loading new model for {cache_key}")
+
+        checkpoint_path = _resolve_checkpoint_path(task, checkpoint_path)
+
+        # Load model
+        device = _get_device(prefer_gpu=prefer_gpu)
+        logger.info(f"Loading checkpoint: {checkpoint_path}")
+        logger.info(f"Loading model on device: {device}")
+
+        weights_cache = get_weights_cache()
+        diffusion_module = None
+        converted = weights_cache.load(checkpoint_path, kind="chemeleon")
+        if converted is not None:
+            try:
+                diffusion_module = _build_chemeleon_module(*converted)
+                diffusion_module.to(device)
+                logger.info("Loaded Chemeleon weights from memory-mapped cache")
+            except Exception as e:
+                logger.warning(f"Converted weights unusable, loading original checkpoint: {e}")
+                diffusion_module = None
+
+        if diffusion_module is None:
+            diffusion_module = _load_from_checkpoint(checkpoint_path, device)
+            try:
+                weights_cache.save(
+                    checkpoint_path, "chemeleon", *_chemeleon_weights(diffusion_module)
+                )
+            except Exception as e:
+                logger.warning(f"Skipping weights conversion for {checkpoint_path}: {e}")
+
+        diffusion_module.eval()
+
+        # Log actual device for verification (helps debug HPC GPU issues)
+        try:
+            actual_device = next(diffusion_module.parameters()).device
+            logger.info(f"Model verified on device: {actual_device}")
+        except StopIteration:
+            logger.warning("Could not verify model device (no parameters found)")
+
+        _model_cache[cache_key] = diffusion_module
+
+        return diffusion_module
+
+
+def _sampling_device(task: str, checkpoint_path: str | None, prefer_gpu: bool) -> str:
+    """Device type a model samples on: where it is loaded, else where it would load."""
+    model = _model_cache.get(f"{task}_{checkpoint_path or 'default'}")
+    if model is not None:
+        parameter = next(model.parameters(), None)
+        if parameter is not None:
+            return parameter.device.type
+    return _get_device(prefer_gpu=prefer_gpu)
 
 
 def _atoms_to_structure_dict(atoms: ase.Atoms, formula: str) -> CrystalStructure:
@@ -152,15 +273,132 @@ def _atoms_to_structure_dict(atoms: ase.Atoms, formula: str) -> CrystalStructure
     )
 
 
+def _cached_sample_to_structure(sample: dict, formula: str) -> CrystalStructure:
+    """Convert an entry from the sample cache to a CrystalStructure model."""
+    from ase.data import chemical_symbols
+
+    numbers = [int(n) for n in sample["numbers"]]
+    cell = np.asarray(sample["cell"], dtype=float)
+    return CrystalStructure(
+        formula=formula,
+        cell=cell.tolist(),
+        positions=np.asarray(sample["positions"], dtype=float).tolist(),
+        numbers=numbers,
+        symbols=[chemical_symbols[n] for n in numbers],
+        volume=float(abs(np.linalg.det(cell))),
+    )
+
+
+@contextmanager
+def _checkpoints(model, budget: Budget | None):
+    """Check the budget before every denoising step of ``model.sample``."""
+    if budget is None:
+        yield
+        return
+    # A run that cannot finish within the step budget is refused before it starts
+    if budget.max_steps is not None and budget.steps + model.num_timesteps > budget.max_steps:
+        raise budget.stop("steps")
+    p_sample = model.p_sample
+
+    def checked_p_sample(*args, **kwargs):
+        budget.checkpoint()
+        return p_sample(*args, **kwargs)
+
+    model.p_sample = checked_p_sample
+    try:
+        yield
+    finally:
+        del model.p_sample
+
+
+def _seeded_sample(
+    model, seed: int | None, budget: Budget | None = None, **sample_kwargs
+) -> list[ase.Atoms]:
+    """
+    Run ``model.sample`` under a fixed seed without disturbing the global RNG state.
+
+    With a budget, each denoising step is a checkpoint, so sampling stops with
+    ``BudgetExceeded`` when the time runs out or the call is cancelled.
+    """
+    with _sampling_lock, _checkpoints(model, budget):
+        if seed is None:
+            return model.sample(**sample_kwargs)
+
+        devices = [torch.cuda.current_device()] if torch.cuda.is_available() else []
+        with torch.random.fork_rng(devices=devices):
+            torch.manual_seed(seed)
+            return model.sample(**sample_kwargs)
+
+
+# Both released DNG checkpoints were trained on MP-20 style data (<= 20 atoms per cell)
+DNG_MAX_TRAINING_ATOMS = 20
+
+
+def _sample_num_atoms(
+    batch_size: int, max_atoms: int | None, rng: np.random.Generator
+) -> list[int]:
+    """Draw per-sample atom counts for a DNG batch.
+
+    Uses the training-set atom count distribution shipped with chemeleon-dng when it is
+    available, otherwise falls back to a uniform draw. Counts above ``max_atoms`` are
+    never proposed, so the max-atoms filter rarely has to reject a sample.
+    """
+    upper = min(max_atoms or DNG_MAX_TRAINING_ATOMS, DNG_MAX_TRAINING_ATOMS)
+
+    try:
+        from chemeleon_dng.dataset.num_atom_distributions import NUM_ATOM_DISTRIBUTIONS
+
+        key = next((k for k in NUM_ATOM_DISTRIBUTIONS if "alex" in k), None)
+        distribution = NUM_ATOM_DISTRIBUTIONS[key or next(iter(NUM_ATOM_DISTRIBUTIONS))]
+        counts = np.array([n for n in distribution if 0 < n <= upper], dtype=int)
+        weights = np.array([distribution[n] for n in counts], dtype=float)
+        if counts.size and weights.sum() > 0:
+            return rng.choice(counts, size=batch_size, p=weights / weights.sum()).tolist()
+    except (ImportError, KeyError, StopIteration, TypeError, ValueError):
+        pass
+
+    return rng.integers(1, upper + 1, size=batch_size).tolist()
+
+
+def _passes_filters(
+    atoms: ase.Atoms, allowed_elements: set[str] | None, max_atoms: int | None
+) -> bool:
+    """Check a generated structure against the element and size filters."""
+    if max_atoms is not None and len(atoms) > max_atoms:
+        return False
+    if allowed_elements is not None:
+        return set(atoms.get_chemical_symbols()) <= allowed_elements
+    return True
+
+
 class ChemeleonPredictor:
     """Chemeleon structure prediction without MCP."""
 
-    def __init__(self, checkpoint_dir: str | None = None):
+    def __init__(self, checkpoint_dir: str | None = None, sample_cache: SampleCache | None = None):
         # Use environment variables for checkpoint paths
         # Default to None to let chemeleon-dng auto-download
         if checkpoint_dir is None:
             checkpoint_dir = os.getenv("CHEMELEON_CHECKPOINT_DIR")
         self.checkpoint_dir = checkpoint_dir
+        self.sample_cache = sample_cache or get_sample_cache()
+
+    def _sample_cache_key(
+        self,
+        formula: str,
+        num_samples: int,
+        seed: int,
+        checkpoint_path: str | None,
+        prefer_gpu: bool,
+    ) -> str:
+        """Build the sample cache key, loading the model only if its schedule is unknown."""
+        checkpoint_hash = checkpoint_fingerprint(_resolve_checkpoint_path("csp", checkpoint_path))
+        schedule = self.sample_cache.get_schedule(checkpoint_hash)
+        if schedule is None:
+            model = _load_model(task="csp", checkpoint_path=checkpoint_path, prefer_gpu=prefer_gpu)
+            schedule = schedule_signature(model)
+            self.sample_cache.set_schedule(checkpoint_hash, schedule)
+        device = _sampling_device("csp", checkpoint_path, prefer_gpu)
+        return SampleCache.make_key(formula, num_samples, seed, checkpoint_hash, schedule, device)
 
     async def predict_structure(
         self,
@@ -168,6 +406,8 @@ class ChemeleonPredictor:
         num_samples: int = 1,
         checkpoint_path: str | None = None,
         prefer_gpu: bool = True,
+        seed: int | None = None,
+        budget: Budget | None = None,
     ) -> PredictionResult:
         """
         Predict crystal structure for a formula using direct API (no disk I/O).
@@ -175,28 +415,54 @@ class ChemeleonPredictor:
         This method uses the direct DiffusionModule API for in-memory structure generation,
         avoiding temporary file I/O overhead and providing better error handling.
 
+        Seeded requests are reproducible and cached on disk, keyed by composition,
+        num_samples, seed, checkpoint hash, sampling schedule and device, so repeating
+        one returns the stored structures without running the diffusion model.
+
         Args:
             formula: Chemical formula (e.g., "TiO2", "GeSn")
             num_samples: Number of structures to generate
             checkpoint_path: Optional path to specific checkpoint file
             prefer_gpu: Use GPU if available
+            seed: Random seed for reproducible sampling (None = unseeded, not cached)
+            budget: Time and denoising-step budget; sampling runs in a worker thread
+                and stops at the next step once it is spent or cancelled
 
         Returns:
             PredictionResult with structures or error information
         """
-        import time
-
         from pymatgen.core import Composition
 
         start_time = time.time()
 
         try:
-            # Load model (uses caching via _load_model)
-            model = _load_model(task="csp", checkpoint_path=checkpoint_path, prefer_gpu=prefer_gpu)
-
             # Parse formula to get atomic composition
             comp = Composition(formula)
 
+            cache_key = None
+            if seed is not None:
+                cache_key = self._sample_cache_key(
+                    comp.formula, num_samples, seed, checkpoint_path, prefer_gpu
+                )
+                cached = self.sample_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Serving {formula} (seed={seed}) from sample cache")
+                    return PredictionResult(
+                        success=True,
+                        formula=formula,
+                        predicted_structures=[
+                            _cached_sample_to_structure(sample, formula) for sample in cached
+                        ],
+                        computation_time=time.time() - start_time,
+                        method="chemeleon-dng",
+                        checkpoint_used=checkpoint_path or "default",
+                        seed=seed,
+                        from_cache=True,
+                    )
+
+            # Load model (uses caching via _load_model)
+            model = _load_model(task="csp", checkpoint_path=checkpoint_path, prefer_gpu=prefer_gpu)
+
             # Prepare batched input for all samples
             # Chemeleon expects: atom_types (flat list of atomic numbers for all samples)
             #                    num_atoms (list of atom counts per sample)
@@ -210,10 +476,26 @@ class ChemeleonPredictor:
 
             # Generate structures using direct API (in-memory, no disk I/O)
             logger.info(f"Generating {num_samples} structure(s) for {formula} using Chemeleon CSP")
-            samples = model.sample(
-                task="csp", atom_types=batch_atom_types, num_atoms=batch_num_atoms
+            samples = await run_in_thread(
+                budget,
+                _seeded_sample,
+                model,
+                seed,
+                budget,
+                task="csp",
+                atom_types=batch_atom_types,
+                num_atoms=batch_num_atoms,
             )
 
+            if cache_key is not None:
+                self.sample_cache.put(
+                    cache_key,
+                    [
+                        {"numbers": a.numbers, "positions": a.positions, "cell": a.cell.array}
+                        for a in samples
+                    ],
+                )
+
             # Convert ASE Atoms objects to CrystalStructure models
             structures = [_atoms_to_structure_dict(atoms, formula) for atoms in samples]
 
@@ -227,6 +509,17 @@ class ChemeleonPredictor:
                 computation_time=computation_time,
                 method="chemeleon-dng",
                 checkpoint_used=checkpoint_path or "default",
+                seed=seed,
+            )
+
+        except BudgetExceeded as e:
+            logger.info(f"Structure prediction for {formula} stopped: {e}")
+            return PredictionResult(
+                success=False,
+                formula=formula,
+                computation_time=time.time() - start_time,
+                stopped=e.reason,
+                error=str(e),
             )
 
         except Exception as e:
@@ -245,18 +538,176 @@ class ChemeleonPredictor:
 
             return PredictionResult(success=False, formula=formula, error=error_msg)
 
+    async def generate_de_novo(
+        self,
+        num_samples: int = 10,
+        batch_size: int = 5,
+        allowed_elements: list[str] | None = None,
+        max_atoms: int | None = None,
+        checkpoint_path: str | None = None,
+        prefer_gpu: bool = True,
+        budget: Budget | None = None,
+    ) -> AsyncIterator[GenerationBatch]:
+        """
+        Sample novel compositions and structures with the Chemeleon DNG model.
+
+        Batches are sampled in a worker thread and yielded as soon as each one finishes.
+        Sampling of the next batch starts before the current one is yielded, so callers
+        can validate or run MACE on a batch while the next is still denoising. Element
+        and size filters are applied before yielding. Closing the stream early cancels
+        the batch sampled ahead, and with it ``budget``.
+
+        Args:
+            num_samples: Total number of structures to sample
+            batch_size: Number of structures denoised together per batch
+            allowed_elements: Only keep structures made exclusively of these elements
+            max_atoms: Only keep structures with at most this many atoms per cell
+            checkpoint_path: Optional path to specific DNG checkpoint file
+            prefer_gpu: Use GPU if available
+            budget: Time and denoising-step budget shared by all batches; when it runs
+                out the stream ends with a batch that has ``stopped`` set
+
+        Yields:
+            GenerationBatch for every sampled batch; a batch with ``error`` set ends the stream
+        """
+        if num_samples < 1 or batch_size < 1:
+            yield GenerationBatch(
+                batch_index=0, error="num_samples and batch_size must both be at least 1"
+            )
+            return
+
+        allowed = {el.strip() for el in allowed_elements} if allowed_elements else None
+        checkpoint_used = checkpoint_path or "default"
+        rng = np.random.default_rng()
+
+        try:
+            model = await asyncio.to_thread(
+                _load_model, task="dng", checkpoint_path=checkpoint_path, prefer_gpu=prefer_gpu
+            )
+        except Exception as e:
+            logger.error(f"Failed to load Chemeleon DNG model: {e}", exc_info=True)
+            yield GenerationBatch(
+                batch_index=0,
+                checkpoint_used=checkpoint_used,
+                error=f"Checkpoint loading failed: {e}",
+            )
+            return
+
+        sizes = [min(batch_size, num_samples - n) for n in range(0, num_samples, batch_size)]
+
+        async def sample(batch_index: int) -> tuple[list[ase.Atoms], float]:
+            start_time = time.time()
+            num_atoms = _sample_num_atoms(sizes[batch_index], max_atoms, rng)
+            logger.info(
+                f"Sampling DNG batch {batch_index} ({sizes[batch_index]} structures, "
+                f"{sum(sizes[batch_index:])} remaining)"
+            )
+            samples = await run_in_thread(
+                budget, _seeded_sample, model, None, budget, task="dng", num_atoms=num_atoms
+            )
+            return samples, time.time() - start_time
+
+        pending = asyncio.ensure_future(sample(0))
+        try:
+            for batch_index in range(len(sizes)):
+                try:
+                    samples, elapsed = await pending
+                except BudgetExceeded as e:
+                    logger.info(f"DNG sampling stopped before batch {batch_index} finished: {e}")
+                    yield GenerationBatch(
+                        batch_index=batch_index,
+                        checkpoint_used=checkpoint_used,
+                        stopped=e.reason,
+                        error=str(e),
+                    )
+                    return
+                except Exception as e:
+                    logger.error(f"DNG sampling failed on batch {batch_index}: {e}", exc_info=True)
+                    yield GenerationBatch(
+                        batch_index=batch_index, checkpoint_used=checkpoint_used, error=str(e)
+                    )
+                    return
+
+                # Denoise the next batch while the caller works on this one
+                if batch_index + 1 < len(sizes):
+                    pending = asyncio.ensure_future(sample(batch_index + 1))
+
+                filter_start = time.time()
+                kept = [atoms for atoms in samples if _passes_filters(atoms, allowed, max_atoms)]
+                structures = [
+                    _atoms_to_structure_dict(atoms, atoms.get_chemical_formula(empirical=True))
+                    for atoms in kept
+                ]
+
+                yield GenerationBatch(
+                    batch_index=batch_index,
+                    structures=structures,
+                    num_sampled=len(samples),
+                    num_rejected=len(samples) - len(kept),
+                    computation_time=elapsed + time.time() - filter_start,
+                    checkpoint_used=checkpoint_used,
+                )
+        finally:
+            if not pending.done():
+                pending.cancel()
+                with suppress(asyncio.CancelledError, BudgetExceeded):
+                    await pending
+
+    async def generate_de_novo_collected(
+        self,
+        num_samples: int = 10,
+        batch_size: int = 5,
+        allowed_elements: list[str] | None = None,
+        max_atoms: int | None = None,
+        checkpoint_path: str | None = None,
+        prefer_gpu: bool = True,
+        budget: Budget | None = None,
+    ) -> DeNovoGenerationResult:
+        """
+        Run ``generate_de_novo`` to completion and aggregate every batch.
+
+        If the budget runs out, the batches finished so far are returned with
+        ``stopped`` set.
+        """
+        start_time = time.time()
+        result = DeNovoGenerationResult(
+            success=True, allowed_elements=allowed_elements, max_atoms=max_atoms
+        )
+
+        async for batch in self.generate_de_novo(
+            num_samples=num_samples,
+            batch_size=batch_size,
+            allowed_elements=allowed_elements,
+            max_atoms=max_atoms,
+            checkpoint_path=checkpoint_path,
+            prefer_gpu=prefer_gpu,
+            budget=budget,
+        ):
+            result.checkpoint_used = batch.checkpoint_used
+            if batch.error:
+                result.error = batch.error
+                result.stopped = batch.stopped
+                result.success = bool(result.predicted_structures)
+                break
+            result.predicted_structures.extend(batch.structures)
+            result.num_batches += 1
+            result.num_sampled += batch.num_sampled
+            result.num_rejected += batch.num_rejected
+
+        result.computation_time = time.time() - start_time
+        return result
+
     def predict_structure_sync(
         self,
         formula: str,
         num_samples: int = 1,
         checkpoint_path: str | None = None,
         prefer_gpu: bool = True,
+        seed: int | None = None,
     ) -> PredictionResult:
         """Synchronous version of predict_structure."""
-        import asyncio
-
         return asyncio.run(
-            self.predict_structure(formula, num_samples, checkpoint_path, prefer_gpu)
+            self.predict_structure(formula, num_samples, checkpoint_path, prefer_gpu, seed)
         )
 
     def clear_cache(self):
@@ -0,0 +1,266 @@
+"""
+On-disk cache for seeded Chemeleon samples.
+
+A seeded CSP request is fully determined by the composition, the number of samples,
+the seed, the checkpoint weights, the sampling schedule and the device it runs on
+(CPU and GPU kernels, and their random streams, give different structures for the
+same seed). Caching on exactly that key lets repeated agent turns reuse earlier diffusion runs instead of paying for
+them again, and makes the returned structures reproducible across processes.
+
+Samples are stored as compressed ``.npz`` arrays (atomic numbers, positions, cells)
+under ``~/.cache/crystalyse/chemeleon_samples/`` or ``CRYSTALYSE_SAMPLE_CACHE_DIR``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..weights_cache import file_sha256
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_CACHE_DIR = Path.home() / ".cache" / "crystalyse" / "chemeleon_samples"
+DEFAULT_MAX_CACHE_MB = 512
+
+# Bump when the on-disk layout changes so stale entries are never read back
+CACHE_FORMAT_VERSION = 1
+
+# Hyperparameters that define the reverse-diffusion schedule of a checkpoint
+SCHEDULE_HPARAMS = (
+    "num_timesteps",
+    "beta_schedule_ddpm",
+    "beta_schedule_d3pm",
+    "sigma_begin",
+    "sigma_end",
+    "d3pm_hybrid_coeff",
+)
+
+
+def checkpoint_fingerprint(checkpoint_path: str | Path) -> str:
+    """
+    Return the SHA256 of a checkpoint file, memoised per process.
+
+    Args:
+        checkpoint_path: Path to the checkpoint file
+
+    Returns:
+        Hex digest of the file contents
+    """
+    return file_sha256(checkpoint_path)
+
+
+def schedule_signature(model: Any, step_lr: float | None = None) -> str:
+    """
+    Describe the sampling schedule of a loaded diffusion module.
+
+    Args:
+        model: Loaded Chemeleon DiffusionModule
+        step_lr: Step size passed to ``model.sample`` (None = model default)
+
+    Returns:
+        Stable string identifying the schedule
+    """
+    hparams = getattr(model, "hparams", None) or {}
+    parts = {}
+    for name in SCHEDULE_HPARAMS:
+        value = hparams.get(name, getattr(model, name, None))
+        if value is not None:
+            parts[name] = getattr(value, "name", value)
+    parts["step_lr"] = step_lr
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+class SampleCache:
+    """Content-keyed, size-bounded on-disk cache of sampled structures."""
+
+    def __init__(self, cache_dir: str | Path | None = None, max_size_mb: float | None = None):
+        if cache_dir is None:
+            cache_dir = os.getenv("CRYSTALYSE_SAMPLE_CACHE_DIR") or DEFAULT_SAMPLE_CACHE_DIR
+        if max_size_mb is None:
+            max_size_mb = float(
+                os.getenv("CRYSTALYSE_SAMPLE_CACHE_MAX_MB", str(DEFAULT_MAX_CACHE_MB))
+            )
+
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        formula: str, num_samples: int, seed: int, checkpoint_hash: str, schedule: str, device: str
+    ) -> str:
+        """Build the cache key for a seeded sampling request."""
+        payload = json.dumps(
+            {
+                "version": CACHE_FORMAT_VERSION,
+                "formula": formula,
+                "num_samples": num_samples,
+                "seed": seed,
+                "checkpoint": checkpoint_hash,
+                "schedule": schedule,
+                "device": device,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.npz"
+
+    def _schedule_path(self, checkpoint_hash: str) -> Path:
+        return self.cache_dir / "schedules" / f"{checkpoint_hash}.json"
+
+    def get_schedule(self, checkpoint_hash: str) -> str | None:
+        """Return the recorded schedule for a checkpoint, if one was seen before."""
+        path = self._schedule_path(checkpoint_hash)
+        try:
+            return path.read_text()
+        except OSError:
+            return None
+
+    def set_schedule(self, checkpoint_hash: str, schedule: str) -> None:
+        """Record a checkpoint's schedule so later processes can check the cache unloaded."""
+        path = self._schedule_path(checkpoint_hash)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(schedule)
+        except OSError as e:
+            logger.warning(f"Could not record sampling schedule: {e}")
+
+    def get(self, key: str) -> list[dict[str, Any]] | None:
+        """
+        Load cached samples.
+
+        Returns:
+            List of dicts with ``numbers``, ``positions`` and ``cell`` arrays, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            with np.load(path) as data:
+                numbers = data["numbers"]
+                positions = data["positions"]
+                cells = data["cells"]
+                offsets = np.concatenate([[0], np.cumsum(data["num_atoms"])])
+        except (OSError, KeyError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Touch the entry so size-based eviction drops the least recently used first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+
+        return [
+            {
+                "numbers": numbers[start:end],
+                "positions": positions[start:end],
+                "cell": cells[i],
+            }
+            for i, (start, end) in enumerate(zip(offsets[:-1], offsets[1:], strict=True))
+        ]
+
+    def put(self, key: str, samples: list[dict[str, Any]]) -> None:
+        """
+        Store samples under ``key``.
+
+        Args:
+            key: Key from ``make_key``
+            samples: Dicts with ``numbers``, ``positions`` and ``cell`` entries
+        """
+        if not samples:
+            return
+
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=path.parent, suffix=".npz.tmp", delete=False
+            ) as tmp_file:
+                np.savez_compressed(
+                    tmp_file,
+                    numbers=np.concatenate([np.asarray(s["numbers"]) for s in samples]).astype(
+                        np.uint8
+                    ),
+                    positions=np.concatenate(
+                        [np.asarray(s["positions"], dtype=np.float64) for s in samples]
+                    ),
+                    cells=np.stack([np.asarray(s["cell"], dtype=np.float64) for s in samples]),
+                    num_atoms=np.array([len(s["numbers"]) for s in samples], dtype=np.int32),
+                )
+            os.replace(tmp_file.name, path)
+        except OSError as e:
+            logger.warning(f"Could not write sample cache entry: {e}")
+            return
+
+        self._evict()
+
+    def _entries(self) -> list[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob("??/*.npz"))
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits its size budget."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> int:
+        """Remove all cached samples and return the number of entries deleted."""
+        removed = 0
+        for path in self._entries():
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        """Report hit rate and on-disk size."""
+        entries = self._entries()
+        size_bytes = 0
+        for path in entries:
+            try:
+                size_bytes += path.stat().st_size
+            except OSError:
+                pass
+
+        lookups = self.hits + self.misses
+        return {
+            "directory": str(self.cache_dir),
+            "entries": len(entries),
+            "size_mb": round(size_bytes / (1024 * 1024), 3),
+            "max_size_mb": round(self.max_size_bytes / (1024 * 1024), 3),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
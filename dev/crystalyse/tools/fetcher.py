@@ -0,0 +1,412 @@
+"""
+Shared fetcher for large downloaded artifacts (model checkpoints, datasets).
+
+Every artifact goes through the same path:
+
+- **Mirror / offline**: ``CRYSTALYSE_ARTIFACT_MIRROR`` points at a local directory
+  (or an ``http(s)://`` base URL) holding artifacts by filename; it is checked
+  before the original URL. With ``CRYSTALYSE_OFFLINE=1`` the network is never used.
+- **Resume**: bytes are written to ``<file>.part`` and an interrupted transfer
+  continues with an HTTP ``Range`` request. ``If-Range`` makes the server send the
+  whole file again if it changed upstream in the meantime.
+- **Verification**: the finished file is checked against its SHA256 (or MD5 for
+  artifacts that only publish one) before it is moved into place.
+- **Locking**: an exclusive file lock per artifact lets many processes on a shared
+  cluster call ``fetch`` at once; one downloads, the others wait and reuse it.
+- **Selective extraction**: ``extract_members`` streams through a tar archive and
+  writes only the requested members. Members land in ``<file>.tmp`` and are moved
+  into place only once the archive hash and each member's hash have been checked;
+  the member hash is recorded next to it (``<file>.sha256``) like a download's.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import tarfile
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+import requests
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+# Network reads are smaller: a chunk cut off by a dropped connection is lost
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Progress callback: (bytes_done, total_bytes or None)
+ProgressCallback = Callable[[int, int | None], None]
+
+
+class ArtifactUnavailableError(RuntimeError):
+    """Raised when an artifact cannot be found locally and may not be downloaded."""
+
+
+class ChecksumMismatchError(RuntimeError):
+    """Raised when a downloaded artifact does not match its published hash."""
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """A downloadable file and the hash it must match."""
+
+    url: str
+    filename: str
+    sha256: str | None = None
+    md5: str | None = None
+    description: str = ""
+
+
+def is_offline() -> bool:
+    """Return True if network downloads are disabled via ``CRYSTALYSE_OFFLINE``."""
+    return os.getenv("CRYSTALYSE_OFFLINE", "").lower() in ("1", "true", "yes", "on")
+
+
+def get_mirror() -> str | None:
+    """Return the configured artifact mirror (directory or base URL), if any."""
+    return os.getenv("CRYSTALYSE_ARTIFACT_MIRROR") or None
+
+
+def file_digest(path: Path, algorithm: str = "sha256") -> str:
+    """Compute the hex digest of a file."""
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_artifact(path: Path, artifact: Artifact) -> bool:
+    """
+    Check a file against the artifact's published hash.
+
+    Artifacts without a published hash are verified against the SHA256 recorded
+    next to the file when it was first downloaded (``<file>.sha256``).
+    """
+    if not path.exists():
+        return False
+    if artifact.sha256:
+        return file_digest(path, "sha256") == artifact.sha256
+    if artifact.md5:
+        return file_digest(path, "md5") == artifact.md5
+
+    recorded = recorded_sha256(path)
+    if recorded:
+        return file_digest(path, "sha256") == recorded
+    return path.stat().st_size > 0
+
+
+def recorded_sha256(path: Path) -> str | None:
+    """Return the SHA256 recorded next to a file when it was fetched or extracted."""
+    recorded = path.with_name(path.name + ".sha256")
+    return recorded.read_text().strip() if recorded.exists() else None
+
+
+@contextlib.contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on ``<path>.lock`` for the duration of the block."""
+    lock_path = path.with_name(path.name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(lock_path, "a") as lock_file:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _tqdm_progress(description: str) -> tuple[ProgressCallback, Callable[[], None]]:
+    """Build a tqdm-backed progress callback and its close function."""
+    from tqdm import tqdm
+
+    bar = tqdm(desc=description, unit="B", unit_scale=True, unit_divisor=1024)
+
+    def update(done: int, total: int | None) -> None:
+        if total and bar.total != total:
+            bar.total = total
+        bar.update(done - bar.n)
+
+    return update, bar.close
+
+
+def _download(
+    url: str,
+    part_path: Path,
+    progress: ProgressCallback | None,
+    timeout: float,
+    max_retries: int,
+) -> None:
+    """Download ``url`` into ``part_path``, resuming from whatever is already there."""
+    meta_path = part_path.with_name(part_path.name + ".json")
+
+    for attempt in range(1, max_retries + 1):
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        meta = {}
+        if offset and meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text())
+            except ValueError:
+                meta = {}
+
+        headers = {}
+        if offset and meta.get("url") == url:
+            headers["Range"] = f"bytes={offset}-"
+            validator = meta.get("etag") or meta.get("last_modified")
+            if validator:
+                headers["If-Range"] = validator
+            logger.info(f"Resuming download at {offset} bytes: {url}")
+
+        try:
+            with requests.get(url, stream=True, timeout=timeout, headers=headers) as response:
+                if response.status_code == 416:
+                    # Partial file is unusable for this range; start again
+                    part_path.unlink(missing_ok=True)
+                    raise OSError("Requested range not satisfiable")
+                response.raise_for_status()
+
+                if response.status_code == 206:
+                    mode = "ab"
+                    remaining = int(response.headers.get("content-length", 0))
+                    total = offset + remaining if remaining else None
+                else:
+                    # Server ignored the range (or the file changed): start over
+                    mode, offset = "wb", 0
+                    total = int(response.headers.get("content-length", 0)) or None
+
+                meta_path.write_text(
+                    json.dumps(
+                        {
+                            "url": url,
+                            "etag": response.headers.get("etag"),
+                            "last_modified": response.headers.get("last-modified"),
+                        }
+                    )
+                )
+
+                done = offset
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        if chunk:
+                            f.write(chunk)
+                            done += len(chunk)
+                            if progress:
+                                progress(done, total)
+
+            if total is not None and part_path.stat().st_size != total:
+                raise OSError(f"Incomplete download: {part_path.stat().st_size} of {total} bytes")
+            meta_path.unlink(missing_ok=True)
+            return
+
+        except (requests.RequestException, OSError) as e:
+            if attempt == max_retries:
+                raise RuntimeError(f"Download failed after {attempt} attempts: {e}") from e
+            wait = min(2**attempt, 30)
+            logger.warning(f"Download interrupted ({e}); retrying in {wait}s")
+            time.sleep(wait)
+
+
+def fetch(
+    artifact: Artifact,
+    dest_dir: Path,
+    force: bool = False,
+    progress: ProgressCallback | None = None,
+    timeout: float = 60.0,
+    max_retries: int = 5,
+) -> Path:
+    """
+    Return a verified local copy of an artifact, downloading it if needed.
+
+    Args:
+        artifact: What to fetch and the hash it must match
+        dest_dir: Cache directory for the downloaded file
+        force: Discard any existing copy and download again
+        progress: Optional callback receiving (bytes_done, total_bytes)
+        timeout: Per-request timeout in seconds
+        max_retries: Attempts before giving up; each attempt resumes the last
+
+    Returns:
+        Path to the verified file (inside the mirror directory if served from there)
+
+    Raises:
+        ArtifactUnavailableError: Offline and not available locally
+        ChecksumMismatchError: Downloaded file does not match the published hash
+        RuntimeError: Download failed
+    """
+    target = Path(dest_dir) / artifact.filename
+    mirror = get_mirror()
+
+    # A local mirror directory is used in place, never copied
+    if mirror and not mirror.startswith(("http://", "https://")):
+        mirrored = Path(mirror) / artifact.filename
+        if mirrored.exists():
+            if verify_artifact(mirrored, artifact):
+                logger.info(f"Using mirrored artifact: {mirrored}")
+                return mirrored
+            logger.warning(f"Mirrored artifact failed verification, ignoring: {mirrored}")
+
+    if not force and target.exists() and verify_artifact(target, artifact):
+        return target
+
+    with file_lock(target):
+        # Another process may have finished the download while we waited
+        if not force and target.exists() and verify_artifact(target, artifact):
+            return target
+
+        if is_offline():
+            raise ArtifactUnavailableError(
+                f"{artifact.filename} is not available locally and CRYSTALYSE_OFFLINE is set. "
+                f"Place it in {target.parent} or in CRYSTALYSE_ARTIFACT_MIRROR."
+            )
+
+        url = artifact.url
+        if mirror and mirror.startswith(("http://", "https://")):
+            url = f"{mirror.rstrip('/')}/{artifact.filename}"
+
+        part_path = target.with_name(target.name + ".part")
+        if force:
+            part_path.unlink(missing_ok=True)
+
+        close = None
+        if progress is None:
+            progress, close = _tqdm_progress(f"Downloading {artifact.filename}")
+        try:
+            _download(url, part_path, progress, timeout, max_retries)
+        finally:
+            if close:
+                close()
+
+        sha256 = file_digest(part_path, "sha256")
+        if artifact.sha256 and sha256 != artifact.sha256:
+            part_path.unlink(missing_ok=True)
+            raise ChecksumMismatchError(
+                f"{artifact.filename}: expected sha256 {artifact.sha256}, got {sha256}"
+            )
+        if artifact.md5 and file_digest(part_path, "md5") != artifact.md5:
+            part_path.unlink(missing_ok=True)
+            raise ChecksumMismatchError(f"{artifact.filename}: md5 mismatch")
+
+        os.replace(part_path, target)
+        target.with_name(target.name + ".sha256").write_text(sha256)
+        logger.info(f"Fetched and verified {target}")
+        return target
+
+
+class _HashingReader(io.RawIOBase):
+    """Read-only file wrapper that hashes every byte passed through it."""
+
+    def __init__(self, raw: BinaryIO):
+        self.raw = raw
+        self.digest = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = self.raw.readinto(buffer)
+        self.digest.update(memoryview(buffer)[:n])
+        return n
+
+
+def extract_members(
+    archive: Path,
+    members: dict[str, Path],
+    sha256: str | None = None,
+    digests: dict[str, str] | None = None,
+) -> dict[str, Path]:
+    """
+    Stream through a tar archive and write only the requested members.
+
+    Members are matched by basename, so the archive's internal directory layout does
+    not matter. The archive is read sequentially (``r|*``) and hashed as it is read,
+    so verifying it costs no extra pass. Without ``sha256`` reading stops as soon as
+    every requested member is found.
+
+    Nothing is moved into place until every check has passed; on any failure the
+    partially extracted files are removed and existing destinations are untouched.
+
+    Args:
+        archive: Path to a (optionally compressed) tar archive
+        members: Mapping of member basename to destination path
+        sha256: Expected SHA256 of the archive itself
+        digests: Expected SHA256 of individual members, by basename
+
+    Returns:
+        Mapping of member basename to the extracted path
+
+    Raises:
+        ChecksumMismatchError: The archive or a member does not match its hash
+        RuntimeError: If the archive is unreadable or a member is missing
+    """
+    digests = digests or {}
+    pending = dict(members)
+    extracted: dict[str, tuple[Path, Path, str]] = {}
+
+    try:
+        with open(archive, "rb") as raw:
+            reader = _HashingReader(raw)
+            with tarfile.open(fileobj=reader, mode="r|*") as tar:
+                for info in tar:
+                    name = Path(info.name).name
+                    if not info.isfile() or name not in pending:
+                        continue
+
+                    dest = pending.pop(name)
+                    dest.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = dest.with_name(dest.name + ".tmp")
+                    extracted[name] = (dest, tmp_path, "")
+                    digest = hashlib.sha256()
+                    source = tar.extractfile(info)
+                    with source, open(tmp_path, "wb") as out:
+                        while chunk := source.read(CHUNK_SIZE):
+                            digest.update(chunk)
+                            out.write(chunk)
+                    member_sha256 = digest.hexdigest()
+                    if digests.get(name, member_sha256) != member_sha256:
+                        raise ChecksumMismatchError(
+                            f"{name}: expected sha256 {digests[name]}, got {member_sha256}"
+                        )
+                    extracted[name] = (dest, tmp_path, member_sha256)
+
+                    if not pending and not sha256:
+                        break
+
+            if sha256:
+                # Hash whatever the tar stream left unread so the digest covers the whole file
+                while reader.read(CHUNK_SIZE):
+                    pass
+                if reader.digest.hexdigest() != sha256:
+                    raise ChecksumMismatchError(
+                        f"{archive.name}: expected sha256 {sha256}, got {reader.digest.hexdigest()}"
+                    )
+
+        if pending:
+            raise RuntimeError(f"Members not found in {archive.name}: {sorted(pending)}")
+    except BaseException as e:
+        for _, tmp_path, _ in extracted.values():
+            tmp_path.unlink(missing_ok=True)
+        if isinstance(e, tarfile.TarError):
+            raise RuntimeError(f"Failed to read archive {archive}: {e}") from e
+        raise
+
+    for name, (dest, tmp_path, member_sha256) in extracted.items():
+        os.replace(tmp_path, dest)
+        dest.with_name(dest.name + ".sha256").write_text(member_sha256)
+        logger.info(f"Extracted {name} -> {dest}")
+    return {name: dest for name, (dest, _, _) in extracted.items()}
@@ -1,11 +1,15 @@
 """MACE formation energy calculations - extracted from MCP server."""
 
 import logging
+import threading
 import warnings
 from typing import Any
 
 import numpy as np
-from pydantic import BaseModel
+
+from ..budget import Budget, BudgetExceeded
+from ..models import EnergyResult, RelaxationResult
+from .weights import calculator_from_model_file
 
 # Suppress e3nn warning about TORCH_FORCE_NO_WEIGHTS_ONLY_LOAD
 warnings.filterwarnings(
@@ -14,37 +18,12 @@ warnings.filterwarnings(
 
 logger = logging.getLogger(__name__)
 
-# Global model cache
+# Global model cache (the lock makes concurrent first calls share one load)
 _model_cache: dict[str, Any] = {}
+_model_cache_lock = threading.Lock()
 
-
-class EnergyResult(BaseModel):
-    """Formation energy calculation result."""
-
-    success: bool = True
-    formula: str
-    formation_energy: float | None = None
-    energy_per_atom: float | None = None
-    total_energy: float | None = None
-    unit: str = "eV"
-    method: str = "mace"
-    max_force: float | None = None
-    rms_force: float | None = None
-    error: str | None = None
-
-
-class RelaxationResult(BaseModel):
-    """Structure relaxation result."""
-
-    success: bool = True
-    converged: bool = False
-    initial_energy: float | None = None
-    final_energy: float | None = None
-    energy_change: float | None = None
-    max_displacement: float | None = None
-    n_steps: int = 0
-    relaxed_structure: dict[str, Any] | None = None
-    error: str | None = None
+# Calculators are shared and hold per-call state, so one calculation runs at a time
+_calculation_lock = threading.RLock()
 
 
 def _import_dependencies():
@@ -85,31 +64,38 @@ def get_mace_calculator(
     default_dtype: str = "float32",
 ) -> Any:
     """Get or create MACE calculator with caching and optimisation."""
+    # Resolve "auto" first, so "auto" and the device it picks share one loaded model
+    if device == "auto":
+        device = "cuda" if torch.cuda.is_available() else "cpu"
     cache_key = f"{model_type}_{size}_{device}_{compile_model}_{default_dtype}"
 
-    if cache_key not in _model_cache:
-        if device == "auto":
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-
-        logger.info(f"Loading MACE model: {model_type} ({size}) on {device}")
-
-        try:
-            if model_type == "mace_mp":
-                calc = mace_mp(model=size, device=device, default_dtype=default_dtype)
-            elif model_type == "mace_off":
-                calc = mace_off(model=size, device=device, default_dtype=default_dtype)
-            else:
-                # Custom model path
-                calc = MACECalculator(
-                    model_paths=model_type, device=device, default_dtype=default_dtype
-                )
-
-            _model_cache[cache_key] = calc
-            logger.info(f"MACE calculator cached: {cache_key}")
-
-        except Exception as e:
-            logger.error(f"Failed to load MACE calculator: {e}")
-            raise
+    with _model_cache_lock:
+        if cache_key not in _model_cache:
+            logger.info(f"Loading MACE model: {model_type} ({size}) on {device}")
+
+            try:
+                if model_type == "mace_mp":
+                    try:
+                        from mace.calculators.foundations_models import download_mace_mp_checkpoint
+
+                        calc = calculator_from_model_file(
+                            download_mace_mp_checkpoint(size), device, default_dtype
+                        )
+                    except Exception as e:
+                        logger.warning(f"Fast MACE load failed, using mace_mp loader: {e}")
+                        calc = mace_mp(model=size, device=device, default_dtype=default_dtype)
+                elif model_type == "mace_off":
+                    calc = mace_off(model=size, device=device, default_dtype=default_dtype)
+                else:
+                    # Custom model path
+                    calc = calculator_from_model_file(model_type, device, default_dtype)
+
+                _model_cache[cache_key] = calc
+                logger.info(f"MACE calculator cached: {cache_key}")
+
+            except Exception as e:
+                logger.error(f"Failed to load MACE calculator: {e}")
+                raise
 
     return _model_cache[cache_key]
 
@@ -194,21 +180,22 @@ class MACECalculator:  # noqa: F811
             )
             atoms.calc = calc
 
-            # Calculate energy
-            compound_energy = atoms.get_potential_energy()
+            with _calculation_lock:
+                # Calculate energy
+                compound_energy = atoms.get_potential_energy()
 
-            # Get reference energies from the foundation model
-            atomic_numbers = atoms.get_atomic_numbers()
-            indices = torch.tensor(
-                [calc.z_table.z_to_index(z) for z in atomic_numbers], device=calc.device
-            )
+                # Get reference energies from the foundation model
+                atomic_numbers = atoms.get_atomic_numbers()
+                indices = torch.tensor(
+                    [calc.z_table.z_to_index(z) for z in atomic_numbers], device=calc.device
+                )
 
-            # Convert to one-hot encoding
-            num_elements = len(calc.z_table)
-            one_hot = torch.nn.functional.one_hot(indices, num_classes=num_elements).float()
+                # Convert to one-hot encoding
+                num_elements = len(calc.z_table)
+                one_hot = torch.nn.functional.one_hot(indices, num_classes=num_elements).float()
 
-            # Get atomic energies
-            atomic_energies = calc.models[0].atomic_energies_fn(one_hot).detach().cpu().numpy()
+                # Get atomic energies
+                atomic_energies = calc.models[0].atomic_energies_fn(one_hot).detach().cpu().numpy()
             total_reference_energy = np.sum(atomic_energies)
 
             # Calculate formation energy
@@ -232,8 +219,16 @@ class MACECalculator:  # noqa: F811
         fmax: float = 0.01,
         steps: int = 500,
         optimizer: str = "BFGS",
+        budget: Budget | None = None,
     ) -> RelaxationResult:
-        """Relax structure to local energy minimum."""
+        """
+        Relax structure to local energy minimum.
+
+        With a budget, the optimiser checks it after every step and stops when the
+        time runs out or the call is cancelled, returning the lowest-energy structure
+        reached so far with ``stopped`` set. Steps are capped at the budget's
+        ``max_steps``.
+        """
         try:
             # Validate structure
             valid, msg = validate_structure(structure)
@@ -246,10 +241,6 @@ class MACECalculator:  # noqa: F811
             )
             atoms.calc = calc
 
-            # Store initial state
-            initial_energy = float(atoms.get_potential_energy())
-            initial_positions = atoms.positions.copy()
-
             # Select optimizer
             if optimizer.upper() == "BFGS":
                 opt_class = BFGS
@@ -263,40 +254,81 @@ class MACECalculator:  # noqa: F811
                     error=f"Invalid optimizer '{optimizer}'. Choose from BFGS, FIRE, LBFGS.",
                 )
 
-            # Track optimization progress
-            energies = [initial_energy]
+            capped = False
+            if budget is not None and budget.max_steps is not None:
+                allowed = max(0, budget.max_steps - budget.steps)
+                capped = steps > allowed
+                steps = min(steps, allowed)
 
-            def track_energy():
-                energies.append(float(atoms.get_potential_energy()))
-
-            opt = opt_class(atoms, logfile=None)
-            opt.attach(track_energy, interval=1)
-
-            # Run optimization
-            converged = opt.run(fmax=fmax, steps=steps)
-
-            # Calculate metrics
-            final_energy = float(atoms.get_potential_energy())
-            energy_change = final_energy - initial_energy
-            max_displacement = float(
-                np.max(np.linalg.norm(atoms.positions - initial_positions, axis=1))
-            )
-
-            return RelaxationResult(
-                success=True,
-                converged=bool(converged),
-                initial_energy=initial_energy,
-                final_energy=final_energy,
-                energy_change=energy_change,
-                max_displacement=max_displacement,
-                n_steps=len(energies) - 1,
-                relaxed_structure=atoms_to_dict(atoms),
-            )
+            with _calculation_lock:
+                return self._relax(atoms, opt_class, fmax, steps, budget, capped)
 
         except Exception as e:
             logger.error(f"Relaxation failed: {e}")
             return RelaxationResult(success=False, error=str(e))
 
+    def _relax(
+        self,
+        atoms: Any,
+        opt_class: Any,
+        fmax: float,
+        steps: int,
+        budget: Budget | None,
+        capped: bool,
+    ) -> RelaxationResult:
+        """Run the optimiser on atoms with a calculator attached."""
+        # Store initial state
+        initial_energy = float(atoms.get_potential_energy())
+        initial_positions = atoms.positions.copy()
+
+        # Track optimization progress, and the lowest-energy positions for early stops
+        energies = [initial_energy]
+        best = {"energy": initial_energy, "positions": initial_positions}
+
+        def track_energy():
+            energy = float(atoms.get_potential_energy())
+            energies.append(energy)
+            if energy < best["energy"]:
+                best.update(energy=energy, positions=atoms.positions.copy())
+            if budget is not None:
+                budget.checkpoint(0)
+
+        opt = opt_class(atoms, logfile=None)
+        opt.attach(track_energy, interval=1)
+
+        # Run optimization
+        stopped = None
+        try:
+            converged = opt.run(fmax=fmax, steps=steps)
+        except BudgetExceeded as e:
+            logger.info(f"Relaxation stopped after {opt.nsteps} steps: {e}")
+            converged = False
+            stopped = e.reason
+            atoms.positions = best["positions"]
+        if budget is not None:
+            budget.steps += opt.nsteps
+        if stopped is None and capped and not converged:
+            stopped = "steps"
+
+        # Calculate metrics
+        final_energy = best["energy"] if stopped else float(atoms.get_potential_energy())
+        energy_change = final_energy - initial_energy
+        max_displacement = float(
+            np.max(np.linalg.norm(atoms.positions - initial_positions, axis=1))
+        )
+
+        return RelaxationResult(
+            success=True,
+            converged=bool(converged),
+            initial_energy=initial_energy,
+            final_energy=final_energy,
+            energy_change=energy_change,
+            max_displacement=max_displacement,
+            n_steps=len(energies) - 1,
+            relaxed_structure=atoms_to_dict(atoms),
+            stopped=stopped,
+        )
+
     async def calculate_energy(self, cif_content: str, prefer_gpu: bool = True) -> dict[str, Any]:
         """
         Calculate energy from CIF content (compatible with MCP server interface).
@@ -310,11 +342,9 @@ class MACECalculator:  # noqa: F811
         """
         try:
             # Parse CIF to atoms
-            from io import StringIO
-
-            from ase.io import read
+            from ...utils.parse_cache import parse_cif_atoms
 
-            atoms = read(StringIO(cif_content), format="cif")
+            atoms = parse_cif_atoms(cif_content)
 
             # Convert to structure dict
             structure = atoms_to_dict(atoms)
@@ -357,8 +387,9 @@ class MACECalculator:  # noqa: F811
         fmax: float = 0.01,
         steps: int = 500,
         optimizer: str = "BFGS",
+        budget: Budget | None = None,
     ) -> RelaxationResult:
         """Synchronous version of relax_structure."""
         import asyncio
 
-        return asyncio.run(self.relax_structure(structure, fmax, steps, optimizer))
+        return asyncio.run(self.relax_structure(structure, fmax, steps, optimizer, budget))
@@ -8,34 +8,12 @@ checkpoint download and caching.
 import logging
 from typing import Any
 
-from pydantic import BaseModel, Field
+from ..models import FoundationModelInfo, FoundationModelListResult
+from .weights import calculator_from_model_file
 
 logger = logging.getLogger(__name__)
 
 
-class FoundationModelInfo(BaseModel):
-    """Information about available foundation models."""
-
-    success: bool = True
-    model_name: str = Field(description="Model identifier")
-    model_type: str = Field(description="Model family (mace_mp, mace_omat, mace_matpes)")
-    size: str = Field(description="Model size (small, medium, large)")
-    description: str = Field(description="Model description")
-    training_data: str = Field(description="Training dataset description")
-    functional: str | None = Field(None, description="DFT functional if applicable")
-    license: str = Field(description="License type (MIT or ASL)")
-    url: str = Field(description="Download URL")
-    error_message: str | None = None
-
-
-class FoundationModelListResult(BaseModel):
-    """List of available foundation models."""
-
-    success: bool = True
-    models: list[FoundationModelInfo] = Field(default_factory=list)
-    error_message: str | None = None
-
-
 try:
     from mace.calculators import MACECalculator as MACECalc
     from mace.calculators import mace_mp, mace_off
@@ -220,13 +198,16 @@ class MACEFoundationModels:
 
                 device = "cuda" if torch.cuda.is_available() else "cpu"
 
-            calc = mace_mp(
-                model=model_name,
-                device=device,
-                dispersion=dispersion,
-                dispersion_xc=dispersion_xc,
-                default_dtype=default_dtype,
-            )
+            if dispersion:
+                calc = mace_mp(
+                    model=model_name,
+                    device=device,
+                    dispersion=dispersion,
+                    dispersion_xc=dispersion_xc,
+                    default_dtype=default_dtype,
+                )
+            else:
+                calc = calculator_from_model_file(checkpoint_path, device, default_dtype)
 
             logger.info(f"MACE calculator created successfully on {device}")
             return calc
@@ -8,44 +8,10 @@ import logging
 from typing import Any
 
 import numpy as np
-from pydantic import BaseModel, Field
-
-logger = logging.getLogger(__name__)
 
+from ..models import EOSResult, StressResult
 
-class StressResult(BaseModel):
-    """Stress calculation result."""
-
-    success: bool = True
-    formula: str
-    stress_tensor_3x3: list[list[float]] | None = Field(
-        None, description="Full 3x3 stress tensor in eV/Å³"
-    )
-    stress_voigt: list[float] | None = Field(
-        None, description="Voigt 6-component stress [xx, yy, zz, yz, xz, xy] in eV/Å³"
-    )
-    pressure: float | None = Field(
-        None, description="Hydrostatic pressure (GPa), negative = tensile"
-    )
-    von_mises_stress: float | None = Field(None, description="Von Mises equivalent stress (GPa)")
-    max_shear_stress: float | None = Field(None, description="Maximum shear stress (GPa)")
-    unit: str = "eV/Å³ for stress, GPa for pressure"
-    error: str | None = None
-
-
-class EOSResult(BaseModel):
-    """Equation of state fitting result."""
-
-    success: bool = True
-    formula: str
-    eos_type: str = Field(description="EOS type (e.g., 'birchmurnaghan')")
-    v0: float | None = Field(None, description="Equilibrium volume (Å³)")
-    e0: float | None = Field(None, description="Minimum energy (eV)")
-    b0: float | None = Field(None, description="Bulk modulus (GPa)")
-    b0_prime: float | None = Field(None, description="Pressure derivative of bulk modulus")
-    volumes: list[float] | None = Field(None, description="Volumes sampled (Å³)")
-    energies: list[float] | None = Field(None, description="Energies calculated (eV)")
-    error: str | None = None
+logger = logging.getLogger(__name__)
 
 
 try:
@@ -0,0 +1,125 @@
+"""
+Fast MACE model loading through the memory-mapped weights cache.
+
+MACE ``.model`` files are whole pickled modules. ``load_mace_model`` converts them
+once into a weights-only file plus the architecture config from
+``extract_config_mace_model``, and rebuilds the module from that on later starts.
+
+Weights are converted to the precision the calculator runs in, one file per
+precision. The calculator then has nothing to cast, so the parameters stay the
+memory-mapped pages of the file (shared between server processes) rather than
+private copies made by ``.float()``.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any
+
+from ..weights_cache import decode_config_value, encode_config_value, get_weights_cache
+
+logger = logging.getLogger(__name__)
+
+# Config entries holding e3nn Irreps, stored as their string form
+_IRREPS_KEYS = ("hidden_irreps", "MLP_irreps", "edge_irreps")
+
+
+def _encode_mace_config(model: Any) -> dict[str, Any] | None:
+    """Return a JSON-compatible architecture config, or None if the model is unsupported."""
+    from mace.tools.scripts_utils import extract_config_mace_model
+
+    config = extract_config_mace_model(model)
+    if "error" in config:
+        return None
+    if config.get("cueq_config") is not None:
+        return None
+
+    for key in _IRREPS_KEYS:
+        if config.get(key) is not None:
+            config[key] = str(config[key])
+
+    return {
+        "model_class": encode_config_value(type(model)),
+        "model_dtype": str(next(model.parameters()).dtype).removeprefix("torch."),
+        "config": encode_config_value(config),
+    }
+
+
+def _build_mace_model(tensors: dict[str, Any], encoded: dict[str, Any]) -> Any:
+    """Rebuild a MACE model from converted weights."""
+    import torch
+    from e3nn import o3
+
+    config = decode_config_value(encoded["config"])
+    for key in _IRREPS_KEYS:
+        if config.get(key) is not None:
+            config[key] = o3.Irreps(config[key])
+
+    model_cls = decode_config_value(encoded["model_class"])
+    model = model_cls(**config)
+    model.to(getattr(torch, encoded["model_dtype"]))
+    model.load_state_dict(tensors, strict=True, assign=True)
+    return model
+
+
+def load_mace_model(model_path: str | Path, dtype: str | None = None) -> Any:
+    """
+    Load a MACE model file, using the memory-mapped weights cache when possible.
+
+    The first load unpickles the original file and writes the converted copy;
+    later loads rebuild the model from memory-mapped weights. Any failure falls
+    back to unpickling the original file.
+
+    Args:
+        model_path: Path to a MACE ``.model`` file
+        dtype: Precision to convert the weights to ('float32' or 'float64'; None
+            keeps the file's own)
+
+    Returns:
+        MACE model on CPU, ready to pass to ``MACECalculator(models=...)``
+    """
+    import torch
+
+    kind = "mace" if dtype is None else f"mace-{dtype}"
+    weights_cache = get_weights_cache()
+    converted = weights_cache.load(model_path, kind=kind)
+    if converted is not None:
+        try:
+            model = _build_mace_model(*converted)
+            logger.info(f"Loaded MACE weights from memory-mapped cache for {model_path}")
+            return model
+        except Exception as e:
+            logger.warning(f"Converted MACE weights unusable, loading original file: {e}")
+
+    model = torch.load(model_path, map_location="cpu", weights_only=False)
+    if dtype is not None:
+        model.to(getattr(torch, dtype))
+
+    try:
+        encoded = _encode_mace_config(model)
+        if encoded is not None:
+            weights_cache.save(model_path, kind, model.state_dict(), encoded)
+    except Exception as e:
+        logger.warning(f"Skipping weights conversion for {model_path}: {e}")
+
+    return model
+
+
+def calculator_from_model_file(model_path: str | Path, device: str, default_dtype: str) -> Any:
+    """
+    Create a MACE ASE calculator from a model file via the weights cache.
+
+    Args:
+        model_path: Path to a MACE ``.model`` file
+        device: Compute device ('cpu', 'cuda')
+        default_dtype: Model precision ('float32' or 'float64')
+
+    Returns:
+        mace.calculators.MACECalculator instance
+    """
+    from mace.calculators import MACECalculator
+
+    return MACECalculator(
+        models=load_mace_model(model_path, default_dtype),
+        device=device,
+        default_dtype=default_dtype,
+    )
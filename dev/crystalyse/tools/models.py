@@ -1,6 +1,13 @@
-"""Shared Pydantic models for all tools."""
+"""
+Shared Pydantic models for all tools.
+
+The result models live here rather than next to their tools so that they (and
+the MCP tool schemas built from them) can be imported without loading torch,
+MACE, Chemeleon, SMACT or pymatgen. Each tool module re-exports its own models.
+"""
 
 from datetime import datetime
+from typing import Any
 
 from pydantic import BaseModel, Field
 
@@ -25,37 +32,678 @@ class MaterialProperty(BaseModel):
     confidence: float = Field(ge=0.0, le=1.0, default=1.0)
 
 
-# Import specific models from each module
-from .chemeleon.predictor import CrystalStructure, PredictionResult
-from .mace.energy import EnergyResult, RelaxationResult
-from .mace.foundation_models import FoundationModelInfo, FoundationModelListResult
-from .mace.stress import EOSResult, StressResult
-from .pymatgen.analyzer import CoordinationResult, OxidationStateResult, SpaceGroupResult
-from .pymatgen.phase_diagram import EnergyAboveHullResult
-from .smact.calculators import BandGapResult, ElementInfo
-from .smact.dopant_predictor import DopantPredictionResult, DopantSuggestion
-from .smact.screening import (
-    CompositionFilterResult,
-    CompositionValidityResult,
-    MLRepresentationResult,
-)
-from .smact.validators import StabilityResult, ValidationResult
-from .visualization.visualizer import VisualizationResult
+# SMACT models
+class ValidationResult(BaseModel):
+    """Structured validation result."""
+
+    valid: bool
+    formula: str
+    oxidation_states: dict[str, float] | None = None
+    charge_balanced: bool = Field(default=False)
+    errors: list[str] = Field(default_factory=list)
+    warnings: list[str] = Field(default_factory=list)
+    message: str = ""
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+class StabilityResult(BaseModel):
+    """Stability analysis result."""
+
+    formula: str
+    stable: bool
+    smact_valid: bool
+    electronegativity_difference: float | None = None
+    bonding_character: str | None = None
+    metallicity_score: float | None = None
+    stability_prediction: str
+
+
+class BandGapResult(BaseModel):
+    """Band gap prediction result."""
+
+    formula: str
+    band_gap_ev: float | None = None
+    band_gap_estimate: str
+    method: str
+    electronegativity_difference: float | None = None
+    confidence: float = Field(ge=0.0, le=1.0, default=0.5)
+
+
+class ElementInfo(BaseModel):
+    """Element information result."""
+
+    symbol: str
+    name: str
+    atomic_number: int
+    atomic_mass: float
+    electronegativity: float | None = None
+    oxidation_states: dict[str, list[int]] | None = None
+
+
+class DopantSuggestion(BaseModel):
+    """Single dopant suggestion with scoring."""
+
+    dopant_species: str = Field(description="Dopant species (e.g., 'Fe3+')")
+    host_species: str = Field(description="Host species being replaced")
+    substitution_probability: float = Field(description="Probability of substitution")
+    chemical_similarity: float = Field(description="Chemical similarity (lambda value)")
+    selectivity: float = Field(description="Selectivity score (0-1)")
+    combined_score: float = Field(description="Combined probability-selectivity score")
+
+
+class DopantPredictionResult(BaseModel):
+    """Result from dopant prediction."""
+
+    success: bool = True
+    composition: str = Field(description="Original composition formula")
+    embedding: str = Field(description="Embedding used for prediction")
+
+    # Dopant suggestions
+    n_type_cation: list[DopantSuggestion] = Field(
+        default_factory=list, description="N-type cation dopants"
+    )
+    p_type_cation: list[DopantSuggestion] = Field(
+        default_factory=list, description="P-type cation dopants"
+    )
+    n_type_anion: list[DopantSuggestion] = Field(
+        default_factory=list, description="N-type anion dopants"
+    )
+    p_type_anion: list[DopantSuggestion] = Field(
+        default_factory=list, description="P-type anion dopants"
+    )
+
+    # Metadata
+    num_suggestions: int = Field(description="Number of suggestions per category")
+    error_message: str | None = None
+
+
+class DopantBatchResult(BaseModel):
+    """Result from dopant prediction over many hosts."""
+
+    success: bool = True
+    embedding: str = Field(description="Embedding used for prediction")
+    results: list[DopantPredictionResult] = Field(
+        default_factory=list, description="One prediction per host, in input order"
+    )
+    cache_hits: int = Field(default=0, description="Hosts answered from the result cache")
+    computation_time: float | None = None
+    error_message: str | None = None
+
+
+class CompositionValidityResult(BaseModel):
+    """Result from SMACT validity check."""
+
+    success: bool = True
+    composition: str = Field(description="Chemical formula tested")
+    is_valid: bool = Field(description="Whether composition passes SMACT tests")
+
+    # Test parameters
+    use_pauling_test: bool = Field(description="Whether Pauling EN test was used")
+    include_alloys: bool = Field(description="Whether alloys are considered valid")
+    check_metallicity: bool = Field(description="Whether metallicity was checked")
+    oxidation_states_set: str | None = Field(description="Oxidation state dataset used")
+
+    # Optional metadata
+    metallicity_threshold: float | None = None
+    error_message: str | None = None
+
+
+class EncodedArray(BaseModel):
+    """Numeric array as base64 of its little-endian bytes (see crystalyse.tools.arrays)."""
+
+    dtype: str = Field(description='NumPy dtype of the data, e.g. "<f8", "<f4" or "<i4"')
+    shape: list[int]
+    data: str = Field(description="Base64 of the array bytes in C order")
+
+
+class MLRepresentationResult(BaseModel):
+    """Result from ML representation generation."""
+
+    success: bool = True
+    composition: str = Field(description="Chemical formula")
+    ml_vector: list[float] | EncodedArray = Field(
+        description="103-element ML representation vector (normalized)"
+    )
+    vector_length: int = Field(default=103, description="Length of ML vector")
+    error_message: str | None = None
+
+
+class CompositionFilterResult(BaseModel):
+    """Result from SMACT composition filtering."""
+
+    success: bool = True
+    elements: list[str] = Field(description="Element symbols tested")
+    num_valid_compositions: int = Field(description="Number of valid compositions found")
+    valid_compositions: list[dict[str, Any]] = Field(
+        default_factory=list,
+        description="List of valid compositions with oxidation states and stoichiometry",
+    )
+    threshold: int = Field(description="Stoichiometry threshold used")
+    oxidation_states_set: str = Field(description="Oxidation state dataset used")
+    offset: int = Field(default=0, description="Index of the first composition in this page")
+    next_cursor: str | None = Field(
+        default=None, description="Pass as cursor to fetch the next page (None on the last page)"
+    )
+    error_message: str | None = None
+
+
+class BulkValidationResult(BaseModel):
+    """Compact result of validating many compositions at once."""
+
+    success: bool = True
+    total: int = Field(description="Number of formulas submitted")
+    unique: int = Field(description="Number of distinct reduced formulas validated")
+    num_valid: int = Field(default=0, description="Number of submitted formulas that are valid")
+    verdicts: list[bool | None] = Field(
+        default_factory=list,
+        description="Validity per submitted formula, in input order (None if unparseable)",
+    )
+    valid_formulas: list[str] = Field(
+        default_factory=list, description="Distinct valid reduced formulas"
+    )
+    errors: dict[str, str] = Field(
+        default_factory=dict,
+        description="Input formulas (as given) that could not be validated, with reasons",
+    )
+    use_pauling_test: bool = True
+    include_alloys: bool = True
+    check_metallicity: bool = False
+    oxidation_states_set: str = "icsd24"
+    workers: int = Field(default=1, description="Processes used for validation")
+    computation_time: float | None = None
+    error_message: str | None = None
+
+
+class FeatureMatrixResult(BaseModel):
+    """Summary of a feature matrix written to disk."""
+
+    success: bool = True
+    matrix_path: str | None = Field(default=None, description="Path to the .npy or CSR .npz")
+    index_path: str | None = Field(default=None, description="Path to the row/column index")
+    format: str = Field(default="dense", description="'dense' (.npy) or 'csr' (.npz)")
+    shape: list[int] = Field(default_factory=list, description="[rows, 103]")
+    num_failed: int = Field(default=0, description="Rows left empty because parsing failed")
+    density: float = Field(default=0.0, description="Fraction of non-zero entries")
+    mean_elements_per_row: float = 0.0
+    element_counts: dict[str, int] = Field(
+        default_factory=dict, description="Rows containing each element (most common first)"
+    )
+    computation_time: float | None = None
+    error_message: str | None = None
+
+
+# Structure store models
+class StructureSummary(BaseModel):
+    """Handle and summary of a structure held in the server-side structure store."""
+
+    handle: str
+    formula: str
+    num_atoms: int
+    volume: float | None = None
+
+
+class StructureStoreResult(BaseModel):
+    """Structure stored, or exported, through the structure store."""
+
+    success: bool = True
+    structure: StructureSummary | None = None
+    format: str | None = None
+    content: str | None = None
+    output_path: str | None = None
+    error: str | None = None
+
+
+# Chemeleon models
+class CrystalStructure(BaseModel):
+    """Predicted crystal structure."""
+
+    formula: str
+    cell: list[list[float]] | EncodedArray
+    positions: list[list[float]] | EncodedArray
+    numbers: list[int] | EncodedArray
+    symbols: list[str]
+    volume: float
+    confidence: float = Field(ge=0.0, le=1.0, default=1.0)
+
+
+class PredictionResult(BaseModel):
+    """Structure prediction result."""
+
+    success: bool
+    formula: str
+    predicted_structures: list[CrystalStructure] = Field(default_factory=list)
+    structure_handles: list[StructureSummary] = Field(default_factory=list)
+    computation_time: float | None = None
+    method: str = "chemeleon"
+    checkpoint_used: str = ""
+    seed: int | None = None
+    from_cache: bool = False
+    stopped: str | None = Field(
+        None, description="Why the call stopped early: time, steps or cancelled"
+    )
+    error: str | None = None
+
+
+class GenerationBatch(BaseModel):
+    """One batch of de novo generated structures, yielded as soon as it is sampled."""
+
+    batch_index: int
+    structures: list[CrystalStructure] = Field(default_factory=list)
+    num_sampled: int = 0
+    num_rejected: int = 0
+    computation_time: float | None = None
+    checkpoint_used: str = ""
+    stopped: str | None = Field(
+        None, description="Why the call stopped early: time, steps or cancelled"
+    )
+    error: str | None = None
+
+
+class DeNovoGenerationResult(BaseModel):
+    """Aggregated de novo generation result."""
+
+    success: bool
+    predicted_structures: list[CrystalStructure] = Field(default_factory=list)
+    structure_handles: list[StructureSummary] = Field(default_factory=list)
+    num_batches: int = 0
+    num_sampled: int = 0
+    num_rejected: int = 0
+    allowed_elements: list[str] | None = None
+    max_atoms: int | None = None
+    computation_time: float | None = None
+    method: str = "chemeleon-dng"
+    checkpoint_used: str = ""
+    stopped: str | None = Field(
+        None, description="Why the call stopped early: time, steps or cancelled"
+    )
+    error: str | None = None
+
+
+# MACE models
+class EnergyResult(BaseModel):
+    """Formation energy calculation result."""
+
+    success: bool = True
+    formula: str
+    formation_energy: float | None = None
+    energy_per_atom: float | None = None
+    total_energy: float | None = None
+    unit: str = "eV"
+    method: str = "mace"
+    max_force: float | None = None
+    rms_force: float | None = None
+    error: str | None = None
+
+
+class RelaxationResult(BaseModel):
+    """Structure relaxation result."""
+
+    success: bool = True
+    converged: bool = False
+    initial_energy: float | None = None
+    final_energy: float | None = None
+    energy_change: float | None = None
+    max_displacement: float | None = None
+    n_steps: int = 0
+    relaxed_structure: dict[str, Any] | None = None
+    relaxed_handle: StructureSummary | None = None
+    stopped: str | None = Field(
+        None,
+        description="Why the relaxation stopped before converging: time, steps or cancelled",
+    )
+    error: str | None = None
+
+
+class StressResult(BaseModel):
+    """Stress calculation result."""
+
+    success: bool = True
+    formula: str
+    stress_tensor_3x3: list[list[float]] | None = Field(
+        None, description="Full 3x3 stress tensor in eV/Å³"
+    )
+    stress_voigt: list[float] | None = Field(
+        None, description="Voigt 6-component stress [xx, yy, zz, yz, xz, xy] in eV/Å³"
+    )
+    pressure: float | None = Field(
+        None, description="Hydrostatic pressure (GPa), negative = tensile"
+    )
+    von_mises_stress: float | None = Field(None, description="Von Mises equivalent stress (GPa)")
+    max_shear_stress: float | None = Field(None, description="Maximum shear stress (GPa)")
+    unit: str = "eV/Å³ for stress, GPa for pressure"
+    error: str | None = None
+
+
+class EOSResult(BaseModel):
+    """Equation of state fitting result."""
+
+    success: bool = True
+    formula: str
+    eos_type: str = Field(description="EOS type (e.g., 'birchmurnaghan')")
+    v0: float | None = Field(None, description="Equilibrium volume (Å³)")
+    e0: float | None = Field(None, description="Minimum energy (eV)")
+    b0: float | None = Field(None, description="Bulk modulus (GPa)")
+    b0_prime: float | None = Field(None, description="Pressure derivative of bulk modulus")
+    volumes: list[float] | None = Field(None, description="Volumes sampled (Å³)")
+    energies: list[float] | None = Field(None, description="Energies calculated (eV)")
+    error: str | None = None
+
+
+class FoundationModelInfo(BaseModel):
+    """Information about available foundation models."""
+
+    success: bool = True
+    model_name: str = Field(description="Model identifier")
+    model_type: str = Field(description="Model family (mace_mp, mace_omat, mace_matpes)")
+    size: str = Field(description="Model size (small, medium, large)")
+    description: str = Field(description="Model description")
+    training_data: str = Field(description="Training dataset description")
+    functional: str | None = Field(None, description="DFT functional if applicable")
+    license: str = Field(description="License type (MIT or ASL)")
+    url: str = Field(description="Download URL")
+    error_message: str | None = None
+
+
+class FoundationModelListResult(BaseModel):
+    """List of available foundation models."""
+
+    success: bool = True
+    models: list[FoundationModelInfo] = Field(default_factory=list)
+    error_message: str | None = None
+
+
+# PyMatgen models
+class SpaceGroupResult(BaseModel):
+    """Space group analysis result (primitive, lattice and CIF fields only if requested)."""
+
+    success: bool = True
+    space_group_symbol: str
+    space_group_number: int
+    point_group: str
+    crystal_system: str
+    hall_symbol: str
+    original_formula: str
+    original_num_atoms: int
+    primitive_formula: str | None = None
+    primitive_num_atoms: int | None = None
+    num_symmetry_ops: int
+    lattice_a: float | None = None
+    lattice_b: float | None = None
+    lattice_c: float | None = None
+    lattice_alpha: float | None = None
+    lattice_beta: float | None = None
+    lattice_gamma: float | None = None
+    volume: float | None = None
+    symmetrized_cif: str | None = None
+    primitive_cif: str | None = None
+    error: str | None = None
+
+
+class SpaceGroupBatchResult(BaseModel):
+    """Space group analysis of many structures."""
+
+    success: bool = True
+    results: list[SpaceGroupResult] = Field(
+        default_factory=list, description="One result per structure, in input order"
+    )
+    num_failed: int = 0
+    cache_hits: int = Field(default=0, description="Structures answered from the symmetry cache")
+    workers: int = Field(default=1, description="Processes used for analysis")
+    computation_time: float | None = None
+    error: str | None = None
+
+
+class CoordinationResult(BaseModel):
+    """Coordination analysis result."""
+
+    success: bool = True
+    formula: str
+    num_sites: int
+    sites_analyzed: int
+    average_coordination: float
+    method: str = "voronoi"
+    num_inequivalent_sites: int | None = Field(
+        default=None, description="Sites whose environment was actually computed"
+    )
+    coordination_data: list[dict[str, Any]] = Field(default_factory=list)
+    error: str | None = None
+
+
+class CoordinationBatchResult(BaseModel):
+    """Coordination analysis of many structures."""
+
+    success: bool = True
+    results: list[CoordinationResult] = Field(
+        default_factory=list, description="One result per structure, in input order"
+    )
+    num_failed: int = 0
+    workers: int = Field(default=1, description="Processes used for analysis")
+    computation_time: float | None = None
+    error: str | None = None
+
+
+class OxidationStateResult(BaseModel):
+    """Oxidation state validation result."""
+
+    success: bool = True
+    formula: str
+    oxidation_states_guessed: bool
+    structure_is_valid: bool
+    site_analysis: list[dict[str, Any]] = Field(default_factory=list)
+    validity_percentage: float
+    method: str | None = Field(
+        default=None, description='"smact", "bond_valence", or "fallback" after a timeout'
+    )
+    timed_out: bool = False
+    budget_enforced: bool = Field(
+        default=True,
+        description="False if the time budget could not be applied (the analysis ran unbounded)",
+    )
+    error: str | None = None
+
+
+class OxidationStateBatchResult(BaseModel):
+    """Oxidation state validation of many structures."""
+
+    success: bool = True
+    results: list[OxidationStateResult] = Field(
+        default_factory=list, description="One result per structure, in input order"
+    )
+    num_failed: int = 0
+    num_timed_out: int = 0
+    cache_hits: int = Field(default=0, description="Structures answered from the result cache")
+    workers: int = Field(default=1, description="Processes used for bond-valence analysis")
+    computation_time: float | None = None
+    error: str | None = None
+
+
+class EnergyAboveHullResult(BaseModel):
+    """Energy above hull calculation result."""
+
+    success: bool = True
+    composition: str
+    energy_per_atom: float
+    energy_above_hull: float
+    is_stable: bool
+    is_metastable: bool
+    is_unstable: bool
+    decomposition_products: list[dict[str, Any]] = Field(default_factory=list)
+    competing_phases: int = 0
+    error: str | None = None
+
+
+class KnownMaterialResult(BaseModel):
+    """Whether a composition already exists in the phase diagram data."""
+
+    composition: str
+    reduced_formula: str | None = None
+    is_known: bool = False
+    num_polymorphs: int = 0
+    lowest_energy_per_atom: float | None = Field(
+        default=None, description="Lowest known energy per atom for this formula (eV/atom)"
+    )
+    ground_state_on_hull: bool | None = None
+    entry_ids: list[str] = Field(default_factory=list, description="Lowest energy first")
+    energy_per_atom: float | None = None
+    energy_above_known: float | None = Field(
+        default=None, description="energy_per_atom minus the lowest known energy (eV/atom)"
+    )
+    error: str | None = None
+
+
+class KnownMaterialsBatchResult(BaseModel):
+    """Known-material lookup for many compositions."""
+
+    success: bool = True
+    results: list[KnownMaterialResult] = Field(
+        default_factory=list, description="One result per composition, in input order"
+    )
+    num_known: int = 0
+    index_size: int = Field(default=0, description="Distinct formulas in the index")
+    computation_time: float | None = None
+    error: str | None = None
+
+
+class HullTargetResult(BaseModel):
+    """Hull energy a new phase of one composition would have to reach."""
+
+    composition: str
+    chemsys: str | None = None
+    hull_energy_per_atom: float | None = Field(
+        default=None, description="Convex hull energy at this composition (eV/atom)"
+    )
+    target_formation_energy: float | None = Field(
+        default=None, description="Formation energy needed to reach the hull (eV/atom)"
+    )
+    competing_phases: list[dict[str, Any]] = Field(default_factory=list)
+    passes: bool | None = Field(
+        default=None, description="Target is no deeper than min_target_energy (if given)"
+    )
+    error: str | None = None
+
+
+class HullTargetBatchResult(BaseModel):
+    """Hull energy targets for many compositions."""
+
+    success: bool = True
+    results: list[HullTargetResult] = Field(
+        default_factory=list, description="One result per composition, in input order"
+    )
+    num_passing: int | None = None
+    min_target_energy: float | None = None
+    computation_time: float | None = None
+    error: str | None = None
+
+
+# Visualization models
+class VisualizationResult(BaseModel):
+    """Visualization result."""
+
+    success: bool = True
+    visualization_type: str
+    output_path: str | None = None
+    formula: str
+    cached: bool = False
+    description: str
+    error: str | None = None
+
+
+# Pipeline models
+class PipelineCandidate(BaseModel):
+    """One composition, or one of its structures, carried through the screening pipeline."""
+
+    formula: str
+    rank: int | None = None
+    structure: StructureSummary | None = None
+    formation_energy: float | None = Field(None, description="MACE formation energy (eV/atom)")
+    total_energy: float | None = Field(
+        None, description="MACE total energy of the cell, after relaxation if relaxed (eV)"
+    )
+    relaxed: bool = False
+    energy_above_hull: float | None = Field(None, description="Energy above hull (eV/atom)")
+    is_stable: bool | None = None
+    stage: str = Field(description="Last stage the candidate passed")
+    rejected_at: str | None = None
+    error: str | None = None
+
+
+class ScreeningPipelineResult(BaseModel):
+    """Ranked result of a server-side screening pipeline run."""
+
+    success: bool = True
+    stages: list[str] = Field(default_factory=list)
+    num_compositions: int = 0
+    stage_counts: dict[str, int] = Field(
+        default_factory=dict, description="Candidates that passed each stage"
+    )
+    stage_seconds: dict[str, float] = Field(
+        default_factory=dict, description="Time spent in each stage (s)"
+    )
+    ranked: list[PipelineCandidate] = Field(
+        default_factory=list, description="Candidates that passed every stage, best first"
+    )
+    rejected: list[PipelineCandidate] = Field(default_factory=list)
+    computation_time: float | None = None
+    stopped: str | None = Field(None, description="Why the run stopped early: time or cancelled")
+    error: str | None = None
+
+
+# Batch models
+class BatchCall(BaseModel):
+    """One tool call inside a batch."""
+
+    tool: str = Field(description="Name of a tool on this server")
+    arguments: dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchCallItem(BaseModel):
+    """Outcome of one call in a batch, in the order the calls were given."""
+
+    index: int
+    tool: str
+    success: bool = False
+    result: Any = Field(None, description="The tool's result, as it would return it")
+    error: str | None = None
+    duplicate_of: int | None = Field(
+        None, description="Index of the identical call whose result this shares"
+    )
+    seconds: float | None = None
+
+
+class BatchCallResult(BaseModel):
+    """Per-call results of a batch of tool calls."""
+
+    success: bool = True
+    results: list[BatchCallItem] = Field(default_factory=list)
+    num_calls: int = 0
+    num_executed: int = Field(0, description="Calls run after removing duplicates")
+    num_failed: int = 0
+    computation_time: float | None = None
+    error: str | None = None
+
 
 __all__ = [
     "ToolResult",
     "MaterialProperty",
+    "EncodedArray",
     "ValidationResult",
     "StabilityResult",
     "BandGapResult",
     "ElementInfo",
     "DopantPredictionResult",
     "DopantSuggestion",
+    "DopantBatchResult",
     "CompositionValidityResult",
     "MLRepresentationResult",
     "CompositionFilterResult",
+    "BulkValidationResult",
+    "FeatureMatrixResult",
+    "StructureSummary",
+    "StructureStoreResult",
     "PredictionResult",
     "CrystalStructure",
+    "GenerationBatch",
+    "DeNovoGenerationResult",
     "EnergyResult",
     "RelaxationResult",
     "StressResult",
@@ -63,8 +711,20 @@ __all__ = [
     "FoundationModelInfo",
     "FoundationModelListResult",
     "SpaceGroupResult",
+    "SpaceGroupBatchResult",
     "CoordinationResult",
+    "CoordinationBatchResult",
     "OxidationStateResult",
+    "OxidationStateBatchResult",
     "EnergyAboveHullResult",
+    "HullTargetResult",
+    "HullTargetBatchResult",
+    "KnownMaterialResult",
+    "KnownMaterialsBatchResult",
     "VisualizationResult",
+    "PipelineCandidate",
+    "ScreeningPipelineResult",
+    "BatchCall",
+    "BatchCallItem",
+    "BatchCallResult",
 ]
@@ -0,0 +1,497 @@
+"""
+Server-side screening pipeline over many compositions.
+
+A screen driven by the agent is a chain of tool calls, each with a model round
+trip and the structures serialised in between. ``ScreeningPipeline`` runs the
+same chain inside the server in one call:
+
+    validate -> generate -> energy -> relax -> hull
+
+- ``validate``: SMACT rules over all compositions at once
+- ``generate``: Chemeleon CSP structures for each valid composition
+- ``energy``: MACE formation energy, filtered by ``max_formation_energy``
+- ``relax``: MACE relaxation
+- ``hull``: energy above the Materials Project hull, filtered by
+  ``max_energy_above_hull``
+
+Stages can be left out, but each stage needs the ones it consumes (structures
+for the MACE stages, an energy for the hull). Generation runs in one worker
+thread and MACE in another, connected by a bounded queue, so structures for the
+next composition are sampled while earlier ones are evaluated. With a
+``Budget``, sampling and relaxation stop once its time runs out or it is
+cancelled; the remaining structures are rejected and the candidates screened
+so far are still ranked. Structures go
+into the structure store, and candidates carry their handles. Candidates that
+pass every stage are ranked by energy above hull (or formation energy when the
+hull stage is left out).
+
+``run_stages`` is the general form used by the creative server: items flow
+through a list of ``Stage`` functions, each with its own worker threads and a
+bounded queue in front of it, so all stages run at once and a slow stage holds
+back the ones feeding it instead of letting work pile up in memory.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+from .budget import Budget
+from .models import PipelineCandidate, ScreeningPipelineResult, StructureSummary
+from .registry import ToolRegistry
+from .resources import wait_for_resource
+from .structure_store import get_structure_store
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("validate", "generate", "energy", "relax", "hull")
+
+# Generated structures waiting for MACE; bounds how far generation runs ahead
+QUEUE_SIZE = 8
+
+# progress(done, total, message), e.g. the MCP context's ``report_progress``
+ProgressCallback = Callable[[float, float | None, str], Awaitable[None]]
+
+
+def normalize_stages(stages: list[str] | None) -> list[str]:
+    """
+    Stages to run, in pipeline order.
+
+    Raises:
+        ValueError: If a stage is unknown or a stage it depends on is missing
+    """
+    if not stages:
+        return list(STAGES)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages {sorted(unknown)}. Stages: {', '.join(STAGES)}")
+    selected = [stage for stage in STAGES if stage in stages]
+    if {"energy", "relax", "hull"} & set(selected) and "generate" not in selected:
+        raise ValueError("The energy, relax and hull stages need the generate stage")
+    if "hull" in selected and not {"energy", "relax"} & set(selected):
+        raise ValueError("The hull stage needs the energy or relax stage")
+    return selected
+
+
+def _sort_key(candidate: PipelineCandidate) -> tuple[float, float]:
+    inf = float("inf")
+    primary = candidate.energy_above_hull
+    if primary is None:
+        primary = candidate.formation_energy
+    secondary = candidate.formation_energy
+    return (inf if primary is None else primary, inf if secondary is None else secondary)
+
+
+class ScreeningPipeline:
+    """SMACT -> Chemeleon -> MACE -> hull screen over many compositions in one call."""
+
+    def __init__(
+        self,
+        tools: ToolRegistry,
+        stages: list[str] | None = None,
+        structures_per_composition: int = 1,
+        max_formation_energy: float | None = None,
+        max_energy_above_hull: float | None = None,
+        fmax: float = 0.05,
+        relax_steps: int = 200,
+        seed: int | None = None,
+        prefer_gpu: bool = True,
+        budget: Budget | None = None,
+    ):
+        """
+        Args:
+            tools: Registry holding ``chemeleon_predictor``, ``mace_calculator`` and
+                ``phase_diagram_analyzer``
+            stages: Stages to run (default: all)
+            structures_per_composition: Chemeleon samples per composition
+            max_formation_energy: Reject structures above this formation energy (eV/atom)
+            max_energy_above_hull: Reject structures further above the hull (eV/atom)
+            fmax: Relaxation force convergence criterion (eV/Å)
+            relax_steps: Maximum relaxation steps
+            seed: Random seed for Chemeleon sampling (seeded samples are cached)
+            prefer_gpu: Use a GPU for Chemeleon if available
+            budget: Time budget and cancellation flag for the whole run
+
+        Raises:
+            ValueError: If the stage list is invalid
+        """
+        self.tools = tools
+        self.stages = normalize_stages(stages)
+        self.structures_per_composition = max(1, structures_per_composition)
+        self.max_formation_energy = max_formation_energy
+        self.max_energy_above_hull = max_energy_above_hull
+        self.fmax = fmax
+        self.relax_steps = relax_steps
+        self.seed = seed
+        self.prefer_gpu = prefer_gpu
+        self.budget = budget
+        self.stage_counts = dict.fromkeys(self.stages, 0)
+        self.stage_seconds = dict.fromkeys(self.stages, 0.0)
+
+    def _passed(self, candidate: PipelineCandidate, stage: str, start: float) -> None:
+        self.stage_seconds[stage] += time.perf_counter() - start
+        self.stage_counts[stage] += 1
+        candidate.stage = stage
+
+    def _reject(self, candidate: PipelineCandidate, stage: str, start: float, error: str) -> None:
+        self.stage_seconds[stage] += time.perf_counter() - start
+        candidate.rejected_at = stage
+        candidate.error = error
+
+    async def run(
+        self, compositions: list[str], progress: ProgressCallback | None = None
+    ) -> ScreeningPipelineResult:
+        """
+        Screen compositions through the configured stages.
+
+        Args:
+            compositions: Chemical formulas; repeats are screened once
+            progress: Awaited after each composition is generated and each structure
+                evaluated
+
+        Returns:
+            Candidates that passed every stage (ranked, best first) and rejected
+            candidates with the stage and reason
+        """
+        start = time.perf_counter()
+        formulas = list(dict.fromkeys(compositions))
+        result = ScreeningPipelineResult(stages=self.stages, num_compositions=len(formulas))
+        survivors: list[PipelineCandidate] = []
+
+        async def report(done: float, total: float, message: str) -> None:
+            if progress is not None:
+                try:
+                    await progress(done, total, message)
+                except Exception as e:
+                    logger.debug(f"Progress notification failed: {e}")
+
+        if "validate" in self.stages:
+            formulas = await self._validate(formulas, result.rejected)
+            await report(0, len(formulas), f"validate: {len(formulas)} valid compositions")
+
+        if "generate" not in self.stages:
+            for formula in formulas:
+                survivors.append(PipelineCandidate(formula=formula, stage="validate"))
+        else:
+            survivors = await self._screen(formulas, result.rejected, report)
+
+        survivors.sort(key=_sort_key)
+        for rank, candidate in enumerate(survivors, start=1):
+            candidate.rank = rank
+        result.ranked = survivors
+        result.stage_counts = dict(self.stage_counts)
+        result.stage_seconds = {stage: round(s, 3) for stage, s in self.stage_seconds.items()}
+        result.stopped = self.budget.stopped if self.budget is not None else None
+        result.computation_time = time.perf_counter() - start
+        logger.info(
+            f"Screened {result.num_compositions} compositions in {result.computation_time:.1f}s: "
+            f"{len(survivors)} passed, {len(result.rejected)} rejected"
+        )
+        return result
+
+    async def _validate(self, formulas: list[str], rejected: list[PipelineCandidate]) -> list[str]:
+        from .smact.bulk import validate_compositions_bulk
+
+        start = time.perf_counter()
+        bulk = await asyncio.to_thread(validate_compositions_bulk, formulas)
+        self.stage_seconds["validate"] += time.perf_counter() - start
+        if not bulk.success:
+            raise RuntimeError(bulk.error_message or "SMACT validation failed")
+        valid = []
+        for formula, verdict in zip(formulas, bulk.verdicts, strict=True):
+            if verdict:
+                valid.append(formula)
+            else:
+                rejected.append(
+                    PipelineCandidate(
+                        formula=formula,
+                        stage="input",
+                        rejected_at="validate",
+                        error=bulk.errors.get(formula, "Fails SMACT charge-neutrality rules"),
+                    )
+                )
+        self.stage_counts["validate"] = len(valid)
+        return valid
+
+    async def _screen(
+        self,
+        formulas: list[str],
+        rejected: list[PipelineCandidate],
+        report: Callable[[float, float, str], Awaitable[None]],
+    ) -> list[PipelineCandidate]:
+        """Generate structures and evaluate them with MACE as they arrive."""
+        queue: asyncio.Queue[tuple[PipelineCandidate, dict[str, Any]] | None] = asyncio.Queue(
+            QUEUE_SIZE
+        )
+        total = len(formulas) * (1 + self.structures_per_composition)
+        done = 0
+        survivors: list[PipelineCandidate] = []
+
+        async def generate() -> None:
+            nonlocal done, total
+            generated = 0
+            try:
+                await asyncio.to_thread(wait_for_resource, self.tools, "chemeleon:csp")
+                predictor = await asyncio.to_thread(self.tools.get, "chemeleon_predictor")
+                for formula in formulas:
+                    structures = await self._generate(predictor, formula, rejected)
+                    generated += 1
+                    # Compositions that yield fewer structures shrink the total
+                    total -= self.structures_per_composition - len(structures)
+                    done += 1
+                    await report(done, total, f"generate: {formula} ({len(structures)} structures)")
+                    for item in structures:
+                        await queue.put(item)
+            except Exception as e:
+                logger.error(f"Structure generation failed: {e}")
+                for formula in formulas[generated:]:
+                    rejected.append(
+                        PipelineCandidate(
+                            formula=formula, stage="validate", rejected_at="generate", error=str(e)
+                        )
+                    )
+            # Not in a finally: once cancelled there is no consumer, and a full queue
+            # would block the producer forever
+            await queue.put(None)
+
+        producer = asyncio.create_task(generate())
+        try:
+            # Load MACE and the phase diagram while the first structures are sampled
+            if {"energy", "relax"} & set(self.stages):
+                await asyncio.to_thread(wait_for_resource, self.tools, "mace:medium")
+            if "hull" in self.stages:
+                await asyncio.to_thread(wait_for_resource, self.tools, "phase_diagram")
+            while (item := await queue.get()) is not None:
+                candidate, structure = item
+                try:
+                    await asyncio.to_thread(self._evaluate, candidate, structure)
+                except Exception as e:
+                    candidate.rejected_at = self._next_stage(candidate.stage)
+                    candidate.error = str(e)
+                (rejected if candidate.rejected_at else survivors).append(candidate)
+                done += 1
+                await report(done, total, self._describe(candidate))
+            await producer
+        finally:
+            # The consumer failed or was cancelled: stop generating for it
+            if not producer.done():
+                producer.cancel()
+                with suppress(asyncio.CancelledError):
+                    await producer
+        return survivors
+
+    async def _generate(
+        self, predictor: Any, formula: str, rejected: list[PipelineCandidate]
+    ) -> list[tuple[PipelineCandidate, dict[str, Any]]]:
+        """Sample structures for one composition and put them in the structure store."""
+        start = time.perf_counter()
+        candidate = PipelineCandidate(formula=formula, stage="validate")
+        # The predictor's coroutine runs the model synchronously, so give it its own
+        # thread (and loop) to keep the MACE stage and the MCP session responsive
+        prediction = await asyncio.to_thread(
+            asyncio.run,
+            predictor.predict_structure(
+                formula=formula,
+                num_samples=self.structures_per_composition,
+                prefer_gpu=self.prefer_gpu,
+                seed=self.seed,
+                budget=self.budget,
+            ),
+        )
+        if not prediction.success or not prediction.predicted_structures:
+            self._reject(candidate, "generate", start, prediction.error or "No structures")
+            rejected.append(candidate)
+            return []
+        store = get_structure_store()
+        items = []
+        for sampled in prediction.predicted_structures:
+            structure = sampled.model_dump()
+            handle = store.put(structure, formula=sampled.formula)
+            items.append(
+                (
+                    PipelineCandidate(
+                        formula=formula,
+                        structure=StructureSummary(**store.summary(handle)),
+                        stage="generate",
+                    ),
+                    structure,
+                )
+            )
+        self.stage_seconds["generate"] += time.perf_counter() - start
+        self.stage_counts["generate"] += len(items)
+        return items
+
+    def _next_stage(self, stage: str) -> str:
+        later = [s for s in self.stages if STAGES.index(s) > STAGES.index(stage)]
+        return later[0] if later else stage
+
+    def _evaluate(self, candidate: PipelineCandidate, structure: dict[str, Any]) -> None:
+        """Run the MACE and hull stages on one structure (in a worker thread)."""
+        if self.budget is not None:
+            self.budget.checkpoint(0)
+        if {"energy", "relax"} & set(self.stages):
+            mace = self.tools.get("mace_calculator")
+        structure = {
+            "numbers": structure["numbers"],
+            "positions": structure["positions"],
+            "cell": structure["cell"],
+            "pbc": structure.get("pbc", [True, True, True]),
+        }
+
+        if "energy" in self.stages:
+            start = time.perf_counter()
+            energy = asyncio.run(mace.calculate_formation_energy(structure))
+            if not energy.success:
+                return self._reject(candidate, "energy", start, energy.error or "MACE failed")
+            candidate.formation_energy = energy.formation_energy
+            candidate.total_energy = energy.total_energy
+            limit = self.max_formation_energy
+            if limit is not None and energy.formation_energy > limit:
+                return self._reject(
+                    candidate,
+                    "energy",
+                    start,
+                    f"Formation energy {energy.formation_energy:.3f} eV/atom is above {limit}",
+                )
+            self._passed(candidate, "energy", start)
+
+        if "relax" in self.stages:
+            start = time.perf_counter()
+            relaxation = asyncio.run(
+                mace.relax_structure(
+                    structure=structure,
+                    fmax=self.fmax,
+                    steps=self.relax_steps,
+                    budget=self.budget,
+                )
+            )
+            if not relaxation.success or not relaxation.relaxed_structure:
+                return self._reject(
+                    candidate, "relax", start, relaxation.error or "Relaxation failed"
+                )
+            if relaxation.stopped:
+                return self._reject(
+                    candidate, "relax", start, f"Relaxation stopped early ({relaxation.stopped})"
+                )
+            structure = relaxation.relaxed_structure
+            store = get_structure_store()
+            handle = store.put(structure, formula=candidate.formula)
+            candidate.structure = StructureSummary(**store.summary(handle))
+            candidate.total_energy = relaxation.final_energy
+            candidate.relaxed = True
+            self._passed(candidate, "relax", start)
+
+        if "hull" in self.stages:
+            from ase import Atoms
+
+            start = time.perf_counter()
+            cell_formula = Atoms(numbers=structure["numbers"]).get_chemical_formula()
+            hull = self.tools.get("phase_diagram_analyzer").calculate_energy_above_hull(
+                cell_formula, candidate.total_energy, per_atom=False
+            )
+            if not hull.success:
+                return self._reject(candidate, "hull", start, hull.error or "Hull analysis failed")
+            candidate.energy_above_hull = hull.energy_above_hull
+            candidate.is_stable = hull.is_stable
+            limit = self.max_energy_above_hull
+            if limit is not None and hull.energy_above_hull > limit:
+                return self._reject(
+                    candidate,
+                    "hull",
+                    start,
+                    f"{hull.energy_above_hull:.3f} eV/atom above hull exceeds {limit}",
+                )
+            self._passed(candidate, "hull", start)
+
+    @staticmethod
+    def _describe(candidate: PipelineCandidate) -> str:
+        label = candidate.formula
+        if candidate.structure:
+            label += f" {candidate.structure.handle}"
+        if candidate.rejected_at:
+            return f"{candidate.rejected_at}: rejected {label}"
+        if candidate.energy_above_hull is not None:
+            label += f" e_hull={candidate.energy_above_hull:.3f}"
+        return f"{candidate.stage}: {label}"
+
+
+@dataclass
+class Stage:
+    """One step of a ``run_stages`` pipeline."""
+
+    name: str
+    # Called in a worker thread with one item; returns the items for the next stage
+    func: Callable[[Any], Iterable[Any]]
+    workers: int = 1
+
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+async def run_stages(
+    items: Iterable[Any],
+    stages: list[Stage],
+    queue_size: int = QUEUE_SIZE,
+    stage_seconds: dict[str, float] | None = None,
+) -> list[Any]:
+    """
+    Run items through stages that work concurrently.
+
+    Each stage has ``workers`` threads taking items from a queue of at most
+    ``queue_size`` items; whatever a stage returns is queued for the next one.
+    A stage function that raises drops that item (the error is logged), so
+    stages should report failures in the items they return.
+
+    Args:
+        items: Inputs to the first stage
+        stages: Stages in order
+        queue_size: Items waiting in front of each stage
+        stage_seconds: Filled with the time (s) each stage's workers spent busy
+
+    Returns:
+        Outputs of the last stage, in completion order
+    """
+    if stage_seconds is None:
+        stage_seconds = {}
+    for stage in stages:
+        stage_seconds.setdefault(stage.name, 0.0)
+    queues: list[asyncio.Queue] = [asyncio.Queue(max(1, queue_size)) for _ in stages]
+    remaining = [max(1, stage.workers) for stage in stages]
+    outputs: list[Any] = []
+
+    async def feed() -> None:
+        for item in items:
+            await queues[0].put(item)
+        for _ in range(remaining[0]):
+            await queues[0].put(_DONE)
+
+    async def work(index: int) -> None:
+        stage = stages[index]
+        last = index == len(stages) - 1
+        while (item := await queues[index].get()) is not _DONE:
+            start = time.perf_counter()
+            try:
+                results = list(await asyncio.to_thread(stage.func, item))
+            except Exception as e:
+                logger.error(f"Pipeline stage {stage.name} failed: {e}")
+                results = []
+            stage_seconds[stage.name] += time.perf_counter() - start
+            for result in results:
+                if last:
+                    outputs.append(result)
+                else:
+                    await queues[index + 1].put(result)
+        remaining[index] -= 1
+        if remaining[index] == 0 and not last:
+            for _ in range(remaining[index + 1]):
+                await queues[index + 1].put(_DONE)
+
+    workers = [
+        work(index) for index, stage in enumerate(stages) for _ in range(max(1, stage.workers))
+    ]
+    await asyncio.gather(feed(), *workers)
+    return outputs
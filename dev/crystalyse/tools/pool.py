@@ -0,0 +1,58 @@
+"""
+Process-pool fan-out for CPU-bound batch analyses.
+
+Symmetry, coordination, bond-valence and SMACT batches are pure Python and hold
+the GIL, so threads do not speed them up. ``map_in_processes`` spreads their
+tasks over a short-lived ``ProcessPoolExecutor`` when the batch is large enough
+to pay for starting the workers, and runs them in-process otherwise, or when no
+pool can be started (no ``fork``, restricted sandboxes, a task that cannot be
+pickled).
+
+Task functions must be importable at module level and should return an error
+value rather than raise: an exception from a worker aborts the pool and the
+whole batch is repeated in-process.
+"""
+
+import logging
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def map_in_processes(
+    func: Callable[[Any], T],
+    tasks: Sequence[Any],
+    workers: int | None = None,
+    parallel: bool = True,
+    chunksize: int = 1,
+    isolate: bool = False,
+) -> tuple[list[T], int]:
+    """
+    Apply ``func`` to every task, in worker processes where worthwhile.
+
+    Args:
+        func: Module-level function taking one task
+        tasks: Picklable task arguments
+        workers: Worker processes (default: CPU count; 1 disables the pool)
+        parallel: Whether the batch is large enough for a pool (the caller's
+            threshold)
+        chunksize: Tasks sent to a worker at a time
+        isolate: Use worker processes even for one task or one worker, e.g. so
+            tasks run on a main thread that can receive signals
+
+    Returns:
+        (results in task order, processes used)
+    """
+    max_workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if tasks and (isolate or (parallel and max_workers > 1)):
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                return list(pool.map(func, tasks, chunksize=chunksize)), max_workers
+        except Exception as e:
+            logger.warning(f"Process pool unavailable ({e}); running in-process")
+    return [func(task) for task in tasks], 1
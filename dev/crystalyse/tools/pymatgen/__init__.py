@@ -1,13 +1,35 @@
 """PyMatgen tools package - structure analysis and phase diagrams."""
 
-from .analyzer import CoordinationResult, OxidationStateResult, PyMatgenAnalyzer, SpaceGroupResult
-from .phase_diagram import EnergyAboveHullResult, PhaseDiagramAnalyzer
+from .analyzer import (
+    CoordinationBatchResult,
+    CoordinationResult,
+    OxidationStateBatchResult,
+    OxidationStateResult,
+    PyMatgenAnalyzer,
+    SpaceGroupBatchResult,
+    SpaceGroupResult,
+)
+from .phase_diagram import (
+    EnergyAboveHullResult,
+    HullTargetBatchResult,
+    HullTargetResult,
+    KnownMaterialResult,
+    KnownMaterialsBatchResult,
+    PhaseDiagramAnalyzer,
+)
 
 __all__ = [
     "PyMatgenAnalyzer",
     "SpaceGroupResult",
+    "SpaceGroupBatchResult",
     "CoordinationResult",
+    "CoordinationBatchResult",
     "OxidationStateResult",
+    "OxidationStateBatchResult",
     "PhaseDiagramAnalyzer",
     "EnergyAboveHullResult",
+    "HullTargetResult",
+    "HullTargetBatchResult",
+    "KnownMaterialResult",
+    "KnownMaterialsBatchResult",
 ]
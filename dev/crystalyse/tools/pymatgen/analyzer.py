@@ -1,76 +1,41 @@
 """PyMatgen analysis tools - space group, coordination, oxidation states."""
 
 import logging
+import time
 from typing import Any
 
 import numpy as np
-from pydantic import BaseModel, Field
-from pymatgen.analysis.bond_valence import BVAnalyzer
-from pymatgen.analysis.local_env import VoronoiNN
-from pymatgen.core import Structure
-from pymatgen.io.cif import CifParser
-from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+from pymatgen.core import IStructure, Structure
+
+from ...utils.parse_cache import parse_cif_structure
+from ..models import (
+    CoordinationBatchResult,
+    CoordinationResult,
+    OxidationStateBatchResult,
+    OxidationStateResult,
+    SpaceGroupBatchResult,
+    SpaceGroupResult,
+)
+from ..structure_store import get_structure_store
+from .coordination import METHODS, SYMPREC, analyze_sites, analyze_structures
+from .oxidation import DEFAULT_TIME_BUDGET, assign_oxidation_states_batch
+from .symmetry import analyze_symmetry_batch, groups_for_fields
 
 logger = logging.getLogger(__name__)
 
 
-class SpaceGroupResult(BaseModel):
-    """Space group analysis result."""
-
-    success: bool = True
-    space_group_symbol: str
-    space_group_number: int
-    point_group: str
-    crystal_system: str
-    hall_symbol: str
-    original_formula: str
-    original_num_atoms: int
-    primitive_formula: str
-    primitive_num_atoms: int
-    num_symmetry_ops: int
-    lattice_a: float
-    lattice_b: float
-    lattice_c: float
-    lattice_alpha: float
-    lattice_beta: float
-    lattice_gamma: float
-    volume: float
-    symmetrized_cif: str | None = None
-    primitive_cif: str | None = None
-    error: str | None = None
-
-
-class CoordinationResult(BaseModel):
-    """Coordination analysis result."""
-
-    success: bool = True
-    formula: str
-    num_sites: int
-    sites_analyzed: int
-    average_coordination: float
-    coordination_data: list[dict[str, Any]] = Field(default_factory=list)
-    error: str | None = None
-
-
-class OxidationStateResult(BaseModel):
-    """Oxidation state validation result."""
-
-    success: bool = True
-    formula: str
-    oxidation_states_guessed: bool
-    structure_is_valid: bool
-    site_analysis: list[dict[str, Any]] = Field(default_factory=list)
-    validity_percentage: float
-    error: str | None = None
-
-
-def _parse_structure(structure_input: str | dict[str, Any]) -> Structure:
-    """Parse structure from various input formats."""
-    if isinstance(structure_input, str):
-        from io import StringIO
+def _parse_structure(structure_input: str | dict[str, Any]) -> IStructure:
+    """
+    Parse structure from various input formats, for read-only analysis.
 
-        parser = CifParser(StringIO(structure_input))
-        structure = parser.parse_structures()[0]
+    CIF strings go through the shared parse cache and return the cached
+    ``IStructure`` itself; dicts return a new ``Structure`` (a subclass). Either
+    way callers must not modify the result; copy it with ``Structure.from_sites``
+    first. Structure-store handles are replaced by the structure they refer to.
+    """
+    structure_input = get_structure_store().resolve(structure_input)
+    if isinstance(structure_input, str):
+        structure = parse_cif_structure(structure_input)
     elif isinstance(structure_input, dict):
         # Check for PyMatGen format (has 'lattice' and 'sites')
         if "lattice" in structure_input and "sites" in structure_input:
@@ -107,20 +72,67 @@ def _parse_structure(structure_input: str | dict[str, Any]) -> Structure:
     return structure
 
 
-def _guess_coordination_geometry(cn: int) -> str:
-    """Guess coordination geometry from coordination number."""
-    geometries = {
-        2: "linear",
-        3: "trigonal planar",
-        4: "tetrahedral or square planar",
-        5: "trigonal bipyramidal or square pyramidal",
-        6: "octahedral",
-        7: "pentagonal bipyramidal or capped octahedral",
-        8: "cubic or square antiprismatic",
-        9: "tricapped trigonal prismatic",
-        12: "cuboctahedral or anticuboctahedral",
-    }
-    return geometries.get(cn, f"{cn}-coordinate")
+def _failed_space_group(error: str) -> SpaceGroupResult:
+    return SpaceGroupResult(
+        success=False,
+        space_group_symbol="P1",
+        space_group_number=1,
+        point_group="1",
+        crystal_system="triclinic",
+        hall_symbol="P 1",
+        original_formula="unknown",
+        original_num_atoms=0,
+        primitive_formula="unknown",
+        primitive_num_atoms=0,
+        num_symmetry_ops=0,
+        lattice_a=0.0,
+        lattice_b=0.0,
+        lattice_c=0.0,
+        lattice_alpha=0.0,
+        lattice_beta=0.0,
+        lattice_gamma=0.0,
+        volume=0.0,
+        error=error,
+    )
+
+
+def _coordination_result(
+    structure: IStructure, method: str, coordination_data: list[dict[str, Any]], num_unique: int
+) -> CoordinationResult:
+    all_cns = [d["coordination_number"] for d in coordination_data]
+    return CoordinationResult(
+        success=True,
+        formula=structure.composition.reduced_formula,
+        num_sites=len(structure),
+        sites_analyzed=len(coordination_data),
+        average_coordination=float(np.mean(all_cns)) if all_cns else 0.0,
+        method=method,
+        num_inequivalent_sites=num_unique,
+        coordination_data=coordination_data,
+    )
+
+
+def _failed_oxidation(error: str, formula: str = "unknown") -> OxidationStateResult:
+    return OxidationStateResult(
+        success=False,
+        formula=formula,
+        oxidation_states_guessed=False,
+        structure_is_valid=False,
+        validity_percentage=0.0,
+        error=error,
+    )
+
+
+def _failed_coordination(error: str, method: str) -> CoordinationResult:
+    return CoordinationResult(
+        success=False,
+        formula="unknown",
+        num_sites=0,
+        sites_analyzed=0,
+        average_coordination=0.0,
+        method=method,
+        error=error,
+    )
 
 
 class PyMatgenAnalyzer:
@@ -131,255 +143,268 @@ class PyMatgenAnalyzer:
         structure_input: str | dict[str, Any],
         symprec: float = 0.1,
         angle_tolerance: float = 5.0,
+        fields: list[str] | None = None,
     ) -> SpaceGroupResult:
         """
         Analyze the space group and symmetry of a crystal structure.
 
+        Results are cached per structure and tolerance (see ``symmetry.py``).
+
         Args:
             structure_input: CIF string or pymatgen structure dict
             symprec: Symmetry precision for distance tolerance (in Angstrom)
             angle_tolerance: Angle tolerance for symmetry finding (in degrees)
+            fields: Result fields to compute (None for all, including both CIFs)
 
         Returns:
             Structured space group analysis result
         """
         try:
             structure = _parse_structure(structure_input)
-
-            analyzer = SpacegroupAnalyzer(
-                structure, symprec=symprec, angle_tolerance=angle_tolerance
-            )
-
-            space_group_symbol = analyzer.get_space_group_symbol()
-            space_group_number = analyzer.get_space_group_number()
-            point_group = analyzer.get_point_group_symbol()
-            crystal_system = analyzer.get_crystal_system()
-            hall_symbol = analyzer.get_hall()
-
-            primitive_structure = analyzer.get_primitive_standard_structure()
-            conventional_structure = analyzer.get_conventional_standard_structure()
-            symmetry_ops = analyzer.get_symmetry_operations()
-
-            return SpaceGroupResult(
-                success=True,
-                space_group_symbol=space_group_symbol,
-                space_group_number=space_group_number,
-                point_group=point_group,
-                crystal_system=crystal_system,
-                hall_symbol=hall_symbol,
-                original_formula=structure.composition.reduced_formula,
-                original_num_atoms=len(structure),
-                primitive_formula=primitive_structure.composition.reduced_formula,
-                primitive_num_atoms=len(primitive_structure),
-                num_symmetry_ops=len(symmetry_ops),
-                lattice_a=conventional_structure.lattice.a,
-                lattice_b=conventional_structure.lattice.b,
-                lattice_c=conventional_structure.lattice.c,
-                lattice_alpha=conventional_structure.lattice.alpha,
-                lattice_beta=conventional_structure.lattice.beta,
-                lattice_gamma=conventional_structure.lattice.gamma,
-                volume=conventional_structure.lattice.volume,
-                symmetrized_cif=conventional_structure.to(fmt="cif"),
-                primitive_cif=primitive_structure.to(fmt="cif"),
+            results, _, _ = analyze_symmetry_batch(
+                [structure], symprec, angle_tolerance, fields=fields, workers=1
             )
+            if isinstance(results[0], str):
+                raise ValueError(results[0])
+            return SpaceGroupResult(success=True, **results[0])
 
         except Exception as e:
             logger.error(f"Space group analysis failed: {e}")
-            return SpaceGroupResult(
-                success=False,
-                space_group_symbol="P1",
-                space_group_number=1,
-                point_group="1",
-                crystal_system="triclinic",
-                hall_symbol="P 1",
-                original_formula="unknown",
-                original_num_atoms=0,
-                primitive_formula="unknown",
-                primitive_num_atoms=0,
-                num_symmetry_ops=0,
-                lattice_a=0.0,
-                lattice_b=0.0,
-                lattice_c=0.0,
-                lattice_alpha=0.0,
-                lattice_beta=0.0,
-                lattice_gamma=0.0,
-                volume=0.0,
-                error=str(e),
-            )
+            return _failed_space_group(str(e))
+
+    @staticmethod
+    def analyze_space_group_batch(
+        structure_inputs: list[str | dict[str, Any]],
+        symprec: float = 0.1,
+        angle_tolerance: float = 5.0,
+        fields: list[str] | None = None,
+        workers: int | None = None,
+    ) -> SpaceGroupBatchResult:
+        """
+        Analyze the space groups of many structures.
+
+        Args:
+            structure_inputs: CIF strings, structure dicts or structure-store handles
+            symprec: Symmetry precision for distance tolerance (in Angstrom)
+            angle_tolerance: Angle tolerance for symmetry finding (in degrees)
+            fields: Result fields to compute (None for all, including both CIFs)
+            workers: Worker processes (default: CPU count; 1 disables the pool)
+
+        Returns:
+            One space group result per input, in input order
+        """
+        start = time.perf_counter()
+        try:
+            groups_for_fields(fields)
+        except ValueError as e:
+            return SpaceGroupBatchResult(success=False, error=str(e))
+
+        structures, parse_errors = [], {}
+        for i, structure_input in enumerate(structure_inputs):
+            try:
+                structures.append(_parse_structure(structure_input))
+            except Exception as e:
+                parse_errors[i] = f"Could not parse structure: {e}"
+
+        values, hits, used = analyze_symmetry_batch(
+            structures, symprec, angle_tolerance, fields=fields, workers=workers
+        )
+        values = iter(values)
+        results = []
+        for i in range(len(structure_inputs)):
+            value = parse_errors.get(i) or next(values)
+            if isinstance(value, str):
+                results.append(_failed_space_group(value))
+            else:
+                results.append(SpaceGroupResult(success=True, **value))
+
+        return SpaceGroupBatchResult(
+            results=results,
+            num_failed=sum(1 for r in results if not r.success),
+            cache_hits=hits,
+            workers=used,
+            computation_time=time.perf_counter() - start,
+        )
 
     @staticmethod
     def analyze_coordination(
-        structure_input: str | dict[str, Any], site_index: int | None = None
+        structure_input: str | dict[str, Any],
+        site_index: int | None = None,
+        method: str = "voronoi",
+        symmetry_reduce: bool = True,
+        symprec: float = SYMPREC,
     ) -> CoordinationResult:
         """
         Analyze coordination environment of sites in a structure.
 
+        Only one site per symmetry orbit is analysed; equivalent sites share its
+        result (see ``coordination.py``).
+
         Args:
             structure_input: CIF string or pymatgen structure dict
             site_index: Specific site index to analyze (None = all sites)
+            method: Neighbour finding method ("voronoi", "crystalnn" or "cutoff")
+            symmetry_reduce: Analyse only symmetry-inequivalent sites
+            symprec: Symmetry precision (Å) for grouping equivalent sites
 
         Returns:
             Structured coordination analysis result
         """
         try:
             structure = _parse_structure(structure_input)
-            voronoi_nn = VoronoiNN()
-
-            if site_index is not None:
-                sites_to_analyze = [site_index]
-            else:
-                sites_to_analyze = range(len(structure))
-
-            coordination_data = []
-
-            for idx in sites_to_analyze:
-                site = structure[idx]
-                nn_info = voronoi_nn.get_nn_info(structure, idx)
-                cn = len(nn_info)
-
-                coordinated_sites = [info["site"] for info in nn_info]
-                bond_lengths = []
-                coordinating_elements = {}
-
-                for coord_site in coordinated_sites:
-                    distance = site.distance(coord_site)
-                    bond_lengths.append(distance)
-
-                    element = coord_site.specie.symbol
-                    if element not in coordinating_elements:
-                        coordinating_elements[element] = []
-                    coordinating_elements[element].append(distance)
-
-                avg_bond_lengths = {
-                    elem: float(np.mean(distances))
-                    for elem, distances in coordinating_elements.items()
-                }
-
-                coordination_data.append(
-                    {
-                        "site_index": idx,
-                        "element": site.specie.symbol,
-                        "fractional_coords": site.frac_coords.tolist(),
-                        "coordination_number": cn,
-                        "bond_lengths": {
-                            "min": float(min(bond_lengths)) if bond_lengths else 0,
-                            "max": float(max(bond_lengths)) if bond_lengths else 0,
-                            "mean": float(np.mean(bond_lengths)) if bond_lengths else 0,
-                            "by_element": avg_bond_lengths,
-                        },
-                        "coordinating_elements": list(coordinating_elements.keys()),
-                        "geometry": _guess_coordination_geometry(cn),
-                    }
-                )
-
-            all_cns = [d["coordination_number"] for d in coordination_data]
-
-            return CoordinationResult(
-                success=True,
-                formula=structure.composition.reduced_formula,
-                num_sites=len(structure),
-                sites_analyzed=len(coordination_data),
-                average_coordination=float(np.mean(all_cns)) if all_cns else 0.0,
-                coordination_data=coordination_data,
+            coordination_data, num_unique = analyze_sites(
+                structure,
+                method=method,
+                site_index=site_index,
+                symmetry_reduce=symmetry_reduce,
+                symprec=symprec,
             )
+            return _coordination_result(structure, method, coordination_data, num_unique)
 
         except Exception as e:
             logger.error(f"Coordination analysis failed: {e}")
-            return CoordinationResult(
-                success=False,
-                formula="unknown",
-                num_sites=0,
-                sites_analyzed=0,
-                average_coordination=0.0,
-                error=str(e),
+            return _failed_coordination(str(e), method)
+
+    @staticmethod
+    def analyze_coordination_batch(
+        structure_inputs: list[str | dict[str, Any]],
+        method: str = "cutoff",
+        symmetry_reduce: bool = True,
+        symprec: float = SYMPREC,
+        workers: int | None = None,
+    ) -> CoordinationBatchResult:
+        """
+        Analyze the coordination environments of many structures.
+
+        Args:
+            structure_inputs: CIF strings, structure dicts or structure-store handles
+            method: Neighbour finding method ("voronoi", "crystalnn" or "cutoff")
+            symmetry_reduce: Analyse only symmetry-inequivalent sites
+            symprec: Symmetry precision (Å) for grouping equivalent sites
+            workers: Worker processes (default: CPU count; 1 disables the pool)
+
+        Returns:
+            One coordination result per input, in input order
+        """
+        start = time.perf_counter()
+        if method not in METHODS:
+            return CoordinationBatchResult(
+                success=False, error=f"Unknown method '{method}'. Choose from {list(METHODS)}"
             )
 
+        structures, parse_errors = [], {}
+        for i, structure_input in enumerate(structure_inputs):
+            try:
+                structures.append(_parse_structure(structure_input))
+            except Exception as e:
+                parse_errors[i] = f"Could not parse structure: {e}"
+
+        values, used = analyze_structures(
+            structures,
+            method=method,
+            symmetry_reduce=symmetry_reduce,
+            symprec=symprec,
+            workers=workers,
+        )
+        analysed = iter(zip(structures, values, strict=True))
+        results = []
+        for i in range(len(structure_inputs)):
+            if i in parse_errors:
+                results.append(_failed_coordination(parse_errors[i], method))
+                continue
+            structure, value = next(analysed)
+            if isinstance(value, str):
+                results.append(_failed_coordination(value, method))
+            else:
+                results.append(_coordination_result(structure, method, *value))
+
+        return CoordinationBatchResult(
+            results=results,
+            num_failed=sum(1 for r in results if not r.success),
+            workers=used,
+            computation_time=time.perf_counter() - start,
+        )
+
     @staticmethod
     def validate_oxidation_states(
         structure_input: str | dict[str, Any],
         oxidation_states: dict[str, float] | None = None,
+        time_budget: float | None = None,
     ) -> OxidationStateResult:
         """
         Validate oxidation states using bond valence analysis.
 
+        Compositions with a single SMACT charge-neutral assignment skip the
+        bond-valence search; results are cached (see ``oxidation.py``).
+
         Args:
             structure_input: CIF string or pymatgen structure dict
             oxidation_states: Optional dict of element: oxidation_state
+            time_budget: Seconds of bond-valence analysis before falling back (None = no limit)
 
         Returns:
             Structured oxidation state validation result
         """
         try:
             structure = _parse_structure(structure_input)
+            results, _, _ = assign_oxidation_states_batch(
+                [structure], oxidation_states, time_budget=time_budget, workers=1
+            )
+            if isinstance(results[0], str):
+                return _failed_oxidation(results[0], structure.composition.reduced_formula)
+            return OxidationStateResult(success=True, **results[0])
 
-            if oxidation_states:
-                structure.add_oxidation_state_by_element(oxidation_states)
-
-            if not any(hasattr(site.specie, "oxi_state") for site in structure):
-                try:
-                    structure.add_oxidation_state_by_guess()
-                    guessed = True
-                except Exception:
-                    return OxidationStateResult(
-                        success=False,
-                        formula=structure.composition.reduced_formula,
-                        oxidation_states_guessed=False,
-                        structure_is_valid=False,
-                        validity_percentage=0.0,
-                        error="Could not determine oxidation states",
-                    )
-            else:
-                guessed = False
+        except Exception as e:
+            logger.error(f"Oxidation state validation failed: {e}")
+            return _failed_oxidation(str(e))
+
+    @staticmethod
+    def validate_oxidation_states_batch(
+        structure_inputs: list[str | dict[str, Any]],
+        oxidation_states: dict[str, float] | None = None,
+        time_budget: float | None = DEFAULT_TIME_BUDGET,
+        workers: int | None = None,
+    ) -> OxidationStateBatchResult:
+        """
+        Validate the oxidation states of many structures.
 
-            bv_analyzer = BVAnalyzer()
+        Args:
+            structure_inputs: CIF strings, structure dicts or structure-store handles
+            oxidation_states: Optional dict of element: oxidation_state applied to all
+            time_budget: Seconds of bond-valence analysis per structure (None = no limit)
+            workers: Worker processes (default: CPU count; 1 disables the pool)
 
+        Returns:
+            One oxidation state result per input, in input order
+        """
+        start = time.perf_counter()
+        structures, parse_errors = [], {}
+        for i, structure_input in enumerate(structure_inputs):
             try:
-                bv_sum = bv_analyzer.get_valences(structure)
-                is_valid = bv_analyzer.get_oxi_state_decorated_structure(structure) is not None
+                structures.append(_parse_structure(structure_input))
             except Exception as e:
-                logger.warning(f"BV analysis warning: {e}")
-                bv_sum = None
-                is_valid = False
-
-            site_results = []
-            for i, site in enumerate(structure):
-                ox_state = getattr(site.specie, "oxi_state", None)
-                bv_value = bv_sum[i] if bv_sum is not None else None
-
-                site_results.append(
-                    {
-                        "site_index": i,
-                        "element": site.specie.element.symbol,
-                        "assigned_oxidation_state": ox_state,
-                        "bond_valence_sum": float(bv_value) if bv_value else None,
-                        "difference": float(abs(ox_state - bv_value))
-                        if (ox_state and bv_value)
-                        else None,
-                        "is_reasonable": abs(ox_state - bv_value) < 0.5
-                        if (ox_state and bv_value)
-                        else None,
-                    }
-                )
-
-            reasonable_sites = [s for s in site_results if s["is_reasonable"]]
-            validity = (len(reasonable_sites) / len(site_results) * 100) if site_results else 0.0
-
-            return OxidationStateResult(
-                success=True,
-                formula=structure.composition.reduced_formula,
-                oxidation_states_guessed=guessed,
-                structure_is_valid=is_valid,
-                site_analysis=site_results,
-                validity_percentage=validity,
-            )
-
-        except Exception as e:
-            logger.error(f"Oxidation state validation failed: {e}")
-            return OxidationStateResult(
-                success=False,
-                formula="unknown",
-                oxidation_states_guessed=False,
-                structure_is_valid=False,
-                validity_percentage=0.0,
-                error=str(e),
-            )
+                parse_errors[i] = f"Could not parse structure: {e}"
+
+        values, hits, used = assign_oxidation_states_batch(
+            structures, oxidation_states, time_budget=time_budget, workers=workers
+        )
+        analysed = iter(zip(structures, values, strict=True))
+        results = []
+        for i in range(len(structure_inputs)):
+            if i in parse_errors:
+                results.append(_failed_oxidation(parse_errors[i]))
+                continue
+            structure, value = next(analysed)
+            if isinstance(value, str):
+                results.append(_failed_oxidation(value, structure.composition.reduced_formula))
+            else:
+                results.append(OxidationStateResult(success=True, **value))
+
+        return OxidationStateBatchResult(
+            results=results,
+            num_failed=sum(1 for r in results if not r.success),
+            num_timed_out=sum(1 for r in results if r.timed_out),
+            cache_hits=hits,
+            workers=used,
+            computation_time=time.perf_counter() - start,
+        )
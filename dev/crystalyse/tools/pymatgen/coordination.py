@@ -0,0 +1,287 @@
+"""
+Coordination analysis with symmetry reduction and selectable neighbour backends.
+
+Running ``VoronoiNN.get_nn_info`` on every site made coordination the slowest
+analysis tool for supercells. Symmetry-equivalent sites have identical
+environments, so only one representative per spglib orbit (``equivalent_atoms``)
+is analysed and its result is copied to the other members.
+
+spglib is run with a tight tolerance (``SYMPREC``), so nearly symmetric cells
+such as relaxed or noisy supercells are not merged into orbits whose members have
+different environments. As a check, one other member of every orbit is analysed
+too; if its neighbours differ from the representative's (a different count or a
+distance off by more than ``ENVIRONMENT_TOLERANCE``), every member of that orbit
+is analysed separately.
+
+Backends:
+
+- ``voronoi``: pymatgen ``VoronoiNN`` (the previous behaviour);
+- ``crystalnn``: pymatgen ``CrystalNN``;
+- ``cutoff``: one vectorised periodic neighbour list
+  (``Structure.get_neighbor_list``). A neighbour counts if it lies within
+  ``(1 + tolerance)`` times the site's shortest neighbour distance, as in
+  ``MinimumDistanceNN``.
+"""
+
+import logging
+import warnings
+from typing import Any
+
+import numpy as np
+
+from ..pool import map_in_processes
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("voronoi", "crystalnn", "cutoff")
+
+# Search radius (Å) for the cutoff backend
+CUTOFF_RADIUS = 5.0
+
+# Relative tolerance on the shortest neighbour distance for the cutoff backend
+CUTOFF_TOLERANCE = 0.1
+
+# spglib tolerance (Å) for grouping sites into symmetry orbits
+SYMPREC = 1e-3
+
+# Largest neighbour-distance difference (Å) between members of one orbit
+ENVIRONMENT_TOLERANCE = 1e-2
+
+# Batches with fewer structures than this are analysed in-process
+PARALLEL_THRESHOLD = 4
+
+GEOMETRIES = {
+    2: "linear",
+    3: "trigonal planar",
+    4: "tetrahedral or square planar",
+    5: "trigonal bipyramidal or square pyramidal",
+    6: "octahedral",
+    7: "pentagonal bipyramidal or capped octahedral",
+    8: "cubic or square antiprismatic",
+    9: "tricapped trigonal prismatic",
+    12: "cuboctahedral or anticuboctahedral",
+}
+
+
+def guess_coordination_geometry(cn: int) -> str:
+    """Guess coordination geometry from coordination number."""
+    return GEOMETRIES.get(cn, f"{cn}-coordinate")
+
+
+def representative_sites(structure: Any, symprec: float = SYMPREC) -> np.ndarray:
+    """
+    Representative site index for every site (itself when symmetry is unavailable).
+
+    Args:
+        structure: pymatgen structure
+        symprec: Symmetry precision passed to spglib
+
+    Returns:
+        Array mapping each site index to the index of its representative
+    """
+    from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+
+    try:
+        dataset = SpacegroupAnalyzer(structure, symprec=symprec).get_symmetry_dataset()
+        return np.asarray(dataset.equivalent_atoms)
+    except Exception as e:
+        logger.debug(f"Symmetry reduction unavailable, analysing every site: {e}")
+        return np.arange(len(structure))
+
+
+def _cutoff_neighbours(
+    structure: Any, indices: list[int], radius: float, tolerance: float
+) -> dict[int, tuple[list[str], np.ndarray]]:
+    """Neighbour elements and distances of several sites from one neighbour list."""
+    centres, neighbours, _, distances = structure.get_neighbor_list(
+        radius, sites=[structure[i] for i in indices]
+    )
+    symbols = np.array([site.specie.symbol for site in structure])
+    found: dict[int, tuple[list[str], np.ndarray]] = {}
+    for k, index in enumerate(indices):
+        # get_neighbor_list does not reliably drop the centre itself when given sites
+        mask = (centres == k) & (distances > 1e-4)
+        d = distances[mask]
+        if len(d) == 0:
+            found[index] = ([], d)
+            continue
+        keep = d <= d.min() * (1 + tolerance)
+        found[index] = (symbols[neighbours[mask][keep]].tolist(), d[keep])
+    return found
+
+
+def _neighbours(
+    structure: Any, indices: list[int], method: str, cutoff: float, tolerance: float
+) -> dict[int, tuple[list[str], np.ndarray]]:
+    if method == "cutoff":
+        return _cutoff_neighbours(structure, indices, cutoff, tolerance)
+    return {i: _pymatgen_neighbours(structure, i, method) for i in indices}
+
+
+def _same_environment(a: tuple[list[str], np.ndarray], b: tuple[list[str], np.ndarray]) -> bool:
+    """Whether two sites have the same neighbour elements at the same distances."""
+    (elements_a, distances_a), (elements_b, distances_b) = a, b
+    if len(distances_a) != len(distances_b):
+        return False
+    order_a, order_b = np.argsort(distances_a), np.argsort(distances_b)
+    return sorted(elements_a) == sorted(elements_b) and bool(
+        np.allclose(distances_a[order_a], distances_b[order_b], rtol=0, atol=ENVIRONMENT_TOLERANCE)
+    )
+
+
+def _pymatgen_neighbours(structure: Any, index: int, method: str) -> tuple[list[str], np.ndarray]:
+    from pymatgen.analysis.local_env import CrystalNN, VoronoiNN
+
+    strategy = VoronoiNN() if method == "voronoi" else CrystalNN()
+    site = structure[index]
+    with warnings.catch_warnings():
+        # CrystalNN warns on every call when the structure has no oxidation states
+        warnings.simplefilter("ignore", UserWarning)
+        nn_info = strategy.get_nn_info(structure, index)
+    elements = [info["site"].specie.symbol for info in nn_info]
+    distances = np.array([site.distance(info["site"]) for info in nn_info])
+    return elements, distances
+
+
+def _site_record(structure: Any, index: int, elements: list[str], distances: np.ndarray) -> dict:
+    site = structure[index]
+    by_element: dict[str, list[float]] = {}
+    for element, distance in zip(elements, distances, strict=True):
+        by_element.setdefault(element, []).append(float(distance))
+    cn = len(elements)
+    return {
+        "site_index": index,
+        "element": site.specie.symbol,
+        "fractional_coords": site.frac_coords.tolist(),
+        "coordination_number": cn,
+        "bond_lengths": {
+            "min": float(distances.min()) if cn else 0,
+            "max": float(distances.max()) if cn else 0,
+            "mean": float(distances.mean()) if cn else 0,
+            "by_element": {el: float(np.mean(d)) for el, d in by_element.items()},
+        },
+        "coordinating_elements": list(by_element),
+        "geometry": guess_coordination_geometry(cn),
+    }
+
+
+def analyze_sites(
+    structure: Any,
+    method: str = "voronoi",
+    site_index: int | None = None,
+    symmetry_reduce: bool = True,
+    cutoff: float = CUTOFF_RADIUS,
+    tolerance: float = CUTOFF_TOLERANCE,
+    symprec: float = SYMPREC,
+) -> tuple[list[dict], int]:
+    """
+    Coordination records for one structure.
+
+    Args:
+        structure: pymatgen structure
+        method: One of ``METHODS``
+        site_index: Analyse only this site
+        symmetry_reduce: Analyse one site per symmetry orbit and copy the result
+        cutoff: Search radius in Å (cutoff method)
+        tolerance: Relative tolerance on the shortest distance (cutoff method)
+        symprec: spglib tolerance in Å for finding symmetry orbits
+
+    Returns:
+        (one record per site, number of distinct environments computed)
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Choose from {list(METHODS)}")
+
+    if site_index is not None:
+        targets = [site_index]
+        representatives = {site_index: site_index}
+    else:
+        targets = list(range(len(structure)))
+        mapping = (
+            representative_sites(structure, symprec)
+            if symmetry_reduce
+            else np.arange(len(structure))
+        )
+        representatives = {i: int(mapping[i]) for i in targets}
+
+    # One other member per orbit, to check that the orbit really shares one environment
+    checks = {}
+    for i, representative in representatives.items():
+        if i != representative:
+            checks[representative] = i
+    unique = sorted(set(representatives.values()))
+    neighbours = _neighbours(structure, unique + list(checks.values()), method, cutoff, tolerance)
+
+    mismatched = {
+        representative
+        for representative, member in checks.items()
+        if not _same_environment(neighbours[representative], neighbours[member])
+    }
+    if mismatched:
+        logger.debug(f"{len(mismatched)} symmetry orbits differ; analysing their sites separately")
+        for i in targets:
+            if representatives[i] in mismatched:
+                representatives[i] = i
+        missing = [i for i in targets if representatives[i] == i and i not in neighbours]
+        neighbours.update(_neighbours(structure, missing, method, cutoff, tolerance))
+        unique = sorted(set(representatives.values()))
+    computed = {i: _site_record(structure, i, *neighbours[i]) for i in unique}
+
+    records = []
+    for i in targets:
+        record = dict(computed[representatives[i]])
+        record["site_index"] = i
+        record["fractional_coords"] = structure[i].frac_coords.tolist()
+        records.append(record)
+    return records, len(unique)
+
+
+def _analyze_task(
+    task: tuple[Any, str, bool, float, float, float],
+) -> tuple[list[dict], int] | str:
+    """Worker entry point; returns the error message instead of raising."""
+    structure, method, symmetry_reduce, cutoff, tolerance, symprec = task
+    try:
+        return analyze_sites(
+            structure,
+            method=method,
+            symmetry_reduce=symmetry_reduce,
+            cutoff=cutoff,
+            tolerance=tolerance,
+            symprec=symprec,
+        )
+    except Exception as e:
+        return str(e)
+
+
+def analyze_structures(
+    structures: list[Any],
+    method: str = "voronoi",
+    symmetry_reduce: bool = True,
+    cutoff: float = CUTOFF_RADIUS,
+    tolerance: float = CUTOFF_TOLERANCE,
+    symprec: float = SYMPREC,
+    workers: int | None = None,
+) -> tuple[list[tuple[list[dict], int] | str], int]:
+    """
+    Coordination records for many structures, spread over a process pool.
+
+    Args:
+        structures: pymatgen structures
+        method: One of ``METHODS``
+        symmetry_reduce: Analyse one site per symmetry orbit and copy the result
+        cutoff: Search radius in Å (cutoff method)
+        tolerance: Relative tolerance on the shortest distance (cutoff method)
+        symprec: spglib tolerance in Å for finding symmetry orbits
+        workers: Worker processes (default: CPU count; 1 disables the pool)
+
+    Returns:
+        (per-structure ``analyze_sites`` output or error message, processes used)
+    """
+    tasks = [(s, method, symmetry_reduce, cutoff, tolerance, symprec) for s in structures]
+    return map_in_processes(
+        _analyze_task, tasks, workers, parallel=len(tasks) >= PARALLEL_THRESHOLD
+    )
@@ -0,0 +1,223 @@
+"""
+Vectorised hull energies for composition-only stability prescreening.
+
+The hull energy at a composition is the energy a new phase of that composition
+must reach to be stable. Knowing it before any structure is generated lets a
+pipeline drop compositions whose target is implausibly deep.
+
+``PhaseDiagram.get_hull_energy_per_atom`` finds the containing facet by testing
+facets one at a time for every composition. Here compositions are grouped by
+the (sub-)diagram that covers their chemical system, and each group is solved at
+once:
+
+- the inverse barycentric matrix of every hull facet is computed once per
+  diagram and cached;
+- barycentric coordinates of all compositions in all facets come from one
+  ``einsum``, and each composition takes the first facet with all coordinates
+  non-negative;
+- the hull energy is the barycentric average of the facet vertex energies, and
+  the competing phases are the vertices with non-zero weight.
+
+Compositions that no sub-diagram of a ``PatchedPhaseDiagram`` covers (e.g. a
+quaternary space without quaternary entries) fall back to pymatgen's own
+decomposition, one composition at a time.
+"""
+
+import logging
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Barycentric coordinates above -TOLERANCE count as inside a facet
+TOLERANCE = 1e-8
+
+# Vertices with less weight than this are not reported as competing phases
+MIN_FRACTION = 1e-6
+
+# Cap on (compositions x facets) evaluated per einsum
+BLOCK_ELEMENTS = 2_000_000
+
+HULL_TABLE_CACHE_SIZE = 256
+
+
+class HullTable:
+    """Facet geometry of one phase diagram, prepared for batch hull queries."""
+
+    def __init__(self, phase_diagram: Any):
+        self.phase_diagram = phase_diagram
+        self.elements = [el.symbol for el in phase_diagram.elements]
+        facets = np.asarray(phase_diagram.facets, dtype=np.int64)
+        qhull = np.asarray(phase_diagram.qhull_data, dtype=np.float64)
+        vertices = qhull[facets, :-1]
+        # Rows: vertex coordinates transposed, plus a row of ones for sum(b) == 1
+        matrices = np.concatenate(
+            [vertices.transpose(0, 2, 1), np.ones((len(facets), 1, facets.shape[1]))], axis=1
+        )
+        self.inverses = np.linalg.pinv(matrices)
+        self.facets = facets
+        self.vertex_energies = qhull[facets, -1]
+        self.vertex_formulas = [
+            entry.composition.reduced_formula for entry in phase_diagram.qhull_entries
+        ]
+        self.reference_energies = np.array(
+            [phase_diagram.el_refs[el].energy_per_atom for el in phase_diagram.elements]
+        )
+
+    def fractions(self, compositions: list[Any]) -> np.ndarray:
+        """Atomic fractions of the diagram's elements for each composition."""
+        return np.array(
+            [[comp.get_atomic_fraction(el) for el in self.elements] for comp in compositions],
+            dtype=np.float64,
+        ).reshape(len(compositions), len(self.elements))
+
+    def solve(self, fractions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Containing facet and barycentric weights for many compositions.
+
+        Args:
+            fractions: (m, n) atomic fractions in the diagram's element order
+
+        Returns:
+            (facet index per composition or -1, (m, n) barycentric weights)
+        """
+        m = len(fractions)
+        points = np.concatenate([fractions[:, 1:], np.ones((m, 1))], axis=1)
+        facet_index = np.full(m, -1, dtype=np.int64)
+        weights = np.zeros((m, self.facets.shape[1]))
+        block = max(1, BLOCK_ELEMENTS // max(len(self.facets), 1))
+        for start in range(0, m, block):
+            chunk = points[start : start + block]
+            bary = np.einsum("kij,mj->mki", self.inverses, chunk)
+            inside = (bary >= -TOLERANCE).all(axis=2)
+            found = inside.any(axis=1)
+            first = inside.argmax(axis=1)
+            rows = np.arange(len(chunk))
+            facet_index[start : start + block] = np.where(found, first, -1)
+            weights[start : start + block] = bary[rows, first]
+        return facet_index, weights
+
+
+_tables: OrderedDict[int, HullTable] = OrderedDict()
+_tables_lock = threading.Lock()
+
+
+def get_hull_table(phase_diagram: Any) -> HullTable:
+    """Get the cached hull table of a (sub-)phase diagram."""
+    key = id(phase_diagram)
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is not None and table.phase_diagram is phase_diagram:
+            _tables.move_to_end(key)
+            return table
+    table = HullTable(phase_diagram)
+    with _tables_lock:
+        _tables[key] = table
+        while len(_tables) > HULL_TABLE_CACHE_SIZE:
+            _tables.popitem(last=False)
+    return table
+
+
+def _diagram_for(phase_diagram: Any, composition: Any) -> Any:
+    """
+    The diagram covering a composition's elements (a sub-diagram for patched ones).
+
+    Raises:
+        KeyError: If an element is not in the phase diagram at all
+        ValueError: If no sub-diagram of a patched diagram covers the composition
+    """
+    missing = set(composition.elements) - set(phase_diagram.elements)
+    if missing:
+        raise KeyError(f"Elements {sorted(map(str, missing))} are not in the phase diagram")
+    if hasattr(phase_diagram, "get_pd_for_entry"):
+        return phase_diagram.get_pd_for_entry(composition)
+    return phase_diagram
+
+
+def _summary(
+    composition: Any, hull_energy: float, reference: float, phases: list[tuple[str, float]]
+) -> dict[str, Any]:
+    return {
+        "chemsys": "-".join(sorted(el.symbol for el in composition.elements)),
+        "hull_energy_per_atom": hull_energy,
+        "target_formation_energy": hull_energy - reference,
+        "competing_phases": [
+            {"formula": formula, "fraction": fraction}
+            for formula, fraction in phases
+            if fraction > MIN_FRACTION
+        ],
+    }
+
+
+def _decompose(phase_diagram: Any, composition: Any) -> dict[str, Any]:
+    """Hull target of one composition through pymatgen's decomposition."""
+    with warnings.catch_warnings():
+        # The SLSQP fallback warns on every call
+        warnings.simplefilter("ignore")
+        decomposition = phase_diagram.get_decomposition(composition)
+    hull_energy = sum(amount * entry.energy_per_atom for entry, amount in decomposition.items())
+    reference = sum(
+        composition.get_atomic_fraction(el) * phase_diagram.el_refs[el].energy_per_atom
+        for el in composition.elements
+    )
+    phases = [
+        (entry.composition.reduced_formula, float(amount))
+        for entry, amount in decomposition.items()
+    ]
+    return _summary(composition, float(hull_energy), float(reference), phases)
+
+
+def hull_targets(phase_diagram: Any, compositions: list[Any]) -> list[dict[str, Any] | str]:
+    """
+    Hull energy and competing phases at many compositions.
+
+    Args:
+        phase_diagram: pymatgen ``PhaseDiagram`` or ``PatchedPhaseDiagram``
+        compositions: pymatgen compositions
+
+    Returns:
+        Per composition either the chemical system, hull energy and formation
+        energy per atom (eV/atom) and competing phases, or an error message
+    """
+    results: list[dict[str, Any] | str] = ["" for _ in compositions]
+    groups: dict[int, tuple[Any, list[int]]] = {}
+    for i, comp in enumerate(compositions):
+        try:
+            diagram = _diagram_for(phase_diagram, comp)
+        except KeyError as e:
+            results[i] = e.args[0]
+            continue
+        except ValueError:
+            try:
+                results[i] = _decompose(phase_diagram, comp)
+            except Exception as e:
+                results[i] = str(e) or f"No hull energy for {comp.reduced_formula}"
+            continue
+        groups.setdefault(id(diagram), (diagram, []))[1].append(i)
+
+    for diagram, indices in groups.values():
+        table = get_hull_table(diagram)
+        fractions = table.fractions([compositions[i] for i in indices])
+        facet_index, weights = table.solve(fractions)
+        references = fractions @ table.reference_energies
+        for row, i in enumerate(indices):
+            facet = facet_index[row]
+            if facet < 0:
+                results[i] = f"No hull facet found for {compositions[i].reduced_formula}"
+                continue
+            w = weights[row]
+            phases = [
+                (table.vertex_formulas[vertex], float(fraction))
+                for vertex, fraction in zip(table.facets[facet], w, strict=True)
+            ]
+            results[i] = _summary(
+                compositions[i],
+                float(w @ table.vertex_energies[facet]),
+                float(references[row]),
+                phases,
+            )
+    return results
@@ -0,0 +1,196 @@
+"""
+Index of compositions already present in the phase-diagram data.
+
+Before spending generation and relaxation compute on a composition it is worth
+knowing whether the Materials Project entries behind the phase diagram already
+contain it. Unpickling the phase diagram takes tens of seconds, so a compact
+summary per reduced formula is built from it once and cached on disk:
+
+- formulas: sorted reduced formulas (looked up with ``np.searchsorted``);
+- lowest_energy: lowest energy per atom among the entries for that formula;
+- num_polymorphs: number of entries with that formula;
+- on_hull: whether the lowest entry is a stable phase of the diagram;
+- entry_ids / id_offsets: entry ids of each formula, lowest energy first.
+
+The index file lives under ``~/.cache/crystalyse/`` (or
+``CRYSTALYSE_KNOWN_MATERIALS_DIR``) and is named after ``INDEX_VERSION`` and a
+fingerprint of the phase-diagram file, so replacing the data rebuilds it.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the set or meaning of the arrays changes
+INDEX_VERSION = 1
+
+DEFAULT_INDEX_DIR = Path.home() / ".cache" / "crystalyse"
+
+
+class KnownMaterialsIndex:
+    """Per-formula summary of phase-diagram entries as sorted numpy arrays."""
+
+    def __init__(self, arrays: dict[str, np.ndarray]):
+        self.formulas = arrays["formulas"]
+        self.lowest_energy = arrays["lowest_energy"]
+        self.num_polymorphs = arrays["num_polymorphs"]
+        self.on_hull = arrays["on_hull"]
+        self.entry_ids = arrays["entry_ids"]
+        self.id_offsets = arrays["id_offsets"]
+
+    def __len__(self) -> int:
+        return len(self.formulas)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Any], stable_entries: Iterable[Any] = ()):
+        """
+        Build the index from phase-diagram entries.
+
+        Args:
+            entries: pymatgen entries (``PDEntry`` / ``ComputedEntry``)
+            stable_entries: Entries on the convex hull
+
+        Returns:
+            The index
+        """
+        stable = {
+            (entry.composition.reduced_formula, round(float(entry.energy_per_atom), 8))
+            for entry in stable_entries
+        }
+        rows = sorted(
+            (
+                entry.composition.reduced_formula,
+                float(entry.energy_per_atom),
+                str(getattr(entry, "entry_id", None) or ""),
+            )
+            for entry in entries
+        )
+
+        formulas, lowest, counts, on_hull, ids, offsets = [], [], [], [], [], [0]
+        for formula, energy, entry_id in rows:
+            if not formulas or formulas[-1] != formula:
+                formulas.append(formula)
+                lowest.append(energy)
+                counts.append(0)
+                on_hull.append((formula, round(energy, 8)) in stable)
+                offsets.append(offsets[-1])
+            counts[-1] += 1
+            if entry_id:
+                ids.append(entry_id)
+                offsets[-1] += 1
+
+        return cls(
+            {
+                "formulas": np.array(formulas, dtype=str),
+                "lowest_energy": np.array(lowest, dtype=np.float64),
+                "num_polymorphs": np.array(counts, dtype=np.int32),
+                "on_hull": np.array(on_hull, dtype=bool),
+                "entry_ids": np.array(ids, dtype=str),
+                "id_offsets": np.array(offsets, dtype=np.int64),
+            }
+        )
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """The arrays that make up the index, for saving."""
+        return {
+            "formulas": self.formulas,
+            "lowest_energy": self.lowest_energy,
+            "num_polymorphs": self.num_polymorphs,
+            "on_hull": self.on_hull,
+            "entry_ids": self.entry_ids,
+            "id_offsets": self.id_offsets,
+        }
+
+    def positions(self, formulas: list[str]) -> np.ndarray:
+        """Row of each reduced formula in the index (-1 if unknown)."""
+        if not len(self.formulas) or not formulas:
+            return np.full(len(formulas), -1, dtype=np.int64)
+        query = np.array(formulas, dtype=str)
+        rows = np.searchsorted(self.formulas, query).clip(max=len(self.formulas) - 1)
+        return np.where(self.formulas[rows] == query, rows, -1)
+
+    def ids(self, row: int, limit: int | None = None) -> list[str]:
+        """Entry ids of one formula, lowest energy first."""
+        start, stop = int(self.id_offsets[row]), int(self.id_offsets[row + 1])
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return self.entry_ids[start:stop].tolist()
+
+
+def _fingerprint(path: str) -> str:
+    stat = os.stat(path)
+    source = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.blake2b(source.encode(), digest_size=8).hexdigest()
+
+
+def index_path(phase_diagram_path: str) -> Path:
+    """Location of the cached index for a phase-diagram file."""
+    directory = Path(os.getenv("CRYSTALYSE_KNOWN_MATERIALS_DIR") or DEFAULT_INDEX_DIR)
+    return directory / f"known_materials-v{INDEX_VERSION}-{_fingerprint(phase_diagram_path)}.npz"
+
+
+def load_known_materials_index(phase_diagram_path: str, phase_diagram: Any = None):
+    """
+    Load the cached index for a phase-diagram file, building it if needed.
+
+    Args:
+        phase_diagram_path: Path of the pickled phase diagram
+        phase_diagram: The loaded diagram, if already in memory (built from it on a miss)
+
+    Returns:
+        The index, or None if it is not cached and the diagram cannot be loaded
+    """
+    path = index_path(phase_diagram_path)
+    try:
+        with np.load(path) as data:
+            return KnownMaterialsIndex({name: data[name] for name in data.files})
+    except (OSError, KeyError, ValueError):
+        pass
+
+    if phase_diagram is None:
+        from .phase_diagram import _load_phase_diagram
+
+        phase_diagram = _load_phase_diagram()
+        if phase_diagram is None:
+            return None
+
+    index = KnownMaterialsIndex.from_entries(
+        phase_diagram.all_entries, phase_diagram.stable_entries
+    )
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".npz.tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **index.arrays())
+        os.replace(tmp_name, path)
+        logger.info(f"Indexed {len(index)} known formulas -> {path}")
+    except OSError as e:
+        logger.debug(f"Could not cache known-materials index at {path}: {e}")
+    return index
+
+
+_known_index: KnownMaterialsIndex | None = None
+_known_index_lock = threading.Lock()
+
+
+def get_known_materials_index() -> KnownMaterialsIndex | None:
+    """Get the process-wide known-materials index, loading it on first use."""
+    global _known_index
+    if _known_index is None:
+        with _known_index_lock:
+            if _known_index is None:
+                from . import phase_diagram
+
+                source = phase_diagram._find_phase_diagram_path()
+                if source is not None:
+                    _known_index = load_known_materials_index(source, phase_diagram._PPD_DATA)
+    return _known_index
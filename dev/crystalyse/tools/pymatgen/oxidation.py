@@ -0,0 +1,398 @@
+"""
+Cached oxidation-state assignment with a SMACT fast path and a time budget.
+
+``BVAnalyzer`` searches over oxidation-state permutations of the symmetry-distinct
+sites, which can take seconds on low-symmetry cells. Most candidate compositions
+do not need it: when SMACT allows exactly one charge-neutral assignment (one state
+per element, passing the Pauling test, anions in their most negative state) and no
+two atoms are implausibly close, the structure is accepted without bond valences.
+Such results carry the SMACT states but no bond-valence sums. Ambiguous
+compositions (mixed valence, several cation states), compressed geometries and
+requests with given oxidation states (from the caller or the structure) are
+escalated to bond-valence analysis, which:
+
+- runs once per structure (``get_valences``) rather than twice;
+- is stopped after ``time_budget`` seconds by ``SIGALRM``, in which case the
+  result falls back to the first SMACT assignment, marked ``timed_out``;
+- runs in a process pool when a batch has enough escalated structures, or
+  whenever a budget is set and the caller is not on the main thread (tools in
+  worker threads and ``batch_call``), since only a main thread receives
+  ``SIGALRM``. Results whose budget could not be enforced (no ``SIGALRM`` on the
+  platform, or no process pool) carry ``budget_enforced=False``.
+
+Results are cached by structure hash and requested oxidation states. Timed-out
+results are not cached, so a later call with a larger budget can still finish.
+"""
+
+import json
+import logging
+import signal
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from ...utils.parse_cache import ParseCache, structure_hash
+from ..budget import BudgetExceeded
+from ..pool import map_in_processes
+
+logger = logging.getLogger(__name__)
+
+# Oxidation-state set used for the composition-level fast path
+OXIDATION_STATES_SET = "icsd24"
+
+# Per-structure bond-valence budget (seconds) for batches
+DEFAULT_TIME_BUDGET = 10.0
+
+# Batches with fewer escalated structures than this are analysed in-process
+PARALLEL_THRESHOLD = 4
+
+OXIDATION_CACHE_SIZE = 4096
+
+# The fast path needs every interatomic distance to be at least this fraction of
+# the sum of the two atomic radii (NaCl at equilibrium is at about 1.0)
+MIN_DISTANCE_RATIO = 0.7
+
+
+def can_interrupt() -> bool:
+    """Whether ``time_limit`` can stop work running in the current thread."""
+    return hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def time_limit(seconds: float | None) -> Iterator[bool]:
+    """
+    Raise ``BudgetExceeded`` in the enclosed block after ``seconds``.
+
+    Yields whether the limit is enforced: only on the main thread of platforms
+    with ``SIGALRM`` (see ``can_interrupt``); elsewhere the block runs to
+    completion. Without ``seconds`` there is nothing to enforce and it yields True.
+    """
+    if not seconds:
+        yield True
+        return
+    if not can_interrupt():
+        yield False
+        return
+
+    def expire(signum, frame):
+        raise BudgetExceeded("time", f"Bond-valence analysis exceeded the {seconds:g} s budget")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield True
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def smact_assignments(structure: Any) -> list[dict[str, int]]:
+    """
+    Charge-neutral oxidation states of a structure's composition according to SMACT.
+
+    Args:
+        structure: pymatgen structure
+
+    Returns:
+        Element to oxidation state mappings; empty if the composition has
+        fractional occupancy or no neutral assignment
+    """
+    from smact.screening import pauling_test
+
+    from ..smact.bulk import element_data, neutral_combinations, parse_stoichiometry
+
+    try:
+        _, stoichiometry = parse_stoichiometry(structure.composition.element_composition.formula)
+    except ValueError:
+        return []
+    if stoichiometry is None:
+        return []
+
+    symbols = [symbol for symbol, _ in stoichiometry]
+    data = [element_data(symbol, OXIDATION_STATES_SET) for symbol in symbols]
+    states = [element_states for element_states, _ in data]
+    electronegativities = [eneg for _, eneg in data]
+
+    assignments = []
+    for combination in neutral_combinations(states, [n for _, n in stoichiometry]):
+        if any(ox < 0 and ox != min(states[i]) for i, ox in enumerate(combination)):
+            continue
+        if None not in electronegativities and not pauling_test(combination, electronegativities):
+            continue
+        assignments.append(dict(zip(symbols, combination, strict=True)))
+    return assignments
+
+
+def _site_records(
+    structure: Any, assigned: list[float | None], valences: list[float] | None
+) -> list[dict[str, Any]]:
+    records = []
+    for i, site in enumerate(structure):
+        ox_state = assigned[i]
+        bv_value = valences[i] if valences is not None else None
+        comparable = bool(ox_state and bv_value)
+        records.append(
+            {
+                "site_index": i,
+                "element": site.specie.symbol,
+                "assigned_oxidation_state": ox_state,
+                "bond_valence_sum": float(bv_value) if bv_value else None,
+                "difference": float(abs(ox_state - bv_value)) if comparable else None,
+                "is_reasonable": abs(ox_state - bv_value) < 0.5 if comparable else None,
+            }
+        )
+    return records
+
+
+def _summary(
+    structure: Any,
+    records: list[dict[str, Any]],
+    guessed: bool,
+    is_valid: bool,
+    method: str,
+    timed_out: bool = False,
+    budget_enforced: bool = True,
+) -> dict[str, Any]:
+    reasonable = [r for r in records if r["is_reasonable"]]
+    return {
+        "formula": structure.composition.reduced_formula,
+        "oxidation_states_guessed": guessed,
+        "structure_is_valid": is_valid,
+        "site_analysis": records,
+        "validity_percentage": len(reasonable) / len(records) * 100 if records else 0.0,
+        "method": method,
+        "timed_out": timed_out,
+        "budget_enforced": budget_enforced,
+    }
+
+
+def _given_states(structure: Any, oxidation_states: dict[str, float] | None) -> list | None:
+    """Per-site states from the request or the structure's decoration, else None."""
+    if oxidation_states:
+        return [oxidation_states.get(site.specie.symbol) for site in structure]
+    if any(hasattr(site.specie, "oxi_state") for site in structure):
+        return [getattr(site.specie, "oxi_state", None) for site in structure]
+    return None
+
+
+def has_plausible_distances(structure: Any) -> bool:
+    """
+    Whether no two atoms are closer than ``MIN_DISTANCE_RATIO`` of their radii sum.
+
+    Args:
+        structure: pymatgen structure
+
+    Returns:
+        False if a distance is too short or an element has no tabulated radius
+    """
+    import numpy as np
+
+    radii = [site.specie.atomic_radius for site in structure]
+    if len(structure) < 2 or None in radii:
+        return len(structure) == 1
+    radii = np.array(radii, dtype=float)
+    distances = structure.distance_matrix
+    np.fill_diagonal(distances, np.inf)
+    return bool(np.all(distances >= MIN_DISTANCE_RATIO * (radii[:, None] + radii[None, :])))
+
+
+def fast_path(
+    structure: Any, oxidation_states: dict[str, float] | None = None
+) -> dict[str, Any] | None:
+    """
+    Validate oxidation states from the composition alone when SMACT is unambiguous.
+
+    Site records carry the SMACT states; their bond-valence fields are None.
+
+    Args:
+        structure: pymatgen structure
+        oxidation_states: Optional dict of element: oxidation_state
+
+    Returns:
+        Result fields, or None if bond-valence analysis is needed
+    """
+    if _given_states(structure, oxidation_states) is not None:
+        return None
+    assignments = smact_assignments(structure)
+    if len(assignments) != 1 or not has_plausible_distances(structure):
+        return None
+    assigned = [assignments[0][site.specie.symbol] for site in structure]
+    result = _summary(
+        structure,
+        _site_records(structure, assigned, None),
+        guessed=True,
+        is_valid=True,
+        method="smact",
+    )
+    result["validity_percentage"] = 100.0
+    return result
+
+
+def bond_valence(
+    structure: Any,
+    oxidation_states: dict[str, float] | None = None,
+    time_budget: float | None = None,
+) -> dict[str, Any]:
+    """
+    Validate oxidation states with pymatgen's ``BVAnalyzer``.
+
+    Args:
+        structure: pymatgen structure
+        oxidation_states: Optional dict of element: oxidation_state
+        time_budget: Seconds before falling back to the SMACT assignment
+
+    Returns:
+        Result fields
+
+    Raises:
+        ValueError: If no oxidation states can be assigned
+    """
+    from pymatgen.analysis.bond_valence import BVAnalyzer
+    from pymatgen.core import Structure
+
+    decorated = Structure.from_sites(structure)
+    if oxidation_states:
+        decorated.add_oxidation_state_by_element(oxidation_states)
+
+    try:
+        with time_limit(time_budget) as enforced:
+            if not enforced:
+                logger.warning(
+                    f"Bond-valence budget of {time_budget:g} s not enforced in this thread"
+                )
+            guessed = not any(hasattr(site.specie, "oxi_state") for site in decorated)
+            if guessed:
+                try:
+                    decorated.add_oxidation_state_by_guess()
+                except BudgetExceeded:
+                    raise
+                except Exception as e:
+                    raise ValueError("Could not determine oxidation states") from e
+
+            try:
+                valences = BVAnalyzer().get_valences(decorated)
+                is_valid = True
+            except BudgetExceeded:
+                raise
+            except Exception as e:
+                logger.warning(f"BV analysis warning: {e}")
+                valences, is_valid = None, False
+    except BudgetExceeded as e:
+        logger.warning(f"{e}; falling back to the composition-level assignment")
+        return _timed_out(structure, oxidation_states)
+
+    assigned = [getattr(site.specie, "oxi_state", None) for site in decorated]
+    records = _site_records(decorated, assigned, valences)
+    if not guessed:
+        # Given states must also agree with the bond-valence assignment
+        is_valid = is_valid and all(r["is_reasonable"] is not False for r in records)
+    return _summary(
+        decorated,
+        records,
+        guessed=guessed,
+        is_valid=is_valid,
+        method="bond_valence",
+        budget_enforced=enforced,
+    )
+
+
+def _timed_out(structure: Any, oxidation_states: dict[str, float] | None) -> dict[str, Any]:
+    given = _given_states(structure, oxidation_states)
+    assignments = smact_assignments(structure)
+    if given is None and assignments:
+        assigned = [assignments[0][site.specie.symbol] for site in structure]
+    else:
+        assigned = given or [None] * len(structure)
+    return _summary(
+        structure,
+        _site_records(structure, assigned, None),
+        guessed=given is None,
+        is_valid=False,
+        method="fallback",
+        timed_out=True,
+    )
+
+
+def _bond_valence_task(
+    task: tuple[Any, dict[str, float] | None, float | None],
+) -> dict[str, Any] | str:
+    """Worker entry point; returns the error message instead of raising."""
+    try:
+        return bond_valence(*task)
+    except Exception as e:
+        return str(e)
+
+
+_oxidation_cache: ParseCache | None = None
+
+
+def get_oxidation_cache() -> ParseCache:
+    """Get the process-wide cache of oxidation-state results."""
+    global _oxidation_cache
+    if _oxidation_cache is None:
+        _oxidation_cache = ParseCache(max_entries=OXIDATION_CACHE_SIZE)
+    return _oxidation_cache
+
+
+def assign_oxidation_states_batch(
+    structures: list[Any],
+    oxidation_states: dict[str, float] | None = None,
+    time_budget: float | None = DEFAULT_TIME_BUDGET,
+    workers: int | None = None,
+) -> tuple[list[dict[str, Any] | str], int, int]:
+    """
+    Validate the oxidation states of many structures, reusing cached results.
+
+    Args:
+        structures: pymatgen structures
+        oxidation_states: Optional dict of element: oxidation_state applied to all
+        time_budget: Seconds of bond-valence analysis per structure (None for no limit)
+        workers: Worker processes (default: CPU count; 1 disables the pool on the
+            main thread; elsewhere a budgeted analysis always runs in a worker process)
+
+    Returns:
+        (per-structure result fields or error message, cache hits, processes used)
+    """
+    cache = get_oxidation_cache()
+    requested = json.dumps(oxidation_states, sort_keys=True)
+    keys = [f"{structure_hash(s)}|{requested}" for s in structures]
+
+    results: dict[str, dict[str, Any] | str] = {}
+    escalated: dict[str, int] = {}
+    hits = 0
+    for i, key in enumerate(keys):
+        if key in results or key in escalated:
+            continue
+        cached = cache.get("oxidation_states", key)
+        if cached is not None:
+            results[key] = cached
+            hits += 1
+            continue
+        try:
+            fast = fast_path(structures[i], oxidation_states)
+        except Exception as e:
+            logger.debug(f"SMACT fast path failed, escalating: {e}")
+            fast = None
+        if fast is None:
+            escalated[key] = i
+        else:
+            results[key] = cache.put("oxidation_states", key, fast)
+
+    tasks = [(structures[i], oxidation_states, time_budget) for i in escalated.values()]
+    # SIGALRM only reaches a main thread, which every pool worker runs its tasks on
+    isolate = bool(time_budget) and not can_interrupt()
+    computed, used = map_in_processes(
+        _bond_valence_task,
+        tasks,
+        workers,
+        parallel=len(tasks) >= PARALLEL_THRESHOLD,
+        isolate=isolate,
+    )
+
+    for key, value in zip(escalated, computed, strict=True):
+        if not isinstance(value, str) and not value["timed_out"]:
+            value = cache.put("oxidation_states", key, value)
+        results[key] = value
+
+    return [results[key] for key in keys], hits, used
@@ -4,44 +4,34 @@ import gzip
 import logging
 import os
 import pickle
+import threading
+import time
 from pathlib import Path
-from typing import Any
 
-from pydantic import BaseModel, Field
 from pymatgen.analysis.phase_diagram import PDEntry, PhaseDiagram
-from pymatgen.core import Composition
+
+from ...utils.parse_cache import parse_composition
+from ..models import (
+    EnergyAboveHullResult,
+    HullTargetBatchResult,
+    HullTargetResult,
+    KnownMaterialResult,
+    KnownMaterialsBatchResult,
+)
+from .hull_targets import hull_targets
+from .known_materials import get_known_materials_index
 
 logger = logging.getLogger(__name__)
 
 # Global phase diagram data
 _PPD_DATA: PhaseDiagram | None = None
 _PPD_PATH: str | None = None
+_PPD_LOCK = threading.Lock()
 
 
-class EnergyAboveHullResult(BaseModel):
-    """Energy above hull calculation result."""
-
-    success: bool = True
-    composition: str
-    energy_per_atom: float
-    energy_above_hull: float
-    is_stable: bool
-    is_metastable: bool
-    is_unstable: bool
-    decomposition_products: list[dict[str, Any]] = Field(default_factory=list)
-    competing_phases: int = 0
-    error: str | None = None
-
-
-def _load_phase_diagram() -> PhaseDiagram | None:
-    """Load the pre-computed phase diagram."""
-    global _PPD_DATA, _PPD_PATH
-
-    if _PPD_DATA is not None:
-        return _PPD_DATA
-
-    # Try to find the phase diagram file
-    from crystalyse.tools.downloader import ensure_phase_diagram_data, get_phase_diagram_path
+def _find_phase_diagram_path() -> str | None:
+    """Locate the phase diagram file on disk without loading or downloading it."""
+    from crystalyse.tools.downloader import get_phase_diagram_path
 
     cache_path = get_phase_diagram_path()
 
@@ -59,42 +49,72 @@ def _load_phase_diagram() -> PhaseDiagram | None:
     for path in possible_paths:
         path_str = str(path)
         if path_str and os.path.exists(path_str):
-            _PPD_PATH = path_str
-            break
+            return path_str
+    return None
 
-    # If not found, attempt to download
-    if not _PPD_PATH:
-        logger.info("Phase diagram data not found locally. Attempting to download...")
-        try:
-            downloaded_path = ensure_phase_diagram_data()
-            _PPD_PATH = str(downloaded_path)
-        except Exception as e:
-            logger.warning(f"Failed to download phase diagram data: {e}")
 
-    if not _PPD_PATH:
-        logger.warning(
-            "Phase diagram file not found. Energy above hull calculations will not be available."
-        )
-        return None
+def _load_phase_diagram() -> PhaseDiagram | None:
+    """Load the pre-computed phase diagram."""
+    global _PPD_DATA, _PPD_PATH
 
-    try:
-        with gzip.open(_PPD_PATH, "rb") as f:
-            _PPD_DATA = pickle.load(f)
-        logger.info(
-            f"Loaded phase diagram with {len(_PPD_DATA.all_entries)} entries from {_PPD_PATH}"
-        )
+    if _PPD_DATA is not None:
         return _PPD_DATA
-    except Exception as e:
-        logger.error(f"Failed to load phase diagram from {_PPD_PATH}: {e}")
-        return None
+
+    with _PPD_LOCK:
+        if _PPD_DATA is not None:
+            return _PPD_DATA
+
+        from crystalyse.tools.downloader import ensure_phase_diagram_data
+
+        _PPD_PATH = _find_phase_diagram_path()
+
+        # If not found, attempt to download
+        if not _PPD_PATH:
+            logger.info("Phase diagram data not found locally. Attempting to download...")
+            try:
+                downloaded_path = ensure_phase_diagram_data()
+                _PPD_PATH = str(downloaded_path)
+            except Exception as e:
+                logger.warning(f"Failed to download phase diagram data: {e}")
+
+        if not _PPD_PATH:
+            logger.warning(
+                "Phase diagram file not found. Energy above hull calculations will not be available."
+            )
+            return None
+
+        try:
+            with gzip.open(_PPD_PATH, "rb") as f:
+                _PPD_DATA = pickle.load(f)
+            logger.info(
+                f"Loaded phase diagram with {len(_PPD_DATA.all_entries)} entries from {_PPD_PATH}"
+            )
+            return _PPD_DATA
+        except Exception as e:
+            logger.error(f"Failed to load phase diagram from {_PPD_PATH}: {e}")
+            return None
 
 
 class PhaseDiagramAnalyzer:
     """PyMatgen phase diagram analysis tools."""
 
     def __init__(self):
-        """Initialize with phase diagram loading."""
-        self.ppd_data = _load_phase_diagram()
+        """Initialize without loading; the phase diagram is loaded on first use."""
+        self._ppd_data: PhaseDiagram | None = None
+        self._ppd_requested = False
+
+    @property
+    def ppd_data(self) -> PhaseDiagram | None:
+        """The phase diagram, loaded (or downloaded) the first time it is needed."""
+        if not self._ppd_requested:
+            self._ppd_data = _load_phase_diagram()
+            self._ppd_requested = True
+        return self._ppd_data
+
+    @ppd_data.setter
+    def ppd_data(self, value: PhaseDiagram | None) -> None:
+        self._ppd_data = value
+        self._ppd_requested = True
 
     def calculate_energy_above_hull(
         self, composition: str, energy: float, per_atom: bool = True
@@ -124,7 +144,7 @@ class PhaseDiagramAnalyzer:
                 )
 
             # Parse composition
-            comp = Composition(composition)
+            comp = parse_composition(composition)
 
             # Convert energy to total if needed
             if per_atom:
@@ -184,6 +204,134 @@ class PhaseDiagramAnalyzer:
                 error=str(e),
             )
 
+    @staticmethod
+    def check_known_materials(
+        compositions: list[str],
+        energies_per_atom: list[float] | None = None,
+        max_entry_ids: int = 5,
+    ) -> KnownMaterialsBatchResult:
+        """
+        Check which compositions already exist in the phase diagram data.
+
+        Uses the cached per-formula index (see ``known_materials.py``) and never
+        touches ``ppd_data``, so the phase diagram itself is only loaded the first
+        time the index is built.
+
+        Args:
+            compositions: Chemical formulas
+            energies_per_atom: Optional energy per atom of each candidate (eV/atom)
+            max_entry_ids: Maximum entry ids reported per composition
+
+        Returns:
+            One known-material result per composition, in input order
+        """
+        start = time.perf_counter()
+        if energies_per_atom is not None and len(energies_per_atom) != len(compositions):
+            return KnownMaterialsBatchResult(
+                success=False, error="energies_per_atom must match compositions in length"
+            )
+        index = get_known_materials_index()
+        if index is None:
+            return KnownMaterialsBatchResult(
+                success=False, error="Phase diagram data not available to build the index"
+            )
+
+        reduced: list[str | None] = []
+        for composition in compositions:
+            try:
+                reduced.append(parse_composition(composition).reduced_formula)
+            except Exception:
+                reduced.append(None)
+        rows = index.positions([formula or "" for formula in reduced])
+
+        results = []
+        for i, (composition, formula, row) in enumerate(
+            zip(compositions, reduced, rows.tolist(), strict=True)
+        ):
+            energy = energies_per_atom[i] if energies_per_atom is not None else None
+            if formula is None:
+                results.append(
+                    KnownMaterialResult(composition=composition, error="Could not parse formula")
+                )
+            elif row < 0:
+                results.append(
+                    KnownMaterialResult(
+                        composition=composition, reduced_formula=formula, energy_per_atom=energy
+                    )
+                )
+            else:
+                lowest = float(index.lowest_energy[row])
+                results.append(
+                    KnownMaterialResult(
+                        composition=composition,
+                        reduced_formula=formula,
+                        is_known=True,
+                        num_polymorphs=int(index.num_polymorphs[row]),
+                        lowest_energy_per_atom=lowest,
+                        ground_state_on_hull=bool(index.on_hull[row]),
+                        entry_ids=index.ids(row, max_entry_ids),
+                        energy_per_atom=energy,
+                        energy_above_known=energy - lowest if energy is not None else None,
+                    )
+                )
+
+        return KnownMaterialsBatchResult(
+            results=results,
+            num_known=sum(1 for r in results if r.is_known),
+            index_size=len(index),
+            computation_time=time.perf_counter() - start,
+        )
+
+    def calculate_hull_targets(
+        self, compositions: list[str], min_target_energy: float | None = None
+    ) -> HullTargetBatchResult:
+        """
+        Hull energy at each composition, before any structure is generated.
+
+        A new phase is only stable if its formation energy reaches the target.
+        Compositions are grouped by chemical system and solved together (see
+        ``hull_targets.py``).
+
+        Args:
+            compositions: Chemical formulas
+            min_target_energy: Deepest acceptable target formation energy (eV/atom);
+                compositions below it get passes=False
+
+        Returns:
+            One hull target per composition, in input order
+        """
+        start = time.perf_counter()
+        if self.ppd_data is None:
+            return HullTargetBatchResult(success=False, error="Phase diagram data not loaded")
+
+        parsed, parse_errors = [], {}
+        for i, composition in enumerate(compositions):
+            try:
+                parsed.append(parse_composition(composition))
+            except Exception as e:
+                parse_errors[i] = f"Could not parse formula: {e}"
+
+        values = iter(hull_targets(self.ppd_data, parsed))
+        results = []
+        for i, composition in enumerate(compositions):
+            value = parse_errors.get(i) or next(values)
+            if isinstance(value, str):
+                results.append(HullTargetResult(composition=composition, error=value))
+                continue
+            passes = None
+            if min_target_energy is not None:
+                passes = value["target_formation_energy"] >= min_target_energy
+            results.append(HullTargetResult(composition=composition, passes=passes, **value))
+
+        return HullTargetBatchResult(
+            results=results,
+            num_passing=sum(1 for r in results if r.passes)
+            if min_target_energy is not None
+            else None,
+            min_target_energy=min_target_energy,
+            computation_time=time.perf_counter() - start,
+        )
+
     def is_loaded(self) -> bool:
         """Check if phase diagram is loaded."""
         return self.ppd_data is not None
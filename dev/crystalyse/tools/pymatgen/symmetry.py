@@ -0,0 +1,223 @@
+"""
+Cached, field-selective space-group analysis.
+
+``SpacegroupAnalyzer`` itself (one spglib call) is cheap. Most of the cost of a
+full space-group report is building the standard primitive and conventional
+cells and serialising them to CIF. The report is split into field groups that
+are only computed when one of their fields is requested:
+
+- ``core``: space group, point group, crystal system, Hall symbol, formula,
+  atom and symmetry-operation counts (always computed);
+- ``primitive``: primitive formula and atom count;
+- ``lattice``: conventional lattice parameters and volume;
+- ``symmetrized_cif`` / ``primitive_cif``: the standard cells as CIF.
+
+Each computed group is cached by structure hash, ``symprec`` and
+``angle_tolerance``. Batches send only the cache misses to a process pool.
+"""
+
+from typing import Any
+
+from ...utils.parse_cache import ParseCache, structure_hash
+from ..pool import map_in_processes
+
+FIELD_GROUPS: dict[str, tuple[str, ...]] = {
+    "core": (
+        "space_group_symbol",
+        "space_group_number",
+        "point_group",
+        "crystal_system",
+        "hall_symbol",
+        "original_formula",
+        "original_num_atoms",
+        "num_symmetry_ops",
+    ),
+    "primitive": ("primitive_formula", "primitive_num_atoms"),
+    "lattice": (
+        "lattice_a",
+        "lattice_b",
+        "lattice_c",
+        "lattice_alpha",
+        "lattice_beta",
+        "lattice_gamma",
+        "volume",
+    ),
+    "symmetrized_cif": ("symmetrized_cif",),
+    "primitive_cif": ("primitive_cif",),
+}
+
+# Fields returned when the caller does not choose
+ALL_FIELDS = tuple(field for fields in FIELD_GROUPS.values() for field in fields)
+
+# Batches with fewer cache misses than this are analysed in-process
+PARALLEL_THRESHOLD = 16
+
+SYMMETRY_CACHE_SIZE = 4096
+
+
+def groups_for_fields(fields: list[str] | None) -> tuple[str, ...]:
+    """
+    Field groups needed to produce the requested fields.
+
+    Args:
+        fields: Result field names (None for all)
+
+    Returns:
+        Group names, always including "core"
+
+    Raises:
+        ValueError: If a field name is unknown
+    """
+    if fields is None:
+        return tuple(FIELD_GROUPS)
+    unknown = set(fields) - set(ALL_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields {sorted(unknown)}; choose from {list(ALL_FIELDS)}")
+    requested = set(fields)
+    return tuple(
+        group
+        for group, group_fields in FIELD_GROUPS.items()
+        if group == "core" or requested.intersection(group_fields)
+    )
+
+
+def compute_symmetry(
+    structure: Any, symprec: float, angle_tolerance: float, groups: tuple[str, ...]
+) -> dict[str, dict[str, Any]]:
+    """
+    Run the symmetry analysis for the requested field groups.
+
+    Args:
+        structure: pymatgen structure
+        symprec: Symmetry precision for distance tolerance (in Angstrom)
+        angle_tolerance: Angle tolerance for symmetry finding (in degrees)
+        groups: Names from ``FIELD_GROUPS``
+
+    Returns:
+        Mapping of group name to its field values
+    """
+    from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+
+    analyzer = SpacegroupAnalyzer(structure, symprec=symprec, angle_tolerance=angle_tolerance)
+    values: dict[str, dict[str, Any]] = {}
+
+    if "core" in groups:
+        values["core"] = {
+            "space_group_symbol": analyzer.get_space_group_symbol(),
+            "space_group_number": analyzer.get_space_group_number(),
+            "point_group": analyzer.get_point_group_symbol(),
+            "crystal_system": analyzer.get_crystal_system(),
+            "hall_symbol": analyzer.get_hall(),
+            "original_formula": structure.composition.reduced_formula,
+            "original_num_atoms": len(structure),
+            "num_symmetry_ops": len(analyzer.get_symmetry_dataset().rotations),
+        }
+
+    if "primitive" in groups or "primitive_cif" in groups:
+        primitive = analyzer.get_primitive_standard_structure()
+        if "primitive" in groups:
+            values["primitive"] = {
+                "primitive_formula": primitive.composition.reduced_formula,
+                "primitive_num_atoms": len(primitive),
+            }
+        if "primitive_cif" in groups:
+            values["primitive_cif"] = {"primitive_cif": primitive.to(fmt="cif")}
+
+    if "lattice" in groups or "symmetrized_cif" in groups:
+        conventional = analyzer.get_conventional_standard_structure()
+        lattice = conventional.lattice
+        if "lattice" in groups:
+            values["lattice"] = {
+                "lattice_a": lattice.a,
+                "lattice_b": lattice.b,
+                "lattice_c": lattice.c,
+                "lattice_alpha": lattice.alpha,
+                "lattice_beta": lattice.beta,
+                "lattice_gamma": lattice.gamma,
+                "volume": lattice.volume,
+            }
+        if "symmetrized_cif" in groups:
+            values["symmetrized_cif"] = {"symmetrized_cif": conventional.to(fmt="cif")}
+
+    return values
+
+
+def _compute_task(
+    task: tuple[Any, float, float, tuple[str, ...]],
+) -> dict[str, dict[str, Any]] | str:
+    """Worker entry point; returns the error message instead of raising."""
+    try:
+        return compute_symmetry(*task)
+    except Exception as e:
+        return str(e)
+
+
+_symmetry_cache: ParseCache | None = None
+
+
+def get_symmetry_cache() -> ParseCache:
+    """Get the process-wide cache of symmetry field groups."""
+    global _symmetry_cache
+    if _symmetry_cache is None:
+        _symmetry_cache = ParseCache(max_entries=SYMMETRY_CACHE_SIZE)
+    return _symmetry_cache
+
+
+def analyze_symmetry_batch(
+    structures: list[Any],
+    symprec: float = 0.1,
+    angle_tolerance: float = 5.0,
+    fields: list[str] | None = None,
+    workers: int | None = None,
+) -> tuple[list[dict[str, Any] | str], int, int]:
+    """
+    Analyse the symmetry of many structures, reusing cached field groups.
+
+    Args:
+        structures: pymatgen structures
+        symprec: Symmetry precision for distance tolerance (in Angstrom)
+        angle_tolerance: Angle tolerance for symmetry finding (in degrees)
+        fields: Result fields to compute (None for all)
+        workers: Worker processes (default: CPU count; 1 disables the pool)
+
+    Returns:
+        (per-structure field values or error message, cache hits, processes used)
+    """
+    groups = groups_for_fields(fields)
+    cache = get_symmetry_cache()
+    keys = [f"{structure_hash(s)}|{symprec}|{angle_tolerance}" for s in structures]
+
+    found: list[dict[str, dict[str, Any]]] = []
+    missing: dict[str, tuple[int, tuple[str, ...]]] = {}
+    hits = 0
+    for i, key in enumerate(keys):
+        cached = {group: cache.get(group, key) for group in groups}
+        found.append({group: value for group, value in cached.items() if value is not None})
+        absent = tuple(group for group in groups if group not in found[i])
+        if not absent:
+            hits += 1
+        elif key not in missing:
+            missing[key] = (i, absent)
+
+    tasks = [(structures[i], symprec, angle_tolerance, absent) for i, absent in missing.values()]
+    computed, used = map_in_processes(
+        _compute_task, tasks, workers, parallel=len(tasks) >= PARALLEL_THRESHOLD, chunksize=4
+    )
+
+    fresh = dict(zip(missing, computed, strict=True))
+    for key, values in fresh.items():
+        if not isinstance(values, str):
+            for group, group_values in values.items():
+                cache.put(group, key, group_values)
+
+    results: list[dict[str, Any] | str] = []
+    for i, key in enumerate(keys):
+        values = fresh.get(key, {})
+        if isinstance(values, str):
+            results.append(values)
+            continue
+        merged: dict[str, Any] = {}
+        for group in groups:
+            merged.update(found[i].get(group) or values[group])
+        results.append(merged)
+    return results, hits, used
@@ -0,0 +1,241 @@
+"""
+Lazily loaded tool objects and resources for the MCP servers.
+
+Importing the tool stacks costs seconds (torch and MACE alone take ~5 s), and a
+server that imports them before it answers the MCP handshake looks hung to the
+client. Servers therefore declare their tools up front (the result models in
+``crystalyse.tools.models`` are cheap to import) and register each tool object
+by import path:
+
+    tools = ToolRegistry()
+    tools.register("mace_calculator", "crystalyse.tools.mace.energy:MACECalculator")
+    ...
+    tools.get("mace_calculator").relax_structure(...)
+
+The module is imported and the object instantiated on the first ``get``, or
+earlier by ``warm_up`` in a background thread. Import and instantiation times
+are recorded per tool and reported by ``status``.
+
+Model weights and data tables are registered the same way as resources (see
+``crystalyse.tools.resources``). A tool that needs one calls ``wait``: if the
+warm-up thread is loading it the tool blocks until it is ready rather than
+starting a second load, and ``readiness`` reports the state and load time of
+each resource. A failed load is not retried for ``RETRY_AFTER`` seconds; until
+then every ``get`` raises the recorded error at once, so a missing model
+file or an offline download does not stall each tool call that needs it.
+"""
+
+import importlib
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+# Seconds before a failed load is attempted again
+RETRY_AFTER = 60.0
+
+
+class Resource:
+    """A named object (model weights, data) loaded at most once at a time."""
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self.loader = loader
+        self.state = PENDING
+        self.load_seconds: float | None = None
+        self.error: str | None = None
+        self._value: Any = None
+        self._lock = threading.Lock()
+        self._failure: Exception | None = None
+        self._failed_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self.state == READY
+
+    def _load(self) -> Any:
+        return self.loader()
+
+    def _raise_recent_failure(self) -> None:
+        if self.state == FAILED and time.monotonic() - self._failed_at < RETRY_AFTER:
+            raise self._failure
+
+    def get(self) -> Any:
+        """
+        The loaded object, loading it now (or waiting for the thread that is).
+
+        Raises:
+            Exception: The load error, also raised again without loading while it
+                is less than ``RETRY_AFTER`` seconds old
+        """
+        if self.state == READY:
+            return self._value
+        self._raise_recent_failure()
+        with self._lock:
+            if self.state != READY:
+                # A thread we waited for may have just failed
+                self._raise_recent_failure()
+                self.state = LOADING
+                start = time.perf_counter()
+                try:
+                    value = self._load()
+                except Exception as e:
+                    self.load_seconds = time.perf_counter() - start
+                    self.error = f"{type(e).__name__}: {e}"
+                    self.state = FAILED
+                    self._failure, self._failed_at = e, time.monotonic()
+                    raise
+                self.load_seconds = time.perf_counter() - start
+                self._value = value
+                self.error = None
+                self.state = READY
+                logger.info(f"Loaded {self.name} in {self.load_seconds:.2f}s")
+        return self._value
+
+    def status(self) -> dict[str, Any]:
+        return {"state": self.state, "load_seconds": self.load_seconds, "error": self.error}
+
+
+class LazyTool(Resource):
+    """A tool object that is imported (and optionally instantiated) on first use."""
+
+    def __init__(self, name: str, target: str, instantiate: bool = True, **kwargs: Any):
+        """
+        Args:
+            name: Registry name
+            target: ``"package.module:Attribute"``
+            instantiate: Call the attribute (with kwargs) to create the tool object
+            **kwargs: Constructor arguments
+        """
+        super().__init__(name, loader=self._load)
+        self.module, _, self.attribute = target.partition(":")
+        self.instantiate = instantiate
+        self.kwargs = kwargs
+        self.import_seconds: float | None = None
+        self.init_seconds: float | None = None
+
+    def _load(self) -> Any:
+        start = time.perf_counter()
+        value = getattr(importlib.import_module(self.module), self.attribute)
+        self.import_seconds = time.perf_counter() - start
+        if self.instantiate:
+            start = time.perf_counter()
+            value = value(**self.kwargs)
+            self.init_seconds = time.perf_counter() - start
+        return value
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "import_seconds": self.import_seconds,
+            "init_seconds": self.init_seconds,
+            "error": self.error,
+        }
+
+
+class ToolRegistry:
+    """Named lazily loaded tool objects and resources."""
+
+    def __init__(self):
+        self._entries: dict[str, Resource] = {}
+        self._warm_up: threading.Thread | None = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def register(self, name: str, target: str, instantiate: bool = True, **kwargs: Any):
+        """
+        Register a tool object without importing it.
+
+        Args:
+            name: Name the tool object is fetched by
+            target: ``"package.module:Attribute"``
+            instantiate: Create an instance (False for classes used through static methods)
+            **kwargs: Constructor arguments
+
+        Returns:
+            The registry entry
+        """
+        tool = LazyTool(name, target, instantiate, **kwargs)
+        self._entries[name] = tool
+        return tool
+
+    def add_resource(self, name: str, loader: Callable[[], Any]) -> Resource:
+        """Register a resource (model weights, data) without loading it, unless already known."""
+        return self._entries.setdefault(name, Resource(name, loader))
+
+    def get(self, name: str) -> Any:
+        """The named tool object or resource, loading it on first use."""
+        return self._entries[name].get()
+
+    def is_loaded(self, name: str) -> bool:
+        return self._entries[name].loaded
+
+    def wait(self, name: str) -> bool:
+        """
+        Block until a resource is loaded, loading it here if nothing else is.
+
+        Load errors are logged and recorded rather than raised, so the tool
+        that needed the resource reports the failure in its own result.
+
+        Returns:
+            Whether the resource is ready
+        """
+        try:
+            self.get(name)
+        except Exception as e:
+            logger.warning(f"Resource {name} is unavailable: {e}")
+            return False
+        return True
+
+    def warm_up(self, names: Iterable[str] | None = None) -> threading.Thread:
+        """
+        Load tool objects and resources in a background thread.
+
+        Failures are recorded in ``status``/``readiness`` and raised again by
+        ``get`` (see ``RETRY_AFTER``).
+
+        Args:
+            names: Entries to load, in order (default: all registered)
+
+        Returns:
+            The (daemon) warm-up thread
+        """
+        order = list(self._entries) if names is None else list(names)
+
+        def run() -> None:
+            start = time.perf_counter()
+            for name in order:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    logger.warning(f"Warm-up of {name} failed: {e}")
+            logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+
+        self._warm_up = threading.Thread(target=run, name="tool-warm-up", daemon=True)
+        self._warm_up.start()
+        return self._warm_up
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        """Load state and import/instantiation times (s) of every tool object."""
+        return {
+            name: entry.status()
+            for name, entry in self._entries.items()
+            if isinstance(entry, LazyTool)
+        }
+
+    def readiness(self) -> dict[str, dict[str, Any]]:
+        """State (pending/loading/ready/failed) and load time (s) of every resource."""
+        return {
+            name: entry.status()
+            for name, entry in self._entries.items()
+            if not isinstance(entry, LazyTool)
+        }
@@ -0,0 +1,108 @@
+"""
+Model weights and data that the MCP servers load ahead of the first tool call.
+
+A warm-up plan is a list of resource specs:
+
+- ``phase_diagram``: the pickled Materials Project phase diagram
+- ``mace:<size>``: a MACE-MP foundation model (``small``, ``medium``, ``large``, ...)
+- ``chemeleon:<task>``: Chemeleon weights for ``csp`` or ``dng``
+- ``doper:<embedding>``: a dopant-prediction embedding (``skipspecies``, ...)
+
+Each loader fills the same process-wide cache the tools read from, so a tool
+that waits on its resource afterwards finds the object already loaded.
+
+``CRYSTALYSE_WARM_UP`` selects the plan: ``1`` (default) for the server's own
+plan, ``0`` for none, or a comma-separated list of specs.
+"""
+
+import os
+from collections.abc import Callable
+from typing import Any
+
+from .registry import ToolRegistry
+
+RESOURCE_KINDS = ("phase_diagram", "mace", "chemeleon", "doper")
+
+
+def _load_phase_diagram() -> Any:
+    from .pymatgen.phase_diagram import _load_phase_diagram
+
+    phase_diagram = _load_phase_diagram()
+    if phase_diagram is None:
+        raise FileNotFoundError("Phase diagram data is not available")
+    return phase_diagram
+
+
+def resource_loader(spec: str) -> Callable[[], Any]:
+    """
+    Loader for a resource spec.
+
+    Raises:
+        ValueError: If the spec is not one of the known resource kinds
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "phase_diagram" and not arg:
+        return _load_phase_diagram
+    if kind == "mace" and arg:
+
+        def load_mace() -> Any:
+            from .mace.energy import get_mace_calculator
+
+            return get_mace_calculator(model_type="mace_mp", size=arg)
+
+        return load_mace
+    if kind == "chemeleon" and arg in ("csp", "dng"):
+
+        def load_chemeleon() -> Any:
+            from .chemeleon.predictor import _load_model
+
+            return _load_model(task=arg)
+
+        return load_chemeleon
+    if kind == "doper" and arg:
+
+        def load_doper() -> Any:
+            from .smact.dopant_predictor import get_dopant_session
+
+            return get_dopant_session(arg)
+
+        return load_doper
+    raise ValueError(f"Unknown resource '{spec}'. Kinds: {', '.join(RESOURCE_KINDS)}")
+
+
+def warm_up_plan(default: list[str], value: str | None = None) -> list[str]:
+    """
+    Resource specs to load at startup.
+
+    Args:
+        default: The server's own plan
+        value: Setting to parse (default: ``CRYSTALYSE_WARM_UP``)
+
+    Returns:
+        Specs in load order (empty if warm-up is disabled)
+    """
+    if value is None:
+        value = os.getenv("CRYSTALYSE_WARM_UP", "1")
+    value = value.strip()
+    if value.lower() in ("", "0", "false", "no", "none"):
+        return []
+    if value.lower() in ("1", "true", "yes"):
+        return list(default)
+    return [spec.strip() for spec in value.split(",") if spec.strip()]
+
+
+def add_resource(registry: ToolRegistry, spec: str) -> None:
+    """Register a resource spec with the registry (no-op if already registered)."""
+    if spec not in registry:
+        registry.add_resource(spec, resource_loader(spec))
+
+
+def wait_for_resource(registry: ToolRegistry, spec: str) -> bool:
+    """
+    Wait for a resource a tool is about to use, loading it if nothing else is.
+
+    Returns:
+        Whether the resource is ready
+    """
+    add_resource(registry, spec)
+    return registry.wait(spec)
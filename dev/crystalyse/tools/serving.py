@@ -0,0 +1,121 @@
+"""
+Running the MCP servers over stdio or as shared local HTTP services.
+
+By default each agent session spawns its own stdio copy of every server, so
+each session loads its own MACE and Chemeleon models and phase diagram. Started
+with ``--http``, a server stays up as a streamable-HTTP endpoint on this host
+(``http://127.0.0.1:<port>/mcp``) that any number of sessions share: the models
+are loaded once per host and new sessions connect without a start-up. Point
+the agent at a running endpoint with ``CRYSTALYSE_UNIFIED_URL``,
+``CRYSTALYSE_CREATIVE_URL`` or ``CRYSTALYSE_VISUALIZATION_URL``.
+
+Each connected client runs at most ``--client-concurrency`` tool calls at a
+time (default ``CRYSTALYSE_MCP_CLIENT_CONCURRENCY``, 4); further calls from
+that client wait, so one busy session cannot take every worker from the rest.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORTS = {"chemistry_unified": 8701, "chemistry_creative": 8702, "visualization": 8703}
+DEFAULT_CLIENT_CONCURRENCY = 4
+
+HTTP_PATH = "/mcp"
+
+
+def endpoint_url(server_name: str, host: str = DEFAULT_HOST, port: int | None = None) -> str:
+    """URL of a server's streamable-HTTP endpoint."""
+    return f"http://{host}:{port or DEFAULT_PORTS[server_name]}{HTTP_PATH}"
+
+
+class ClientLimiter:
+    """Caps the calls in flight for each client; further calls wait for a slot."""
+
+    def __init__(self, max_calls: int = DEFAULT_CLIENT_CONCURRENCY):
+        self.max_calls = max(1, max_calls)
+        # Released along with the client's session
+        self._slots: weakref.WeakKeyDictionary[Any, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+    @asynccontextmanager
+    async def slot(self, client: Any):
+        """Hold one of the client's slots for the duration of a call."""
+        slots = self._slots.get(client)
+        if slots is None:
+            slots = self._slots[client] = asyncio.Semaphore(self.max_calls)
+        async with slots:
+            yield
+
+
+def limit_clients(server: Any, max_calls: int = DEFAULT_CLIENT_CONCURRENCY) -> ClientLimiter:
+    """
+    Limit the tool calls each client session of a FastMCP server runs at once.
+
+    Args:
+        server: The FastMCP server
+        max_calls: Tool calls in flight per client
+
+    Returns:
+        The ClientLimiter applied to the server
+    """
+    from mcp import types
+
+    lowlevel = server._mcp_server
+    handler = lowlevel.request_handlers[types.CallToolRequest]
+    limiter = ClientLimiter(max_calls)
+
+    async def limited(request: types.CallToolRequest) -> Any:
+        async with limiter.slot(lowlevel.request_context.session):
+            return await handler(request)
+
+    lowlevel.request_handlers[types.CallToolRequest] = limited
+    return limiter
+
+
+def serve(server: Any, server_name: str, argv: list[str] | None = None) -> None:
+    """
+    Run a FastMCP server over stdio, or over streamable HTTP with ``--http``.
+
+    Args:
+        server: The FastMCP server
+        server_name: Key of the server in ``DEFAULT_PORTS``
+        argv: Command-line arguments (default: ``sys.argv[1:]``)
+    """
+    parser = argparse.ArgumentParser(description=f"Run the {server_name} MCP server.")
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Serve streamable HTTP for any number of local clients instead of stdio",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORTS[server_name])
+    parser.add_argument(
+        "--client-concurrency",
+        type=int,
+        default=int(
+            os.getenv("CRYSTALYSE_MCP_CLIENT_CONCURRENCY", str(DEFAULT_CLIENT_CONCURRENCY))
+        ),
+        help="Tool calls each client may run at once",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.http:
+        server.run()
+        return
+
+    server.settings.host = args.host
+    server.settings.port = args.port
+    server.settings.streamable_http_path = HTTP_PATH
+    limit_clients(server, args.client_concurrency)
+    logger.info(
+        f"Serving {server_name} at {endpoint_url(server_name, args.host, args.port)} "
+        f"({args.client_concurrency} calls per client)"
+    )
+    server.run(transport="streamable-http")
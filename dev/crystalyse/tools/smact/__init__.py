@@ -1,7 +1,16 @@
 """SMACT tools package - composition validation and analysis."""
 
+from .bulk import BulkValidationResult, validate_compositions_bulk
 from .calculators import BandGapResult, ElementInfo, SMACTCalculator
-from .dopant_predictor import DopantPredictionResult, DopantSuggestion, SMACTDopantPredictor
+from .dopant_predictor import (
+    DopantBatchResult,
+    DopantPredictionResult,
+    DopantSuggestion,
+    SMACTDopantPredictor,
+    get_dopant_session,
+)
+from .enumeration import EnumerationStore, iter_compositions
+from .features import FeatureMatrixResult, featurise_compositions, featurise_enumeration
 from .screening import (
     CompositionFilterResult,
     CompositionValidityResult,
@@ -26,8 +35,17 @@ __all__ = [
     "SMACTDopantPredictor",
     "DopantPredictionResult",
     "DopantSuggestion",
+    "DopantBatchResult",
+    "get_dopant_session",
     "SMACTScreener",
     "CompositionValidityResult",
     "MLRepresentationResult",
     "CompositionFilterResult",
+    "BulkValidationResult",
+    "validate_compositions_bulk",
+    "EnumerationStore",
+    "iter_compositions",
+    "FeatureMatrixResult",
+    "featurise_compositions",
+    "featurise_enumeration",
 ]
@@ -0,0 +1,323 @@
+"""
+Bulk SMACT composition validation.
+
+Enumerated chemical spaces produce tens of thousands of formulas, and validating
+them one call at a time is dominated by overhead: every ``smact_validity`` call
+re-parses the formula and rebuilds SMACT ``Element`` objects for its elements.
+This module validates a whole batch at once:
+
+- each distinct input string is parsed once and reduced to integer stoichiometry;
+- inputs with the same reduced formula (``Fe2O3`` / ``Fe4O6``) are checked once;
+- oxidation states, electronegativities and metal flags come from the shared
+  element table and are memoised per element;
+- charge neutrality is the same test ``smact_validity`` performs, but branches of
+  the oxidation-state product that cannot sum to zero are pruned up front;
+- large batches are split into chunks and validated in a process pool.
+
+Compositions the fast path cannot handle (fractional occupancies, custom
+oxidation-state files) are passed to ``smact_validity`` unchanged.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterator
+from functools import cache, partial
+
+from ...utils.element_table import get_element_table
+from ..models import BulkValidationResult
+from ..pool import map_in_processes
+
+try:
+    from smact.screening import pauling_test, smact_validity
+
+    SMACT_AVAILABLE = True
+except ImportError:
+    SMACT_AVAILABLE = False
+    pauling_test = None
+    smact_validity = None
+
+# Built-in oxidation-state sets handled by the fast path
+FAST_PATH_SETS = ("icsd24", "icsd16", "smact14", "pymatgen_sp", "wiki")
+
+# Unique formulas per worker task
+DEFAULT_CHUNK_SIZE = 2000
+
+# Below this many unique formulas a process pool costs more than it saves
+PARALLEL_THRESHOLD = 5000
+
+# Reduced stoichiometry: ((symbol, count), ...) sorted by symbol
+Stoichiometry = tuple[tuple[str, int], ...]
+
+# Verdict for one unique formula: (valid or None, error message or None)
+Verdict = tuple[bool | None, str | None]
+
+
+@cache
+def element_data(symbol: str, oxidation_states_set: str) -> tuple[tuple[int, ...], float | None]:
+    """
+    Oxidation states and Pauling electronegativity of an element, memoised.
+
+    Args:
+        symbol: Element symbol
+        oxidation_states_set: One of ``FAST_PATH_SETS``
+
+    Returns:
+        (oxidation states, Pauling electronegativity or None)
+
+    Raises:
+        ValueError: If the symbol is not an element
+    """
+    table = get_element_table()
+    z = table.atomic_number(symbol)
+    if not z:
+        raise ValueError(f"Elemental data for {symbol} not found")
+    pauling = float(table.pauling_eneg[z])
+    states = table.oxidation_states(symbol, oxidation_states_set)
+    return states, None if math.isnan(pauling) else pauling
+
+
+@cache
+def _is_metal(symbol: str) -> bool:
+    table = get_element_table()
+    return bool(table.is_metal[table.atomic_number(symbol)])
+
+
+def parse_stoichiometry(formula: str) -> tuple[str, Stoichiometry | None]:
+    """
+    Reduce a formula to integer stoichiometry.
+
+    Args:
+        formula: Chemical formula
+
+    Returns:
+        (reduced formula, sorted (symbol, count) pairs), with None in place of the
+        stoichiometry if the composition has non-integer amounts
+
+    Raises:
+        ValueError: If the formula cannot be parsed
+    """
+    from pymatgen.core import Composition
+
+    comp = Composition(formula)
+    if comp.num_atoms == 0:
+        raise ValueError("empty composition")
+
+    amounts = comp.get_el_amt_dict()
+    if not all(float(n).is_integer() for n in amounts.values()):
+        return comp.reduced_formula, None
+
+    # Built directly rather than via Composition.reduced_formula, which dominates
+    # the cost of parsing; elements keep the order they were written in
+    counts = {symbol: int(n) for symbol, n in amounts.items()}
+    divisor = math.gcd(*counts.values())
+    reduced = "".join(
+        f"{symbol}{n // divisor if n // divisor > 1 else ''}" for symbol, n in counts.items()
+    )
+    stoichiometry = tuple(sorted((symbol, n // divisor) for symbol, n in counts.items()))
+    return reduced, stoichiometry
+
+
+def neutral_combinations(
+    oxidation_states: list[tuple[int, ...]], counts: list[int]
+) -> Iterator[tuple[int, ...]]:
+    """
+    Yield the oxidation-state combinations whose total charge is zero.
+
+    Equivalent to filtering ``itertools.product`` by charge, but the sets of charges
+    reachable by the remaining elements prune every branch that cannot balance.
+    """
+    reachable: list[set[int]] = [{0}]
+    for states, n in zip(reversed(oxidation_states), reversed(counts), strict=True):
+        reachable.append({charge + ox * n for charge in reachable[-1] for ox in states})
+    reachable.reverse()
+
+    if 0 not in reachable[0]:
+        return
+
+    def extend(index: int, charge: int, prefix: tuple[int, ...]) -> Iterator[tuple[int, ...]]:
+        if index == len(counts):
+            yield prefix
+            return
+        for ox in oxidation_states[index]:
+            total = charge + ox * counts[index]
+            if -total in reachable[index + 1]:
+                yield from extend(index + 1, total, (*prefix, ox))
+
+    yield from extend(0, 0, ())
+
+
+def is_valid_stoichiometry(
+    stoichiometry: Stoichiometry,
+    use_pauling_test: bool = True,
+    include_alloys: bool = True,
+    oxidation_states_set: str = "icsd24",
+) -> bool:
+    """
+    SMACT validity of a reduced integer stoichiometry using memoised element data.
+
+    Gives the same answer as ``smact.screening.smact_validity`` for the built-in
+    oxidation-state sets (metallicity is handled by the caller).
+    """
+    symbols = [symbol for symbol, _ in stoichiometry]
+    if len(symbols) == 1:
+        return True
+    if include_alloys and all(_is_metal(symbol) for symbol in symbols):
+        return True
+
+    data = [element_data(symbol, oxidation_states_set) for symbol in symbols]
+    oxidation_states = [states for states, _ in data]
+    if any(not states for states in oxidation_states):
+        return False
+
+    counts = [n for _, n in stoichiometry]
+    electronegativities = [eneg for _, eneg in data]
+
+    for states in neutral_combinations(oxidation_states, counts):
+        if not use_pauling_test:
+            return True
+        try:
+            if pauling_test(states, electronegativities):
+                return True
+        except TypeError:
+            # Missing electronegativity: smact_validity treats this as passing
+            return True
+    return False
+
+
+def _validate_chunk(
+    items: list[tuple[str, Stoichiometry | None]],
+    use_pauling_test: bool,
+    include_alloys: bool,
+    check_metallicity: bool,
+    metallicity_threshold: float,
+    oxidation_states_set: str,
+) -> list[Verdict]:
+    """Validate a chunk of unique reduced formulas; runs in worker processes."""
+    fast = oxidation_states_set in FAST_PATH_SETS
+    verdicts: list[Verdict] = []
+
+    for formula, stoichiometry in items:
+        try:
+            if stoichiometry is None or not fast:
+                valid = smact_validity(
+                    formula,
+                    use_pauling_test=use_pauling_test,
+                    include_alloys=include_alloys,
+                    check_metallicity=check_metallicity,
+                    metallicity_threshold=metallicity_threshold,
+                    oxidation_states_set=oxidation_states_set,
+                )
+            else:
+                valid = is_valid_stoichiometry(
+                    stoichiometry, use_pauling_test, include_alloys, oxidation_states_set
+                )
+                if not valid and check_metallicity:
+                    from smact.metallicity import metallicity_score
+
+                    valid = metallicity_score(formula) >= metallicity_threshold
+            verdicts.append((bool(valid), None))
+        except Exception as e:
+            verdicts.append((None, str(e)))
+
+    return verdicts
+
+
+def validate_compositions_bulk(
+    compositions: list[str],
+    use_pauling_test: bool = True,
+    include_alloys: bool = True,
+    check_metallicity: bool = False,
+    metallicity_threshold: float = 0.7,
+    oxidation_states_set: str = "icsd24",
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> BulkValidationResult:
+    """
+    Validate many compositions with SMACT rules in one call.
+
+    Args:
+        compositions: Chemical formulas; duplicates and multiples are validated once
+        use_pauling_test: Apply Pauling electronegativity test
+        include_alloys: Consider pure metals valid automatically
+        check_metallicity: Consider high metallicity compositions valid
+        metallicity_threshold: Threshold for metallicity validity (0-1)
+        oxidation_states_set: Oxidation state dataset ('icsd24', 'smact14', etc.)
+        workers: Worker processes (default: CPU count; 1 disables the pool)
+        chunk_size: Unique formulas per worker task
+
+    Returns:
+        Per-formula verdicts in input order plus the distinct valid formulas
+    """
+    start = time.perf_counter()
+    result = BulkValidationResult(
+        total=len(compositions),
+        unique=0,
+        use_pauling_test=use_pauling_test,
+        include_alloys=include_alloys,
+        check_metallicity=check_metallicity,
+        oxidation_states_set=oxidation_states_set,
+    )
+
+    if not SMACT_AVAILABLE:
+        result.success = False
+        result.error_message = "SMACT not available - install with: pip install SMACT"
+        return result
+
+    # Parse each distinct input string once, then collapse to reduced formulas
+    # Formulas are deduplicated on sorted stoichiometry, so LiO and OLi collapse too;
+    # the first spelling seen becomes the reported reduced formula
+    key_by_input: dict[str, Stoichiometry | str | None] = {}
+    labels: dict[Stoichiometry | str, tuple[str, Stoichiometry | None]] = {}
+    for formula in compositions:
+        if formula in key_by_input:
+            continue
+        try:
+            reduced, stoichiometry = parse_stoichiometry(formula)
+        except Exception as e:
+            key_by_input[formula] = None
+            result.errors[formula] = f"Could not parse formula: {e}"
+            continue
+        key = stoichiometry if stoichiometry is not None else reduced
+        key_by_input[formula] = key
+        labels.setdefault(key, (reduced, stoichiometry))
+
+    keys = list(labels)
+    unique = list(labels.values())
+    result.unique = len(unique)
+    options = {
+        "use_pauling_test": use_pauling_test,
+        "include_alloys": include_alloys,
+        "check_metallicity": check_metallicity,
+        "metallicity_threshold": metallicity_threshold,
+        "oxidation_states_set": oxidation_states_set,
+    }
+
+    chunk_size = max(1, chunk_size)
+    chunks = [unique[i : i + chunk_size] for i in range(0, len(unique), chunk_size)]
+    chunk_verdicts, result.workers = map_in_processes(
+        partial(_validate_chunk, **options),
+        chunks,
+        workers,
+        parallel=len(unique) >= PARALLEL_THRESHOLD,
+    )
+    verdicts: list[Verdict] = [verdict for chunk in chunk_verdicts for verdict in chunk]
+
+    by_key: dict[Stoichiometry | str, Verdict] = {}
+    for key, (reduced, _), (valid, error) in zip(keys, unique, verdicts, strict=True):
+        by_key[key] = (valid, error)
+        if valid and not error:
+            result.valid_formulas.append(reduced)
+
+    # Errors are keyed by the caller's own spelling, like parse errors above
+    for formula in compositions:
+        key = key_by_input[formula]
+        valid, error = by_key[key] if key is not None else (None, None)
+        result.verdicts.append(valid)
+        if error:
+            result.errors[formula] = error
+
+    result.num_valid = sum(1 for verdict in result.verdicts if verdict)
+    result.computation_time = time.perf_counter() - start
+    return result
@@ -1,31 +1,10 @@
 """SMACT calculation tools - extracted from MCP server."""
 
 import numpy as np
-from pydantic import BaseModel, Field
 
-from .validators import get_robust_electronegativity
-
-
-class BandGapResult(BaseModel):
-    """Band gap prediction result."""
-
-    formula: str
-    band_gap_ev: float | None = None
-    band_gap_estimate: str
-    method: str
-    electronegativity_difference: float | None = None
-    confidence: float = Field(ge=0.0, le=1.0, default=0.5)
-
-
-class ElementInfo(BaseModel):
-    """Element information result."""
-
-    symbol: str
-    name: str
-    atomic_number: int
-    atomic_mass: float
-    electronegativity: float | None = None
-    oxidation_states: dict[str, list[int]] | None = None
+from ...utils.element_table import OXIDATION_STATE_SETS, electronegativities, get_element_table
+from ...utils.parse_cache import parse_composition
+from ..models import BandGapResult, ElementInfo
 
 
 class SMACTCalculator:
@@ -43,20 +22,13 @@ class SMACTCalculator:
             Structured band gap prediction result
         """
         try:
-            from pymatgen.core import Composition
-
-            comp = Composition(composition)
-
-            elements = list(comp.as_dict().keys())
+            comp = parse_composition(composition)
 
             # Get electronegativities robustly
-            electronegativities = []
-            for elem in elements:
-                eneg = get_robust_electronegativity(elem, method="pauling")
-                if not np.isnan(eneg):
-                    electronegativities.append(eneg)
+            enegs = electronegativities(comp.as_dict().keys())
+            enegs = enegs[~np.isnan(enegs)]
 
-            if len(electronegativities) < 2:
+            if len(enegs) < 2:
                 return BandGapResult(
                     formula=composition,
                     band_gap_estimate="unknown",
@@ -65,7 +37,7 @@ class SMACTCalculator:
                 )
 
             # Simple Harrison-based estimate (very approximate)
-            eneg_diff = max(electronegativities) - min(electronegativities)
+            eneg_diff = float(enegs.max() - enegs.min())
 
             # Empirical relationship (very rough approximation)
             if eneg_diff > 2.0:
@@ -104,28 +76,25 @@ class SMACTCalculator:
             Structured element information
         """
         try:
-            from smact import Element
-
-            elem = Element(symbol)
+            table = get_element_table()
+            z = table.atomic_number(symbol)
+            if not z:
+                raise KeyError(f"Unknown element symbol: {symbol}")
 
             ox_states = None
             if include_oxidation_states:
                 ox_states = {}
-                if hasattr(elem, "oxidation_states_icsd24"):
-                    ox_states["icsd24"] = elem.oxidation_states_icsd24
-                if hasattr(elem, "oxidation_states_icsd16"):
-                    ox_states["icsd16"] = elem.oxidation_states_icsd16
-                if hasattr(elem, "oxidation_states_smact14"):
-                    ox_states["smact14"] = elem.oxidation_states_smact14
-                if hasattr(elem, "oxidation_states_wiki"):
-                    ox_states["wiki"] = elem.oxidation_states_wiki
+                for name in ("icsd24", "icsd16", "smact14", "wiki"):
+                    if name in OXIDATION_STATE_SETS:
+                        ox_states[name] = list(table.oxidation_states(symbol, name))
 
+            pauling = float(table.pauling_eneg[z])
             return ElementInfo(
-                symbol=elem.symbol,
-                name=elem.name,
-                atomic_number=elem.number,
-                atomic_mass=elem.mass,
-                electronegativity=elem.pauling_eneg,
+                symbol=str(table.symbols[z]),
+                name=str(table.names[z]),
+                atomic_number=z,
+                atomic_mass=float(table.mass[z]),
+                electronegativity=None if np.isnan(pauling) else pauling,
                 oxidation_states=ox_states if ox_states else None,
             )
 
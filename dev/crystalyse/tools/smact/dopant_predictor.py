@@ -3,58 +3,234 @@ SMACT Dopant Prediction Module
 
 Predicts n-type and p-type dopants for materials using chemical and electronic filters.
 Based on SMACT's dopant_prediction.doper module.
+
+SMACT's ``Doper`` rebuilds its species similarity table (a pandas fill that takes
+several seconds) every time it is constructed. ``DopantEmbeddingSession`` loads
+each embedding once per process into a numpy matrix and scores every candidate
+dopant for a host ion with one vectorised pass over that matrix, giving the same
+rankings as ``Doper.get_dopants``.
 """
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from ..models import DopantBatchResult, DopantPredictionResult, DopantSuggestion
 
 try:
     from smact import data_directory
+    from smact.dopant_prediction import doper as _doper
     from smact.dopant_prediction.doper import Doper
+    from smact.structure_prediction.utilities import parse_spec
 
     SMACT_AVAILABLE = True
 except ImportError:
     SMACT_AVAILABLE = False
     Doper = None
     data_directory = None
+    _doper = None
+    parse_spec = None
+
+# Lambda assigned by SMACT's CationMutator to species pairs missing from a table
+MISSING_LAMBDA = -5.0
+
+# Weights of similarity and selectivity in the combined score (as in Doper)
+SELECTIVITY_WEIGHT = 0.25
+
+# Distinct (host species, num_dopants, selectivity) results kept per embedding
+RESULT_CACHE_SIZE = 4096
+
+RESULT_KEYS = (
+    "n-type cation substitutions",
+    "p-type cation substitutions",
+    "n-type anion substitutions",
+    "p-type anion substitutions",
+)
+
+
+class DopantEmbeddingSession:
+    """
+    One species embedding loaded as a similarity matrix, reused across predictions.
+
+    Use ``get_dopant_session`` rather than constructing sessions directly, so each
+    embedding is only loaded once per process.
+    """
+
+    def __init__(self, embedding: str):
+        """
+        Load the cosine-similarity table of an embedding.
+
+        Args:
+            embedding: One of ``SMACTDopantPredictor.AVAILABLE_EMBEDDINGS``
+        """
+        paths = {
+            "skipspecies": _doper.SKIPSPECIES_COSINE_SIM_PATH,
+            "M3GNet-MP-2023.11.1-oxi-Eform": _doper.SPECIES_M3GNET_MP2023_EFORM_COSINE_PATH,
+            "M3GNet-MP-2023.11.1-oxi-band_gap": _doper.SPECIES_M3GNET_MP2023_GAP_COSINE_PATH,
+        }
+        if embedding not in paths:
+            raise ValueError(f"Embedding {embedding} is not supported")
 
+        with open(paths[embedding]) as f:
+            entries = json.load(f)
 
-class DopantSuggestion(BaseModel):
-    """Single dopant suggestion with scoring."""
+        self.embedding = embedding
+        self.species = sorted({s for entry in entries for s in entry[:2]})
+        self.index = {s: i for i, s in enumerate(self.species)}
+        self.charges = np.array([parse_spec(s)[1] for s in self.species])
 
-    dopant_species: str = Field(description="Dopant species (e.g., 'Fe3+')")
-    host_species: str = Field(description="Host species being replaced")
-    substitution_probability: float = Field(description="Probability of substitution")
-    chemical_similarity: float = Field(description="Chemical similarity (lambda value)")
-    selectivity: float = Field(description="Selectivity score (0-1)")
-    combined_score: float = Field(description="Combined probability-selectivity score")
+        # Fill the table symmetrically, then use SMACT's default for missing pairs
+        lambdas = np.full((len(self.species), len(self.species)), np.nan)
+        rows = np.fromiter((self.index[e[0]] for e in entries), dtype=np.int64)
+        cols = np.fromiter((self.index[e[1]] for e in entries), dtype=np.int64)
+        lambdas[rows, cols] = [e[2] for e in entries]
+        lambdas = np.where(np.isnan(lambdas), lambdas.T, lambdas)
+        self.lambdas = np.where(np.isnan(lambdas), MISSING_LAMBDA, lambdas)
 
+        self.Z = np.exp(self.lambdas).sum()
+        self.probabilities = np.exp(self.lambdas) / self.Z
+        self.threshold = 1 / self.Z * np.exp(MISSING_LAMBDA)
 
-class DopantPredictionResult(BaseModel):
-    """Result from dopant prediction."""
+        self._missing_lambdas = np.full(len(self.species), MISSING_LAMBDA)
+        self._missing_probabilities = np.exp(self._missing_lambdas) / self.Z
+        self._results: OrderedDict[tuple, dict[str, list[list]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
 
-    success: bool = True
-    composition: str = Field(description="Original composition formula")
-    embedding: str = Field(description="Embedding used for prediction")
+    def _row(self, species: str) -> tuple[np.ndarray, np.ndarray]:
+        """Lambdas and substitution probabilities of one species against all others."""
+        i = self.index.get(species)
+        if i is None:
+            return self._missing_lambdas, self._missing_probabilities
+        return self.lambdas[i], self.probabilities[i]
 
-    # Dopant suggestions
-    n_type_cation: list[DopantSuggestion] = Field(
-        default_factory=list, description="N-type cation dopants"
-    )
-    p_type_cation: list[DopantSuggestion] = Field(
-        default_factory=list, description="P-type cation dopants"
-    )
-    n_type_anion: list[DopantSuggestion] = Field(
-        default_factory=list, description="N-type anion dopants"
-    )
-    p_type_anion: list[DopantSuggestion] = Field(
-        default_factory=list, description="P-type anion dopants"
-    )
+    def _substitutions(
+        self, hosts: list[str], cations: list[str], key: str, get_selectivity: bool
+    ) -> list[list]:
+        q = self.charges
+        is_cation_site = key.endswith("cation substitutions")
+        entries = []
+        for host in hosts:
+            host_charge = parse_spec(host)[1]
+            if key.startswith("n-type"):
+                mask = q > host_charge if is_cation_site else (q > host_charge) & (q < 0)
+            else:
+                mask = (q < host_charge) & (q > 0) if is_cation_site else q < host_charge
 
-    # Metadata
-    num_suggestions: int = Field(description="Number of suggestions per category")
-    error_message: str | None = None
+            lambdas, probabilities = self._row(host)
+            mask &= probabilities > self.threshold
+            candidates = np.flatnonzero(mask)
+
+            if get_selectivity and is_cation_site:
+                others = [self._row(c)[1][candidates] for c in cations if c != host]
+                competing = probabilities[candidates] + np.sum(others, axis=0)
+                selectivities = np.round(probabilities[candidates] / competing, 2)
+            else:
+                selectivities = np.ones(len(candidates))
+
+            for j, selectivity in zip(candidates, selectivities, strict=True):
+                entry = [self.species[j], host, probabilities[j], lambdas[j]]
+                if get_selectivity:
+                    entry.append(1.0 if not is_cation_site else selectivity)
+                    entry.append(
+                        (1 - SELECTIVITY_WEIGHT) * lambdas[j] + SELECTIVITY_WEIGHT * entry[4]
+                    )
+                entries.append(entry)
+
+        entries.sort(key=lambda x: x[2], reverse=True)
+        if get_selectivity:
+            entries.sort(key=lambda x: x[5], reverse=True)
+        return entries
+
+    def get_dopants(
+        self,
+        species: list[str] | tuple[str, ...],
+        num_dopants: int = 5,
+        get_selectivity: bool = True,
+    ) -> dict[str, list[list]]:
+        """
+        Rank dopants for one host, as the "sorted" lists of ``Doper.get_dopants``.
+
+        Args:
+            species: Host species with oxidation states (e.g. ["Ti4+", "O2-"])
+            num_dopants: Number of dopants per category
+            get_selectivity: Add selectivity and combined scores and rank by the latter
+
+        Returns:
+            Mapping of category name to [dopant, host, probability, lambda,
+            (selectivity, combined score)] entries
+        """
+        key = (tuple(species), num_dopants, get_selectivity)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        cations, anions = [], []
+        for ion in species:
+            try:
+                charge = parse_spec(ion)[1]
+            except (AttributeError, ValueError):
+                continue
+            if charge > 0:
+                cations.append(ion)
+            elif charge < 0:
+                anions.append(ion)
+
+        results = {
+            key_name: self._substitutions(
+                cations if "cation" in key_name else anions, cations, key_name, get_selectivity
+            )[:num_dopants]
+            for key_name in RESULT_KEYS
+        }
+
+        with self._lock:
+            self._results[key] = results
+            if len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return results
+
+
+_dopant_sessions: dict[str, DopantEmbeddingSession] = {}
+_dopant_sessions_lock = threading.Lock()
+
+
+def get_dopant_session(embedding: str = "skipspecies") -> DopantEmbeddingSession:
+    """Get the process-wide session for an embedding, loading it on first use."""
+    session = _dopant_sessions.get(embedding)
+    if session is None:
+        with _dopant_sessions_lock:
+            session = _dopant_sessions.get(embedding)
+            if session is None:
+                session = DopantEmbeddingSession(embedding)
+                _dopant_sessions[embedding] = session
+    return session
+
+
+def _parse_dopant_list(dopant_data: list) -> list[DopantSuggestion]:
+    suggestions = []
+    for entry in dopant_data:
+        if len(entry) >= 6:  # Full data with selectivity
+            suggestions.append(
+                DopantSuggestion(
+                    dopant_species=entry[0],
+                    host_species=entry[1],
+                    substitution_probability=float(entry[2]),
+                    chemical_similarity=float(entry[3]),
+                    selectivity=float(entry[4]),
+                    combined_score=float(entry[5]),
+                )
+            )
+    return suggestions
 
 
 class SMACTDopantPredictor:
@@ -80,7 +256,7 @@ class SMACTDopantPredictor:
         num_dopants: int = 5,
         embedding: str = "skipspecies",
         get_selectivity: bool = True,
-        group_by_charge: bool = True,
+        group_by_charge: bool = True,  # noqa: ARG004
     ) -> DopantPredictionResult:
         """
         Predict dopants for a given composition.
@@ -91,7 +267,7 @@ class SMACTDopantPredictor:
             num_dopants: Number of dopant suggestions per category
             embedding: Embedding method to use
             get_selectivity: Calculate selectivity scores
-            group_by_charge: Group suggestions by charge state
+            group_by_charge: Kept for compatibility; results are always the overall rankings
 
         Returns:
             Structured dopant prediction result
@@ -116,57 +292,18 @@ class SMACTDopantPredictor:
                     error_message=f"Invalid embedding. Choose from: {SMACTDopantPredictor.AVAILABLE_EMBEDDINGS}",
                 )
 
-            # Initialize Doper
-            doper = Doper(
-                original_species=tuple(species), embedding=embedding, use_probability=True
-            )
-
-            # Get dopant suggestions
-            results = doper.get_dopants(
-                num_dopants=num_dopants,
-                get_selectivity=get_selectivity,
-                group_by_charge=group_by_charge,
-            )
-
-            # Parse results into structured format
-            def parse_dopant_list(dopant_data: list) -> list[DopantSuggestion]:
-                suggestions = []
-                for entry in dopant_data:
-                    if len(entry) >= 6:  # Full data with selectivity
-                        suggestions.append(
-                            DopantSuggestion(
-                                dopant_species=entry[0],
-                                host_species=entry[1],
-                                substitution_probability=float(entry[2]),
-                                chemical_similarity=float(entry[3]),
-                                selectivity=float(entry[4]),
-                                combined_score=float(entry[5]),
-                            )
-                        )
-                return suggestions
-
-            # Extract sorted results
-            n_type_cat = parse_dopant_list(
-                results.get("n-type cation substitutions", {}).get("sorted", [])
-            )
-            p_type_cat = parse_dopant_list(
-                results.get("p-type cation substitutions", {}).get("sorted", [])
-            )
-            n_type_an = parse_dopant_list(
-                results.get("n-type anion substitutions", {}).get("sorted", [])
-            )
-            p_type_an = parse_dopant_list(
-                results.get("p-type anion substitutions", {}).get("sorted", [])
+            results = get_dopant_session(embedding).get_dopants(
+                species, num_dopants=num_dopants, get_selectivity=get_selectivity
             )
 
             return DopantPredictionResult(
                 success=True,
                 composition=composition,
                 embedding=embedding,
-                n_type_cation=n_type_cat,
-                p_type_cation=p_type_cat,
-                n_type_anion=n_type_an,
-                p_type_anion=p_type_an,
+                n_type_cation=_parse_dopant_list(results["n-type cation substitutions"]),
+                p_type_cation=_parse_dopant_list(results["p-type cation substitutions"]),
+                n_type_anion=_parse_dopant_list(results["n-type anion substitutions"]),
+                p_type_anion=_parse_dopant_list(results["p-type anion substitutions"]),
                 num_suggestions=num_dopants,
             )
 
@@ -178,3 +315,71 @@ class SMACTDopantPredictor:
                 num_suggestions=num_dopants,
                 error_message=f"Dopant prediction failed: {str(e)}",
             )
+
+    @staticmethod
+    def predict_dopants_batch(
+        hosts: list[list[str]],
+        compositions: list[str] | None = None,
+        num_dopants: int = 5,
+        embedding: str = "skipspecies",
+        get_selectivity: bool = True,
+    ) -> DopantBatchResult:
+        """
+        Predict dopants for many hosts with one loaded embedding.
+
+        Args:
+            hosts: Species lists, one per host (e.g. [["Ti4+", "O2-"], ["Zn2+", "O2-"]])
+            compositions: Formula of each host for reference (default: joined species)
+            num_dopants: Number of dopant suggestions per category
+            embedding: Embedding method to use
+            get_selectivity: Calculate selectivity scores
+
+        Returns:
+            One dopant prediction result per host, in input order
+        """
+        start = time.perf_counter()
+        if compositions is not None and len(compositions) != len(hosts):
+            return DopantBatchResult(
+                success=False,
+                embedding=embedding,
+                error_message="compositions must have one entry per host",
+            )
+        if not SMACT_AVAILABLE:
+            return DopantBatchResult(
+                success=False,
+                embedding=embedding,
+                error_message="SMACT not available - install with: pip install SMACT",
+            )
+        if embedding not in SMACTDopantPredictor.AVAILABLE_EMBEDDINGS:
+            return DopantBatchResult(
+                success=False,
+                embedding=embedding,
+                error_message=f"Invalid embedding. Choose from: {SMACTDopantPredictor.AVAILABLE_EMBEDDINGS}",
+            )
+
+        try:
+            session = get_dopant_session(embedding)
+        except Exception as e:
+            return DopantBatchResult(
+                success=False,
+                embedding=embedding,
+                error_message=f"Could not load embedding: {str(e)}",
+            )
+
+        hits_before = session.hits
+        results = [
+            SMACTDopantPredictor.predict_dopants(
+                species=species,
+                composition=compositions[i] if compositions else " ".join(species),
+                num_dopants=num_dopants,
+                embedding=embedding,
+                get_selectivity=get_selectivity,
+            )
+            for i, species in enumerate(hosts)
+        ]
+        return DopantBatchResult(
+            embedding=embedding,
+            results=results,
+            cache_hits=session.hits - hits_before,
+            computation_time=time.perf_counter() - start,
+        )
@@ -0,0 +1,393 @@
+"""
+Streaming, sharded enumeration of charge-neutral compositions.
+
+``smact_filter`` walks every oxidation-state combination of an element set and,
+for each, every stoichiometry up to a threshold, building one Python list of the
+results. This engine gives the same compositions in the same order, but:
+
+- stoichiometries are a precomputed integer grid, so charge neutrality for one
+  oxidation-state combination is a single matrix-vector product;
+- oxidation-state combinations are split into shards that worker processes
+  enumerate in parallel, and results are streamed out as shards finish;
+- complete enumerations are written once to a compact on-disk table (raw int8
+  oxidation states and int16 stoichiometries plus a JSON header) that is
+  memory-mapped to serve pages behind a cursor.
+
+Tables live under ``~/.cache/crystalyse/enumerations/`` (or
+``CRYSTALYSE_ENUMERATION_DIR``), keyed by the enumeration parameters.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ...utils.element_table import get_element_table
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENUMERATION_DIR = Path.home() / ".cache" / "crystalyse" / "enumerations"
+
+# Bump when the on-disk layout changes so stale tables are never read back
+TABLE_FORMAT_VERSION = 1
+
+# Oxidation-state combinations per worker task
+SHARD_SIZE = 256
+
+# Below this many charge tests (combinations x stoichiometries) a process pool
+# costs more than it saves
+PARALLEL_THRESHOLD = 2_000_000
+
+# One shard of results: oxidation states (N x n, int8) and stoichiometries (N x n, int16)
+Block = tuple[np.ndarray, np.ndarray]
+
+
+@lru_cache(maxsize=16)
+def _stoichiometry_grid(
+    num_elements: int, threshold: int, stoichs: tuple[tuple[int, ...], ...] | None
+) -> np.ndarray:
+    """All reduced stoichiometries to test, in ``itertools.product`` order."""
+    options = stoichs or (tuple(range(1, threshold + 1)),) * num_elements
+    grid = np.array(list(itertools.product(*options)), dtype=np.int64)
+    grid = grid[np.gcd.reduce(grid, axis=1) == 1]
+    grid.flags.writeable = False
+    return grid
+
+
+def _passes_pauling(oxidation_states: tuple[int, ...], electronegativities: list[float]) -> bool:
+    from smact.screening import pauling_test
+
+    try:
+        return pauling_test(oxidation_states, electronegativities)
+    except TypeError:
+        # Missing electronegativity data: do not reject on it
+        return True
+
+
+def _enumerate_shard(
+    combinations: list[tuple[int, ...]],
+    electronegativities: list[float | None],
+    threshold: int,
+    stoichs: tuple[tuple[int, ...], ...] | None,
+) -> Block:
+    """Charge-neutral, Pauling-valid compositions for a shard of oxidation-state combinations."""
+    num_elements = len(electronegativities)
+    grid = _stoichiometry_grid(num_elements, threshold, stoichs)
+
+    ox_blocks, ratio_blocks = [], []
+    for states in combinations:
+        neutral = grid[grid @ np.asarray(states, dtype=np.int64) == 0]
+        if len(neutral) and _passes_pauling(states, electronegativities):
+            ox_blocks.append(np.tile(np.asarray(states, dtype=np.int8), (len(neutral), 1)))
+            ratio_blocks.append(neutral.astype(np.int16))
+
+    if not ox_blocks:
+        empty = np.empty((0, num_elements))
+        return empty.astype(np.int8), empty.astype(np.int16)
+    return np.concatenate(ox_blocks), np.concatenate(ratio_blocks)
+
+
+def iter_composition_blocks(
+    elements: list[str],
+    threshold: int = 8,
+    stoichs: list[list[int]] | None = None,
+    species_unique: bool = True,
+    oxidation_states_set: str = "icsd24",
+    workers: int | None = None,
+) -> Iterator[Block]:
+    """
+    Stream valid compositions for an element set, one shard at a time.
+
+    Blocks arrive in the same order ``smact_filter`` would list the compositions.
+    With ``species_unique=False`` repeated stoichiometries are dropped and the
+    oxidation-state arrays have zero columns.
+
+    Args:
+        elements: Element symbols (e.g., ["Li", "Fe", "P", "O"])
+        threshold: Maximum stoichiometry coefficient
+        stoichs: Optional fixed stoichiometry options per site
+        species_unique: Treat different oxidation states as distinct compositions
+        oxidation_states_set: Oxidation state dataset to use
+        workers: Worker processes (default: CPU count; 1 disables the pool)
+
+    Yields:
+        (oxidation states, stoichiometries) arrays for each shard
+
+    Raises:
+        ValueError: If an element is unknown or has no oxidation states in the set
+    """
+    table = get_element_table()
+    states = []
+    for symbol in elements:
+        if not table.atomic_number(symbol):
+            raise ValueError(f"Unknown element: {symbol}")
+        states.append(table.oxidation_states(symbol, oxidation_states_set))
+    missing = [symbol for symbol, s in zip(elements, states, strict=True) if not s]
+    if missing:
+        raise ValueError(
+            f"No oxidation states found for {missing} in "
+            f"oxidation_states_set='{oxidation_states_set}'."
+        )
+
+    enegs = [
+        None if np.isnan(x) else float(x)
+        for x in table.pauling_eneg[table.atomic_numbers(elements)]
+    ]
+    stoichs_key = tuple(tuple(s) for s in stoichs) if stoichs else None
+    grid_size = len(_stoichiometry_grid(len(elements), threshold, stoichs_key))
+
+    combinations = list(itertools.product(*states))
+    shards = [combinations[i : i + SHARD_SIZE] for i in range(0, len(combinations), SHARD_SIZE)]
+    max_workers = min(workers or os.cpu_count() or 1, len(shards))
+
+    def blocks() -> Iterator[Block]:
+        if max_workers > 1 and len(combinations) * grid_size >= PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                yield from pool.map(
+                    _enumerate_shard,
+                    shards,
+                    itertools.repeat(enegs),
+                    itertools.repeat(threshold),
+                    itertools.repeat(stoichs_key),
+                )
+        else:
+            for shard in shards:
+                yield _enumerate_shard(shard, enegs, threshold, stoichs_key)
+
+    seen: set[bytes] = set()
+    for ox_block, ratio_block in blocks():
+        if species_unique:
+            if len(ratio_block):
+                yield ox_block, ratio_block
+            continue
+        keep = []
+        for i, row in enumerate(ratio_block):
+            key = row.tobytes()
+            if key not in seen:
+                seen.add(key)
+                keep.append(i)
+        if keep:
+            yield ox_block[keep][:, :0], ratio_block[keep]
+
+
+def iter_compositions(
+    elements: list[str], **kwargs: Any
+) -> Iterator[tuple[tuple[str, ...], tuple[int, ...], tuple[int, ...]]]:
+    """
+    Stream valid compositions as ``(symbols, oxidation states, stoichiometry)`` tuples.
+
+    Accepts the same keyword arguments as ``iter_composition_blocks``; with
+    ``species_unique=False`` the oxidation states are an empty tuple.
+    """
+    symbols = tuple(elements)
+    for ox_block, ratio_block in iter_composition_blocks(elements, **kwargs):
+        for ox, ratio in zip(ox_block.tolist(), ratio_block.tolist(), strict=True):
+            yield symbols, tuple(ox), tuple(ratio)
+
+
+@dataclass
+class EnumerationTable:
+    """A completed enumeration on disk, memory-mapped for paging."""
+
+    key: str
+    elements: list[str]
+    threshold: int
+    oxidation_states_set: str
+    species_unique: bool
+    count: int
+    oxidation_states: np.ndarray
+    stoichiometry: np.ndarray
+
+    def page(self, offset: int = 0, limit: int = 100) -> list[dict[str, Any]]:
+        """
+        Format a slice of the table like ``SMACTScreener.filter_compositions``.
+
+        Args:
+            offset: Index of the first composition
+            limit: Maximum number of compositions
+
+        Returns:
+            Compositions with elements, stoichiometry and (if species_unique) oxidation states
+        """
+        ox_rows = self.oxidation_states[offset : offset + limit].tolist()
+        ratio_rows = self.stoichiometry[offset : offset + limit].tolist()
+        page = []
+        for ox, ratio in zip(ox_rows, ratio_rows, strict=True):
+            entry: dict[str, Any] = {"elements": list(self.elements)}
+            if self.species_unique:
+                entry["oxidation_states"] = ox
+            entry["stoichiometry"] = ratio
+            page.append(entry)
+        return page
+
+
+class EnumerationStore:
+    """On-disk tables of completed enumerations, addressed by parameter hash."""
+
+    def __init__(self, directory: str | Path | None = None):
+        self.directory = Path(
+            directory or os.getenv("CRYSTALYSE_ENUMERATION_DIR") or DEFAULT_ENUMERATION_DIR
+        )
+
+    @staticmethod
+    def make_key(
+        elements: list[str],
+        threshold: int,
+        stoichs: list[list[int]] | None,
+        species_unique: bool,
+        oxidation_states_set: str,
+    ) -> str:
+        """Derive the table key from everything that determines the enumeration."""
+        import smact
+
+        payload = json.dumps(
+            {
+                "version": TABLE_FORMAT_VERSION,
+                "smact": getattr(smact, "__version__", "unknown"),
+                "elements": list(elements),
+                "threshold": None if stoichs else threshold,
+                "stoichs": stoichs,
+                "species_unique": species_unique,
+                "oxidation_states_set": oxidation_states_set,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def get(self, key: str) -> EnumerationTable | None:
+        """Open a completed table, or None if it does not exist or is unreadable."""
+        path = self.directory / key
+        try:
+            meta = json.loads((path / "meta.json").read_text())
+            if meta.get("version") != TABLE_FORMAT_VERSION:
+                return None
+            count = meta["count"]
+            width = len(meta["elements"])
+            ox_width = width if meta["species_unique"] else 0
+            return EnumerationTable(
+                key=key,
+                elements=meta["elements"],
+                threshold=meta["threshold"],
+                oxidation_states_set=meta["oxidation_states_set"],
+                species_unique=meta["species_unique"],
+                count=count,
+                oxidation_states=_open_array(
+                    path / "oxidation_states.bin", np.int8, count, ox_width
+                ),
+                stoichiometry=_open_array(path / "stoichiometry.bin", np.int16, count, width),
+            )
+        except (OSError, ValueError, KeyError) as e:
+            if path.exists():
+                logger.warning(f"Ignoring unreadable enumeration table {path}: {e}")
+            return None
+
+    def build(
+        self,
+        elements: list[str],
+        threshold: int = 8,
+        stoichs: list[list[int]] | None = None,
+        species_unique: bool = True,
+        oxidation_states_set: str = "icsd24",
+        workers: int | None = None,
+    ) -> EnumerationTable:
+        """
+        Return the table for these parameters, enumerating and writing it if needed.
+
+        Shards are appended to disk as they arrive, so memory use stays at one shard
+        regardless of the size of the chemical space.
+        """
+        key = self.make_key(elements, threshold, stoichs, species_unique, oxidation_states_set)
+        existing = self.get(key)
+        if existing is not None:
+            return existing
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.directory, prefix=f".{key}-"))
+        count = 0
+        try:
+            with (
+                open(tmp_dir / "oxidation_states.bin", "wb") as ox_file,
+                open(tmp_dir / "stoichiometry.bin", "wb") as ratio_file,
+            ):
+                for ox_block, ratio_block in iter_composition_blocks(
+                    elements,
+                    threshold=threshold,
+                    stoichs=stoichs,
+                    species_unique=species_unique,
+                    oxidation_states_set=oxidation_states_set,
+                    workers=workers,
+                ):
+                    ox_file.write(np.ascontiguousarray(ox_block, dtype=np.int8).tobytes())
+                    ratio_file.write(np.ascontiguousarray(ratio_block, dtype=np.int16).tobytes())
+                    count += len(ratio_block)
+
+            meta = {
+                "version": TABLE_FORMAT_VERSION,
+                "elements": list(elements),
+                "threshold": threshold,
+                "stoichs": stoichs,
+                "species_unique": species_unique,
+                "oxidation_states_set": oxidation_states_set,
+                "count": count,
+            }
+            (tmp_dir / "meta.json").write_text(json.dumps(meta))
+            os.replace(tmp_dir, self.directory / key)
+        except OSError:
+            # Another process may have finished the same table first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            table = self.get(key)
+            if table is None:
+                raise
+            return table
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        logger.info(f"Enumerated {count} compositions for {elements} -> {self.directory / key}")
+        return self.get(key)
+
+
+def _open_array(path: Path, dtype: type, count: int, width: int) -> np.ndarray:
+    if count == 0 or width == 0:
+        return np.empty((count, width), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count, width))
+
+
+def encode_cursor(key: str, offset: int) -> str:
+    """Encode a table position as an opaque cursor string."""
+    return f"{key}:{offset}"
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    """
+    Decode a cursor from ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    key, _, offset = cursor.partition(":")
+    if not key or not offset.isdigit():
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return key, int(offset)
+
+
+_enumeration_store: EnumerationStore | None = None
+
+
+def get_enumeration_store() -> EnumerationStore:
+    """Get the process-wide enumeration store."""
+    global _enumeration_store
+    if _enumeration_store is None:
+        _enumeration_store = EnumerationStore()
+    return _enumeration_store
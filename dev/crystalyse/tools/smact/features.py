@@ -0,0 +1,272 @@
+"""
+Batch composition featurisation into memory-mapped matrices.
+
+``SMACTScreener.generate_ml_representation`` returns one 103-element Python list
+per formula, which downstream ML code then has to stack into a matrix. For large
+sets that list building dominates. The functions here fill an N x 103 float32
+matrix directly:
+
+- dense matrices are written into a memory-mapped ``.npy`` in row chunks, so the
+  full matrix never has to fit in memory;
+- sparse matrices (CSR, the default above ``SPARSE_ROW_THRESHOLD`` rows) are
+  written with ``scipy.sparse.save_npz``;
+- an ``.index.json`` next to the matrix lists the formula for each row and the
+  element symbol for each column.
+
+Rows are the same normalised element fractions as ``smact.screening.ml_rep_generator``.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ...utils.element_table import MAX_ATOMIC_NUMBER, get_element_table
+from ..models import FeatureMatrixResult
+from .enumeration import EnumerationTable
+
+logger = logging.getLogger(__name__)
+
+# Rows written per chunk when filling a dense memmap
+CHUNK_ROWS = 65536
+
+# Above this many rows sparse output is chosen automatically (dense would exceed ~100 MB)
+SPARSE_ROW_THRESHOLD = 250_000
+
+
+def _output_paths(output_dir: str | Path, name: str | None, rows: list[str], sparse: bool):
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    if name is None:
+        digest = hashlib.sha256("\n".join(rows).encode()).hexdigest()[:12]
+        name = f"features-{digest}"
+    matrix_path = directory / f"{name}.npz" if sparse else directory / f"{name}.npy"
+    return matrix_path, directory / f"{name}.index.json"
+
+
+def _write_index(
+    index_path: Path, rows: list[str], failed: dict[str, str], matrix_format: str
+) -> None:
+    table = get_element_table()
+    index = {
+        "format": matrix_format,
+        "shape": [len(rows), MAX_ATOMIC_NUMBER],
+        "columns": [str(symbol) for symbol in table.symbols[1:]],
+        "rows": rows,
+        "failed": failed,
+    }
+    index_path.write_text(json.dumps(index))
+
+
+def _summarise(
+    result: FeatureMatrixResult, nonzero_per_row: np.ndarray, column_counts: np.ndarray
+) -> None:
+    rows = len(nonzero_per_row)
+    total = int(nonzero_per_row.sum())
+    result.density = total / (rows * MAX_ATOMIC_NUMBER) if rows else 0.0
+    result.mean_elements_per_row = float(nonzero_per_row.mean()) if rows else 0.0
+    symbols = get_element_table().symbols
+    order = np.argsort(-column_counts, kind="stable")
+    result.element_counts = {
+        str(symbols[z + 1]): int(column_counts[z]) for z in order[:20] if column_counts[z]
+    }
+
+
+def _write_blocks(
+    blocks, rows: int, matrix_path: Path, sparse: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """Write (row_offset, dense float32 block) pairs; return per-row and per-column non-zeros."""
+    nonzero_per_row = np.zeros(rows, dtype=np.int64)
+    column_counts = np.zeros(MAX_ATOMIC_NUMBER, dtype=np.int64)
+
+    if sparse:
+        from scipy import sparse as sp
+
+        parts = []
+        for offset, block in blocks:
+            nonzero = block != 0
+            nonzero_per_row[offset : offset + len(block)] = nonzero.sum(axis=1)
+            column_counts += nonzero.sum(axis=0)
+            parts.append(sp.csr_matrix(block))
+        matrix = (
+            sp.vstack(parts, format="csr")
+            if parts
+            else sp.csr_matrix((0, MAX_ATOMIC_NUMBER), dtype=np.float32)
+        )
+        sp.save_npz(matrix_path, matrix)
+    else:
+        matrix = np.lib.format.open_memmap(
+            matrix_path, mode="w+", dtype=np.float32, shape=(rows, MAX_ATOMIC_NUMBER)
+        )
+        for offset, block in blocks:
+            matrix[offset : offset + len(block)] = block
+            nonzero = block != 0
+            nonzero_per_row[offset : offset + len(block)] = nonzero.sum(axis=1)
+            column_counts += nonzero.sum(axis=0)
+        matrix.flush()
+        del matrix
+
+    return nonzero_per_row, column_counts
+
+
+def featurise_compositions(
+    compositions: list[str],
+    output_dir: str | Path,
+    name: str | None = None,
+    sparse: bool | None = None,
+) -> FeatureMatrixResult:
+    """
+    Write the ML composition vectors of many formulas as one matrix.
+
+    Args:
+        compositions: Chemical formulas; row i of the matrix is compositions[i]
+        output_dir: Directory for the matrix and its index
+        name: File stem (default: derived from the formulas)
+        sparse: Write CSR instead of dense (default: CSR above SPARSE_ROW_THRESHOLD rows)
+
+    Returns:
+        Paths to the written files and summary statistics
+    """
+    from pymatgen.core import Composition
+
+    start = time.perf_counter()
+    if sparse is None:
+        sparse = len(compositions) > SPARSE_ROW_THRESHOLD
+    result = FeatureMatrixResult(format="csr" if sparse else "dense")
+
+    try:
+        table = get_element_table()
+        parsed: dict[str, tuple[np.ndarray, np.ndarray] | None] = {}
+        failed: dict[str, str] = {}
+
+        # Each distinct formula is parsed once into (column indices, fractions)
+        for formula in compositions:
+            if formula in parsed:
+                continue
+            try:
+                amounts = Composition(formula).get_el_amt_dict()
+                numbers = table.atomic_numbers(amounts)
+                if not len(numbers) or not numbers.all():
+                    raise ValueError("unknown or missing elements")
+                values = np.fromiter(amounts.values(), dtype=np.float64)
+                parsed[formula] = (numbers - 1, values / values.sum())
+            except Exception as e:
+                parsed[formula] = None
+                failed[formula] = str(e)
+
+        def blocks():
+            for offset in range(0, len(compositions), CHUNK_ROWS):
+                chunk = compositions[offset : offset + CHUNK_ROWS]
+                block = np.zeros((len(chunk), MAX_ATOMIC_NUMBER), dtype=np.float32)
+                for i, formula in enumerate(chunk):
+                    entry = parsed[formula]
+                    if entry is not None:
+                        np.add.at(block[i], entry[0], entry[1])
+                yield offset, block
+
+        matrix_path, index_path = _output_paths(output_dir, name, compositions, sparse)
+        nonzero_per_row, column_counts = _write_blocks(
+            blocks(), len(compositions), matrix_path, sparse
+        )
+        _write_index(index_path, list(compositions), failed, result.format)
+
+        result.matrix_path = str(matrix_path)
+        result.index_path = str(index_path)
+        result.shape = [len(compositions), MAX_ATOMIC_NUMBER]
+        result.num_failed = sum(1 for formula in compositions if parsed[formula] is None)
+        _summarise(result, nonzero_per_row, column_counts)
+
+    except Exception as e:
+        result.success = False
+        result.error_message = f"Featurisation failed: {e}"
+
+    result.computation_time = time.perf_counter() - start
+    return result
+
+
+def featurise_enumeration(
+    table: EnumerationTable,
+    output_dir: str | Path,
+    name: str | None = None,
+    sparse: bool | None = None,
+) -> FeatureMatrixResult:
+    """
+    Write the ML composition vectors of a stored enumeration as one matrix.
+
+    Every row shares the same elements, so each chunk is filled by column
+    assignment straight from the memory-mapped stoichiometry array.
+
+    Args:
+        table: Enumeration from ``EnumerationStore``
+        output_dir: Directory for the matrix and its index
+        name: File stem (default: ``features-<enumeration key>``)
+        sparse: Write CSR instead of dense (default: CSR above SPARSE_ROW_THRESHOLD rows)
+
+    Returns:
+        Paths to the written files and summary statistics
+    """
+    start = time.perf_counter()
+    if sparse is None:
+        sparse = table.count > SPARSE_ROW_THRESHOLD
+    result = FeatureMatrixResult(format="csr" if sparse else "dense")
+
+    try:
+        columns = get_element_table().atomic_numbers(table.elements) - 1
+
+        def blocks():
+            for offset in range(0, table.count, CHUNK_ROWS):
+                ratios = np.asarray(table.stoichiometry[offset : offset + CHUNK_ROWS], np.float64)
+                fractions = ratios / ratios.sum(axis=1, keepdims=True)
+                block = np.zeros((len(ratios), MAX_ATOMIC_NUMBER), dtype=np.float32)
+                for j, column in enumerate(columns):
+                    block[:, column] += fractions[:, j]
+                yield offset, block
+
+        rows = [
+            "".join(
+                f"{el}{n if n > 1 else ''}" for el, n in zip(table.elements, ratio, strict=True)
+            )
+            for ratio in table.stoichiometry.tolist()
+        ]
+        matrix_path, index_path = _output_paths(
+            output_dir, name or f"features-{table.key[:12]}", rows, sparse
+        )
+        nonzero_per_row, column_counts = _write_blocks(blocks(), table.count, matrix_path, sparse)
+        _write_index(index_path, rows, {}, result.format)
+
+        result.matrix_path = str(matrix_path)
+        result.index_path = str(index_path)
+        result.shape = [table.count, MAX_ATOMIC_NUMBER]
+        _summarise(result, nonzero_per_row, column_counts)
+
+    except Exception as e:
+        result.success = False
+        result.error_message = f"Featurisation failed: {e}"
+
+    result.computation_time = time.perf_counter() - start
+    return result
+
+
+def load_feature_matrix(matrix_path: str | Path) -> tuple[Any, dict[str, Any]]:
+    """
+    Open a matrix written by this module together with its index.
+
+    Dense matrices are memory-mapped read-only; CSR matrices are loaded with scipy.
+
+    Args:
+        matrix_path: Path to the ``.npy`` or ``.npz`` file
+
+    Returns:
+        (matrix, index dict with "rows", "columns", "failed")
+    """
+    matrix_path = Path(matrix_path)
+    index = json.loads(matrix_path.with_suffix(".index.json").read_text())
+    if matrix_path.suffix == ".npz":
+        from scipy import sparse as sp
+
+        return sp.load_npz(matrix_path), index
+    return np.load(matrix_path, mmap_mode="r"), index
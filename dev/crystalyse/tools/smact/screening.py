@@ -10,64 +10,20 @@ Fast screening tools for materials discovery including:
 
 from __future__ import annotations
 
-from typing import Any
+import numpy as np
 
-from pydantic import BaseModel, Field
+from ...utils.element_table import MAX_ATOMIC_NUMBER, get_element_table
+from ...utils.parse_cache import parse_composition
+from ..models import CompositionFilterResult, CompositionValidityResult, MLRepresentationResult
+from .enumeration import decode_cursor, encode_cursor, get_enumeration_store
 
 try:
-    from smact import Element
-    from smact.screening import ml_rep_generator, smact_filter, smact_validity
+    from smact.screening import smact_validity
 
     SMACT_AVAILABLE = True
 except ImportError:
     SMACT_AVAILABLE = False
     smact_validity = None
-    ml_rep_generator = None
-    smact_filter = None
-    Element = None
-
-
-class CompositionValidityResult(BaseModel):
-    """Result from SMACT validity check."""
-
-    success: bool = True
-    composition: str = Field(description="Chemical formula tested")
-    is_valid: bool = Field(description="Whether composition passes SMACT tests")
-
-    # Test parameters
-    use_pauling_test: bool = Field(description="Whether Pauling EN test was used")
-    include_alloys: bool = Field(description="Whether alloys are considered valid")
-    check_metallicity: bool = Field(description="Whether metallicity was checked")
-    oxidation_states_set: str | None = Field(description="Oxidation state dataset used")
-
-    # Optional metadata
-    metallicity_threshold: float | None = None
-    error_message: str | None = None
-
-
-class MLRepresentationResult(BaseModel):
-    """Result from ML representation generation."""
-
-    success: bool = True
-    composition: str = Field(description="Chemical formula")
-    ml_vector: list[float] = Field(description="103-element ML representation vector (normalized)")
-    vector_length: int = Field(default=103, description="Length of ML vector")
-    error_message: str | None = None
-
-
-class CompositionFilterResult(BaseModel):
-    """Result from SMACT composition filtering."""
-
-    success: bool = True
-    elements: list[str] = Field(description="Element symbols tested")
-    num_valid_compositions: int = Field(description="Number of valid compositions found")
-    valid_compositions: list[dict[str, Any]] = Field(
-        default_factory=list,
-        description="List of valid compositions with oxidation states and stoichiometry",
-    )
-    threshold: int = Field(description="Stoichiometry threshold used")
-    oxidation_states_set: str = Field(description="Oxidation state dataset used")
-    error_message: str | None = None
 
 
 class SMACTScreener:
@@ -210,21 +166,30 @@ class SMACTScreener:
         try:
             # Handle string composition by parsing it
             if isinstance(composition, str):
-                from pymatgen.core import Composition
-
-                comp = Composition(composition)
-                elements = [Element(sym) for sym in comp.as_dict().keys()]
+                comp = parse_composition(composition)
+                symbols = list(comp.as_dict().keys())
                 stoichs = list(comp.as_dict().values())
                 composition_str = composition
             else:
                 # List of element symbols
-                elements = [Element(sym) if isinstance(sym, str) else sym for sym in composition]
+                symbols = [sym if isinstance(sym, str) else sym.symbol for sym in composition]
                 composition_str = "".join(
-                    [f"{el.symbol}{s}" for el, s in zip(elements, stoichs or [], strict=False)]
+                    [f"{sym}{s}" for sym, s in zip(symbols, stoichs or [], strict=False)]
                 )
 
-            # Generate ML representation
-            ml_vector = ml_rep_generator(elements, stoichs=stoichs)
+            # Generate ML representation (same vector as smact's ml_rep_generator,
+            # built from the element table instead of per-symbol Element objects)
+            if not symbols:
+                raise ValueError("composition must not be empty")
+            numbers = get_element_table().atomic_numbers(symbols)
+            if not numbers.all():
+                raise ValueError(f"Unknown element in {symbols}")
+            counts = np.ones(len(symbols)) if stoichs is None else np.asarray(stoichs, float)
+            vector = np.zeros(MAX_ATOMIC_NUMBER)
+            np.add.at(vector, numbers - 1, counts)
+            if vector.sum() == 0:
+                raise ValueError("Stoichiometries sum to zero; cannot normalise")
+            ml_vector = (vector / vector.sum()).tolist()
 
             return MLRepresentationResult(
                 success=True,
@@ -248,12 +213,17 @@ class SMACTScreener:
         stoichs: list[list[int]] | None = None,
         species_unique: bool = True,
         oxidation_states_set: str = "icsd24",
+        page_size: int = 100,
+        cursor: str | None = None,
+        workers: int | None = None,
     ) -> CompositionFilterResult:
         """
         Generate all valid compositions for a given set of elements.
 
         Applies charge neutrality and electronegativity tests to enumerate
-        valid compositions up to a stoichiometry threshold.
+        valid compositions up to a stoichiometry threshold. The full enumeration
+        is stored on disk; results are returned one page at a time, and
+        ``next_cursor`` fetches the following page.
 
         Args:
             elements: List of element symbols (e.g., ["Li", "Fe", "P", "O"])
@@ -261,9 +231,12 @@ class SMACTScreener:
             stoichs: Optional fixed stoichiometry ratios per site
             species_unique: Consider different oxidation states as unique
             oxidation_states_set: Which oxidation state dataset to use
+            page_size: Maximum compositions to return
+            cursor: ``next_cursor`` from a previous call; other arguments are ignored
+            workers: Worker processes for enumeration (default: CPU count)
 
         Returns:
-            Structured result with all valid compositions
+            Structured result with the total count and one page of valid compositions
         """
         if not SMACT_AVAILABLE:
             return CompositionFilterResult(
@@ -276,41 +249,37 @@ class SMACTScreener:
             )
 
         try:
-            # Create Element objects
-            smact_elements = tuple(Element(sym) for sym in elements)
-
-            # Run SMACT filter
-            valid_comps = smact_filter(
-                els=smact_elements,
-                threshold=threshold,
-                stoichs=stoichs,
-                species_unique=species_unique,
-                oxidation_states_set=oxidation_states_set,
-            )
-
-            # Format results
-            formatted_comps = []
-            for comp in valid_comps[:100]:  # Limit to 100 for response size
-                if species_unique and len(comp) == 3:
-                    formatted_comps.append(
-                        {
-                            "elements": list(comp[0]),
-                            "oxidation_states": list(comp[1]),
-                            "stoichiometry": list(comp[2]),
-                        }
-                    )
-                elif not species_unique and len(comp) == 2:
-                    formatted_comps.append(
-                        {"elements": list(comp[0]), "stoichiometry": list(comp[1])}
+            store = get_enumeration_store()
+            if cursor:
+                key, offset = decode_cursor(cursor)
+                table = store.get(key)
+                if table is None:
+                    raise ValueError(
+                        "Cursor refers to an enumeration that is no longer stored; "
+                        "repeat the request without a cursor"
                     )
+            else:
+                offset = 0
+                table = store.build(
+                    elements,
+                    threshold=threshold,
+                    stoichs=stoichs,
+                    species_unique=species_unique,
+                    oxidation_states_set=oxidation_states_set,
+                    workers=workers,
+                )
 
+            page_size = max(1, page_size)
+            end = min(offset + page_size, table.count)
             return CompositionFilterResult(
                 success=True,
-                elements=elements,
-                num_valid_compositions=len(valid_comps),
-                valid_compositions=formatted_comps,
-                threshold=threshold,
-                oxidation_states_set=oxidation_states_set,
+                elements=table.elements,
+                num_valid_compositions=table.count,
+                valid_compositions=table.page(offset, page_size),
+                threshold=table.threshold,
+                oxidation_states_set=table.oxidation_states_set,
+                offset=offset,
+                next_cursor=encode_cursor(table.key, end) if end < table.count else None,
             )
 
         except Exception as e:
@@ -5,18 +5,19 @@ Pure Python functions that can be imported and used by any part of the system.
 """
 
 import warnings
-from typing import Any
 
 import numpy as np
 
 # Import SMACT libraries
-from pydantic import BaseModel, Field
-from smact import Element
 from smact.screening import smact_validity as smact_validity_check
 
+from ...utils.element_table import electronegativities, get_element_table
+from ...utils.parse_cache import parse_composition
+
 # Import error handling
 from ..errors import ValidationError as ToolValidationError
 from ..errors import with_retry
+from ..models import StabilityResult, ValidationResult
 
 # Suppress electronegativity warnings
 warnings.filterwarnings("ignore", message=".*Pauling electronegativity.*Setting to NaN.*")
@@ -32,37 +33,16 @@ except ImportError:
     METALLICITY_AVAILABLE = False
 
 
-class ValidationResult(BaseModel):
-    """Structured validation result."""
-
-    valid: bool
-    formula: str
-    oxidation_states: dict[str, float] | None = None
-    charge_balanced: bool = Field(default=False)
-    errors: list[str] = Field(default_factory=list)
-    warnings: list[str] = Field(default_factory=list)
-    message: str = ""
-    metadata: dict[str, Any] = Field(default_factory=dict)
-
-
-class StabilityResult(BaseModel):
-    """Stability analysis result."""
-
-    formula: str
-    stable: bool
-    smact_valid: bool
-    electronegativity_difference: float | None = None
-    bonding_character: str | None = None
-    metallicity_score: float | None = None
-    stability_prediction: str
-
-
 def get_robust_electronegativity(
     element_symbol: str, method: str = "pauling", fallback_noble_gas: bool = True
 ) -> float:
     """
     Get electronegativity with robust fallback methods for noble gases.
 
+    Values come from the shared element table: Pauling, then (for noble gases)
+    estimates based on ionisation potential. SMACT only provides the Pauling
+    scale, so other ``method`` values resolve the same way.
+
     Args:
         element_symbol: Chemical symbol (e.g., "He", "Ne", "Ar")
         method: Electronegativity scale ("pauling", "mulliken", "allred_rochow")
@@ -71,49 +51,9 @@ def get_robust_electronegativity(
     Returns:
         Electronegativity value or NaN if not available
     """
-    try:
-        elem = Element(element_symbol)
-
-        # Try requested method first
-        if method == "pauling" and elem.pauling_eneg is not None:
-            return float(elem.pauling_eneg)
-        elif (
-            method == "mulliken"
-            and hasattr(elem, "mulliken_eneg")
-            and elem.mulliken_eneg is not None
-        ):
-            return float(elem.mulliken_eneg)
-        elif (
-            method == "allred_rochow"
-            and hasattr(elem, "allred_rochow_eneg")
-            and elem.allred_rochow_eneg is not None
-        ):
-            return float(elem.allred_rochow_eneg)
-
-        # Fallback to other available methods
-        if elem.pauling_eneg is not None:
-            return float(elem.pauling_eneg)
-        if hasattr(elem, "eig") and elem.eig is not None:
-            return float(elem.eig)  # Allen scale
-
-        # Noble gas fallbacks (reasonable estimates based on ionization potential)
-        if fallback_noble_gas:
-            noble_gas_eneg = {
-                "He": 4.16,  # Very high - reluctant to form bonds
-                "Ne": 4.79,  # Highest of all elements
-                "Ar": 3.24,  # Moderate
-                "Kr": 2.97,  # Slightly lower
-                "Xe": 2.58,  # Can form some compounds
-                "Rn": 2.2,  # Lowest, most reactive noble gas
-            }
-            if element_symbol in noble_gas_eneg:
-                return noble_gas_eneg[element_symbol]
-
-        # If all else fails
-        return np.nan
-
-    except Exception:
-        return np.nan
+    table = get_element_table()
+    values = table.electronegativity if fallback_noble_gas else table.eneg_no_noble
+    return float(values[table.atomic_number(element_symbol)])
 
 
 class SMACTValidator:
@@ -139,9 +79,7 @@ class SMACTValidator:
             Structured validation result
         """
         try:
-            from pymatgen.core import Composition
-
-            comp = Composition(formula)
+            comp = parse_composition(formula)
 
             # Perform SMACT validation
             is_valid = smact_validity_check(
@@ -153,13 +91,11 @@ class SMACTValidator:
 
             # Get oxidation states if possible
             oxidation_states = {}
-            try:
-                for element in comp.elements:
-                    elem = Element(element.symbol)
-                    if elem.oxidation_states:
-                        oxidation_states[element.symbol] = elem.oxidation_states[0]
-            except Exception:
-                pass
+            table = get_element_table()
+            for element in comp.elements:
+                states = table.oxidation_states(element.symbol, "default")
+                if states:
+                    oxidation_states[element.symbol] = states[0]
 
             return ValidationResult(
                 valid=is_valid,
@@ -200,9 +136,7 @@ class SMACTValidator:
             Structured stability analysis result
         """
         try:
-            from pymatgen.core import Composition
-
-            comp = Composition(composition)
+            comp = parse_composition(composition)
 
             # Basic SMACT validity
             is_valid = smact_validity_check(comp, use_pauling_test=True, include_alloys=True)
@@ -212,18 +146,13 @@ class SMACTValidator:
             bonding_char = None
 
             if check_electronegativity:
-                elements = list(comp.as_dict().keys())
-                electronegativities = []
-
-                for elem in elements:
-                    eneg = get_robust_electronegativity(elem, method="pauling")
-                    electronegativities.append(eneg)
+                enegs = electronegativities(comp.as_dict().keys())
 
                 # Filter out NaN values for analysis
-                valid_enegs = [e for e in electronegativities if not np.isnan(e)]
+                valid_enegs = enegs[~np.isnan(enegs)]
 
                 if len(valid_enegs) >= 2:
-                    eneg_diff = max(valid_enegs) - min(valid_enegs)
+                    eneg_diff = float(valid_enegs.max() - valid_enegs.min())
                     bonding_char = (
                         "ionic" if eneg_diff > electronegativity_threshold else "covalent"
                     )
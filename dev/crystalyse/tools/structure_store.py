@@ -0,0 +1,371 @@
+"""
+Server-side store of crystal structures, addressed by short handles.
+
+Generated and relaxed structures are large (positions and cell as nested JSON
+lists), and passing them through the agent means sending them to the model and
+back for every tool call. The MCP servers instead keep each structure here and
+return a handle such as ``struct-3f9c2a71d04be815`` with a small summary
+(formula, atom count, volume). Structure-consuming tools accept the handle in
+place of inline data, and ``export`` turns a handle back into CIF, POSCAR,
+extended XYZ or JSON when the structure itself is needed. Inline structures
+may give their arrays in the compact encoding of ``crystalyse.tools.arrays``.
+
+Handles are content addresses: a hash of the atomic numbers, positions and cell
+(rounded to 1e-6 Å) and periodicity, so storing the same structure twice gives
+the same handle. Structures are held in memory (most recently used first) and
+written to ``~/.cache/crystalyse/structures/`` (or ``CRYSTALYSE_STRUCTURE_DIR``),
+so handles stay valid across server restarts within a session. Entries not used
+for ``CRYSTALYSE_STRUCTURE_TTL`` seconds (default one day, ``0`` to keep them)
+expire and are removed from disk.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .arrays import decode_arrays, encode_arrays
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STRUCTURE_DIR = Path.home() / ".cache" / "crystalyse" / "structures"
+
+HANDLE_PREFIX = "struct-"
+_HANDLE_PATTERN = re.compile(r"struct-[0-9a-f]{16}")
+
+DEFAULT_TTL = 24 * 3600
+
+# Structures kept in memory; older ones are read back from disk on use
+MEMORY_ENTRIES = 1024
+
+# Minimum time (s) between sweeps of the directory for expired entries
+SWEEP_INTERVAL = 300
+
+# Positions and cell are rounded to this many decimals (Å) before hashing
+HASH_DECIMALS = 6
+
+# Export formats and the ASE writer used for each
+EXPORT_FORMATS = {"cif": "cif", "poscar": "vasp", "xyz": "extxyz", "json": None}
+
+
+def is_handle(value: Any) -> bool:
+    """Whether a tool argument is a structure handle rather than inline data."""
+    return isinstance(value, str) and value.startswith(HANDLE_PREFIX) and "\n" not in value
+
+
+def normalize_structure(structure: dict[str, Any]) -> dict[str, Any]:
+    """
+    Reduce a structure dict to atomic numbers, Cartesian positions, cell and pbc.
+
+    Raises:
+        ValueError: If required fields are missing or have inconsistent shapes
+    """
+    try:
+        structure = decode_arrays(structure)
+        numbers = np.asarray(structure["numbers"], dtype=np.int64).reshape(-1)
+        positions = np.asarray(structure["positions"], dtype=np.float64).reshape(-1, 3)
+        cell = np.asarray(structure["cell"], dtype=np.float64).reshape(3, 3)
+        pbc = np.asarray(structure.get("pbc", [True, True, True]), dtype=bool).reshape(-1)
+    except KeyError as e:
+        raise ValueError(f"Structure dict is missing the {e.args[0]!r} field") from None
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Malformed structure dict: {e}") from None
+    if len(numbers) != len(positions):
+        raise ValueError(f"{len(numbers)} atomic numbers but {len(positions)} positions")
+    if pbc.size == 1:
+        pbc = np.repeat(pbc, 3)
+    return {
+        "numbers": numbers.tolist(),
+        "positions": positions.tolist(),
+        "cell": cell.tolist(),
+        "pbc": pbc.tolist(),
+    }
+
+
+def structure_handle(structure: dict[str, Any]) -> str:
+    """Content address of a normalized structure."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(np.asarray(structure["numbers"], dtype=np.int64).tobytes())
+    for key in ("positions", "cell"):
+        rounded = np.round(np.asarray(structure[key], dtype=np.float64), HASH_DECIMALS) + 0.0
+        digest.update(rounded.tobytes())
+    digest.update(np.asarray(structure["pbc"], dtype=bool).tobytes())
+    return HANDLE_PREFIX + digest.hexdigest()
+
+
+def _to_atoms(structure: dict[str, Any]) -> Any:
+    from ase import Atoms
+
+    return Atoms(
+        numbers=structure["numbers"],
+        positions=structure["positions"],
+        cell=structure["cell"],
+        pbc=structure["pbc"],
+    )
+
+
+def _summarize(handle: str, structure: dict[str, Any], formula: str | None) -> dict[str, Any]:
+    if not formula:
+        from ase import Atoms
+
+        formula = Atoms(numbers=structure["numbers"]).get_chemical_formula("metal", empirical=True)
+    volume = abs(float(np.linalg.det(np.asarray(structure["cell"]))))
+    return {
+        "handle": handle,
+        "formula": formula,
+        "num_atoms": len(structure["numbers"]),
+        "volume": round(volume, 4),
+    }
+
+
+class StructureStore:
+    """Content-addressed structures with an in-memory LRU, disk persistence and a TTL."""
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        ttl: float | None = None,
+        memory_entries: int = MEMORY_ENTRIES,
+    ):
+        """
+        Args:
+            directory: Where structures are persisted (default: ``CRYSTALYSE_STRUCTURE_DIR``)
+            ttl: Seconds an unused structure is kept (default: ``CRYSTALYSE_STRUCTURE_TTL``);
+                0 keeps structures indefinitely
+            memory_entries: Structures held in memory
+        """
+        self.directory = Path(
+            directory or os.getenv("CRYSTALYSE_STRUCTURE_DIR") or DEFAULT_STRUCTURE_DIR
+        )
+        if ttl is None:
+            ttl = float(os.getenv("CRYSTALYSE_STRUCTURE_TTL", DEFAULT_TTL))
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        # handle -> (structure, summary, last used)
+        self._entries: OrderedDict[str, tuple[dict[str, Any], dict[str, Any], float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self.puts = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def _path(self, handle: str) -> Path:
+        return self.directory / f"{handle}.json"
+
+    def _expired(self, last_used: float, now: float) -> bool:
+        return self.ttl > 0 and now - last_used > self.ttl
+
+    def _remember(self, handle: str, structure: dict, summary: dict, now: float) -> None:
+        with self._lock:
+            self._entries[handle] = (structure, summary, now)
+            self._entries.move_to_end(handle)
+            while len(self._entries) > self.memory_entries:
+                self._entries.popitem(last=False)
+
+    def _write(self, handle: str, structure: dict, summary: dict) -> None:
+        path = self._path(handle)
+        try:
+            if path.exists():
+                os.utime(path)
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".json.tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"structure": structure, "summary": summary}, f)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.debug(f"Could not persist structure {handle} to {path}: {e}")
+
+    def put(self, structure: dict[str, Any], formula: str | None = None) -> str:
+        """
+        Store a structure.
+
+        Args:
+            structure: Dict with numbers, positions (Cartesian, Å), cell and optional pbc;
+                other fields are dropped
+            formula: Formula to report in the summary (default: derived from the numbers)
+
+        Returns:
+            The structure's handle
+
+        Raises:
+            ValueError: If the structure dict is malformed
+        """
+        normalized = normalize_structure(structure)
+        handle = structure_handle(normalized)
+        summary = _summarize(handle, normalized, formula)
+        now = time.time()
+        self._remember(handle, normalized, summary, now)
+        self._write(handle, normalized, summary)
+        self.puts += 1
+        if now - self._last_sweep > SWEEP_INTERVAL:
+            self.evict_expired()
+        return handle
+
+    def _load(self, handle: str) -> tuple[dict[str, Any], dict[str, Any]] | None:
+        if not _HANDLE_PATTERN.fullmatch(handle):
+            self.misses += 1
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is not None:
+                structure, summary, last_used = entry
+                if not self._expired(last_used, now):
+                    self._entries[handle] = (structure, summary, now)
+                    self._entries.move_to_end(handle)
+                    self.hits += 1
+                else:
+                    del self._entries[handle]
+                    entry = None
+        if entry is not None:
+            # Keep the file's mtime (the disk copy's last use) in step with memory
+            try:
+                os.utime(self._path(handle))
+            except OSError:
+                pass
+            return structure, summary
+        path = self._path(handle)
+        try:
+            if self._expired(path.stat().st_mtime, now):
+                path.unlink(missing_ok=True)
+                self.misses += 1
+                return None
+            data = json.loads(path.read_text())
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self._remember(handle, data["structure"], data["summary"], now)
+        self.hits += 1
+        return data["structure"], data["summary"]
+
+    def get(self, handle: str) -> dict[str, Any] | None:
+        """The structure behind a handle, or None if it is unknown or expired."""
+        loaded = self._load(handle)
+        return None if loaded is None else dict(loaded[0])
+
+    def summary(self, handle: str) -> dict[str, Any] | None:
+        """Handle, formula, number of atoms and volume (Å³) of a stored structure."""
+        loaded = self._load(handle)
+        return None if loaded is None else dict(loaded[1])
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Replace a handle by its structure dict; encoded arrays in other values are decoded.
+
+        Raises:
+            ValueError: If the handle is unknown or has expired
+        """
+        if not is_handle(value):
+            return decode_arrays(value)
+        structure = self.get(value)
+        if structure is None:
+            raise ValueError(
+                f"Unknown or expired structure handle '{value}'. "
+                "Regenerate the structure or pass it inline."
+            )
+        return structure
+
+    def export(self, handle: str, fmt: str = "cif", array_encoding: str | None = None) -> str:
+        """
+        Write a stored structure as text.
+
+        Args:
+            handle: Structure handle
+            fmt: One of ``cif``, ``poscar``, ``xyz`` (extended XYZ) or ``json``
+            array_encoding: For ``json``, encode large arrays as ``"float64"`` or
+                ``"float32"`` base64 (see ``crystalyse.tools.arrays``)
+
+        Returns:
+            The structure in that format
+
+        Raises:
+            ValueError: If the handle is unknown or expired, or the format is not supported
+        """
+        fmt = fmt.lower()
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unsupported export format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}"
+            )
+        structure = self.resolve(handle)
+        if fmt == "json":
+            return json.dumps(encode_arrays(structure, array_encoding))
+        from ase.io import write
+
+        atoms = _to_atoms(structure)
+        if fmt == "cif":
+            # ASE's CIF writer only writes bytes
+            buffer = io.BytesIO()
+            write(buffer, atoms, format="cif")
+            return buffer.getvalue().decode()
+        text = io.StringIO()
+        write(text, atoms, format=EXPORT_FORMATS[fmt])
+        return text.getvalue()
+
+    def evict_expired(self) -> int:
+        """
+        Drop structures unused for longer than the TTL, in memory and on disk.
+
+        Returns:
+            Number of structures removed from disk
+        """
+        now = time.time()
+        self._last_sweep = now
+        if self.ttl <= 0:
+            return 0
+        with self._lock:
+            for handle in [h for h, e in self._entries.items() if self._expired(e[2], now)]:
+                del self._entries[handle]
+        removed = 0
+        try:
+            paths = list(self.directory.glob(f"{HANDLE_PREFIX}*.json"))
+        except OSError:
+            return 0
+        for path in paths:
+            try:
+                if self._expired(path.stat().st_mtime, now):
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        self.evicted += removed
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        """Store size, TTL and hit counts."""
+        with self._lock:
+            in_memory = len(self._entries)
+        return {
+            "directory": str(self.directory),
+            "ttl_seconds": self.ttl,
+            "in_memory": in_memory,
+            "puts": self.puts,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+        }
+
+
+_structure_store: StructureStore | None = None
+
+
+def get_structure_store() -> StructureStore:
+    """Get the process-wide structure store."""
+    global _structure_store
+    if _structure_store is None:
+        _structure_store = StructureStore()
+    return _structure_store
@@ -3,23 +3,11 @@
 import logging
 from pathlib import Path
 
-from pydantic import BaseModel
+from ..models import VisualizationResult
 
 logger = logging.getLogger(__name__)
 
 
-class VisualizationResult(BaseModel):
-    """Visualization result."""
-
-    success: bool = True
-    visualization_type: str
-    output_path: str | None = None
-    formula: str
-    cached: bool = False
-    description: str
-    error: str | None = None
-
-
 class CrystaLyseVisualizer:
     """Simple visualization tools for CrystaLyse."""
 
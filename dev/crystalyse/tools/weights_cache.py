@@ -0,0 +1,339 @@
+"""
+Memory-mappable weights cache for model checkpoints.
+
+Chemeleon Lightning checkpoints and MACE ``.model`` files are full pickles: every
+process start unpickles the module tree, optimiser state and all tensors, and each
+process ends up with its own copy of the weights. The first time a model is loaded
+from its original checkpoint we write a converted copy next to a JSON manifest:
+
+- ``<kind>-<source sha256>.pt``: a plain tensor dict saved with ``torch.save``, loaded
+  with ``torch.load(mmap=True, weights_only=True)`` so pages come straight from the
+  OS page cache and are shared between server processes
+- ``<kind>-<source sha256>.json``: the architecture config needed to rebuild the
+  module, plus SHA256 hashes of both the source checkpoint and the converted file
+
+Converted files are only used while the source checkpoint is unchanged and the
+converted file still matches its recorded hash. Any problem makes ``load`` return
+None so callers fall back to the original checkpoint.
+
+The cache lives in ``~/.cache/crystalyse/weights/`` (override with
+``CRYSTALYSE_WEIGHTS_CACHE_DIR``); set ``CRYSTALYSE_WEIGHTS_CACHE=0`` to disable it.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS_CACHE_DIR = Path.home() / ".cache" / "crystalyse" / "weights"
+
+# Bump when the converted layout changes so old conversions are ignored
+WEIGHTS_FORMAT_VERSION = 1
+
+# Packages whose classes and functions a converted config may refer to. The
+# manifest is a plain file, so anything else is refused rather than imported.
+CALLABLE_MODULE_PREFIXES = ("mace.", "e3nn.", "torch.nn.", "chemeleon_dng.")
+
+# (path, size, mtime) -> sha256, so each file is hashed at most once per process
+_sha256_memo: dict[tuple[str, int, float], str] = {}
+_sha256_lock = threading.Lock()
+
+
+def file_sha256(path: str | Path) -> str:
+    """
+    Return the SHA256 of a file, memoised per process by path, size and mtime.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest of the file contents
+    """
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime)
+
+    with _sha256_lock:
+        if memo_key in _sha256_memo:
+            return _sha256_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    with _sha256_lock:
+        _sha256_memo[memo_key] = digest.hexdigest()
+    return _sha256_memo[memo_key]
+
+
+def _check_callable_path(module_name: str, qualname: str) -> None:
+    """
+    Raises:
+        ValueError: If the import path is outside ``CALLABLE_MODULE_PREFIXES`` or
+            goes through a private attribute
+    """
+    if not any(
+        module_name == prefix.rstrip(".") or module_name.startswith(prefix)
+        for prefix in CALLABLE_MODULE_PREFIXES
+    ):
+        raise ValueError(f"Config refers to {module_name}:{qualname}, outside the allowed modules")
+    if any(attr.startswith("_") for attr in qualname.split(".")):
+        raise ValueError(f"Config refers to private attribute {module_name}:{qualname}")
+
+
+def encode_config_value(value: Any) -> Any:
+    """
+    Convert an architecture config value into JSON-compatible data.
+
+    Classes and functions are stored by import path (only from
+    ``CALLABLE_MODULE_PREFIXES``), numpy arrays and tensors as nested lists with
+    their dtype. Raises TypeError for anything else that JSON cannot represent,
+    which makes the conversion be skipped.
+    """
+    import numpy as np
+    import torch
+
+    if value is None or isinstance(value, bool | int | float | str):
+        return value
+    if isinstance(value, dict):
+        return {str(k): encode_config_value(v) for k, v in value.items()}
+    if isinstance(value, list | tuple):
+        return [encode_config_value(v) for v in value]
+    if isinstance(value, np.ndarray | np.generic):
+        return {"__ndarray__": np.asarray(value).tolist(), "dtype": str(value.dtype)}
+    if isinstance(value, torch.Tensor):
+        return {
+            "__tensor__": value.detach().cpu().tolist(),
+            "dtype": str(value.dtype).removeprefix("torch."),
+        }
+    if isinstance(value, type) or callable(value):
+        module = getattr(value, "__module__", None)
+        qualname = getattr(value, "__qualname__", None)
+        if module and qualname and "<" not in qualname:
+            try:
+                _check_callable_path(module, qualname)
+            except ValueError as e:
+                raise TypeError(str(e)) from e
+            return {"__callable__": f"{module}:{qualname}"}
+    raise TypeError(f"Cannot encode config value of type {type(value).__name__}")
+
+
+def decode_config_value(value: Any) -> Any:
+    """
+    Inverse of ``encode_config_value``.
+
+    Raises:
+        ValueError: If a stored import path is outside ``CALLABLE_MODULE_PREFIXES``
+    """
+    import numpy as np
+    import torch
+
+    if isinstance(value, list):
+        return [decode_config_value(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "__ndarray__" in value:
+        return np.array(value["__ndarray__"], dtype=value["dtype"])
+    if "__tensor__" in value:
+        return torch.tensor(value["__tensor__"], dtype=getattr(torch, value["dtype"]))
+    if "__callable__" in value:
+        module_name, qualname = value["__callable__"].split(":")
+        _check_callable_path(module_name, qualname)
+        obj = importlib.import_module(module_name)
+        for attr in qualname.split("."):
+            obj = getattr(obj, attr)
+        return obj
+    return {k: decode_config_value(v) for k, v in value.items()}
+
+
+class WeightsCache:
+    """Converted, memory-mappable copies of model checkpoints."""
+
+    def __init__(self, cache_dir: str | Path | None = None, enabled: bool | None = None):
+        if cache_dir is None:
+            cache_dir = os.getenv("CRYSTALYSE_WEIGHTS_CACHE_DIR") or DEFAULT_WEIGHTS_CACHE_DIR
+        if enabled is None:
+            enabled = os.getenv("CRYSTALYSE_WEIGHTS_CACHE", "1").lower() not in (
+                "0",
+                "false",
+                "off",
+            )
+
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def _index_path(self) -> Path:
+        return self.cache_dir / "sources.json"
+
+    def _read_index(self) -> dict[str, Any]:
+        try:
+            return json.loads(self._index_path().read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_json(self, path: Path, data: dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, suffix=".tmp", delete=False
+        ) as tmp_file:
+            json.dump(data, tmp_file, indent=2)
+        os.replace(tmp_file.name, path)
+
+    def _source_digest(self, source_path: Path) -> str:
+        """
+        Return the SHA256 of a source checkpoint.
+
+        Digests are recorded in an index keyed by path, size and mtime, so a large
+        checkpoint is only hashed again after it has been replaced.
+        """
+        stat = source_path.stat()
+        key = str(source_path.resolve())
+
+        with self._lock:
+            index = self._read_index()
+            entry = index.get(key)
+            if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                return entry["sha256"]
+
+        digest = file_sha256(source_path)
+        with self._lock:
+            index = self._read_index()
+            index[key] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest}
+            try:
+                self._write_json(self._index_path(), index)
+            except OSError as e:
+                logger.debug(f"Could not update weights cache index: {e}")
+        return digest
+
+    def _paths(self, kind: str, source_digest: str) -> tuple[Path, Path]:
+        stem = f"{kind}-{source_digest[:32]}"
+        return self.cache_dir / f"{stem}.pt", self.cache_dir / f"{stem}.json"
+
+    def load(
+        self, source_path: str | Path, kind: str
+    ) -> tuple[dict[str, Any], dict[str, Any]] | None:
+        """
+        Load the converted copy of a checkpoint.
+
+        Args:
+            source_path: Original checkpoint file
+            kind: Model family, e.g. "chemeleon" or "mace"
+
+        Returns:
+            (tensors, config) with memory-mapped tensors, or None if no valid conversion exists
+        """
+        if not self.enabled:
+            return None
+
+        import torch
+
+        try:
+            source_digest = self._source_digest(Path(source_path))
+            weights_path, manifest_path = self._paths(kind, source_digest)
+            if not weights_path.exists() or not manifest_path.exists():
+                return None
+
+            manifest = json.loads(manifest_path.read_text())
+            if (
+                manifest.get("format_version") != WEIGHTS_FORMAT_VERSION
+                or manifest.get("source_sha256") != source_digest
+            ):
+                return None
+
+            # Re-hash only if the converted file changed since it was written
+            stat = weights_path.stat()
+            if (
+                stat.st_size != manifest["weights_size"]
+                or stat.st_mtime != manifest["weights_mtime"]
+            ):
+                if file_sha256(weights_path) != manifest["weights_sha256"]:
+                    logger.warning(f"Converted weights failed integrity check: {weights_path}")
+                    weights_path.unlink(missing_ok=True)
+                    return None
+
+            tensors = torch.load(weights_path, map_location="cpu", mmap=True, weights_only=True)
+            return tensors, manifest["config"]
+
+        except Exception as e:
+            logger.warning(f"Could not load converted weights for {source_path}: {e}")
+            return None
+
+    def save(
+        self,
+        source_path: str | Path,
+        kind: str,
+        tensors: dict[str, Any],
+        config: dict[str, Any],
+    ) -> Path | None:
+        """
+        Write a converted copy of a checkpoint.
+
+        Args:
+            source_path: Original checkpoint file the tensors came from
+            kind: Model family, e.g. "chemeleon" or "mace"
+            tensors: Tensors to store (state dict and any extra buffers)
+            config: JSON-compatible config needed to rebuild the module
+
+        Returns:
+            Path of the converted file, or None if conversion was skipped
+        """
+        if not self.enabled:
+            return None
+
+        import torch
+
+        try:
+            source_digest = self._source_digest(Path(source_path))
+            weights_path, manifest_path = self._paths(kind, source_digest)
+            # Fail before writing anything if the config is not serialisable
+            config_json = json.loads(json.dumps(config))
+
+            cpu_tensors = {name: tensor.detach().cpu() for name, tensor in tensors.items()}
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.cache_dir, suffix=".pt.tmp", delete=False
+            ) as tmp_file:
+                torch.save(cpu_tensors, tmp_file)
+            os.replace(tmp_file.name, weights_path)
+
+            stat = weights_path.stat()
+            self._write_json(
+                manifest_path,
+                {
+                    "format_version": WEIGHTS_FORMAT_VERSION,
+                    "kind": kind,
+                    "source_path": str(source_path),
+                    "source_sha256": source_digest,
+                    "weights_sha256": file_sha256(weights_path),
+                    "weights_size": stat.st_size,
+                    "weights_mtime": stat.st_mtime,
+                    "torch_version": torch.__version__,
+                    "config": config_json,
+                },
+            )
+            logger.info(f"Wrote memory-mappable weights: {weights_path}")
+            return weights_path
+
+        except Exception as e:
+            logger.warning(f"Could not convert {source_path} to mmap weights: {e}")
+            return None
+
+
+_weights_cache: WeightsCache | None = None
+
+
+def get_weights_cache() -> WeightsCache:
+    """Return the process-wide weights cache."""
+    global _weights_cache
+    if _weights_cache is None:
+        _weights_cache = WeightsCache()
+    return _weights_cache
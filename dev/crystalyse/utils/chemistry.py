@@ -3,6 +3,8 @@
 import re
 from typing import Any
 
+from .element_table import get_element_table
+
 
 def analyse_application_requirements(application: str) -> dict[str, Any]:
     """
@@ -162,56 +164,8 @@ def classify_composition(composition: str) -> str:
         return "oxyanion"
     else:
         # Check if all elements are metals
-        metals = {
-            "Li",
-            "Na",
-            "K",
-            "Rb",
-            "Cs",
-            "Be",
-            "Mg",
-            "Ca",
-            "Sr",
-            "Ba",
-            "Al",
-            "Ga",
-            "In",
-            "Sn",
-            "Pb",
-            "Bi",
-            "Sc",
-            "Ti",
-            "V",
-            "Cr",
-            "Mn",
-            "Fe",
-            "Co",
-            "Ni",
-            "Cu",
-            "Zn",
-            "Y",
-            "Zr",
-            "Nb",
-            "Mo",
-            "Tc",
-            "Ru",
-            "Rh",
-            "Pd",
-            "Ag",
-            "Cd",
-            "Hf",
-            "Ta",
-            "W",
-            "Re",
-            "Os",
-            "Ir",
-            "Pt",
-            "Au",
-            "Hg",
-        }
-
         elements = re.findall(r"[A-Z][a-z]?", composition)
-        if all(elem in metals for elem in elements):
+        if get_element_table().metals(elements).all():
             return "intermetallic"
 
     return "mixed_anion"
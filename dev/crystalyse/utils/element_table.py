@@ -0,0 +1,275 @@
+"""
+Precomputed element property table.
+
+Element lookups used to construct a SMACT ``Element`` (which reads several data
+files) every time a property was needed. The table below is generated once from
+SMACT and pymatgen, stored as numpy arrays indexed by atomic number, and cached on
+disk so later processes only pay for an ``np.load``.
+
+Row 0 is a sentinel: unknown symbols map to it and read back as NaN, ``False`` or
+no oxidation states, so batch lookups never raise on bad input.
+
+The cache file lives under ``~/.cache/crystalyse/`` (or
+``CRYSTALYSE_ELEMENT_TABLE_DIR``) and is named after ``TABLE_VERSION`` and the
+installed SMACT version, so upgrading either regenerates it.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the set or meaning of the arrays changes
+TABLE_VERSION = 2
+
+MAX_ATOMIC_NUMBER = 103
+
+DEFAULT_TABLE_DIR = Path.home() / ".cache" / "crystalyse"
+
+# Oxidation-state set name -> smact.Element attribute
+OXIDATION_STATE_SETS = {
+    "default": "oxidation_states",
+    "icsd24": "oxidation_states_icsd24",
+    "icsd16": "oxidation_states_icsd16",
+    "smact14": "oxidation_states_smact14",
+    "pymatgen_sp": "oxidation_states_sp",
+    "wiki": "oxidation_states_wiki",
+}
+
+# Estimates for noble gases, which have no Pauling electronegativity (based on
+# ionisation potential)
+NOBLE_GAS_ELECTRONEGATIVITY = {
+    "He": 4.16,  # Very high - reluctant to form bonds
+    "Ne": 4.79,  # Highest of all elements
+    "Ar": 3.24,  # Moderate
+    "Kr": 2.97,  # Slightly lower
+    "Xe": 2.58,  # Can form some compounds
+    "Rn": 2.2,  # Lowest, most reactive noble gas
+}
+
+
+class ElementTable:
+    """Element properties as numpy arrays indexed by atomic number."""
+
+    def __init__(self, arrays: dict[str, np.ndarray]):
+        self.symbols = arrays["symbols"]
+        self.names = arrays["names"]
+        self.mass = arrays["mass"]
+        self.pauling_eneg = arrays["pauling_eneg"]
+        self.noble_gas_eneg = arrays["noble_gas_eneg"]
+        self.covalent_radius = arrays["covalent_radius"]
+        self.atomic_radius = arrays["atomic_radius"]
+        self.is_metal = arrays["is_metal"]
+
+        # Pauling, then the noble-gas estimates. SMACT's ``eig`` is a HOMO eigenvalue
+        # in eV, not an electronegativity, so it is not used as a fallback scale.
+        self.eneg_no_noble = self.pauling_eneg
+        self.electronegativity = np.where(
+            np.isnan(self.eneg_no_noble), self.noble_gas_eneg, self.eneg_no_noble
+        )
+
+        self._oxidation_states = {
+            name: (arrays[f"ox_{name}"], arrays[f"ox_{name}_count"])
+            for name in OXIDATION_STATE_SETS
+        }
+        self._numbers = {str(symbol): z for z, symbol in enumerate(self.symbols) if symbol}
+        self._states_cache: dict[tuple[str, str], tuple[int, ...]] = {}
+
+    def atomic_number(self, symbol: str) -> int:
+        """Atomic number of an element, or 0 if the symbol is unknown."""
+        return self._numbers.get(symbol, 0)
+
+    def atomic_numbers(self, symbols: Iterable[str]) -> np.ndarray:
+        """Atomic numbers for many symbols (0 for unknown symbols)."""
+        numbers = self._numbers
+        return np.fromiter((numbers.get(s, 0) for s in symbols), dtype=np.int64)
+
+    def electronegativities(
+        self, symbols: Iterable[str], fallback_noble_gas: bool = True
+    ) -> np.ndarray:
+        """Electronegativities for many symbols (NaN where unavailable)."""
+        values = self.electronegativity if fallback_noble_gas else self.eneg_no_noble
+        return values[self.atomic_numbers(symbols)]
+
+    def masses(self, symbols: Iterable[str]) -> np.ndarray:
+        """Atomic masses for many symbols (NaN for unknown symbols)."""
+        return self.mass[self.atomic_numbers(symbols)]
+
+    def covalent_radii(self, symbols: Iterable[str]) -> np.ndarray:
+        """Covalent radii in Å for many symbols (NaN where unavailable)."""
+        return self.covalent_radius[self.atomic_numbers(symbols)]
+
+    def metals(self, symbols: Iterable[str]) -> np.ndarray:
+        """Boolean mask of which symbols are metals in SMACT's classification."""
+        return self.is_metal[self.atomic_numbers(symbols)]
+
+    def oxidation_states(
+        self, symbol: str, oxidation_states_set: str = "icsd24"
+    ) -> tuple[int, ...]:
+        """
+        Oxidation states of an element from one of ``OXIDATION_STATE_SETS``.
+
+        Args:
+            symbol: Element symbol
+            oxidation_states_set: Name of the oxidation-state set
+
+        Returns:
+            Oxidation states (empty for unknown symbols)
+
+        Raises:
+            KeyError: If the oxidation-state set is not in the table
+        """
+        key = (symbol, oxidation_states_set)
+        states = self._states_cache.get(key)
+        if states is None:
+            values, counts = self._oxidation_states[oxidation_states_set]
+            z = self.atomic_number(symbol)
+            states = tuple(int(v) for v in values[z, : counts[z]])
+            self._states_cache[key] = states
+        return states
+
+
+def build_element_table() -> dict[str, np.ndarray]:
+    """
+    Generate the table arrays from SMACT (and pymatgen for atomic radii).
+
+    Returns:
+        Mapping of array name to array, as stored on disk
+    """
+    from smact import Element, metals, ordered_elements
+
+    size = MAX_ATOMIC_NUMBER + 1
+    symbols = np.full(size, "", dtype="<U3")
+    names = np.full(size, "", dtype="<U16")
+    arrays = {
+        name: np.full(size, np.nan)
+        for name in (
+            "mass",
+            "pauling_eneg",
+            "noble_gas_eneg",
+            "covalent_radius",
+            "atomic_radius",
+        )
+    }
+    is_metal = np.zeros(size, dtype=bool)
+    states: dict[str, list[list[int]]] = {
+        name: [[] for _ in range(size)] for name in OXIDATION_STATE_SETS
+    }
+
+    metal_set = set(metals)
+    for z, symbol in enumerate(ordered_elements(1, MAX_ATOMIC_NUMBER), start=1):
+        element = Element(symbol)
+        symbols[z] = symbol
+        names[z] = element.name or ""
+        is_metal[z] = symbol in metal_set
+        for name, value in (
+            ("mass", element.mass),
+            ("pauling_eneg", element.pauling_eneg),
+            ("noble_gas_eneg", NOBLE_GAS_ELECTRONEGATIVITY.get(symbol)),
+            ("covalent_radius", element.covalent_radius),
+        ):
+            if value is not None:
+                arrays[name][z] = float(value)
+        for name, attr in OXIDATION_STATE_SETS.items():
+            states[name][z] = list(getattr(element, attr, None) or [])
+
+    try:
+        from pymatgen.core import Element as PymatgenElement
+
+        for z in range(1, size):
+            radius = PymatgenElement(str(symbols[z])).atomic_radius
+            if radius is not None:
+                arrays["atomic_radius"][z] = float(radius)
+    except Exception as e:
+        logger.debug(f"Atomic radii unavailable from pymatgen: {e}")
+
+    arrays["symbols"] = symbols
+    arrays["names"] = names
+    arrays["is_metal"] = is_metal
+    for name, per_element in states.items():
+        width = max(len(s) for s in per_element)
+        padded = np.zeros((size, width), dtype=np.int8)
+        for z, s in enumerate(per_element):
+            padded[z, : len(s)] = s
+        arrays[f"ox_{name}"] = padded
+        arrays[f"ox_{name}_count"] = np.array([len(s) for s in per_element], dtype=np.int8)
+    return arrays
+
+
+def _table_path() -> Path:
+    import smact
+
+    directory = Path(os.getenv("CRYSTALYSE_ELEMENT_TABLE_DIR") or DEFAULT_TABLE_DIR)
+    version = getattr(smact, "__version__", "unknown")
+    return directory / f"element_table-v{TABLE_VERSION}-smact{version}.npz"
+
+
+def load_element_table(path: Path | None = None) -> ElementTable:
+    """
+    Load the table from disk, generating and saving it if missing or unreadable.
+
+    Args:
+        path: Cache file (default: versioned file in the table directory)
+
+    Returns:
+        Loaded element table
+    """
+    path = Path(path) if path else _table_path()
+
+    if path.exists():
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return ElementTable({name: data[name] for name in data.files})
+        except Exception as e:
+            logger.warning(f"Regenerating unreadable element table {path}: {e}")
+
+    arrays = build_element_table()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".npz.tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_name, path)
+    except OSError as e:
+        logger.debug(f"Could not cache element table at {path}: {e}")
+    return ElementTable(arrays)
+
+
+_element_table: ElementTable | None = None
+_element_table_lock = threading.Lock()
+
+
+def get_element_table() -> ElementTable:
+    """Get the process-wide element table, loading it on first use."""
+    global _element_table
+    if _element_table is None:
+        with _element_table_lock:
+            if _element_table is None:
+                _element_table = load_element_table()
+    return _element_table
+
+
+def electronegativities(symbols: Iterable[str], fallback_noble_gas: bool = True) -> np.ndarray:
+    """Electronegativities for many symbols (NaN where unavailable)."""
+    return get_element_table().electronegativities(symbols, fallback_noble_gas)
+
+
+def atomic_masses(symbols: Iterable[str]) -> np.ndarray:
+    """Atomic masses for many symbols (NaN for unknown symbols)."""
+    return get_element_table().masses(symbols)
+
+
+def covalent_radii(symbols: Iterable[str]) -> np.ndarray:
+    """Covalent radii in Å for many symbols (NaN where unavailable)."""
+    return get_element_table().covalent_radii(symbols)
+
+
+def oxidation_states(symbol: str, oxidation_states_set: str = "icsd24") -> tuple[int, ...]:
+    """Oxidation states of an element from one of ``OXIDATION_STATE_SETS``."""
+    return get_element_table().oxidation_states(symbol, oxidation_states_set)
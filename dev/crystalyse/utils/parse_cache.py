@@ -0,0 +1,211 @@
+"""
+Process-wide cache of parsed compositions and structures.
+
+A pipeline typically hands the same CIF string to space group, coordination,
+oxidation-state and MACE tools, and each used to parse it again. Parsed objects
+are kept here in a bounded LRU keyed by a hash of the input text:
+
+- ``Composition`` is immutable and is returned as-is;
+- CIF structures are cached as pymatgen ``IStructure`` and shared; callers that
+  need to modify one take a copy (``Structure.from_sites``);
+- ASE ``Atoms`` have no immutable form, so every call returns a copy of the
+  cached object.
+
+Parse failures are not cached. The cache size comes from
+``CRYSTALYSE_PARSE_CACHE_SIZE`` (default 512 entries per kind).
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+DEFAULT_CACHE_SIZE = 512
+
+
+class ParseCache:
+    """Thread-safe LRU of parsed objects, keyed by (kind, content hash)."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, bytes], Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+
+    @staticmethod
+    def _digest(content: str) -> bytes:
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+    def get_or_parse(self, kind: str, content: str, parse: Callable[[str], Any]) -> Any:
+        """
+        Return the cached parse of ``content``, parsing and storing it on a miss.
+
+        Two threads missing on the same content may both parse it; the first
+        result stored wins.
+
+        Args:
+            kind: Namespace for the parsed type (e.g. "cif_structure")
+            content: Text to parse
+            parse: Parser called with ``content`` on a miss
+
+        Returns:
+            The parsed object shared by all callers
+        """
+        value = self.get(kind, content)
+        if value is None:
+            value = self.put(kind, content, parse(content))
+        return value
+
+    def get(self, kind: str, content: str) -> Any | None:
+        """Return the cached object for ``content``, or None (counted as a miss)."""
+        key = (kind, self._digest(content))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits[kind] = self._hits.get(kind, 0) + 1
+                return self._entries[key]
+            self._misses[kind] = self._misses.get(kind, 0) + 1
+            return None
+
+    def put(self, kind: str, content: str, value: Any) -> Any:
+        """
+        Store an object computed elsewhere (e.g. in a worker process).
+
+        Returns:
+            The cached object, which is the existing one if another caller stored it first
+        """
+        key = (kind, self._digest(content))
+        with self._lock:
+            value = self._entries.setdefault(key, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits.clear()
+            self._misses.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Report entries and hit rates, overall and per kind."""
+        with self._lock:
+            kinds = sorted(set(self._hits) | set(self._misses))
+            per_kind = {}
+            for kind in kinds:
+                hits, misses = self._hits.get(kind, 0), self._misses.get(kind, 0)
+                per_kind[kind] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / (hits + misses), 4),
+                }
+            hits, misses = sum(self._hits.values()), sum(self._misses.values())
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                "by_kind": per_kind,
+            }
+
+
+_parse_cache: ParseCache | None = None
+_parse_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """Get the process-wide parse cache."""
+    global _parse_cache
+    if _parse_cache is None:
+        with _parse_cache_lock:
+            if _parse_cache is None:
+                size = int(os.getenv("CRYSTALYSE_PARSE_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+                _parse_cache = ParseCache(max_entries=size)
+    return _parse_cache
+
+
+def structure_hash(structure) -> str:
+    """
+    Content hash of a pymatgen structure, for caching results computed from it.
+
+    Lattice and fractional coordinates are rounded to 1e-6 so that round-tripping
+    through CIF or JSON gives the same hash.
+
+    Args:
+        structure: pymatgen ``Structure`` or ``IStructure``
+
+    Returns:
+        Hex digest identifying the lattice, species and coordinates
+    """
+    import numpy as np
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.round(structure.lattice.matrix, 6).tobytes())
+    digest.update(np.round(structure.frac_coords, 6).tobytes())
+    digest.update("|".join(site.species_string for site in structure).encode())
+    return digest.hexdigest()
+
+
+def parse_composition(formula: str):
+    """
+    Parse a chemical formula into a pymatgen ``Composition`` (shared, immutable).
+
+    Args:
+        formula: Chemical formula (e.g. "LiFePO4")
+
+    Returns:
+        Parsed composition
+    """
+    from pymatgen.core import Composition
+
+    return get_parse_cache().get_or_parse("composition", formula, Composition)
+
+
+def _parse_cif_structure(cif: str):
+    from io import StringIO
+
+    from pymatgen.core import IStructure
+    from pymatgen.io.cif import CifParser
+
+    structure = CifParser(StringIO(cif)).parse_structures()[0]
+    return IStructure.from_sites(structure, properties=structure.properties)
+
+
+def parse_cif_structure(cif: str):
+    """
+    Parse the first structure in a CIF with pymatgen.
+
+    Args:
+        cif: CIF file content
+
+    Returns:
+        The shared, immutable ``IStructure``
+    """
+    return get_parse_cache().get_or_parse("cif_structure", cif, _parse_cif_structure)
+
+
+def _parse_cif_atoms(cif: str):
+    from io import StringIO
+
+    from ase.io import read
+
+    return read(StringIO(cif), format="cif")
+
+
+def parse_cif_atoms(cif: str):
+    """
+    Parse a CIF into ASE ``Atoms``.
+
+    Args:
+        cif: CIF file content
+
+    Returns:
+        A private copy of the cached atoms (free to modify or attach a calculator to)
+    """
+    return get_parse_cache().get_or_parse("cif_atoms", cif, _parse_cif_atoms).copy()
@@ -0,0 +1,173 @@
+"""
+One JSON encoder for tool results, shared by the MCP servers and provenance.
+
+Tool results mix dicts and lists with numpy arrays and scalars, pydantic models,
+dataclasses, datetimes, paths and pymatgen objects. ``dumps`` encodes all of
+them in a single pass with orjson, whose walk runs in C. orjson is a required
+dependency rather than an optional speed-up: the standard library formats
+floats differently (``1e-05`` against ``0.00001``), writes NaN where orjson
+writes null and sorts non-string keys differently, so a fallback would give the
+same result different content hashes on different installs. The one value
+orjson rejects, an integer outside the 64-bit range, is written as a string.
+
+Keys are sorted by default, so equal results encode to equal bytes and the
+encoding doubles as the input of a content hash. ``serialize`` encodes a result
+once and keeps the bytes, the parsed JSON data and the hash together, so the
+provenance handler can write the raw output, hash the artifact and log the
+event from one encoding instead of re-serialising the same payload for each.
+"""
+
+import hashlib
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import orjson
+
+# orjson encodes integers in [-2**63, 2**64 - 1]
+INT_MIN = -(2**63)
+UINT_MAX = 2**64 - 1
+
+
+class Serialized:
+    """A value encoded once: its JSON bytes, the parsed data and a content hash."""
+
+    __slots__ = ("data", "payload", "_sha256")
+
+    def __init__(self, data: Any, payload: bytes):
+        """
+        Args:
+            data: JSON-compatible form of the value (dicts, lists and primitives)
+            payload: The value's encoding
+        """
+        self.data = data
+        self.payload = payload
+        self._sha256: str | None = None
+
+    @property
+    def text(self) -> str:
+        return self.payload.decode()
+
+    def digest(self, length: int = 16) -> str:
+        """Leading hex digits of the SHA-256 of the payload."""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.payload).hexdigest()
+        return self._sha256[:length]
+
+
+def _default(obj: Any) -> Any:
+    """JSON form of the types neither encoder handles itself."""
+    if isinstance(obj, Serialized):
+        # Embed the existing encoding rather than encoding the value again (text
+        # outputs are kept as text, so they are encoded as a JSON string)
+        if isinstance(obj.data, str):
+            return obj.data
+        return orjson.Fragment(obj.payload)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json", exclude_none=True)
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind in "biuf" and not obj.flags.c_contiguous:
+            # orjson only encodes contiguous arrays natively; tolist() would turn
+            # float32 values into their float64 expansions
+            return np.ascontiguousarray(obj)
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if hasattr(obj, "as_dict"):
+        # pymatgen (MSONable) objects
+        return obj.as_dict()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if isinstance(obj, datetime | date):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, set | frozenset):
+        return list(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+def _big_ints_as_str(obj: Any) -> Any:
+    """Replace integers outside the 64-bit range, which orjson rejects, by strings."""
+    if isinstance(obj, int) and not isinstance(obj, bool):
+        return str(obj) if not INT_MIN <= obj <= UINT_MAX else obj
+    if isinstance(obj, dict):
+        return {_big_ints_as_str(key): _big_ints_as_str(value) for key, value in obj.items()}
+    if isinstance(obj, list | tuple):
+        return [_big_ints_as_str(value) for value in obj]
+    if is_dataclass(obj) and not isinstance(obj, type):
+        # orjson encodes dataclasses itself, without calling default
+        return _big_ints_as_str(asdict(obj))
+    return obj
+
+
+def dumps(obj: Any, *, sort_keys: bool = True, indent: bool = False) -> bytes:
+    """
+    Encode a value as JSON.
+
+    numpy scalars and arrays keep their precision (float32 values are written in
+    their shortest float32 form), NaN and infinities become null, and non-string
+    keys are converted to strings before sorting. Integers outside the 64-bit
+    range are written as strings.
+
+    Args:
+        obj: Value to encode; unsupported objects are encoded as their ``str``
+        sort_keys: Sort dict keys, so equal values give equal bytes
+        indent: Indent by two spaces
+
+    Returns:
+        UTF-8 JSON
+    """
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(obj, default=_default, option=option)
+    except orjson.JSONEncodeError as e:
+        if "64-bit range" not in str(e):
+            raise
+    # Rare enough that a second pass is cheaper than checking every value first
+    return orjson.dumps(
+        _big_ints_as_str(obj),
+        default=lambda value: _big_ints_as_str(_default(value)),
+        option=option,
+    )
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON."""
+    return orjson.loads(data)
+
+
+def to_jsonable(obj: Any) -> Any:
+    """A value as dicts, lists and primitives only, in its original key order."""
+    return loads(dumps(obj, sort_keys=False))
+
+
+def serialize(obj: Any) -> Serialized:
+    """
+    Encode a value once for every consumer.
+
+    Strings are taken to be serialised already (tool outputs arrive as text) and
+    are kept as they are.
+    """
+    if isinstance(obj, Serialized):
+        return obj
+    if isinstance(obj, str):
+        return Serialized(obj, obj.encode())
+    payload = dumps(obj)
+    return Serialized(loads(payload), payload)
+
+
+def content_hash(obj: Any, length: int = 16) -> str:
+    """Leading hex digits of the SHA-256 of a value's canonical encoding."""
+    return serialize(obj).digest(length)
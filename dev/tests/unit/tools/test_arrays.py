@@ -0,0 +1,80 @@
+"""
+Unit tests for the compact array encoding.
+"""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from crystalyse.tools.arrays import decode_arrays, encode_array, encode_arrays
+from crystalyse.tools.structure_store import StructureStore
+
+
+def make_structure(num_atoms: int = 64) -> dict:
+    rng = np.random.default_rng(0)
+    return {
+        "numbers": rng.integers(1, 90, num_atoms).tolist(),
+        "positions": (rng.random((num_atoms, 3)) * 10).tolist(),
+        "cell": (np.eye(3) * 10).tolist(),
+        "pbc": [True, True, True],
+    }
+
+
+class TestArrayEncoding:
+    """Tests for encode_arrays() and decode_arrays()."""
+
+    def test_round_trip(self) -> None:
+        """Test that float64 and integer arrays decode exactly and float32 to its precision."""
+        structure = make_structure()
+
+        encoded = encode_arrays({"structures": [structure]}, "float64")
+        decoded = decode_arrays(json.loads(json.dumps(encoded)))["structures"][0]
+
+        assert encoded["structures"][0]["positions"]["dtype"] == "<f8"
+        assert encoded["structures"][0]["numbers"]["dtype"] == "<i1"
+        assert np.array_equal(decoded["positions"], structure["positions"])
+        assert decoded["numbers"].tolist() == structure["numbers"]
+        # Small arrays and non-numeric lists stay as they are
+        assert decoded["cell"] == structure["cell"] and decoded["pbc"] == [True, True, True]
+
+        single = decode_arrays(encode_arrays(structure, "float32"))
+        assert single["positions"].dtype == np.float32
+        assert np.allclose(single["positions"], structure["positions"], atol=1e-5)
+
+    def test_encoded_payload_is_smaller(self) -> None:
+        """Test that encoding shrinks an array-heavy payload several-fold."""
+        structure = make_structure(1000)
+        plain = len(json.dumps(structure))
+
+        assert len(json.dumps(encode_arrays(structure, "float64"))) < plain * 0.6
+        assert len(json.dumps(encode_arrays(structure, "float32"))) < plain / 3
+
+    def test_malformed_input(self) -> None:
+        """Test that unknown encodings and truncated data are rejected."""
+        with pytest.raises(ValueError, match="Unknown array encoding"):
+            encode_array([1.0, 2.0], "float16")
+        encoded = encode_array(np.zeros((4, 3)))
+        encoded["shape"] = [5, 3]
+        with pytest.raises(ValueError, match="does not match"):
+            decode_arrays(encoded)
+
+
+class TestEncodedStructureInput:
+    """Tests for encoded arrays in structure inputs."""
+
+    def test_store_accepts_encoded_structure(self, tmp_path) -> None:
+        """Test that an encoded structure is stored under the same handle as the plain one."""
+        store = StructureStore(directory=tmp_path)
+        structure = make_structure()
+
+        handle = store.put(structure)
+
+        assert store.put(encode_arrays(structure, "float64")) == handle
+        assert np.array_equal(
+            store.resolve(encode_arrays(structure, "float64"))["positions"], structure["positions"]
+        )
+        exported = json.loads(store.export(handle, "json", array_encoding="float64"))
+        assert store.put(exported) == handle
@@ -0,0 +1,109 @@
+"""
+Unit tests for batched tool calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from crystalyse.tools.batch import run_batch, serialise_tools
+from crystalyse.tools.models import BatchCall
+
+
+class FakeTool:
+    def __init__(self, fn, context_kwarg: str | None = None):
+        self.fn = fn
+        self.context_kwarg = context_kwarg
+        self.is_async = asyncio.iscoroutinefunction(fn)
+
+    async def run(self, arguments: dict, context=None):
+        if self.is_async:
+            return await self.fn(**arguments)
+        return self.fn(**arguments)
+
+
+def fake_server(tools: dict[str, FakeTool]) -> SimpleNamespace:
+    return SimpleNamespace(_tool_manager=SimpleNamespace(get_tool=tools.get))
+
+
+class TestRunBatch:
+    """Tests for run_batch()."""
+
+    def test_results_errors_and_duplicates(self) -> None:
+        """Test that each call gets its own result or error and identical calls can run once."""
+        calls_made = []
+
+        def square(x: int) -> dict:
+            calls_made.append(x)
+            if x < 0:
+                raise ValueError("negative")
+            return {"square": x * x}
+
+        server = fake_server({"square": FakeTool(square)})
+        calls = [
+            BatchCall(tool="square", arguments={"x": 3}),
+            BatchCall(tool="square", arguments={"x": -1}),
+            BatchCall(tool="square", arguments={"x": 3}),
+            BatchCall(tool="cube", arguments={"x": 3}),
+            BatchCall(tool="batch_call", arguments={"calls": []}),
+        ]
+
+        result = asyncio.run(run_batch(server, calls, deduplicate=True))
+
+        assert sorted(calls_made) == [-1, 3]
+        assert result.num_calls == 5 and result.num_executed == 4 and result.num_failed == 3
+        first, negative, repeat, unknown, nested = result.results
+        assert first.success and first.result == {"square": 9}
+        assert negative.error == "negative"
+        assert repeat.duplicate_of == 0 and repeat.result == {"square": 9}
+        assert "Unknown tool" in unknown.error
+        assert "nested" in nested.error
+
+        # Without deduplication (the default) repeats run again
+        calls_made.clear()
+        result = asyncio.run(run_batch(server, calls[:3]))
+        assert sorted(calls_made) == [-1, 3, 3] and result.results[2].duplicate_of is None
+
+    def test_concurrency_and_exclusive_tools(self) -> None:
+        """Test that calls run concurrently while an exclusive group runs one at a time."""
+        running = {"model": 0, "peak": 0}
+        guard = threading.Lock()
+
+        def analyze(i: int) -> int:
+            time.sleep(0.1)
+            return i
+
+        def energy(i: int) -> int:
+            with guard:
+                running["model"] += 1
+                running["peak"] = max(running["peak"], running["model"])
+            time.sleep(0.02)
+            with guard:
+                running["model"] -= 1
+            return i
+
+        server = fake_server({"analyze": FakeTool(analyze), "energy": FakeTool(energy)})
+        exclusive = serialise_tools(server, {"models": ["energy"]})
+        calls = [BatchCall(tool="analyze", arguments={"i": i}) for i in range(4)]
+        calls += [BatchCall(tool="energy", arguments={"i": i}) for i in range(4)]
+
+        async def batches_and_direct_call():
+            tool = server._tool_manager.get_tool("energy")
+            return await asyncio.gather(
+                run_batch(server, calls, max_concurrency=4, exclusive=exclusive),
+                run_batch(server, calls[4:], exclusive=exclusive),
+                tool.run({"i": 9}),
+            )
+
+        start = time.perf_counter()
+        result, other, direct = asyncio.run(batches_and_direct_call())
+
+        assert [item.result for item in result.results] == [0, 1, 2, 3, 0, 1, 2, 3]
+        assert [item.result for item in other.results] == [0, 1, 2, 3] and direct == 9
+        # The lock holds across both batches and the direct call
+        assert running["peak"] == 1
+        # Serially the analyses alone would take 0.4 s
+        assert time.perf_counter() - start < 0.35
@@ -0,0 +1,143 @@
+"""
+Unit tests for tool time budgets and cooperative cancellation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from ase import Atoms
+from ase.build import bulk
+from ase.calculators.emt import EMT
+from ase.optimize import BFGS
+
+from crystalyse.tools.budget import Budget, BudgetExceeded, run_in_thread, tool_budget
+from crystalyse.tools.chemeleon.predictor import _seeded_sample
+from crystalyse.tools.mace.energy import MACECalculator
+
+
+class StubDiffusionModel:
+    """Stand-in for DiffusionModule that calls p_sample once per denoising step."""
+
+    num_timesteps = 10
+
+    def __init__(self, on_step=None) -> None:
+        self.on_step = on_step
+        self.steps = 0
+
+    def p_sample(self) -> None:
+        self.steps += 1
+        if self.on_step is not None:
+            self.on_step(self.steps)
+
+    def sample(self, task: str) -> list[Atoms]:
+        for _ in range(self.num_timesteps):
+            self.p_sample()
+        return [Atoms("Cu")]
+
+
+class TestBudget:
+    """Tests for Budget and tool_budget()."""
+
+    def test_checkpoint_limits(self) -> None:
+        """Test that checkpoints stop on the step limit, the time limit and cancellation."""
+        budget = Budget(max_steps=3)
+        budget.checkpoint(2)
+        with pytest.raises(BudgetExceeded):
+            budget.checkpoint(2)
+        assert budget.steps == 2 and budget.stopped == "steps"
+
+        expired = Budget(seconds=0.0)
+        with pytest.raises(BudgetExceeded) as excinfo:
+            expired.checkpoint()
+        assert excinfo.value.reason == "time"
+
+        cancelled = Budget()
+        cancelled.cancel()
+        with pytest.raises(BudgetExceeded):
+            cancelled.checkpoint(0)
+        assert cancelled.stopped == "cancelled"
+
+    def test_server_caps(self, monkeypatch) -> None:
+        """Test that callers can ask for less than the server limits but not more."""
+        monkeypatch.setenv("CRYSTALYSE_TOOL_TIME_LIMIT", "60")
+        monkeypatch.setenv("CRYSTALYSE_MAX_RELAX_STEPS", "100")
+
+        assert tool_budget("relax").seconds == 60 and tool_budget("relax").max_steps == 100
+        assert tool_budget("relax", 600, 500).seconds == 60
+        assert tool_budget("relax", 5, 50).max_steps == 50
+        assert tool_budget(None).max_steps is None
+
+        monkeypatch.setenv("CRYSTALYSE_TOOL_TIME_LIMIT", "0")
+        assert tool_budget("relax").seconds is None
+
+
+class TestCancellation:
+    """Tests for stopping work running in worker threads."""
+
+    def test_cancelled_task_stops_sampling(self) -> None:
+        """Test that cancelling the awaiting task stops sampling at its next step."""
+        started = threading.Event()
+
+        def slow_step(step: int) -> None:
+            started.set()
+            threading.Event().wait(0.01)
+
+        model = StubDiffusionModel(on_step=slow_step)
+        model.num_timesteps = 1000
+        budget = Budget()
+
+        async def main() -> None:
+            task = asyncio.create_task(
+                run_in_thread(budget, _seeded_sample, model, None, budget, task="csp")
+            )
+            await asyncio.to_thread(started.wait)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        # The thread finishes its current step, then stops at the next checkpoint
+        for _ in range(100):
+            if budget.stopped:
+                break
+            threading.Event().wait(0.01)
+
+        assert budget.cancelled and budget.stopped == "cancelled"
+        assert model.steps < 1000
+        assert "p_sample" not in vars(model)
+
+    def test_sampling_refused_past_step_limit(self) -> None:
+        """Test that a sampling run that cannot fit in the step budget does not start."""
+        model = StubDiffusionModel()
+        budget = Budget(max_steps=15)
+
+        assert len(_seeded_sample(model, None, budget, task="csp")) == 1
+        with pytest.raises(BudgetExceeded):
+            _seeded_sample(model, None, budget, task="csp")
+        assert model.steps == 10 and budget.steps == 10
+
+    def test_stopped_relaxation_keeps_best_structure(self) -> None:
+        """Test that a cancelled relaxation returns the lowest-energy structure reached."""
+        budget = Budget()
+
+        class CancellingEMT(EMT):
+            calls = 0
+
+            def calculate(self, *args, **kwargs) -> None:
+                super().calculate(*args, **kwargs)
+                CancellingEMT.calls += 1
+                if CancellingEMT.calls == 5:
+                    budget.cancel()
+
+        atoms = bulk("Cu", cubic=True)
+        atoms.rattle(0.1, seed=1)
+        atoms.calc = CancellingEMT()
+
+        result = MACECalculator()._relax(atoms, BFGS, 0.001, 100, budget, False)
+
+        assert result.success and not result.converged and result.stopped == "cancelled"
+        assert result.final_energy < result.initial_energy
+        assert 0 < budget.steps < 100
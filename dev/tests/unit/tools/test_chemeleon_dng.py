@@ -0,0 +1,158 @@
+"""
+Unit tests for Chemeleon de novo generation streaming.
+
+The diffusion model is replaced by a stub so batching and filtering can be tested
+without checkpoints.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+from ase import Atoms
+
+from crystalyse.tools.budget import Budget
+from crystalyse.tools.chemeleon import predictor
+from crystalyse.tools.chemeleon.predictor import ChemeleonPredictor, GenerationBatch
+
+
+class StubDNGModel:
+    """Stand-in for DiffusionModule that returns simple oxide/sodium cells."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[int]] = []
+
+    def sample(self, task: str, num_atoms: list[int]) -> list[Atoms]:
+        assert task == "dng"
+        self.calls.append(list(num_atoms))
+        structures = []
+        for n in num_atoms:
+            symbols = ["Li"] * (n - 1) + ["O"] if n % 2 else ["Na"] * n
+            structures.append(
+                Atoms(
+                    symbols,
+                    positions=[[0.0, 0.0, float(i)] for i in range(n)],
+                    cell=[5.0, 5.0, 5.0 + n],
+                    pbc=True,
+                )
+            )
+        return structures
+
+
+async def _collect(gen) -> list[GenerationBatch]:
+    return [batch async for batch in gen]
+
+
+class TestGenerateDeNovo:
+    """Tests for ChemeleonPredictor.generate_de_novo."""
+
+    async def test_batches_cover_requested_samples(self) -> None:
+        """Test that batch sizes add up to num_samples with a short final batch."""
+        model = StubDNGModel()
+        with patch.object(predictor, "_load_model", return_value=model):
+            batches = await _collect(
+                ChemeleonPredictor().generate_de_novo(num_samples=7, batch_size=3)
+            )
+
+        assert [b.batch_index for b in batches] == [0, 1, 2]
+        assert [len(call) for call in model.calls] == [3, 3, 1]
+        assert sum(b.num_sampled for b in batches) == 7
+        assert all(b.error is None for b in batches)
+
+    async def test_next_batch_sampled_while_consumer_works(self) -> None:
+        """Test that the next batch is denoising while the caller handles the current one."""
+        model = StubDNGModel()
+        with patch.object(predictor, "_load_model", return_value=model):
+            stream = ChemeleonPredictor().generate_de_novo(num_samples=6, batch_size=3)
+            await anext(stream)
+            await asyncio.sleep(0.2)
+            assert len(model.calls) == 2
+            await stream.aclose()
+
+    async def test_closing_early_cancels_prefetched_batch(self) -> None:
+        """Test that closing the stream stops the batch sampled ahead."""
+        release = threading.Event()
+
+        class SlowModel(StubDNGModel):
+            num_timesteps = 1
+
+            def p_sample(self) -> None:
+                pass
+
+            def sample(self, task: str, num_atoms: list[int]) -> list[Atoms]:
+                if self.calls:
+                    release.wait(5)
+                self.p_sample()
+                return super().sample(task, num_atoms)
+
+        budget = Budget()
+        with patch.object(predictor, "_load_model", return_value=SlowModel()):
+            stream = ChemeleonPredictor().generate_de_novo(
+                num_samples=6, batch_size=3, budget=budget
+            )
+            await anext(stream)
+            await asyncio.sleep(0.1)
+            await stream.aclose()
+            release.set()
+
+        assert budget.cancelled
+
+    async def test_filters_applied_before_yield(self) -> None:
+        """Test that element and size filters reject structures before they are yielded."""
+        with patch.object(predictor, "_load_model", return_value=StubDNGModel()):
+            batches = await _collect(
+                ChemeleonPredictor().generate_de_novo(
+                    num_samples=20, batch_size=5, allowed_elements=["Li", "O"], max_atoms=9
+                )
+            )
+
+        for batch in batches:
+            assert batch.num_sampled == len(batch.structures) + batch.num_rejected
+            for structure in batch.structures:
+                assert set(structure.symbols) <= {"Li", "O"}
+                assert len(structure.numbers) <= 9
+
+    async def test_atom_counts_respect_max_atoms(self) -> None:
+        """Test that proposed atom counts never exceed max_atoms."""
+        model = StubDNGModel()
+        with patch.object(predictor, "_load_model", return_value=model):
+            await _collect(
+                ChemeleonPredictor().generate_de_novo(num_samples=30, batch_size=10, max_atoms=4)
+            )
+
+        assert all(0 < n <= 4 for call in model.calls for n in call)
+
+    async def test_model_load_failure_yields_error_batch(self) -> None:
+        """Test that a checkpoint failure ends the stream with an error batch."""
+        with patch.object(predictor, "_load_model", side_effect=RuntimeError("no checkpoint")):
+            batches = await _collect(ChemeleonPredictor().generate_de_novo(num_samples=4))
+
+        assert len(batches) == 1
+        assert batches[0].error is not None
+        assert "no checkpoint" in batches[0].error
+
+    async def test_invalid_arguments(self) -> None:
+        """Test that non-positive sizes are rejected without loading the model."""
+        with patch.object(predictor, "_load_model") as load:
+            batches = await _collect(ChemeleonPredictor().generate_de_novo(num_samples=0))
+
+        load.assert_not_called()
+        assert batches[0].error is not None
+
+
+class TestGenerateDeNovoCollected:
+    """Tests for the aggregating wrapper used by the MCP tools."""
+
+    async def test_collected_result(self) -> None:
+        """Test that all batches are merged into one result."""
+        with patch.object(predictor, "_load_model", return_value=StubDNGModel()):
+            result = await ChemeleonPredictor().generate_de_novo_collected(
+                num_samples=6, batch_size=4
+            )
+
+        assert result.success is True
+        assert result.num_batches == 2
+        assert result.num_sampled == 6
+        assert len(result.predicted_structures) == 6 - result.num_rejected
@@ -0,0 +1,180 @@
+"""
+Unit tests for the seeded Chemeleon sample cache.
+
+The diffusion model is replaced by a stub that draws positions from torch's RNG, so
+seeding and cache behaviour can be tested without checkpoints.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import torch
+from ase import Atoms
+
+from crystalyse.tools.chemeleon import predictor
+from crystalyse.tools.chemeleon.predictor import ChemeleonPredictor
+from crystalyse.tools.chemeleon.sample_cache import SampleCache, checkpoint_fingerprint
+
+
+class StubCSPModel:
+    """Stand-in for DiffusionModule whose output depends on the torch seed."""
+
+    hparams = {"num_timesteps": 1000, "sigma_begin": 10.0, "sigma_end": 0.01}
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def sample(self, task: str, atom_types: list[int], num_atoms: list[int]) -> list[Atoms]:
+        self.calls += 1
+        structures = []
+        offset = 0
+        for n in num_atoms:
+            numbers = atom_types[offset : offset + n]
+            offset += n
+            structures.append(
+                Atoms(
+                    numbers=numbers,
+                    positions=torch.rand(n, 3).double().numpy() * 4.0,
+                    cell=np.eye(3) * 4.0,
+                    pbc=True,
+                )
+            )
+        return structures
+
+
+@pytest.fixture
+def checkpoint(tmp_path: Path) -> Path:
+    path = tmp_path / "csp.ckpt"
+    path.write_bytes(b"fake checkpoint weights")
+    return path
+
+
+@pytest.fixture
+def csp_predictor(tmp_path: Path) -> ChemeleonPredictor:
+    return ChemeleonPredictor(sample_cache=SampleCache(cache_dir=tmp_path / "samples"))
+
+
+class TestSampleCache:
+    """Tests for the on-disk SampleCache."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test that stored samples are read back unchanged."""
+        cache = SampleCache(cache_dir=tmp_path)
+        samples = [
+            {"numbers": np.array([8, 22, 8]), "positions": np.random.rand(3, 3), "cell": np.eye(3)},
+            {"numbers": np.array([3]), "positions": np.random.rand(1, 3), "cell": np.eye(3) * 2},
+        ]
+        key = SampleCache.make_key("Ti1 O2", 2, 7, "abc", "{}", "cpu")
+        cache.put(key, samples)
+
+        loaded = cache.get(key)
+        assert loaded is not None
+        for original, restored in zip(samples, loaded, strict=True):
+            np.testing.assert_array_equal(original["numbers"], restored["numbers"])
+            np.testing.assert_array_equal(original["positions"], restored["positions"])
+            np.testing.assert_array_equal(original["cell"], restored["cell"])
+        assert cache.stats()["hits"] == 1
+
+    def test_key_depends_on_every_field(self) -> None:
+        """Test that changing any key component changes the key."""
+        base = ("Ti1 O2", 2, 7, "abc", "{}", "cpu")
+        keys = {SampleCache.make_key(*base)}
+        for i, value in enumerate(("Ti2 O4", 3, 8, "abd", '{"step_lr": 1}', "cuda")):
+            variant = list(base)
+            variant[i] = value
+            keys.add(SampleCache.make_key(*variant))
+        assert len(keys) == 7
+
+    def test_eviction_respects_size_budget(self, tmp_path: Path) -> None:
+        """Test that old entries are dropped once the cache exceeds its budget."""
+        cache = SampleCache(cache_dir=tmp_path, max_size_mb=0.01)
+        for seed in range(20):
+            cache.put(
+                SampleCache.make_key("X", 1, seed, "abc", "{}", "cpu"),
+                [{"numbers": [1] * 50, "positions": np.random.rand(50, 3), "cell": np.eye(3)}],
+            )
+        assert cache.stats()["size_mb"] <= 0.01
+
+    def test_checkpoint_fingerprint_tracks_content(self, checkpoint: Path) -> None:
+        """Test that the checkpoint hash changes when the file is rewritten."""
+        first = checkpoint_fingerprint(checkpoint)
+        checkpoint.write_bytes(b"different weights, different size")
+        assert checkpoint_fingerprint(checkpoint) != first
+
+
+class TestSeededPrediction:
+    """Tests for seeded predict_structure calls."""
+
+    async def test_repeat_is_served_from_cache(
+        self, csp_predictor: ChemeleonPredictor, checkpoint: Path
+    ) -> None:
+        """Test that a repeated seeded request skips the model and returns identical structures."""
+        model = StubCSPModel()
+        with patch.object(predictor, "_load_model", return_value=model):
+            first = await csp_predictor.predict_structure(
+                "TiO2", num_samples=2, checkpoint_path=str(checkpoint), seed=42
+            )
+            second = await csp_predictor.predict_structure(
+                "TiO2", num_samples=2, checkpoint_path=str(checkpoint), seed=42
+            )
+
+        assert first.success and second.success
+        assert model.calls == 1
+        assert first.from_cache is False
+        assert second.from_cache is True
+        assert second.seed == 42
+        for a, b in zip(first.predicted_structures, second.predicted_structures, strict=True):
+            assert a.positions == b.positions
+            assert a.symbols == b.symbols
+            assert a.volume == pytest.approx(b.volume)
+
+    async def test_seed_is_reproducible_without_cache_hit(
+        self, csp_predictor: ChemeleonPredictor, checkpoint: Path, tmp_path: Path
+    ) -> None:
+        """Test that the same seed gives the same sample even with an empty cache."""
+        other = ChemeleonPredictor(sample_cache=SampleCache(cache_dir=tmp_path / "other"))
+        with patch.object(predictor, "_load_model", return_value=StubCSPModel()):
+            first = await csp_predictor.predict_structure(
+                "NaCl", checkpoint_path=str(checkpoint), seed=3
+            )
+            second = await other.predict_structure("NaCl", checkpoint_path=str(checkpoint), seed=3)
+            different = await other.predict_structure(
+                "NaCl", checkpoint_path=str(checkpoint), seed=4
+            )
+
+        assert second.from_cache is False
+        assert first.predicted_structures[0].positions == second.predicted_structures[0].positions
+        assert (
+            first.predicted_structures[0].positions != different.predicted_structures[0].positions
+        )
+
+    async def test_unseeded_requests_are_not_cached(
+        self, csp_predictor: ChemeleonPredictor, checkpoint: Path
+    ) -> None:
+        """Test that requests without a seed always run the model."""
+        model = StubCSPModel()
+        with patch.object(predictor, "_load_model", return_value=model):
+            for _ in range(2):
+                await csp_predictor.predict_structure("NaCl", checkpoint_path=str(checkpoint))
+
+        assert model.calls == 2
+        assert csp_predictor.sample_cache.stats()["entries"] == 0
+
+    async def test_devices_do_not_share_samples(
+        self, csp_predictor: ChemeleonPredictor, checkpoint: Path
+    ) -> None:
+        """Test that a GPU run does not serve samples cached by a CPU run, or vice versa."""
+        model = StubCSPModel()
+        with patch.object(predictor, "_load_model", return_value=model):
+            for device in ("cpu", "cuda", "cpu"):
+                with patch.object(predictor, "_get_device", return_value=device):
+                    await csp_predictor.predict_structure(
+                        "NaCl", checkpoint_path=str(checkpoint), seed=5
+                    )
+
+        assert model.calls == 2
+        assert csp_predictor.sample_cache.stats()["entries"] == 2
@@ -0,0 +1,71 @@
+"""
+Unit tests for the precomputed element property table.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from smact import Element
+
+from crystalyse.utils.element_table import load_element_table
+
+
+@pytest.fixture
+def table_path(tmp_path: Path) -> Path:
+    return tmp_path / "element_table.npz"
+
+
+class TestElementTable:
+    """Tests for ElementTable lookups and the on-disk cache."""
+
+    def test_matches_smact(self, table_path: Path) -> None:
+        """Test that table values agree with SMACT Element objects."""
+        table = load_element_table(table_path)
+
+        for symbol in ("H", "O", "Fe", "Cs", "Bi"):
+            element = Element(symbol)
+            z = table.atomic_number(symbol)
+            assert z == element.number
+            assert table.mass[z] == pytest.approx(element.mass)
+            assert table.pauling_eneg[z] == pytest.approx(element.pauling_eneg)
+            assert table.oxidation_states(symbol, "icsd24") == tuple(
+                element.oxidation_states_icsd24
+            )
+
+    def test_batch_lookups_with_unknown_symbol(self, table_path: Path) -> None:
+        """Test that batch accessors return NaN for unknown symbols instead of raising."""
+        table = load_element_table(table_path)
+
+        enegs = table.electronegativities(["Na", "Xx", "Cl"])
+        assert enegs[0] == pytest.approx(0.93)
+        assert np.isnan(enegs[1])
+        assert table.oxidation_states("Xx") == ()
+        assert table.metals(["Fe", "O"]).tolist() == [True, False]
+
+    def test_noble_gas_fallback(self, table_path: Path) -> None:
+        """Test that noble gases only get an estimate when the fallback is requested."""
+        table = load_element_table(table_path)
+
+        assert table.electronegativities(["He", "Ne", "Ar"]).tolist() == pytest.approx(
+            [4.16, 4.79, 3.24]
+        )
+        assert np.isnan(table.electronegativities(["He", "Ne"], fallback_noble_gas=False)).all()
+
+    def test_cached_on_disk(self, table_path: Path) -> None:
+        """Test that the generated table is written once and loaded back unchanged."""
+        generated = load_element_table(table_path)
+        assert table_path.exists()
+
+        loaded = load_element_table(table_path)
+        np.testing.assert_array_equal(loaded.symbols, generated.symbols)
+        np.testing.assert_array_equal(loaded.covalent_radius, generated.covalent_radius)
+
+    def test_unreadable_cache_regenerated(self, table_path: Path) -> None:
+        """Test that a corrupt cache file is replaced rather than failing the lookup."""
+        table_path.write_bytes(b"not an npz file")
+
+        table = load_element_table(table_path)
+        assert table.atomic_number("Fe") == 26
@@ -0,0 +1,311 @@
+"""
+Unit tests for the shared artifact fetcher.
+
+A local HTTP server stands in for Figshare and supports Range requests, ETags and
+dropping the connection part-way through a transfer.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from crystalyse.tools import fetcher
+from crystalyse.tools.chemeleon import checkpoint_manager
+from crystalyse.tools.fetcher import (
+    Artifact,
+    ArtifactUnavailableError,
+    ChecksumMismatchError,
+    extract_members,
+    fetch,
+)
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+ETAG = '"v1"'
+
+
+class ArtifactServer:
+    """Serve files from memory, recording every request."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+        self.requests: list[dict[str, str | None]] = []
+        self.drop_after: int | None = None
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                name = self.path.lstrip("/")
+                server.requests.append(
+                    {"path": name, "range": self.headers.get("Range"), "if_range": None}
+                )
+                server.requests[-1]["if_range"] = self.headers.get("If-Range")
+                if name not in server.files:
+                    self.send_error(404)
+                    return
+
+                data = server.files[name]
+                start = 0
+                range_header = self.headers.get("Range")
+                if_range = self.headers.get("If-Range")
+                if range_header and (if_range is None or if_range == ETAG):
+                    start = int(range_header.removeprefix("bytes=").split("-")[0])
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+                else:
+                    self.send_response(200)
+
+                body = data[start:]
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", ETAG)
+                self.end_headers()
+
+                if server.drop_after is not None:
+                    cut, server.drop_after = server.drop_after, None
+                    self.wfile.write(body[:cut])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    srv = ArtifactServer()
+    srv.files["data.bin"] = PAYLOAD
+    yield srv
+    srv.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("CRYSTALYSE_ARTIFACT_MIRROR", raising=False)
+    monkeypatch.delenv("CRYSTALYSE_OFFLINE", raising=False)
+    monkeypatch.setattr(fetcher.time, "sleep", lambda _: None)
+
+
+def _artifact(server: ArtifactServer, **kwargs) -> Artifact:
+    return Artifact(
+        url=f"{server.url}/data.bin",
+        filename="data.bin",
+        sha256=kwargs.pop("sha256", hashlib.sha256(PAYLOAD).hexdigest()),
+        **kwargs,
+    )
+
+
+def _make_tar(members: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class TestFetch:
+    """Tests for fetch()."""
+
+    def test_download_and_verify(self, server: ArtifactServer, tmp_path: Path) -> None:
+        """Test that a fresh download is verified and moved into place."""
+        path = fetch(_artifact(server), tmp_path, progress=lambda *_: None)
+
+        assert path.read_bytes() == PAYLOAD
+        assert not (tmp_path / "data.bin.part").exists()
+
+    def test_existing_file_is_not_downloaded_again(
+        self, server: ArtifactServer, tmp_path: Path
+    ) -> None:
+        """Test that a verified local copy is reused without a request."""
+        fetch(_artifact(server), tmp_path, progress=lambda *_: None)
+        fetch(_artifact(server), tmp_path, progress=lambda *_: None)
+
+        assert len(server.requests) == 1
+
+    def test_interrupted_transfer_resumes(self, server: ArtifactServer, tmp_path: Path) -> None:
+        """Test that a dropped connection is resumed with a Range request."""
+        cut = 3 * fetcher.DOWNLOAD_CHUNK_SIZE
+        server.drop_after = cut + 100
+
+        path = fetch(_artifact(server), tmp_path, progress=lambda *_: None)
+
+        assert path.read_bytes() == PAYLOAD
+        assert server.requests[0]["range"] is None
+        assert server.requests[1]["range"] == f"bytes={cut}-"
+        assert server.requests[1]["if_range"] == ETAG
+
+    def test_partial_file_from_previous_run_resumes(
+        self, server: ArtifactServer, tmp_path: Path
+    ) -> None:
+        """Test that a .part file left by a killed process is continued."""
+        cut = fetcher.DOWNLOAD_CHUNK_SIZE
+        server.drop_after = cut
+        with pytest.raises(RuntimeError):
+            fetch(_artifact(server), tmp_path, progress=lambda *_: None, max_retries=1)
+        assert (tmp_path / "data.bin.part").stat().st_size == cut
+
+        path = fetch(_artifact(server), tmp_path, progress=lambda *_: None)
+        assert path.read_bytes() == PAYLOAD
+        assert server.requests[-1]["range"] == f"bytes={cut}-"
+
+    def test_checksum_mismatch(self, server: ArtifactServer, tmp_path: Path) -> None:
+        """Test that a hash mismatch raises and leaves nothing behind."""
+        with pytest.raises(ChecksumMismatchError):
+            fetch(_artifact(server, sha256="0" * 64), tmp_path, progress=lambda *_: None)
+
+        assert not (tmp_path / "data.bin").exists()
+        assert not (tmp_path / "data.bin.part").exists()
+
+    def test_offline_without_local_copy(
+        self, server: ArtifactServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that offline mode refuses to use the network."""
+        monkeypatch.setenv("CRYSTALYSE_OFFLINE", "1")
+
+        with pytest.raises(ArtifactUnavailableError):
+            fetch(_artifact(server), tmp_path)
+        assert server.requests == []
+
+    def test_mirror_directory_used_in_place(
+        self, server: ArtifactServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a verified file in the mirror directory is returned without downloading."""
+        mirror = tmp_path / "mirror"
+        mirror.mkdir()
+        (mirror / "data.bin").write_bytes(PAYLOAD)
+        monkeypatch.setenv("CRYSTALYSE_ARTIFACT_MIRROR", str(mirror))
+        monkeypatch.setenv("CRYSTALYSE_OFFLINE", "1")
+
+        assert fetch(_artifact(server), tmp_path / "cache") == mirror / "data.bin"
+        assert server.requests == []
+
+    def test_concurrent_callers_share_one_download(
+        self, server: ArtifactServer, tmp_path: Path
+    ) -> None:
+        """Test that simultaneous fetches of the same artifact download it once."""
+        results: list[Path] = []
+
+        def worker() -> None:
+            results.append(fetch(_artifact(server), tmp_path, progress=lambda *_: None))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 4
+        assert all(path.read_bytes() == PAYLOAD for path in results)
+        assert len(server.requests) == 1
+
+
+class TestExtractMembers:
+    """Tests for selective streaming extraction."""
+
+    def test_only_requested_members_written(self, tmp_path: Path) -> None:
+        """Test that unrequested members are skipped."""
+        archive = tmp_path / "bundle.tar.gz"
+        archive.write_bytes(_make_tar({"ckpts/a.ckpt": b"aaa", "ckpts/b.ckpt": b"bbb"}))
+
+        extracted = extract_members(archive, {"b.ckpt": tmp_path / "out" / "b.ckpt"})
+
+        assert extracted["b.ckpt"].read_bytes() == b"bbb"
+        assert not (tmp_path / "out" / "a.ckpt").exists()
+
+    def test_missing_member(self, tmp_path: Path) -> None:
+        """Test that a requested member absent from the archive raises."""
+        archive = tmp_path / "bundle.tar.gz"
+        archive.write_bytes(_make_tar({"a.ckpt": b"aaa"}))
+
+        with pytest.raises(RuntimeError, match="c.ckpt"):
+            extract_members(archive, {"c.ckpt": tmp_path / "c.ckpt"})
+
+    def test_members_verified_before_moved_into_place(self, tmp_path: Path) -> None:
+        """Test that a corrupt archive leaves no partial files and keeps existing ones."""
+        archive = tmp_path / "bundle.tar.gz"
+        archive.write_bytes(_make_tar({"a.ckpt": b"aaa", "b.ckpt": b"bbb"}))
+        existing = tmp_path / "out" / "a.ckpt"
+        existing.parent.mkdir()
+        existing.write_bytes(b"old")
+        members = {"a.ckpt": existing, "b.ckpt": tmp_path / "out" / "b.ckpt"}
+
+        with pytest.raises(ChecksumMismatchError, match="bundle.tar.gz"):
+            extract_members(archive, members, sha256="0" * 64)
+        assert existing.read_bytes() == b"old"
+        assert sorted(p.name for p in existing.parent.iterdir()) == ["a.ckpt"]
+
+        with pytest.raises(ChecksumMismatchError, match="b.ckpt"):
+            extract_members(archive, members, digests={"b.ckpt": "0" * 64})
+        assert sorted(p.name for p in existing.parent.iterdir()) == ["a.ckpt"]
+
+        sha256 = hashlib.sha256(archive.read_bytes()).hexdigest()
+        extracted = extract_members(archive, members, sha256=sha256)
+        assert extracted["a.ckpt"].read_bytes() == b"aaa"
+        assert fetcher.recorded_sha256(existing) == hashlib.sha256(b"aaa").hexdigest()
+
+
+class TestCheckpointManager:
+    """Tests for Chemeleon checkpoint fetching on top of the fetcher."""
+
+    def test_tasks_extracted_on_demand(
+        self, server: ArtifactServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that only the requested checkpoint is extracted and the archive is reused."""
+        csp, dng = checkpoint_manager.CHECKPOINT_FILENAMES.values()
+        server.files["checkpoints.tar.gz"] = _make_tar(
+            {f"chemeleon_checkpoints/{csp}": b"csp weights", f"chemeleon_checkpoints/{dng}": b"dng"}
+        )
+        monkeypatch.setattr(
+            checkpoint_manager,
+            "CHECKPOINT_ARCHIVE",
+            Artifact(url=f"{server.url}/checkpoints.tar.gz", filename="checkpoints.tar.gz"),
+        )
+        monkeypatch.setattr(fetcher, "_tqdm_progress", lambda _: (lambda *_: None, lambda: None))
+
+        paths = checkpoint_manager.ensure_checkpoints_downloaded(tmp_path, tasks=["csp"])
+        assert paths["csp"].read_bytes() == b"csp weights"
+        assert not (tmp_path / dng).exists()
+        assert (tmp_path / "checkpoints.tar.gz").exists()
+
+        paths = checkpoint_manager.ensure_checkpoints_downloaded(tmp_path, tasks=["dng"])
+        assert paths["dng"].read_bytes() == b"dng"
+        assert len(server.requests) == 1
+        assert not (tmp_path / "checkpoints.tar.gz").exists()
+
+    def test_corrupt_checkpoint_extracted_again(
+        self, server: ArtifactServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a cached checkpoint not matching its recorded hash is replaced."""
+        csp = checkpoint_manager.CHECKPOINT_FILENAMES["csp"]
+        server.files["checkpoints.tar.gz"] = _make_tar({csp: b"csp weights"})
+        monkeypatch.setattr(
+            checkpoint_manager,
+            "CHECKPOINT_ARCHIVE",
+            Artifact(url=f"{server.url}/checkpoints.tar.gz", filename="checkpoints.tar.gz"),
+        )
+        monkeypatch.setattr(fetcher, "_tqdm_progress", lambda _: (lambda *_: None, lambda: None))
+
+        path = checkpoint_manager.ensure_checkpoints_downloaded(tmp_path, tasks=["csp"])["csp"]
+        path.write_bytes(b"truncated")
+
+        path = checkpoint_manager.ensure_checkpoints_downloaded(tmp_path, tasks=["csp"])["csp"]
+        assert path.read_bytes() == b"csp weights"
+        assert len(server.requests) == 1
@@ -0,0 +1,79 @@
+"""
+Unit tests for vectorised hull energy targets.
+"""
+
+from __future__ import annotations
+
+import pytest
+from pymatgen.analysis.phase_diagram import PatchedPhaseDiagram, PDEntry, PhaseDiagram
+from pymatgen.core import Composition
+
+from crystalyse.tools.pymatgen.hull_targets import hull_targets
+from crystalyse.tools.pymatgen.phase_diagram import PhaseDiagramAnalyzer
+
+ENTRIES = [
+    PDEntry("Li", -1.9),
+    PDEntry("O2", -9.8),
+    PDEntry("Li2O", -14.4),
+    PDEntry("Li2O2", -18.0),
+    PDEntry("Fe", -8.3),
+    PDEntry("Fe2O3", -34.0),
+    PDEntry("LiFeO2", -24.0),
+]
+
+FORMULAS = ["Li2O", "LiO", "Li3FeO3", "Fe3O4", "LiFe5O8", "Li", "O"]
+
+
+class TestHullTargets:
+    """Tests for hull_targets()."""
+
+    @pytest.mark.parametrize("patched", [False, True])
+    def test_matches_pymatgen(self, patched: bool) -> None:
+        """Test that hull energies and competing phases equal pymatgen's decomposition."""
+        diagram = PatchedPhaseDiagram(ENTRIES) if patched else PhaseDiagram(ENTRIES)
+        reference = PhaseDiagram(ENTRIES)
+        compositions = [Composition(f) for f in FORMULAS]
+
+        results = hull_targets(diagram, compositions)
+
+        for comp, result in zip(compositions, results, strict=True):
+            assert result["hull_energy_per_atom"] == pytest.approx(
+                reference.get_hull_energy_per_atom(comp)
+            )
+            decomposition = reference.get_decomposition(comp)
+            assert {p["formula"] for p in result["competing_phases"]} == {
+                e.composition.reduced_formula for e in decomposition
+            }
+
+    def test_target_is_formation_energy(self) -> None:
+        """Test that a stable phase's target is its own formation energy."""
+        diagram = PhaseDiagram(ENTRIES)
+
+        (result,) = hull_targets(diagram, [Composition("Li2O")])
+
+        assert result["target_formation_energy"] == pytest.approx(
+            diagram.get_form_energy_per_atom(ENTRIES[2])
+        )
+
+    def test_unknown_elements(self) -> None:
+        """Test that compositions outside the diagram get an error message."""
+        (result,) = hull_targets(PhaseDiagram(ENTRIES), [Composition("NaCl")])
+
+        assert "not in the phase diagram" in result
+
+
+class TestCalculateHullTargets:
+    """Tests for PhaseDiagramAnalyzer.calculate_hull_targets()."""
+
+    def test_threshold(self) -> None:
+        """Test that targets deeper than min_target_energy are flagged."""
+        analyzer = PhaseDiagramAnalyzer.__new__(PhaseDiagramAnalyzer)
+        analyzer.ppd_data = PhaseDiagram(ENTRIES)
+
+        batch = analyzer.calculate_hull_targets(["Li2O", "Fe3O4", "???"], min_target_energy=-1.5)
+
+        li2o, fe3o4, bad = batch.results
+        assert li2o.target_formation_energy == pytest.approx(-1.9)
+        assert li2o.passes is False and fe3o4.passes is True
+        assert bad.error is not None
+        assert batch.num_passing == 1
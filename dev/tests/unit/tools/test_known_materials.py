@@ -0,0 +1,106 @@
+"""
+Unit tests for the known-material index over phase-diagram entries.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from pymatgen.analysis.phase_diagram import PhaseDiagram
+from pymatgen.entries.computed_entries import ComputedEntry
+
+from crystalyse.tools.pymatgen import known_materials, phase_diagram
+from crystalyse.tools.pymatgen.known_materials import (
+    KnownMaterialsIndex,
+    load_known_materials_index,
+)
+from crystalyse.tools.pymatgen.phase_diagram import PhaseDiagramAnalyzer
+
+
+def entry(formula: str, energy_per_atom: float, entry_id: str) -> ComputedEntry:
+    computed = ComputedEntry(formula, 0.0, entry_id=entry_id)
+    return ComputedEntry(
+        formula, energy_per_atom * computed.composition.num_atoms, entry_id=entry_id
+    )
+
+
+@pytest.fixture
+def diagram() -> PhaseDiagram:
+    return PhaseDiagram(
+        [
+            entry("Li", -1.9, "mp-1"),
+            entry("O2", -4.9, "mp-2"),
+            entry("Li2O", -4.8, "mp-3"),
+            entry("Li2O", -4.7, "mp-4"),
+            entry("Li4O4", -4.0, "mp-5"),
+        ]
+    )
+
+
+class TestKnownMaterialsIndex:
+    """Tests for KnownMaterialsIndex."""
+
+    def test_summary_per_formula(self, diagram: PhaseDiagram) -> None:
+        """Test that polymorphs are grouped by reduced formula with the lowest energy first."""
+        index = KnownMaterialsIndex.from_entries(diagram.all_entries, diagram.stable_entries)
+
+        row = index.positions(["Li2O"])[0]
+        assert len(index) == 4
+        assert index.num_polymorphs[row] == 2
+        assert index.lowest_energy[row] == pytest.approx(-4.8)
+        assert index.ids(row) == ["mp-3", "mp-4"]
+        assert index.on_hull[row]
+        assert index.positions(["LiO", "NaCl", "Zz"]).tolist()[1:] == [-1, -1]
+
+    def test_cached_on_disk(
+        self, diagram: PhaseDiagram, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the index is written once and read back without the diagram."""
+        monkeypatch.setenv("CRYSTALYSE_KNOWN_MATERIALS_DIR", str(tmp_path))
+        source = tmp_path / "ppd.pkl.gz"
+        source.write_bytes(b"placeholder")
+
+        built = load_known_materials_index(str(source), diagram)
+        loaded = load_known_materials_index(str(source), phase_diagram=None)
+
+        assert known_materials.index_path(str(source)).exists()
+        assert loaded.formulas.tolist() == built.formulas.tolist()
+        assert loaded.ids(0) == built.ids(0)
+
+
+class TestCheckKnownMaterials:
+    """Tests for PhaseDiagramAnalyzer.check_known_materials()."""
+
+    def test_batch_lookup(self, diagram: PhaseDiagram, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that known, unknown and unparseable compositions are reported in order."""
+        index = KnownMaterialsIndex.from_entries(diagram.all_entries, diagram.stable_entries)
+        monkeypatch.setattr(phase_diagram, "get_known_materials_index", lambda: index)
+        analyzer = PhaseDiagramAnalyzer.__new__(PhaseDiagramAnalyzer)
+
+        batch = analyzer.check_known_materials(
+            ["Li4O2", "LiF", "???"], energies_per_atom=[-4.5, -3.0, 0.0]
+        )
+
+        known, unknown, bad = batch.results
+        assert batch.num_known == 1
+        assert known.reduced_formula == "Li2O" and known.num_polymorphs == 2
+        assert known.energy_above_known == pytest.approx(0.3)
+        assert not unknown.is_known and unknown.energy_per_atom == -3.0
+        assert bad.error is not None
+
+    def test_does_not_load_phase_diagram(
+        self, diagram: PhaseDiagram, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the lookup uses only the index and never unpickles the diagram."""
+        index = KnownMaterialsIndex.from_entries(diagram.all_entries, diagram.stable_entries)
+        monkeypatch.setattr(phase_diagram, "get_known_materials_index", lambda: index)
+
+        def fail() -> None:
+            raise AssertionError("phase diagram loaded")
+
+        monkeypatch.setattr(phase_diagram, "_load_phase_diagram", fail)
+
+        batch = PhaseDiagramAnalyzer().check_known_materials(["Li2O"])
+
+        assert batch.success and batch.num_known == 1
@@ -0,0 +1,88 @@
+"""
+Unit tests for the shared parse cache.
+"""
+
+from __future__ import annotations
+
+import pytest
+from pymatgen.core import IStructure, Lattice, Structure
+
+from crystalyse.utils.parse_cache import (
+    ParseCache,
+    get_parse_cache,
+    parse_cif_atoms,
+    parse_cif_structure,
+    parse_composition,
+)
+
+NACL_CIF = Structure(Lattice.cubic(5.64), ["Na", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]]).to(fmt="cif")
+
+
+@pytest.fixture(autouse=True)
+def clear_parse_cache() -> None:
+    get_parse_cache().clear()
+
+
+class TestParseCache:
+    """Tests for ParseCache."""
+
+    def test_hit_and_miss_counts(self) -> None:
+        """Test that repeated content is parsed once and counted as a hit."""
+        cache = ParseCache()
+        calls = []
+
+        def parse(text: str) -> str:
+            calls.append(text)
+            return text.upper()
+
+        assert cache.get_or_parse("word", "abc", parse) == "ABC"
+        assert cache.get_or_parse("word", "abc", parse) == "ABC"
+
+        assert calls == ["abc"]
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    def test_least_recently_used_evicted(self) -> None:
+        """Test that the cache keeps at most max_entries objects."""
+        cache = ParseCache(max_entries=2)
+        for text in ("a", "b", "a", "c"):
+            cache.get_or_parse("word", text, str.upper)
+
+        cache.get_or_parse("word", "a", str.upper)
+
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["hits"] == 2
+
+    def test_failures_not_cached(self) -> None:
+        """Test that a parse error propagates and is retried next time."""
+        cache = ParseCache()
+        with pytest.raises(ValueError):
+            cache.get_or_parse("number", "x", int)
+
+        assert cache.stats()["entries"] == 0
+
+
+class TestParsers:
+    """Tests for the composition, structure and atoms helpers."""
+
+    def test_composition_shared(self) -> None:
+        """Test that the same formula returns the same Composition object."""
+        assert parse_composition("LiFePO4") is parse_composition("LiFePO4")
+
+    def test_structure_shared_and_immutable(self) -> None:
+        """Test that the shared structure is immutable and copies of it are private."""
+        shared = parse_cif_structure(NACL_CIF)
+        copy = Structure.from_sites(shared, properties=shared.properties)
+        copy.replace_species({"Na": "K"})
+
+        assert isinstance(shared, IStructure) and not isinstance(shared, Structure)
+        assert parse_cif_structure(NACL_CIF) is shared
+        assert shared.composition.reduced_formula == "NaCl"
+
+    def test_atoms_returned_as_copies(self) -> None:
+        """Test that modifying returned atoms does not affect later calls."""
+        atoms = parse_cif_atoms(NACL_CIF)
+        atoms.positions += 1.0
+
+        assert parse_cif_atoms(NACL_CIF).positions[0] == pytest.approx([0.0, 0.0, 0.0])
+        assert get_parse_cache().stats()["by_kind"]["cif_atoms"]["hits"] == 1
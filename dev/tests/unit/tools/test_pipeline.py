@@ -0,0 +1,200 @@
+"""
+Unit tests for the server-side screening pipeline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from crystalyse.tools.models import (
+    CrystalStructure,
+    EnergyAboveHullResult,
+    EnergyResult,
+    PredictionResult,
+    RelaxationResult,
+)
+from crystalyse.tools.pipeline import ScreeningPipeline, Stage, normalize_stages, run_stages
+from crystalyse.tools.registry import ToolRegistry
+
+NUMBERS = {"NaCl": [11, 17], "KCl": [19, 17], "NaBr": [11, 35]}
+E_HULL = {"ClNa": 0.0, "ClK": 0.05, "BrNa": 0.3}
+
+
+class FakePredictor:
+    def __init__(self, events: list):
+        self.events = events
+
+    async def predict_structure(self, formula: str, **kwargs) -> PredictionResult:
+        time.sleep(0.05)
+        self.events.append(("generated", formula, time.perf_counter()))
+        structure = CrystalStructure(
+            formula=formula,
+            cell=[[4.0, 0, 0], [0, 4.0, 0], [0, 0, 4.0]],
+            positions=[[0, 0, 0], [2.0, 2.0, 2.0]],
+            numbers=NUMBERS[formula],
+            symbols=[],
+            volume=64.0,
+        )
+        return PredictionResult(success=True, formula=formula, predicted_structures=[structure])
+
+
+class FakeMACE:
+    def __init__(self, events: list):
+        self.events = events
+
+    async def calculate_formation_energy(self, structure: dict) -> EnergyResult:
+        self.events.append(("energy", structure["numbers"][0], time.perf_counter()))
+        time.sleep(0.05)
+        return EnergyResult(formula="", formation_energy=-1.0, total_energy=-8.0)
+
+    async def relax_structure(self, structure: dict, **kwargs) -> RelaxationResult:
+        return RelaxationResult(final_energy=-8.5, relaxed_structure=structure)
+
+
+class FakeHull:
+    def calculate_energy_above_hull(
+        self, composition: str, energy: float, per_atom: bool = True
+    ) -> EnergyAboveHullResult:
+        e_hull = E_HULL[composition]
+        return EnergyAboveHullResult(
+            composition=composition,
+            energy_per_atom=energy / 2,
+            energy_above_hull=e_hull,
+            is_stable=e_hull == 0,
+            is_metastable=False,
+            is_unstable=e_hull > 0,
+        )
+
+
+@pytest.fixture
+def tools(tmp_path: Path, monkeypatch) -> tuple[ToolRegistry, list]:
+    monkeypatch.setenv("CRYSTALYSE_STRUCTURE_DIR", str(tmp_path))
+    monkeypatch.setattr("crystalyse.tools.structure_store._structure_store", None)
+    events: list = []
+    registry = ToolRegistry()
+    for spec in ("chemeleon:csp", "mace:medium", "phase_diagram"):
+        registry.add_resource(spec, lambda: None)
+    registry.add_resource("chemeleon_predictor", lambda: FakePredictor(events))
+    registry.add_resource("mace_calculator", lambda: FakeMACE(events))
+    registry.add_resource("phase_diagram_analyzer", FakeHull)
+    return registry, events
+
+
+class TestScreeningPipeline:
+    """Tests for ScreeningPipeline."""
+
+    def test_ranks_and_filters(self, tools: tuple[ToolRegistry, list]) -> None:
+        """Test that candidates are filtered per stage, ranked by hull energy and reported."""
+        registry, _ = tools
+        progress = []
+
+        async def report(done: float, total: float | None, message: str) -> None:
+            progress.append((done, total, message))
+
+        pipeline = ScreeningPipeline(registry, max_energy_above_hull=0.1)
+        result = asyncio.run(pipeline.run(["KCl", "NaCl2", "NaCl", "NaBr", "KCl"], report))
+
+        assert result.num_compositions == 4
+        assert [(c.rank, c.formula) for c in result.ranked] == [(1, "NaCl"), (2, "KCl")]
+        assert result.ranked[0].relaxed and result.ranked[0].total_energy == -8.5
+        assert result.ranked[0].structure.handle.startswith("struct-")
+        assert {c.formula: c.rejected_at for c in result.rejected} == {
+            "NaCl2": "validate",
+            "NaBr": "hull",
+        }
+        assert result.stage_counts == {
+            "validate": 3,
+            "generate": 3,
+            "energy": 3,
+            "relax": 3,
+            "hull": 2,
+        }
+        assert progress[-1][0] == progress[-1][1] == 6
+
+    def test_generation_overlaps_mace(self, tools: tuple[ToolRegistry, list]) -> None:
+        """Test that MACE evaluates early structures while later ones are being generated."""
+        registry, events = tools
+
+        asyncio.run(
+            ScreeningPipeline(registry, stages=["generate", "energy"]).run(["NaCl", "KCl", "NaBr"])
+        )
+
+        first_energy = min(t for kind, _, t in events if kind == "energy")
+        last_generated = max(t for kind, _, t in events if kind == "generated")
+        assert first_energy < last_generated
+
+    def test_cancelled_run_stops_generation(self, tools: tuple[ToolRegistry, list]) -> None:
+        """Test that cancelling a run cancels structure generation instead of leaving it pending."""
+        registry, events = tools
+
+        async def main() -> None:
+            pipeline = ScreeningPipeline(registry, stages=["generate", "energy"])
+            task = asyncio.create_task(pipeline.run(["NaCl", "KCl", "NaBr"]))
+            await asyncio.sleep(0.08)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert all(other.done() for other in asyncio.all_tasks() - {asyncio.current_task()})
+
+        asyncio.run(main())
+        assert len([e for e in events if e[0] == "generated"]) < 3
+
+    def test_stage_dependencies(self) -> None:
+        """Test that stages are put in order and missing inputs are rejected."""
+        assert normalize_stages(["hull", "generate", "energy"]) == ["generate", "energy", "hull"]
+        with pytest.raises(ValueError):
+            normalize_stages(["validate", "energy"])
+        with pytest.raises(ValueError):
+            normalize_stages(["generate", "hull"])
+
+
+class TestRunStages:
+    """Tests for run_stages()."""
+
+    def test_stages_overlap(self) -> None:
+        """Test that stages run concurrently, fan out and drop items that fail."""
+
+        def generate(n: int) -> list[int]:
+            time.sleep(0.05)
+            return [n, -n]
+
+        def evaluate(n: int) -> list[int]:
+            if n == -2:
+                raise ValueError("bad structure")
+            time.sleep(0.05)
+            return [n * 10]
+
+        seconds: dict[str, float] = {}
+        stages = [Stage("generate", generate), Stage("energy", evaluate, workers=2)]
+        start = time.perf_counter()
+        outputs = asyncio.run(run_stages(range(1, 5), stages, 2, seconds))
+
+        assert sorted(outputs) == [-40, -30, -10, 10, 20, 30, 40]
+        assert seconds["generate"] >= 0.2 and seconds["energy"] >= 0.3
+        # Serially this would take 0.2 s + 0.35 s
+        assert time.perf_counter() - start < 0.5
+
+    def test_back_pressure(self) -> None:
+        """Test that a fast stage is held back by a slow one instead of running ahead."""
+        produced, consumed, lag = [], [], []
+
+        def generate(n: int) -> list[int]:
+            produced.append(n)
+            lag.append(len(produced) - len(consumed))
+            return [n]
+
+        def evaluate(n: int) -> list[int]:
+            time.sleep(0.01)
+            consumed.append(n)
+            return [n]
+
+        asyncio.run(
+            run_stages(range(30), [Stage("generate", generate), Stage("energy", evaluate)], 2)
+        )
+
+        assert len(consumed) == 30
+        assert max(lag) <= 5
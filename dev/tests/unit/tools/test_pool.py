@@ -0,0 +1,46 @@
+"""
+Unit tests for the shared process-pool fan-out.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from crystalyse.tools import pool
+from crystalyse.tools.pool import map_in_processes
+
+
+def square_with_pid(x: int) -> tuple[int, int]:
+    return x * x, os.getpid()
+
+
+class TestMapInProcesses:
+    """Tests for map_in_processes()."""
+
+    def test_small_batch_in_process(self) -> None:
+        """Test that a batch below the caller's threshold runs in this process."""
+        results, used = map_in_processes(square_with_pid, [1, 2, 3], workers=2, parallel=False)
+
+        assert [value for value, _ in results] == [1, 4, 9]
+        assert used == 1 and {pid for _, pid in results} == {os.getpid()}
+
+    def test_parallel_keeps_order(self) -> None:
+        """Test that pooled results come back in task order from worker processes."""
+        results, used = map_in_processes(square_with_pid, list(range(8)), workers=2)
+
+        assert [value for value, _ in results] == [x * x for x in range(8)]
+        assert used == 2 and os.getpid() not in {pid for _, pid in results}
+
+    def test_falls_back_without_pool(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the batch runs in-process when no pool can be started."""
+
+        def unavailable(*args, **kwargs):
+            raise OSError("no processes")
+
+        monkeypatch.setattr(pool, "ProcessPoolExecutor", unavailable)
+
+        results, used = map_in_processes(square_with_pid, [2, 3], workers=2)
+
+        assert [value for value, _ in results] == [4, 9] and used == 1
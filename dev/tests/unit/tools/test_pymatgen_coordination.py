@@ -0,0 +1,95 @@
+"""
+Unit tests for symmetry-reduced and batched coordination analysis.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from pymatgen.core import Lattice, Structure
+
+from crystalyse.tools.pymatgen.analyzer import PyMatgenAnalyzer
+
+
+def rocksalt(a: float = 5.64) -> Structure:
+    return Structure.from_spacegroup(
+        "Fm-3m", Lattice.cubic(a), ["Na", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]]
+    )
+
+
+def rutile() -> Structure:
+    return Structure.from_spacegroup(
+        "P4_2/mnm", Lattice.tetragonal(4.59, 2.96), ["Ti", "O"], [[0, 0, 0], [0.305, 0.305, 0]]
+    )
+
+
+class TestAnalyzeCoordination:
+    """Tests for PyMatgenAnalyzer.analyze_coordination()."""
+
+    def test_symmetry_reduction_matches_full_analysis(self) -> None:
+        """Test that broadcasting inequivalent sites reproduces the per-site result."""
+        structure = rutile().as_dict()
+
+        reduced = PyMatgenAnalyzer.analyze_coordination(structure)
+        full = PyMatgenAnalyzer.analyze_coordination(structure, symmetry_reduce=False)
+
+        assert reduced.num_inequivalent_sites == 2
+        assert full.num_inequivalent_sites == 6
+        assert [d["coordination_number"] for d in reduced.coordination_data] == [
+            d["coordination_number"] for d in full.coordination_data
+        ]
+        assert [d["fractional_coords"] for d in reduced.coordination_data] == [
+            d["fractional_coords"] for d in full.coordination_data
+        ]
+
+    def test_perturbed_cell_matches_full_analysis(self) -> None:
+        """Test that sites of a nearly symmetric cell are not given a shared environment."""
+        structure = Structure.from_spacegroup(
+            "Fm-3m", Lattice.cubic(4.21), ["Mg", "O"], [[0, 0, 0], [0.5, 0.5, 0.5]]
+        )
+        rng = np.random.default_rng(0)
+        for i in range(len(structure)):
+            structure.translate_sites([i], rng.normal(0, 0.001, 3), frac_coords=False)
+        structure = structure.as_dict()
+
+        full = PyMatgenAnalyzer.analyze_coordination(structure, symmetry_reduce=False)
+        reduced = PyMatgenAnalyzer.analyze_coordination(structure)
+        # A loose tolerance merges the sites into two orbits, but the check catches it
+        loose = PyMatgenAnalyzer.analyze_coordination(structure, symprec=0.1)
+
+        # The noise gives the two Mg sites different Voronoi environments
+        assert full.coordination_data[0] != full.coordination_data[1]
+        assert reduced.coordination_data == full.coordination_data
+        assert loose.coordination_data == full.coordination_data
+
+    def test_cutoff_method(self) -> None:
+        """Test that the cutoff backend finds octahedral Na and Cl in a supercell."""
+        result = PyMatgenAnalyzer.analyze_coordination(
+            (rocksalt() * (2, 2, 2)).as_dict(), method="cutoff"
+        )
+
+        assert result.success and result.method == "cutoff"
+        assert result.sites_analyzed == 64
+        assert {d["coordination_number"] for d in result.coordination_data} == {6}
+        assert {d["geometry"] for d in result.coordination_data} == {"octahedral"}
+
+    def test_unknown_method(self) -> None:
+        """Test that an unknown method is reported as a failure."""
+        result = PyMatgenAnalyzer.analyze_coordination(rocksalt().as_dict(), method="bogus")
+
+        assert not result.success
+        assert "Unknown method" in result.error
+
+
+class TestAnalyzeCoordinationBatch:
+    """Tests for PyMatgenAnalyzer.analyze_coordination_batch()."""
+
+    def test_results_in_input_order(self) -> None:
+        """Test that unparseable inputs fail individually without shifting results."""
+        batch = PyMatgenAnalyzer.analyze_coordination_batch(
+            [rocksalt().as_dict(), "not a cif", rutile().as_dict()], workers=1
+        )
+
+        assert batch.num_failed == 1
+        assert [r.success for r in batch.results] == [True, False, True]
+        assert batch.results[0].average_coordination == 6.0
+        assert batch.results[2].formula == "TiO2"
@@ -0,0 +1,128 @@
+"""
+Unit tests for cached and batched oxidation-state validation.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pymatgen.analysis.bond_valence import BVAnalyzer
+from pymatgen.core import Lattice, Structure
+
+from crystalyse.tools import pool
+from crystalyse.tools.pymatgen.analyzer import PyMatgenAnalyzer
+from crystalyse.tools.pymatgen.oxidation import get_oxidation_cache, smact_assignments
+
+
+def rocksalt(a: float = 5.64) -> Structure:
+    return Structure.from_spacegroup(
+        "Fm-3m", Lattice.cubic(a), ["Na", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]]
+    )
+
+
+def magnetite() -> Structure:
+    return Structure.from_spacegroup(
+        "Fd-3m",
+        Lattice.cubic(8.39),
+        ["Fe", "Fe", "O"],
+        [[0.125, 0.125, 0.125], [0.5, 0.5, 0.5], [0.2549, 0.2549, 0.2549]],
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_oxidation_cache() -> None:
+    get_oxidation_cache().clear()
+
+
+class TestSmactAssignments:
+    """Tests for smact_assignments()."""
+
+    def test_unambiguous_and_mixed_valence(self) -> None:
+        """Test that NaCl has one assignment and mixed-valence Fe3O4 has none."""
+        assert smact_assignments(rocksalt()) == [{"Cl": -1, "Na": 1}]
+        assert smact_assignments(magnetite()) == []
+
+
+class TestValidateOxidationStatesBatch:
+    """Tests for PyMatgenAnalyzer.validate_oxidation_states_batch()."""
+
+    def test_fast_path_escalation_and_cache(self) -> None:
+        """Test that only the ambiguous structure uses bond valences and repeats are cached."""
+        inputs = [rocksalt().as_dict(), magnetite().as_dict(), "not a cif"]
+
+        batch = PyMatgenAnalyzer.validate_oxidation_states_batch(inputs, workers=1)
+        repeat = PyMatgenAnalyzer.validate_oxidation_states_batch(inputs, workers=1)
+
+        assert [r.method for r in batch.results] == ["smact", "bond_valence", None]
+        assert batch.results[0].structure_is_valid
+        assert batch.results[0].validity_percentage == 100.0
+        assert batch.results[0].site_analysis[0]["bond_valence_sum"] is None
+        assert batch.num_failed == 1
+        assert (batch.cache_hits, repeat.cache_hits) == (0, 2)
+        assert repeat.results == batch.results
+
+    def test_given_states_and_compressed_cells_escalate(self) -> None:
+        """Test that given states and too-short distances are checked with bond valences."""
+        batch = PyMatgenAnalyzer.validate_oxidation_states_batch(
+            [rocksalt().as_dict(), rocksalt(2.0).as_dict()], workers=1
+        )
+        wrong = PyMatgenAnalyzer.validate_oxidation_states(
+            rocksalt().as_dict(), {"Na": 3, "Cl": -1}
+        )
+
+        assert [r.method for r in batch.results] == ["smact", "bond_valence"]
+        assert not batch.results[1].structure_is_valid
+        assert wrong.method == "bond_valence" and not wrong.structure_is_valid
+
+    def test_time_budget_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that slow bond-valence analysis is cut off and not cached."""
+
+        def slow_get_valences(self, structure):
+            time.sleep(5)
+
+        monkeypatch.setattr(BVAnalyzer, "get_valences", slow_get_valences)
+
+        start = time.perf_counter()
+        batch = PyMatgenAnalyzer.validate_oxidation_states_batch(
+            [magnetite().as_dict()], time_budget=0.2, workers=1
+        )
+
+        assert time.perf_counter() - start < 4
+        result = batch.results[0]
+        assert result.success and result.timed_out and result.method == "fallback"
+        assert not result.structure_is_valid
+        assert batch.num_timed_out == 1
+        assert get_oxidation_cache().stats()["entries"] == 0
+
+    def test_time_budget_off_main_thread(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the budget holds in worker threads and is reported when it cannot."""
+
+        def slow_get_valences(self, structure):
+            time.sleep(2)
+
+        monkeypatch.setattr(BVAnalyzer, "get_valences", slow_get_valences)
+
+        def validate(time_budget: float):
+            with ThreadPoolExecutor(max_workers=1) as thread:
+                return thread.submit(
+                    PyMatgenAnalyzer.validate_oxidation_states_batch,
+                    [magnetite().as_dict()],
+                    time_budget=time_budget,
+                    workers=1,
+                ).result()
+
+        start = time.perf_counter()
+        batch = validate(0.2)
+
+        assert time.perf_counter() - start < 1.5
+        assert batch.results[0].timed_out and batch.results[0].budget_enforced
+
+        def unavailable(*args, **kwargs):
+            raise OSError("no processes")
+
+        monkeypatch.setattr(pool, "ProcessPoolExecutor", unavailable)
+        result = validate(0.3).results[0]
+
+        assert not result.timed_out and not result.budget_enforced
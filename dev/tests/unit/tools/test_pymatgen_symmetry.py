@@ -0,0 +1,79 @@
+"""
+Unit tests for cached and batched space-group analysis.
+"""
+
+from __future__ import annotations
+
+import pytest
+from pymatgen.core import Lattice, Structure
+
+from crystalyse.tools.pymatgen import symmetry
+from crystalyse.tools.pymatgen.analyzer import PyMatgenAnalyzer
+from crystalyse.tools.pymatgen.symmetry import get_symmetry_cache, groups_for_fields
+
+
+def rocksalt(a: float) -> dict:
+    return Structure.from_spacegroup(
+        "Fm-3m", Lattice.cubic(a), ["Na", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]]
+    ).as_dict()
+
+
+@pytest.fixture(autouse=True)
+def clear_symmetry_cache() -> None:
+    get_symmetry_cache().clear()
+
+
+class TestFieldGroups:
+    """Tests for groups_for_fields()."""
+
+    def test_only_needed_groups(self) -> None:
+        """Test that requesting a lattice field does not pull in the CIF groups."""
+        assert groups_for_fields(["space_group_number", "lattice_a"]) == ("core", "lattice")
+
+    def test_unknown_field(self) -> None:
+        """Test that an unknown field name is rejected."""
+        with pytest.raises(ValueError, match="Unknown fields"):
+            groups_for_fields(["spacegroup"])
+
+
+class TestAnalyzeSpaceGroupBatch:
+    """Tests for PyMatgenAnalyzer.analyze_space_group_batch()."""
+
+    def test_selected_fields_only(self) -> None:
+        """Test that unrequested CIFs and lattice parameters are not produced."""
+        batch = PyMatgenAnalyzer.analyze_space_group_batch(
+            [rocksalt(5.64)], fields=["space_group_number"], workers=1
+        )
+
+        result = batch.results[0]
+        assert (result.space_group_symbol, result.space_group_number) == ("Fm-3m", 225)
+        assert result.num_symmetry_ops == 192
+        assert result.symmetrized_cif is None and result.lattice_a is None
+
+    def test_matches_single_analysis_and_caches(self) -> None:
+        """Test that batch results equal analyze_space_group and repeat as cache hits."""
+        inputs = [rocksalt(5.64), rocksalt(4.2)]
+        expected = [PyMatgenAnalyzer.analyze_space_group(s) for s in inputs]
+
+        batch = PyMatgenAnalyzer.analyze_space_group_batch(inputs, workers=1)
+
+        assert batch.results == expected
+        assert batch.cache_hits == 2
+
+    def test_bad_input_does_not_fail_batch(self) -> None:
+        """Test that an unparseable structure gets a failed result in place."""
+        batch = PyMatgenAnalyzer.analyze_space_group_batch([rocksalt(5.64), "not a cif"], workers=1)
+
+        assert batch.success is True
+        assert [r.success for r in batch.results] == [True, False]
+        assert batch.num_failed == 1
+
+    def test_process_pool(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that structures analysed in worker processes come back in order."""
+        monkeypatch.setattr(symmetry, "PARALLEL_THRESHOLD", 1)
+        inputs = [rocksalt(a) for a in (4.0, 4.5, 5.0)]
+
+        batch = PyMatgenAnalyzer.analyze_space_group_batch(inputs, fields=["lattice_a"], workers=2)
+
+        assert batch.workers == 2
+        assert [r.lattice_a for r in batch.results] == pytest.approx([4.0, 4.5, 5.0])
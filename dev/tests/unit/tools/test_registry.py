@@ -0,0 +1,126 @@
+"""
+Unit tests for lazily loaded tool objects and warm-up resources.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from crystalyse.tools import registry
+from crystalyse.tools.registry import ToolRegistry
+from crystalyse.tools.resources import resource_loader, warm_up_plan
+
+
+class TestToolRegistry:
+    """Tests for ToolRegistry."""
+
+    def test_loads_on_first_get(self) -> None:
+        """Test that a tool is created once, on first use, with its load times recorded."""
+        tools = ToolRegistry()
+        tools.register("counter", "collections:Counter", a=2)
+
+        assert not tools.is_loaded("counter")
+        counter = tools.get("counter")
+
+        assert counter["a"] == 2
+        assert tools.get("counter") is counter
+        status = tools.status()["counter"]
+        assert status["loaded"] and status["import_seconds"] is not None
+
+    def test_failure_recorded(self) -> None:
+        """Test that import errors are raised on use and reported in the status."""
+        tools = ToolRegistry()
+        tools.register("missing", "crystalyse.tools.no_such_module:Tool")
+
+        tools.warm_up().join(timeout=10)
+
+        with pytest.raises(ModuleNotFoundError):
+            tools.get("missing")
+        assert "ModuleNotFoundError" in tools.status()["missing"]["error"]
+
+    def test_models_import_without_tool_stacks(self) -> None:
+        """Test that the result models load without torch, SMACT or pymatgen."""
+        code = (
+            "import sys, crystalyse.tools.models; "
+            "print(sorted(m for m in ('torch', 'smact', 'pymatgen', 'mace') if m in sys.modules))"
+        )
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+        ).stdout
+
+        assert out.strip().splitlines()[-1] == "[]"
+
+
+class TestResources:
+    """Tests for warm-up resources and readiness."""
+
+    def test_wait_shares_background_load(self) -> None:
+        """Test that a tool waiting on a resource being warmed up does not load it again."""
+        calls = []
+        started = threading.Event()
+
+        def load() -> str:
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return "weights"
+
+        tools = ToolRegistry()
+        tools.add_resource("model", load)
+        tools.warm_up(["model"])
+        started.wait(timeout=5)
+
+        assert tools.readiness()["model"]["state"] == "loading"
+        assert tools.wait("model")
+        assert len(calls) == 1
+        status = tools.readiness()["model"]
+        assert status["state"] == "ready" and status["load_seconds"] >= 0.2
+
+    def test_failed_resource(self) -> None:
+        """Test that a failed load is reported without raising into the tool."""
+        tools = ToolRegistry()
+        tools.add_resource("model", lambda: 1 / 0)
+
+        assert not tools.wait("model")
+        assert tools.readiness()["model"]["state"] == "failed"
+        assert "ZeroDivisionError" in tools.readiness()["model"]["error"]
+
+    def test_failed_resource_backs_off(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a failed load is not repeated by every tool call until the back-off."""
+        calls = []
+
+        def load() -> None:
+            calls.append(1)
+            raise OSError("offline")
+
+        tools = ToolRegistry()
+        tools.add_resource("model", load)
+
+        assert not tools.wait("model") and not tools.wait("model")
+        with pytest.raises(OSError, match="offline"):
+            tools.get("model")
+        assert len(calls) == 1
+
+        monkeypatch.setattr(registry, "RETRY_AFTER", 0.0)
+        assert not tools.wait("model")
+        assert len(calls) == 2
+
+    def test_warm_up_plan(self) -> None:
+        """Test that the plan setting selects the default, nothing, or a custom list."""
+        default = ["mace:medium", "phase_diagram"]
+
+        assert warm_up_plan(default, "1") == default
+        assert warm_up_plan(default, "0") == []
+        assert warm_up_plan(default, "chemeleon:dng, doper:skipspecies") == [
+            "chemeleon:dng",
+            "doper:skipspecies",
+        ]
+        with pytest.raises(ValueError):
+            resource_loader("chemeleon:unknown")
@@ -0,0 +1,99 @@
+"""
+Unit tests for the shared JSON serialisation layer.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from crystalyse.provenance.artifact_tracker import ArtifactTracker
+from crystalyse.provenance.core.event_logger import JSONLLogger
+from crystalyse.provenance.core.pydantic_serializer import create_enhanced_material_record
+from crystalyse.tools.models import EnergyResult
+from crystalyse.utils.serialization import dumps, serialize, to_jsonable
+
+
+@dataclass
+class Point:
+    x: float
+    y: float
+
+
+def mixed_result() -> dict:
+    return {
+        "formula": "LiCoO2",
+        "energy": EnergyResult(success=True, formula="LiCoO2", formation_energy=-1.5),
+        "positions": np.arange(6, dtype=np.float64).reshape(2, 3),
+        "count": np.int64(3),
+        "point": Point(1.0, 2.0),
+        "when": datetime(2025, 1, 20, 12, 0),
+        "path": Path("/tmp/out.cif"),
+    }
+
+
+class TestDumps:
+    """Tests for dumps()."""
+
+    def test_mixed_types_and_canonical_order(self) -> None:
+        """Test that mixed result types encode to plain JSON with sorted keys."""
+        data = json.loads(dumps(mixed_result()))
+
+        assert data["positions"] == [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]
+        assert data["count"] == 3 and data["point"] == {"x": 1.0, "y": 2.0}
+        assert data["energy"]["formation_energy"] == -1.5 and "error" not in data["energy"]
+        assert data["when"] == "2025-01-20T12:00:00" and data["path"] == "/tmp/out.cif"
+        assert dumps({"b": 1, "a": [1.5, 2]}) == b'{"a":[1.5,2],"b":1}'
+        assert list(json.loads(dumps(data, sort_keys=False))) == list(data)
+
+    def test_numpy_precision_nan_and_keys(self) -> None:
+        """Test that float32 stays short, NaN becomes null and keys sort as strings."""
+        positions = (np.arange(12, dtype=np.float32) / 10).reshape(3, 4)
+
+        assert dumps([np.float32(0.1), float("nan"), np.float64("inf")]) == b"[0.1,null,null]"
+        assert dumps(positions.T) == dumps(np.ascontiguousarray(positions.T))
+        assert b"0.1," in dumps(positions.T) and b"0.10000000149" not in dumps(positions.T)
+        assert dumps({10: "a", 2: "b", "x": "c"}) == b'{"10":"a","2":"b","x":"c"}'
+
+    def test_integers_beyond_64_bits(self) -> None:
+        """Test that integers orjson cannot encode are written as strings."""
+        big = 2**70
+
+        assert dumps([2**64 - 1, -(2**63)]) == b"[18446744073709551615,-9223372036854775808]"
+        assert dumps({"n": big, big: [Point(big, 1.0)]}) == (
+            b'{"1180591620717411303424":[{"x":"1180591620717411303424","y":1.0}],'
+            b'"n":"1180591620717411303424"}'
+        )
+        assert to_jsonable({"n": -big}) == {"n": str(-big)}
+
+
+class TestSerializedReuse:
+    """Tests for sharing one encoding between hash, raw output and event log."""
+
+    def test_hash_and_event_log_reuse_encoding(self, tmp_path) -> None:
+        """Test that the artifact hash and logged record come from the one encoding."""
+        output = {"formula": "NaCl", "formation_energy": -2.1, "success": True}
+        encoded = serialize(output)
+
+        tracker = ArtifactTracker()
+        artifact_id = tracker.register_tool_output(
+            "calculate_formation_energy", "call-1", {}, encoded.data, output_hash=encoded.digest()
+        )
+        assert artifact_id == encoded.digest()
+        assert tracker.register_tool_output("calculate_formation_energy", "call-2", {}, output) == (
+            artifact_id
+        )
+
+        logger = JSONLLogger(tmp_path / "events.jsonl")
+        record = create_enhanced_material_record("calculate_formation_energy", encoded)
+        logger.log("enhanced_material", record)
+        logger.log("tool_output", {"text": serialize("plain text")})
+
+        first, second = logger.read_events()
+        assert first["data"]["full_output"] == output
+        assert first["data"]["key_data"]["formation_energy"] == -2.1
+        assert second["data"]["text"] == "plain text"
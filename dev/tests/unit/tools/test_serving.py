@@ -0,0 +1,93 @@
+"""
+Unit tests for shared HTTP server mode.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from crystalyse.config import CrystaLyseConfig
+from crystalyse.infrastructure import mcp_connection_pool
+from crystalyse.infrastructure.mcp_connection_pool import MCPConnectionPool
+from crystalyse.tools.serving import ClientLimiter, endpoint_url
+
+
+class TestClientLimiter:
+    """Tests for ClientLimiter."""
+
+    def test_limit_is_per_client(self) -> None:
+        """Test that each client is capped separately and extra calls wait for a slot."""
+        limiter = ClientLimiter(max_calls=2)
+        running: dict[str, int] = {"a": 0, "b": 0}
+        peak: dict[str, int] = {"a": 0, "b": 0}
+
+        class Client:
+            def __init__(self, name: str):
+                self.name = name
+
+        async def call(client: Client) -> None:
+            async with limiter.slot(client):
+                running[client.name] += 1
+                peak[client.name] = max(peak[client.name], running[client.name])
+                await asyncio.sleep(0.01)
+                running[client.name] -= 1
+
+        async def main() -> None:
+            a, b = Client("a"), Client("b")
+            await asyncio.gather(*(call(a) for _ in range(6)), call(b))
+
+        asyncio.run(main())
+
+        assert peak == {"a": 2, "b": 1}
+
+
+class TestServerEndpoints:
+    """Tests for pointing the agent at running servers."""
+
+    def test_url_replaces_spawn_config(self, monkeypatch) -> None:
+        """Test that a configured endpoint is used instead of spawning, unless asked to spawn."""
+        url = endpoint_url("chemistry_unified")
+        monkeypatch.setenv("CRYSTALYSE_UNIFIED_URL", url)
+        config = CrystaLyseConfig()
+
+        assert url == "http://127.0.0.1:8701/mcp"
+        assert config.get_server_config("chemistry_unified") == {"url": url}
+        spawn = config.get_server_config("chemistry_unified", spawn=True)
+        assert spawn["args"] == ["-m", "chemistry_unified.server"] and "url" not in spawn
+        assert "url" not in config.get_server_config("visualization")
+
+    def test_pool_spawns_without_url_or_when_endpoint_down(self, monkeypatch) -> None:
+        """Test that the pool spawns a server when no endpoint is set or it cannot be reached."""
+        opened = []
+
+        class FakeClient:
+            def __init__(self, name: str, params: dict, **kwargs):
+                self.params = params
+
+            async def __aenter__(self):
+                if "url" in self.params:
+                    raise ConnectionError("connection refused")
+                opened.append(self.params["args"])
+                return self
+
+            async def __aexit__(self, *exc) -> None:
+                pass
+
+            async def list_tools(self) -> list:
+                return []
+
+        monkeypatch.setattr(mcp_connection_pool, "MCPServerStdio", FakeClient)
+        monkeypatch.setattr(mcp_connection_pool, "MCPServerStreamableHttp", FakeClient)
+        spawn = {"command": "python", "args": ["-m", "chemistry_unified.server"], "cwd": "."}
+
+        async def main() -> None:
+            pool = MCPConnectionPool(max_reconnect_attempts=1)
+            await pool.register_server("unset", {**spawn, "url": None})
+            await pool.register_server("down", {**spawn, "url": endpoint_url("chemistry_unified")})
+            assert await pool.get_connection("unset") is not None
+            assert await pool.get_connection("down") is not None
+            await pool.close_all_connections()
+
+        asyncio.run(main())
+
+        assert len(opened) == 2
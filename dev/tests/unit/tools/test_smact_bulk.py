@@ -0,0 +1,111 @@
+"""
+Unit tests for bulk SMACT composition validation.
+"""
+
+from __future__ import annotations
+
+import pytest
+from smact.screening import smact_validity
+
+from crystalyse.tools.smact import bulk
+from crystalyse.tools.smact.bulk import parse_stoichiometry, validate_compositions_bulk
+
+FORMULAS = [
+    "NaCl",
+    "Fe2O3",
+    "LiFePO4",
+    "CsSnI3",
+    "NaCl2",
+    "CuZn",
+    "Cs",
+    "Ba2Cu3O7",
+    "XeF4",
+    "Li3N",
+    "SiO3",
+    "K2Se5",
+]
+
+
+class TestParseStoichiometry:
+    """Tests for formula reduction."""
+
+    def test_multiples_reduce(self) -> None:
+        """Test that formula multiples reduce to the same stoichiometry."""
+        assert parse_stoichiometry("Fe4O6") == ("Fe2O3", (("Fe", 2), ("O", 3)))
+
+    def test_fractional_amounts(self) -> None:
+        """Test that non-integer compositions have no integer stoichiometry."""
+        _, stoichiometry = parse_stoichiometry("Li0.5CoO2")
+        assert stoichiometry is None
+
+
+class TestValidateCompositionsBulk:
+    """Tests for validate_compositions_bulk()."""
+
+    @pytest.mark.parametrize("use_pauling_test", [True, False])
+    @pytest.mark.parametrize("oxidation_states_set", ["icsd24", "smact14"])
+    def test_matches_smact_validity(
+        self, use_pauling_test: bool, oxidation_states_set: str
+    ) -> None:
+        """Test that bulk verdicts agree with smact_validity formula by formula."""
+        result = validate_compositions_bulk(
+            FORMULAS,
+            use_pauling_test=use_pauling_test,
+            oxidation_states_set=oxidation_states_set,
+            workers=1,
+        )
+
+        expected = [
+            smact_validity(
+                formula,
+                use_pauling_test=use_pauling_test,
+                oxidation_states_set=oxidation_states_set,
+            )
+            for formula in FORMULAS
+        ]
+        assert result.verdicts == expected
+
+    def test_duplicates_validated_once(self) -> None:
+        """Test that repeated and equivalent formulas share one verdict."""
+        result = validate_compositions_bulk(["NaCl", "Na2Cl2", "ClNa", "NaCl"], workers=1)
+
+        assert result.total == 4
+        assert result.unique == 1
+        assert result.verdicts == [True, True, True, True]
+        assert result.valid_formulas == ["NaCl"]
+
+    def test_unparseable_formula(self) -> None:
+        """Test that a bad formula gets a None verdict without failing the batch."""
+        result = validate_compositions_bulk(["NaCl", "Na(Cl"], workers=1)
+
+        assert result.success is True
+        assert result.verdicts == [True, None]
+        assert "Na(Cl" in result.errors
+
+    def test_validation_errors_keyed_by_input(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a failed validation is reported under every spelling that asked for it."""
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("no data")
+
+        monkeypatch.setattr(bulk, "is_valid_stoichiometry", broken)
+
+        result = validate_compositions_bulk(["Fe4O6", "Fe2O3"], workers=1)
+
+        assert result.verdicts == [None, None]
+        assert result.errors == {"Fe4O6": "no data", "Fe2O3": "no data"}
+
+    def test_fractional_composition_falls_back(self) -> None:
+        """Test that fractional compositions are validated by smact_validity."""
+        result = validate_compositions_bulk(["Li0.5CoO2"], workers=1)
+
+        assert result.verdicts == [smact_validity("Li0.5CoO2", oxidation_states_set="icsd24")]
+
+    def test_process_pool(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that chunks validated in worker processes come back in order."""
+        monkeypatch.setattr(bulk, "PARALLEL_THRESHOLD", 1)
+
+        result = validate_compositions_bulk(FORMULAS, workers=2, chunk_size=3)
+
+        assert result.workers == 2
+        assert result.verdicts == validate_compositions_bulk(FORMULAS, workers=1).verdicts
@@ -0,0 +1,63 @@
+"""
+Unit tests for dopant embedding sessions.
+"""
+
+from __future__ import annotations
+
+import pytest
+from smact.dopant_prediction.doper import Doper
+
+from crystalyse.tools.smact.dopant_predictor import (
+    RESULT_KEYS,
+    SMACTDopantPredictor,
+    get_dopant_session,
+)
+
+
+class TestDopantEmbeddingSession:
+    """Tests for DopantEmbeddingSession."""
+
+    def test_session_loaded_once(self) -> None:
+        """Test that the same session is returned for an embedding."""
+        assert get_dopant_session("skipspecies") is get_dopant_session("skipspecies")
+
+    @pytest.mark.parametrize("get_selectivity", [True, False])
+    def test_matches_doper(self, get_selectivity: bool) -> None:
+        """Test that rankings agree with SMACT's Doper."""
+        host = ("Li1+", "Fe3+", "P5+", "O2-")
+        expected = Doper(host, embedding="skipspecies").get_dopants(
+            num_dopants=5, get_selectivity=get_selectivity
+        )
+
+        results = get_dopant_session("skipspecies").get_dopants(
+            host, num_dopants=5, get_selectivity=get_selectivity
+        )
+
+        for key in RESULT_KEYS:
+            ranked = expected[key]["sorted"]
+            assert [entry[:2] for entry in results[key]] == [entry[:2] for entry in ranked]
+            for entry, reference in zip(results[key], ranked, strict=True):
+                assert entry[2:] == pytest.approx([float(x) for x in reference[2:]])
+
+
+class TestPredictDopantsBatch:
+    """Tests for SMACTDopantPredictor.predict_dopants_batch()."""
+
+    def test_repeated_hosts_hit_cache(self) -> None:
+        """Test that results come back in input order and repeats are cached."""
+        hosts = [["Ti4+", "O2-"], ["Zn2+", "O2-"], ["Ti4+", "O2-"]]
+
+        batch = SMACTDopantPredictor.predict_dopants_batch(hosts, num_dopants=3)
+
+        assert batch.success is True
+        assert [r.composition for r in batch.results] == ["Ti4+ O2-", "Zn2+ O2-", "Ti4+ O2-"]
+        assert batch.results[0] == batch.results[2]
+        assert batch.cache_hits >= 1
+        assert batch.results[0].n_type_cation[0].dopant_species == "Nb5+"
+
+    def test_mismatched_compositions(self) -> None:
+        """Test that a compositions list of the wrong length is rejected."""
+        batch = SMACTDopantPredictor.predict_dopants_batch([["Ti4+", "O2-"]], ["TiO2", "ZnO"])
+
+        assert batch.success is False
+        assert "one entry per host" in batch.error_message
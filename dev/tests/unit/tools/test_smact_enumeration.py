@@ -0,0 +1,88 @@
+"""
+Unit tests for streaming, paginated SMACT composition enumeration.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from smact import Element
+from smact.screening import smact_filter
+
+from crystalyse.tools.smact import SMACTScreener, enumeration
+from crystalyse.tools.smact.enumeration import EnumerationStore, iter_compositions
+
+ELEMENTS = ["Li", "Fe", "P", "O"]
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> EnumerationStore:
+    store = EnumerationStore(tmp_path / "enumerations")
+    monkeypatch.setattr(enumeration, "_enumeration_store", store)
+    return store
+
+
+def _reference(elements: list[str], **kwargs) -> list:
+    return smact_filter(tuple(Element(e) for e in elements), **kwargs)
+
+
+class TestIterCompositions:
+    """Tests for the streaming enumeration engine."""
+
+    def test_matches_smact_filter(self) -> None:
+        """Test that compositions and their order match smact_filter."""
+        expected = [tuple(map(tuple, comp)) for comp in _reference(ELEMENTS, threshold=6)]
+
+        assert list(iter_compositions(ELEMENTS, threshold=6, workers=1)) == expected
+
+    def test_element_combinations_only(self) -> None:
+        """Test that species_unique=False deduplicates stoichiometries like smact_filter."""
+        expected = _reference(ELEMENTS, threshold=5, species_unique=False)
+
+        result = list(iter_compositions(ELEMENTS, threshold=5, species_unique=False, workers=1))
+        assert [(symbols, ratio) for symbols, _, ratio in result] == expected
+
+    def test_process_pool(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that shards enumerated in worker processes arrive in order."""
+        monkeypatch.setattr(enumeration, "PARALLEL_THRESHOLD", 1)
+        monkeypatch.setattr(enumeration, "SHARD_SIZE", 7)
+
+        serial = list(iter_compositions(ELEMENTS, threshold=4, workers=1))
+        assert list(iter_compositions(ELEMENTS, threshold=4, workers=2)) == serial
+
+
+class TestFilterCompositionsPaging:
+    """Tests for cursor paging through SMACTScreener.filter_compositions."""
+
+    def test_pages_cover_full_enumeration(self, store: EnumerationStore) -> None:
+        """Test that following next_cursor returns every composition exactly once."""
+        first = SMACTScreener.filter_compositions(ELEMENTS, threshold=5, page_size=50)
+        assert first.success is True
+
+        pages = [first]
+        while pages[-1].next_cursor:
+            pages.append(
+                SMACTScreener.filter_compositions([], page_size=50, cursor=pages[-1].next_cursor)
+            )
+
+        collected = [c for page in pages for c in page.valid_compositions]
+        assert len(collected) == first.num_valid_compositions
+        assert collected[-1]["stoichiometry"] == list(_reference(ELEMENTS, threshold=5)[-1][2])
+        assert pages[-1].offset == 50 * (len(pages) - 1)
+
+    def test_table_reused(self, store: EnumerationStore, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a repeated query is served from the stored table."""
+        SMACTScreener.filter_compositions(ELEMENTS, threshold=4)
+        monkeypatch.setattr(
+            enumeration, "iter_composition_blocks", lambda *_, **__: pytest.fail("re-enumerated")
+        )
+
+        assert SMACTScreener.filter_compositions(ELEMENTS, threshold=4).success is True
+
+    def test_unknown_cursor(self, store: EnumerationStore) -> None:
+        """Test that a cursor for a missing table fails with an explanation."""
+        result = SMACTScreener.filter_compositions([], cursor="0" * 32 + ":100")
+
+        assert result.success is False
+        assert "without a cursor" in result.error_message
@@ -0,0 +1,70 @@
+"""
+Unit tests for batch composition featurisation.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from smact.screening import ml_rep_generator
+
+from crystalyse.tools.smact.enumeration import EnumerationStore
+from crystalyse.tools.smact.features import (
+    featurise_compositions,
+    featurise_enumeration,
+    load_feature_matrix,
+)
+
+FORMULAS = ["LiFePO4", "Fe2O3", "Na(Cl", "Li0.5CoO2", "Fe2O3"]
+
+
+class TestFeaturiseCompositions:
+    """Tests for featurise_compositions()."""
+
+    @pytest.mark.parametrize("sparse", [False, True])
+    def test_rows_match_ml_rep_generator(self, tmp_path: Path, sparse: bool) -> None:
+        """Test that each row equals SMACT's ML vector for that formula."""
+        from pymatgen.core import Composition
+
+        result = featurise_compositions(FORMULAS, tmp_path, sparse=sparse)
+
+        assert result.success is True
+        assert result.shape == [5, 103]
+        assert result.num_failed == 1
+        matrix, index = load_feature_matrix(result.matrix_path)
+        matrix = matrix.toarray() if sparse else np.asarray(matrix)
+        assert index["rows"] == FORMULAS
+        assert "Na(Cl" in index["failed"]
+        assert not matrix[2].any()
+        for row, formula in enumerate(FORMULAS):
+            if formula == "Na(Cl":
+                continue
+            amounts = Composition(formula).get_el_amt_dict()
+            expected = ml_rep_generator(list(amounts), list(amounts.values()))
+            np.testing.assert_allclose(matrix[row], expected, atol=1e-6)
+
+    def test_summary_statistics(self, tmp_path: Path) -> None:
+        """Test that element counts report how many rows contain each element."""
+        result = featurise_compositions(["NaCl", "KCl", "NaF"], tmp_path)
+
+        assert result.element_counts == {"Na": 2, "Cl": 2, "F": 1, "K": 1}
+        assert result.mean_elements_per_row == 2.0
+
+
+class TestFeaturiseEnumeration:
+    """Tests for featurise_enumeration()."""
+
+    def test_matches_formula_featurisation(self, tmp_path: Path) -> None:
+        """Test that an enumeration matrix equals featurising its formulas."""
+        table = EnumerationStore(tmp_path / "enum").build(["Li", "Fe", "O"], threshold=4)
+
+        result = featurise_enumeration(table, tmp_path)
+
+        matrix, index = load_feature_matrix(result.matrix_path)
+        assert result.shape == [table.count, 103]
+        expected, _ = load_feature_matrix(
+            featurise_compositions(index["rows"], tmp_path, name="expected").matrix_path
+        )
+        np.testing.assert_allclose(matrix, expected, atol=1e-6)
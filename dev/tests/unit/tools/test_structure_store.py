@@ -0,0 +1,76 @@
+"""
+Unit tests for the server-side structure store.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from crystalyse.tools.pymatgen.analyzer import PyMatgenAnalyzer
+from crystalyse.tools.structure_store import StructureStore, is_handle
+
+NACL = {
+    "numbers": [11, 17],
+    "positions": [[0.0, 0.0, 0.0], [2.82, 2.82, 2.82]],
+    "cell": [[0.0, 2.82, 2.82], [2.82, 0.0, 2.82], [2.82, 2.82, 0.0]],
+    "symbols": ["Na", "Cl"],
+    "formula": "NaCl",
+}
+
+
+class TestStructureStore:
+    """Tests for StructureStore."""
+
+    def test_handle_is_content_address(self, tmp_path: Path) -> None:
+        """Test that equal structures share a handle and the summary describes them."""
+        store = StructureStore(tmp_path)
+
+        handle = store.put(NACL, formula="NaCl")
+        jittered = {**NACL, "positions": [[0.0, 0.0, 1e-9], [2.82, 2.82, 2.82]]}
+
+        assert is_handle(handle)
+        assert store.put(jittered) == handle
+        summary = store.summary(handle)
+        assert summary["formula"] == "NaCl" and summary["num_atoms"] == 2
+        assert summary["volume"] == pytest.approx(2 * 2.82**3, rel=1e-4)
+
+    def test_persists_and_exports(self, tmp_path: Path) -> None:
+        """Test that a new store over the same directory resolves and exports the handle."""
+        handle = StructureStore(tmp_path).put(NACL)
+        store = StructureStore(tmp_path)
+
+        assert store.resolve(handle)["numbers"] == [11, 17]
+        assert "_cell_length_a" in store.export(handle, "cif")
+        assert store.export(handle, "poscar").split()[:2] == ["Na", "Cl"]
+        assert store.resolve(NACL) is NACL
+
+    def test_ttl_eviction(self, tmp_path: Path) -> None:
+        """Test that structures unused for longer than the TTL expire from memory and disk."""
+        store = StructureStore(tmp_path, ttl=60)
+        handle = store.put(NACL)
+        path = tmp_path / f"{handle}.json"
+        old = time.time() - 120
+        os.utime(path, (old, old))
+        store._entries.clear()
+
+        assert store.evict_expired() == 1
+        assert not path.exists()
+        with pytest.raises(ValueError, match="Unknown or expired"):
+            store.resolve(handle)
+
+    def test_analyzer_accepts_handles(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that the pymatgen tools take a handle in place of the structure."""
+        monkeypatch.setenv("CRYSTALYSE_STRUCTURE_DIR", str(tmp_path))
+        monkeypatch.setattr("crystalyse.tools.structure_store._structure_store", None)
+        from crystalyse.tools.structure_store import get_structure_store
+
+        handle = get_structure_store().put(NACL)
+
+        batch = PyMatgenAnalyzer().analyze_space_group_batch([handle, "struct-0000000000000000"])
+
+        assert batch.results[0].space_group_number == 225
+        assert "Unknown or expired" in batch.results[1].error
@@ -0,0 +1,226 @@
+"""
+Unit tests for the memory-mapped weights cache.
+
+Tiny Chemeleon and MACE models are built in-process so conversion and rebuild can
+be checked without downloading checkpoints.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+from ase import Atoms
+
+from crystalyse.tools.chemeleon.predictor import _build_chemeleon_module, _chemeleon_weights
+from crystalyse.tools.weights_cache import WeightsCache, decode_config_value
+
+
+@pytest.fixture
+def weights_cache(tmp_path: Path) -> WeightsCache:
+    return WeightsCache(cache_dir=tmp_path / "weights", enabled=True)
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    path = tmp_path / "model.ckpt"
+    path.write_bytes(b"original checkpoint")
+    return path
+
+
+def _tiny_diffusion_module():
+    from chemeleon_dng.script_util import create_diffusion_module
+
+    return create_diffusion_module(
+        task="csp",
+        model_configs={
+            "hidden_dim": 16,
+            "time_dim": 8,
+            "num_layers": 2,
+            "max_atoms": 100,
+            "act_fn": "silu",
+            "dis_emb": "sin",
+            "num_freqs": 4,
+            "ln": True,
+            "ip": True,
+            "smooth": False,
+            "cond_dim": 0,
+        },
+        optimizer_configs={
+            "optimizer": "adam",
+            "lr": 1e-4,
+            "weight_decay": 0.0,
+            "scheduler": "plateau",
+            "patience": 10,
+            "early_stopping": 20,
+        },
+        num_timesteps=10,
+        beta_schedule_ddpm="cosine",
+        beta_schedule_d3pm="cosine",
+        max_atoms=100,
+        d3pm_hybrid_coeff=0.01,
+        sigma_begin=0.005,
+        sigma_end=0.5,
+    )
+
+
+def _tiny_mace_model():
+    from e3nn import o3
+    from mace import modules
+
+    interaction = modules.interaction_classes["RealAgnosticResidualInteractionBlock"]
+    return modules.ScaleShiftMACE(
+        r_max=4.0,
+        num_bessel=4,
+        num_polynomial_cutoff=3,
+        max_ell=1,
+        interaction_cls=interaction,
+        interaction_cls_first=interaction,
+        num_interactions=2,
+        num_elements=2,
+        hidden_irreps=o3.Irreps("8x0e"),
+        MLP_irreps=o3.Irreps("4x0e"),
+        gate=torch.nn.functional.silu,
+        atomic_energies=np.array([-1.0, -2.0]),
+        avg_num_neighbors=4.0,
+        atomic_numbers=[1, 8],
+        correlation=2,
+        atomic_inter_scale=1.0,
+        atomic_inter_shift=0.0,
+    )
+
+
+class TestWeightsCache:
+    """Tests for WeightsCache save/load and integrity checks."""
+
+    def test_round_trip(self, weights_cache: WeightsCache, source: Path) -> None:
+        """Test that saved tensors and config load back unchanged."""
+        tensors = {"layer.weight": torch.randn(4, 3), "layer.bias": torch.zeros(4)}
+        assert weights_cache.save(source, "test", tensors, {"hidden": 4}) is not None
+
+        loaded = weights_cache.load(source, "test")
+        assert loaded is not None
+        loaded_tensors, config = loaded
+        assert config == {"hidden": 4}
+        for name, tensor in tensors.items():
+            assert torch.equal(loaded_tensors[name], tensor)
+
+    def test_missing_conversion_returns_none(
+        self, weights_cache: WeightsCache, source: Path
+    ) -> None:
+        """Test that an unconverted checkpoint falls back to the original."""
+        assert weights_cache.load(source, "test") is None
+
+    def test_changed_source_invalidates(self, weights_cache: WeightsCache, source: Path) -> None:
+        """Test that replacing the source checkpoint ignores the old conversion."""
+        weights_cache.save(source, "test", {"w": torch.ones(2)}, {})
+        source.write_bytes(b"a newer, retrained checkpoint")
+        assert weights_cache.load(source, "test") is None
+
+    def test_corrupted_weights_rejected(self, weights_cache: WeightsCache, source: Path) -> None:
+        """Test that a converted file that no longer matches its hash is discarded."""
+        weights_path = weights_cache.save(source, "test", {"w": torch.ones(2)}, {})
+        weights_path.write_bytes(weights_path.read_bytes()[:-8] + b"garbage!")
+
+        assert weights_cache.load(source, "test") is None
+        assert not weights_path.exists()
+
+    def test_unserialisable_config_skips_conversion(
+        self, weights_cache: WeightsCache, source: Path
+    ) -> None:
+        """Test that a config JSON cannot store leaves no partial conversion behind."""
+        assert weights_cache.save(source, "test", {"w": torch.ones(2)}, {"x": object()}) is None
+        assert weights_cache.load(source, "test") is None
+
+    def test_callables_outside_allowlist_rejected(
+        self, weights_cache: WeightsCache, source: Path
+    ) -> None:
+        """Test that a manifest cannot make the loader import arbitrary callables."""
+        with pytest.raises(ValueError, match="outside the allowed modules"):
+            decode_config_value({"__callable__": "os:system"})
+        with pytest.raises(ValueError, match="private attribute"):
+            decode_config_value({"__callable__": "torch.nn.functional:__builtins__"})
+        assert decode_config_value({"__callable__": "torch.nn:SiLU"}) is torch.nn.SiLU
+
+        assert weights_cache.save(source, "test", {"w": torch.ones(2)}, {"f": print}) is None
+
+    def test_disabled_cache(self, tmp_path: Path, source: Path) -> None:
+        """Test that a disabled cache neither writes nor reads conversions."""
+        cache = WeightsCache(cache_dir=tmp_path / "weights", enabled=False)
+        assert cache.save(source, "test", {"w": torch.ones(2)}, {}) is None
+        assert not (tmp_path / "weights").exists()
+
+
+class TestChemeleonConversion:
+    """Tests for rebuilding a DiffusionModule from converted weights."""
+
+    def test_rebuilt_module_samples_identically(
+        self, weights_cache: WeightsCache, source: Path
+    ) -> None:
+        """Test that the rebuilt module matches the original under a fixed seed."""
+        original = _tiny_diffusion_module().eval()
+        weights_cache.save(source, "chemeleon", *_chemeleon_weights(original))
+
+        rebuilt = _build_chemeleon_module(*weights_cache.load(source, "chemeleon")).eval()
+
+        for name, tensor in original.state_dict().items():
+            assert torch.equal(rebuilt.state_dict()[name], tensor)
+
+        samples = []
+        for module in (original, rebuilt):
+            torch.manual_seed(0)
+            samples.append(
+                module.sample(task="csp", atom_types=[8, 22, 8], num_atoms=[3], verbose=False)
+            )
+        np.testing.assert_allclose(samples[0][0].positions, samples[1][0].positions)
+
+
+class TestMACEConversion:
+    """Tests for loading MACE models through the weights cache."""
+
+    def test_converted_model_matches_original(
+        self, weights_cache: WeightsCache, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the second load uses the conversion and gives the same energy."""
+        from crystalyse.tools import weights_cache as weights_cache_module
+        from crystalyse.tools.mace.weights import calculator_from_model_file
+
+        monkeypatch.setattr(weights_cache_module, "_weights_cache", weights_cache)
+        model_path = tmp_path / "tiny.model"
+        torch.save(_tiny_mace_model(), model_path)
+
+        atoms = Atoms("H2O", positions=[[0, 0, 0], [0.96, 0, 0], [-0.24, 0.93, 0]], cell=[6] * 3)
+        energies = []
+        for _ in range(2):
+            atoms.calc = calculator_from_model_file(str(model_path), "cpu", "float64")
+            energies.append(atoms.get_potential_energy())
+
+        assert list(weights_cache.cache_dir.glob("mace-*.pt"))
+        assert energies[0] == pytest.approx(energies[1])
+
+    @pytest.mark.skipif(not Path("/proc/self/maps").exists(), reason="needs /proc/self/maps")
+    def test_float32_parameters_stay_file_backed(
+        self, weights_cache: WeightsCache, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a float32 calculator uses the mapped weights rather than a cast copy."""
+        from crystalyse.tools import weights_cache as weights_cache_module
+        from crystalyse.tools.mace.weights import calculator_from_model_file
+
+        monkeypatch.setattr(weights_cache_module, "_weights_cache", weights_cache)
+        model_path = tmp_path / "tiny.model"
+        torch.save(_tiny_mace_model().double(), model_path)
+
+        calculator_from_model_file(str(model_path), "cpu", "float32")
+        calc = calculator_from_model_file(str(model_path), "cpu", "float32")
+
+        (weights_path,) = weights_cache.cache_dir.glob("mace-float32-*.pt")
+        mapped = []
+        for line in Path("/proc/self/maps").read_text().splitlines():
+            if line.endswith(str(weights_path)):
+                low, high = (int(address, 16) for address in line.split()[0].split("-"))
+                mapped.append((low, high))
+        params = list(calc.models[0].parameters())
+        assert all(p.dtype == torch.float32 for p in params)
+        assert all(any(low <= p.data_ptr() < high for low, high in mapped) for p in params)
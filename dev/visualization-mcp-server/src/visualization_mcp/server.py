@@ -2,6 +2,9 @@
 
 from mcp.server.fastmcp import FastMCP
 
+from crystalyse.tools.batch import register_batch_call
+from crystalyse.tools.serving import serve
+
 from .tools import (
     create_3dmol_visualization,
     create_creative_visualization,
@@ -18,6 +21,13 @@ mcp.tool()(create_pymatviz_analysis_suite)
 mcp.tool()(create_creative_visualization)
 mcp.tool()(create_rigorous_visualization)
 mcp.tool()(create_mode_aligned_visualization)
+register_batch_call(mcp)
+
+
+def main():
+    """Run the visualization MCP server."""
+    serve(mcp, "visualization")
+
 
 if __name__ == "__main__":
-    mcp.run()
+    main()